@@ -116,7 +116,7 @@ const PhotoGallery = ({
 
   const handleDownload = (photo) => {
     const link = document.createElement('a');
-    link.href = `/api/photos/file/${photo.id}`;
+    link.href = photo.file_url || `/api/photos/file/${photo.id}`;
     link.download = photo.original_filename;
     document.body.appendChild(link);
     link.click();
@@ -183,11 +183,11 @@ const PhotoGallery = ({
             <Card key={photo.id} className="overflow-hidden group">
               <div className="relative aspect-square">
                 <img
-                  src={`/api/photos/thumbnail/${photo.id}`}
+                  src={photo.thumbnail_url || `/api/photos/thumbnail/${photo.id}`}
                   alt={photo.alt_text || photo.title || 'Foto'}
                   className="w-full h-full object-cover transition-transform group-hover:scale-105"
                   onError={(e) => {
-                    e.target.src = `/api/photos/file/${photo.id}`;
+                    e.target.src = photo.file_url || `/api/photos/file/${photo.id}`;
                   }}
                 />
 
@@ -221,7 +221,7 @@ const PhotoGallery = ({
                         </DialogHeader>
                         <div className="space-y-4">
                           <img
-                            src={`/api/photos/file/${photo.id}`}
+                            src={photo.file_url || `/api/photos/file/${photo.id}`}
                             alt={photo.alt_text || photo.title || 'Foto'}
                             className="w-full h-auto max-h-[70vh] object-contain"
                           />
@@ -60,3 +60,9 @@ def pre_fork(server, worker):
 def post_fork(server, worker):
     """Called after each worker is forked"""
     server.log.info(f"Worker {worker.pid} spawned")
+
+    # Build the plant suggestion index before the first keystroke reaches this worker;
+    # without preload_app the index is built on the worker's first request instead
+    from src.services.plant_suggestions import plant_suggestions
+
+    plant_suggestions.warm()
@@ -0,0 +1,58 @@
+"""Add normalized natural keys for import duplicate detection
+
+Revision ID: 8d3f1c2a9b47
+Revises: 376b42db1ebc
+Create Date: 2026-10-18 10:12:41.318207
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from src.utils.natural_keys import client_key, plant_key, product_key, supplier_key
+
+# revision identifiers, used by Alembic.
+revision = "8d3f1c2a9b47"
+down_revision = "376b42db1ebc"
+branch_labels = None
+depends_on = None
+
+NATURAL_KEYS = {
+    "plants": (("name",), plant_key),
+    "suppliers": (("name", "email"), supplier_key),
+    "products": (("name", "supplier_id"), product_key),
+    "clients": (("email",), client_key),
+}
+
+INDEX_NAMES = {
+    "plants": "idx_plant_natural_key",
+    "suppliers": "idx_supplier_natural_key",
+    "products": "idx_product_natural_key",
+    "clients": "idx_client_natural_key",
+}
+
+
+def upgrade():
+    for table_name, index_name in INDEX_NAMES.items():
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.add_column(sa.Column("natural_key", sa.String(length=255), nullable=True))
+            batch_op.create_index(index_name, ["natural_key"], unique=False)
+
+    # Backfill existing rows with the same normalization the models apply on write
+    connection = op.get_bind()
+    for table_name, (columns, build_key) in NATURAL_KEYS.items():
+        table = sa.table(table_name, sa.column("id"), sa.column("natural_key"), *(sa.column(name) for name in columns))
+        rows = connection.execute(sa.select(table.c.id, *(table.c[name] for name in columns))).all()
+        updates = [{"row_id": row[0], "key": build_key(*row[1:])} for row in rows]
+        if updates:
+            connection.execute(
+                table.update().where(table.c.id == sa.bindparam("row_id")).values(natural_key=sa.bindparam("key")),
+                updates,
+            )
+
+
+def downgrade():
+    for table_name, index_name in INDEX_NAMES.items():
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.drop_index(index_name)
+            batch_op.drop_column("natural_key")
@@ -0,0 +1,27 @@
+"""Add full-text search indexes for plants, clients, projects and suppliers
+
+Revision ID: a4c8e2f61d97
+Revises: d1b6e9f3a574
+Create Date: 2026-10-19 09:41:18.603215
+
+"""
+
+from alembic import op
+
+from src.utils.full_text import create_search_indexes, drop_search_indexes
+
+# revision identifiers, used by Alembic.
+revision = "a4c8e2f61d97"
+down_revision = "d1b6e9f3a574"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FTS5 tables with triggers on SQLite, generated tsvector columns with GIN indexes
+    # on PostgreSQL; existing rows are indexed as part of the upgrade
+    create_search_indexes(op.get_bind())
+
+
+def downgrade():
+    drop_search_indexes(op.get_bind())
@@ -0,0 +1,46 @@
+"""Add processing state to photos for the background image pipeline
+
+Revision ID: a7e3c1f94b20
+Revises: f2c6a9d15e38
+Create Date: 2026-10-18 22:31:08.904115
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a7e3c1f94b20"
+down_revision = "f2c6a9d15e38"
+branch_labels = None
+depends_on = None
+
+processing_state = sa.Enum("PENDING", "PROCESSING", "READY", "FAILED", name="photoprocessingstate")
+
+
+def upgrade():
+    # The photos table is created by db.create_all() and may not exist yet
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table("photos"):
+        return
+
+    processing_state.create(bind, checkfirst=True)
+    with op.batch_alter_table("photos", schema=None) as batch_op:
+        # Existing photos were processed during their upload
+        batch_op.add_column(sa.Column("processing_state", processing_state, nullable=False, server_default="READY"))
+        batch_op.add_column(sa.Column("processing_error", sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column("processed_at", sa.DateTime(), nullable=True))
+        batch_op.create_index("ix_photos_processing_state", ["processing_state"], unique=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table("photos"):
+        return
+
+    with op.batch_alter_table("photos", schema=None) as batch_op:
+        batch_op.drop_index("ix_photos_processing_state")
+        batch_op.drop_column("processed_at")
+        batch_op.drop_column("processing_error")
+        batch_op.drop_column("processing_state")
+    processing_state.drop(bind, checkfirst=True)
@@ -0,0 +1,104 @@
+"""Add monthly analytics rollup tables
+
+Revision ID: b4e7a19c3d52
+Revises: 8d3f1c2a9b47
+Create Date: 2026-10-18 14:05:12.904311
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from src.utils.date_buckets import month_bucket
+
+# revision identifiers, used by Alembic.
+revision = "b4e7a19c3d52"
+down_revision = "8d3f1c2a9b47"
+branch_labels = None
+depends_on = None
+
+UNDATED_MONTH = "0000-00"
+
+
+def upgrade():
+    op.create_table(
+        "rollup_project_monthly",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("month", sa.String(length=7), nullable=False),
+        sa.Column("project_type", sa.String(length=50), nullable=True),
+        sa.Column("project_count", sa.Integer(), nullable=False),
+        sa.Column("budgeted_count", sa.Integer(), nullable=False),
+        sa.Column("budget_total", sa.Float(), nullable=True),
+        sa.Column("planted_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("idx_rollup_project_month", "rollup_project_monthly", ["month"], unique=False)
+
+    op.create_table(
+        "rollup_plant_monthly",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("month", sa.String(length=7), nullable=False),
+        sa.Column("plant_id", sa.Integer(), nullable=False),
+        sa.Column("selection_count", sa.Integer(), nullable=False),
+        sa.Column("total_quantity", sa.Integer(), nullable=True),
+        sa.Column("unit_cost_sum", sa.Float(), nullable=True),
+        sa.Column("unit_cost_count", sa.Integer(), nullable=False),
+        sa.Column("cost_total", sa.Float(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("idx_rollup_plant_month", "rollup_plant_monthly", ["month", "plant_id"], unique=False)
+
+    op.create_table(
+        "rollup_category_monthly",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("month", sa.String(length=7), nullable=False),
+        sa.Column("city", sa.String(length=50), nullable=True),
+        sa.Column("category", sa.String(length=50), nullable=False),
+        sa.Column("project_count", sa.Integer(), nullable=False),
+        sa.Column("selection_count", sa.Integer(), nullable=False),
+        sa.Column("total_quantity", sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("idx_rollup_category_month", "rollup_category_monthly", ["month"], unique=False)
+
+    op.create_table(
+        "rollup_location_monthly",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("month", sa.String(length=7), nullable=False),
+        sa.Column("city", sa.String(length=50), nullable=True),
+        sa.Column("location", sa.Text(), nullable=True),
+        sa.Column("project_count", sa.Integer(), nullable=False),
+        sa.Column("budget_total", sa.Float(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("idx_rollup_location_month", "rollup_location_monthly", ["month"], unique=False)
+
+    dirty_months = op.create_table(
+        "rollup_dirty_months",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("month", sa.String(length=7), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    with op.batch_alter_table("projects", schema=None) as batch_op:
+        batch_op.create_index("idx_project_created_at", ["created_at"], unique=False)
+
+    # Mark every month with projects dirty; the first analytics read fills the rollups
+    projects = sa.table("projects", sa.column("created_at", sa.DateTime()))
+    month = sa.func.coalesce(month_bucket(projects.c.created_at), UNDATED_MONTH)
+    op.get_bind().execute(dirty_months.insert().from_select(["month"], sa.select(month).distinct()))
+
+
+def downgrade():
+    with op.batch_alter_table("projects", schema=None) as batch_op:
+        batch_op.drop_index("idx_project_created_at")
+
+    op.drop_table("rollup_dirty_months")
+    op.drop_index("idx_rollup_location_month", table_name="rollup_location_monthly")
+    op.drop_table("rollup_location_monthly")
+    op.drop_index("idx_rollup_category_month", table_name="rollup_category_monthly")
+    op.drop_table("rollup_category_monthly")
+    op.drop_index("idx_rollup_plant_month", table_name="rollup_plant_monthly")
+    op.drop_table("rollup_plant_monthly")
+    op.drop_index("idx_rollup_project_month", table_name="rollup_project_monthly")
+    op.drop_table("rollup_project_monthly")
@@ -0,0 +1,34 @@
+"""Add derivatives to photos for the multi-resolution derivative set
+
+Revision ID: b8d4e2a07c61
+Revises: a7e3c1f94b20
+Create Date: 2026-10-18 23:41:52.117630
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b8d4e2a07c61"
+down_revision = "a7e3c1f94b20"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The photos table is created by db.create_all() and may not exist yet
+    if not sa.inspect(op.get_bind()).has_table("photos"):
+        return
+
+    # Existing photos only have a thumbnail until "flask photos reprocess" runs
+    with op.batch_alter_table("photos", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("derivatives", sa.JSON(), nullable=True))
+
+
+def downgrade():
+    if not sa.inspect(op.get_bind()).has_table("photos"):
+        return
+
+    with op.batch_alter_table("photos", schema=None) as batch_op:
+        batch_op.drop_column("derivatives")
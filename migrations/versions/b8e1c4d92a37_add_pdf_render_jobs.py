@@ -0,0 +1,42 @@
+"""Add PDF render jobs table so every worker can answer job polls
+
+Revision ID: b8e1c4d92a37
+Revises: f3b7d25c8e14
+Create Date: 2026-10-19 16:03:52.740118
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b8e1c4d92a37"
+down_revision = "f3b7d25c8e14"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "pdf_render_jobs",
+        sa.Column("id", sa.String(length=32), nullable=False),
+        sa.Column("filename", sa.String(length=255), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("slots", sa.Integer(), nullable=False),
+        sa.Column("path", sa.String(length=500), nullable=True),
+        sa.Column("cache_key", sa.String(length=64), nullable=True),
+        sa.Column("render_seconds", sa.Float(), nullable=True),
+        sa.Column("section_seconds", sa.JSON(), nullable=True),
+        sa.Column("submitted_at", sa.DateTime(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    with op.batch_alter_table("pdf_render_jobs", schema=None) as batch_op:
+        batch_op.create_index("idx_pdf_render_job_submitted_at", ["submitted_at"], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table("pdf_render_jobs", schema=None) as batch_op:
+        batch_op.drop_index("idx_pdf_render_job_submitted_at")
+
+    op.drop_table("pdf_render_jobs")
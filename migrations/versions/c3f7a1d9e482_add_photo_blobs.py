@@ -0,0 +1,48 @@
+"""Add photo blobs for content-addressed photo storage
+
+Revision ID: c3f7a1d9e482
+Revises: b8d4e2a07c61
+Create Date: 2026-10-18 23:58:14.402917
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c3f7a1d9e482"
+down_revision = "b8d4e2a07c61"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The photos table is created by db.create_all() and may not exist yet
+    if not sa.inspect(op.get_bind()).has_table("photos"):
+        return
+
+    op.create_table(
+        "photo_blobs",
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("file_path", sa.String(length=500), nullable=False),
+        sa.Column("file_size", sa.Integer(), nullable=True),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("sha256"),
+    )
+    # Existing photos keep their own files and have no content hash
+    with op.batch_alter_table("photos", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("content_hash", sa.String(length=64), nullable=True))
+        batch_op.create_index("ix_photos_content_hash", ["content_hash"], unique=False)
+        batch_op.create_foreign_key("fk_photos_content_hash", "photo_blobs", ["content_hash"], ["sha256"])
+
+
+def downgrade():
+    if not sa.inspect(op.get_bind()).has_table("photos"):
+        return
+
+    with op.batch_alter_table("photos", schema=None) as batch_op:
+        batch_op.drop_constraint("fk_photos_content_hash", type_="foreignkey")
+        batch_op.drop_index("ix_photos_content_hash")
+        batch_op.drop_column("content_hash")
+    op.drop_table("photo_blobs")
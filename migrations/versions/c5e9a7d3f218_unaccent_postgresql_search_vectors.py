@@ -0,0 +1,32 @@
+"""Build the PostgreSQL search vectors without accents
+
+Revision ID: c5e9a7d3f218
+Revises: b8e1c4d92a37
+Create Date: 2026-10-19 18:27:05.413906
+
+"""
+
+from alembic import op
+
+from src.utils.full_text import SEARCH_COLUMNS, create_search_indexes, drop_search_indexes
+
+# revision identifiers, used by Alembic.
+revision = "c5e9a7d3f218"
+down_revision = "b8e1c4d92a37"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Searches are accent-free, so vectors that kept accents could not match accented words.
+    # Generated columns cannot be altered; they are recreated. SQLite's FTS5 tables already
+    # remove diacritics.
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        drop_search_indexes(bind, list(SEARCH_COLUMNS))
+        create_search_indexes(bind)
+
+
+def downgrade():
+    # The accent-free vectors serve the previous revision's searches as well
+    pass
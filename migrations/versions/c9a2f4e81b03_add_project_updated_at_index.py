@@ -0,0 +1,25 @@
+"""Add index on projects.updated_at for cached analytics versions
+
+Revision ID: c9a2f4e81b03
+Revises: b4e7a19c3d52
+Create Date: 2026-10-18 16:41:07.552930
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c9a2f4e81b03"
+down_revision = "b4e7a19c3d52"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("projects", schema=None) as batch_op:
+        batch_op.create_index("idx_project_updated_at", ["updated_at"], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table("projects", schema=None) as batch_op:
+        batch_op.drop_index("idx_project_updated_at")
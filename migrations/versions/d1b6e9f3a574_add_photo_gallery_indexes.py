@@ -0,0 +1,37 @@
+"""Add photo gallery indexes
+
+Revision ID: d1b6e9f3a574
+Revises: c3f7a1d9e482
+Create Date: 2026-10-19 01:12:36.208841
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d1b6e9f3a574"
+down_revision = "c3f7a1d9e482"
+branch_labels = None
+depends_on = None
+
+ENTITY_COLUMNS = {"plant": "plant_id", "material": "material_id", "client": "client_id", "project": "project_id"}
+
+
+def upgrade():
+    # The photos table is created by db.create_all() and may not exist yet
+    if not sa.inspect(op.get_bind()).has_table("photos"):
+        return
+
+    op.create_index("idx_photo_category_uploaded", "photos", ["category", "uploaded_at"], unique=False)
+    for entity, column in ENTITY_COLUMNS.items():
+        op.create_index(f"idx_photo_{entity}_uploaded", "photos", [column, "category", "uploaded_at"], unique=False)
+
+
+def downgrade():
+    if not sa.inspect(op.get_bind()).has_table("photos"):
+        return
+
+    for entity in ENTITY_COLUMNS:
+        op.drop_index(f"idx_photo_{entity}_uploaded", table_name="photos")
+    op.drop_index("idx_photo_category_uploaded", table_name="photos")
@@ -0,0 +1,45 @@
+"""Add generated reports table for scheduled report pre-generation
+
+Revision ID: e5d8b2c47a16
+Revises: c9a2f4e81b03
+Create Date: 2026-10-18 19:12:44.318027
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e5d8b2c47a16"
+down_revision = "c9a2f4e81b03"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "generated_reports",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("report_type", sa.String(length=50), nullable=False),
+        sa.Column("period", sa.String(length=20), nullable=False),
+        sa.Column("start_date", sa.String(length=32), nullable=True),
+        sa.Column("end_date", sa.String(length=32), nullable=True),
+        sa.Column("data", sa.JSON(), nullable=False),
+        sa.Column("data_version", sa.String(length=255), nullable=False),
+        sa.Column("pdf_cache_key", sa.String(length=64), nullable=True),
+        sa.Column("json_seconds", sa.Float(), nullable=True),
+        sa.Column("pdf_seconds", sa.Float(), nullable=True),
+        sa.Column("generated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("report_type", "period", name="unique_generated_report_period"),
+    )
+
+    with op.batch_alter_table("project_plants", schema=None) as batch_op:
+        batch_op.create_index("idx_project_plant_updated_at", ["updated_at"], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table("project_plants", schema=None) as batch_op:
+        batch_op.drop_index("idx_project_plant_updated_at")
+
+    op.drop_table("generated_reports")
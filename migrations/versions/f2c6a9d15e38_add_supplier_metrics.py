@@ -0,0 +1,74 @@
+"""Add supplier metrics table and covering indexes for its aggregates
+
+Revision ID: f2c6a9d15e38
+Revises: e5d8b2c47a16
+Create Date: 2026-10-18 21:04:37.552190
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f2c6a9d15e38"
+down_revision = "e5d8b2c47a16"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "supplier_metrics",
+        sa.Column("supplier_id", sa.Integer(), nullable=False),
+        sa.Column("product_count", sa.Integer(), nullable=False),
+        sa.Column("plant_count", sa.Integer(), nullable=False),
+        sa.Column("total_items", sa.Integer(), nullable=False),
+        sa.Column("inventory_value", sa.Float(), nullable=False),
+        sa.Column("product_price_sum", sa.Float(), nullable=False),
+        sa.Column("product_price_count", sa.Integer(), nullable=False),
+        sa.Column("plant_price_sum", sa.Float(), nullable=False),
+        sa.Column("plant_price_count", sa.Integer(), nullable=False),
+        sa.Column("project_count", sa.Integer(), nullable=False),
+        sa.Column("selection_count", sa.Integer(), nullable=False),
+        sa.Column("total_quantity", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("supplier_id"),
+    )
+    op.create_index("idx_supplier_metrics_total_items", "supplier_metrics", ["total_items"], unique=False)
+
+    dirty_suppliers = op.create_table(
+        "supplier_metrics_dirty",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("supplier_id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    with op.batch_alter_table("products", schema=None) as batch_op:
+        batch_op.create_index("idx_product_supplier_price", ["supplier_id", "price", "stock_quantity"], unique=False)
+
+    with op.batch_alter_table("plants", schema=None) as batch_op:
+        batch_op.create_index("idx_plant_supplier_price", ["supplier_id", "price"], unique=False)
+
+    with op.batch_alter_table("project_plants", schema=None) as batch_op:
+        batch_op.create_index(
+            "idx_project_plant_usage", ["plant_id", "project_id", "quantity", "unit_cost"], unique=False
+        )
+
+    # Mark every supplier dirty; the first supplier read fills the metrics
+    suppliers = sa.table("suppliers", sa.column("id", sa.Integer()))
+    op.get_bind().execute(dirty_suppliers.insert().from_select(["supplier_id"], sa.select(suppliers.c.id)))
+
+
+def downgrade():
+    with op.batch_alter_table("project_plants", schema=None) as batch_op:
+        batch_op.drop_index("idx_project_plant_usage")
+
+    with op.batch_alter_table("plants", schema=None) as batch_op:
+        batch_op.drop_index("idx_plant_supplier_price")
+
+    with op.batch_alter_table("products", schema=None) as batch_op:
+        batch_op.drop_index("idx_product_supplier_price")
+
+    op.drop_table("supplier_metrics_dirty")
+    op.drop_index("idx_supplier_metrics_total_items", table_name="supplier_metrics")
+    op.drop_table("supplier_metrics")
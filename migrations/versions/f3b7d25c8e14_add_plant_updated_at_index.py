@@ -0,0 +1,25 @@
+"""Add index on plants.updated_at for the plant suggestion index
+
+Revision ID: f3b7d25c8e14
+Revises: a4c8e2f61d97
+Create Date: 2026-10-19 14:12:36.184027
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f3b7d25c8e14"
+down_revision = "a4c8e2f61d97"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("plants", schema=None) as batch_op:
+        batch_op.create_index("idx_plant_updated_at", ["updated_at"], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table("plants", schema=None) as batch_op:
+        batch_op.drop_index("idx_plant_updated_at")
@@ -4,6 +4,7 @@ Configuration settings for the Landscape Architecture Management System
 """
 
 import os
+import tempfile
 from datetime import timedelta
 
 
@@ -55,6 +56,60 @@ class Config:
     UPLOAD_FOLDER = os.environ.get("UPLOAD_FOLDER", os.path.join(os.getcwd(), "uploads"))
     MAX_CONTENT_LENGTH = 10 * 1024 * 1024  # 10MB max file size
 
+    # PDF rendering process pool. Every gunicorn worker has its own pool and pending limit,
+    # so PDF_RENDER_WORKERS and PDF_RENDER_MAX_PENDING multiply by the number of workers;
+    # PDF_RENDER_MAX_PENDING_TOTAL caps the pending renders of all workers together.
+    # A request waits PDF_RENDER_WAIT_SECONDS (holding its worker) before it answers 202
+    # with a job that any worker can report on.
+    PDF_RENDER_MODE = os.environ.get("PDF_RENDER_MODE", "process")  # process or inline
+    PDF_RENDER_WORKERS = int(os.environ.get("PDF_RENDER_WORKERS", "2"))
+    PDF_RENDER_MAX_PENDING = int(os.environ.get("PDF_RENDER_MAX_PENDING", "8"))
+    PDF_RENDER_MAX_PENDING_TOTAL = int(os.environ.get("PDF_RENDER_MAX_PENDING_TOTAL", "16"))
+    PDF_RENDER_WAIT_SECONDS = float(os.environ.get("PDF_RENDER_WAIT_SECONDS", "5"))
+
+    # Rendered PDF cache (defaults to <instance>/pdf_cache)
+    PDF_CACHE_ENABLED = os.environ.get("PDF_CACHE_ENABLED", "true").lower() == "true"
+    PDF_CACHE_DIR = os.environ.get("PDF_CACHE_DIR")
+    PDF_CACHE_MAX_BYTES = int(os.environ.get("PDF_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+    # Background photo processing (thumbnails and dimensions after upload)
+    PHOTO_PIPELINE_MODE = os.environ.get("PHOTO_PIPELINE_MODE", "thread")  # thread or inline
+    PHOTO_PIPELINE_WORKERS = int(os.environ.get("PHOTO_PIPELINE_WORKERS", "2"))
+    PHOTO_PIPELINE_STALE_SECONDS = int(os.environ.get("PHOTO_PIPELINE_STALE_SECONDS", "600"))
+    # Bulk uploads decode in a process pool (0 = one worker per available core)
+    PHOTO_PROCESS_WORKERS = int(os.environ.get("PHOTO_PROCESS_WORKERS", "0"))
+    PHOTO_BULK_MAX_FILES = int(os.environ.get("PHOTO_BULK_MAX_FILES", "200"))
+    PHOTO_BULK_MAX_CONTENT_LENGTH = int(os.environ.get("PHOTO_BULK_MAX_CONTENT_LENGTH", str(512 * 1024 * 1024)))
+    # Derivatives per photo: name -> bounding box, written in each format (jpeg, webp)
+    PHOTO_DERIVATIVE_SIZES = {"thumb": (300, 300), "medium": (800, 600), "large": (1600, 1200)}
+    PHOTO_DERIVATIVE_FORMATS = tuple(os.environ.get("PHOTO_DERIVATIVE_FORMATS", "jpeg,webp").split(","))
+    # Photo delivery: photo ID -> file lookups cached in memory, and an optional hand-off
+    # of the file to the web server (nginx: internal location aliasing UPLOAD_FOLDER)
+    PHOTO_PATH_CACHE_SIZE = int(os.environ.get("PHOTO_PATH_CACHE_SIZE", "4096"))
+    PHOTO_PATH_CACHE_TTL = int(os.environ.get("PHOTO_PATH_CACHE_TTL", "300"))
+    PHOTO_X_ACCEL_REDIRECT_PREFIX = os.environ.get("PHOTO_X_ACCEL_REDIRECT_PREFIX")  # e.g. /protected-uploads/
+    USE_X_SENDFILE = os.environ.get("USE_X_SENDFILE", "false").lower() == "true"  # Apache/lighttpd
+    # Where photo files are kept: local (UPLOAD_FOLDER), s3 (S3-compatible bucket, needs
+    # boto3) or fake (local object-store stand-in); object stores serve presigned URLs
+    PHOTO_STORAGE_BACKEND = os.environ.get("PHOTO_STORAGE_BACKEND", "local")
+    PHOTO_STORAGE_BUCKET = os.environ.get("PHOTO_STORAGE_BUCKET")
+    PHOTO_STORAGE_PREFIX = os.environ.get("PHOTO_STORAGE_PREFIX", "")
+    # Plant search suggestions are served from an in-memory index per process; changes
+    # made by other processes are picked up after at most this many seconds
+    PLANT_SUGGESTIONS_REFRESH_SECONDS = float(os.environ.get("PLANT_SUGGESTIONS_REFRESH_SECONDS", "30"))
+    # Build the index in a background thread when a worker starts instead of on the first suggestion
+    PLANT_SUGGESTIONS_BACKGROUND_BUILD = os.environ.get("PLANT_SUGGESTIONS_BACKGROUND_BUILD", "true").lower() == "true"
+    PHOTO_STORAGE_ENDPOINT_URL = os.environ.get("PHOTO_STORAGE_ENDPOINT_URL")  # e.g. MinIO
+    PHOTO_STORAGE_REGION = os.environ.get("PHOTO_STORAGE_REGION")
+    PHOTO_STORAGE_URL_EXPIRES = int(os.environ.get("PHOTO_STORAGE_URL_EXPIRES", "3600"))
+    PHOTO_STORAGE_FAKE_DIR = os.environ.get("PHOTO_STORAGE_FAKE_DIR")
+
+    # In-process report pre-generation (single-process deployments; otherwise run
+    # "flask reports pregenerate" from cron). Hours are local time, e.g. "1-5" or "22-4".
+    REPORT_SCHEDULER_ENABLED = os.environ.get("REPORT_SCHEDULER_ENABLED", "false").lower() == "true"
+    REPORT_SCHEDULER_INTERVAL_SECONDS = int(os.environ.get("REPORT_SCHEDULER_INTERVAL_SECONDS", "900"))
+    REPORT_SCHEDULER_HOURS = os.environ.get("REPORT_SCHEDULER_HOURS", "1-5")
+
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -103,6 +158,20 @@ class TestingConfig(Config):
     # otherwise use in-memory SQLite
     SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL") or "sqlite:///:memory:"
     SESSION_COOKIE_SECURE = False
+    # Render PDFs in the test process so ReportLab can be patched
+    PDF_RENDER_MODE = "inline"
+    PDF_CACHE_ENABLED = False
+    # Rendered job PDFs are still written to disk; keep them out of the source tree
+    PDF_CACHE_DIR = os.path.join(tempfile.gettempdir(), "landscape-tests", "pdf_cache")
+    REPORT_SCHEDULER_ENABLED = False
+    # Process photos in the request so tests see the outcome
+    PHOTO_PIPELINE_MODE = "inline"
+    # Photo IDs are reused once a test is rolled back
+    PHOTO_PATH_CACHE_TTL = 0
+    PHOTO_STORAGE_BACKEND = "local"
+    # Tests roll back their plants; check the tables before every suggestion
+    PLANT_SUGGESTIONS_REFRESH_SECONDS = 0
+    PLANT_SUGGESTIONS_BACKGROUND_BUILD = False
 
     # PostgreSQL-specific configuration for CI environments
     def __init__(self):
@@ -16,10 +16,11 @@ from flask_limiter.util import get_remote_address
 from flask_migrate import Migrate
 from flask_swagger_ui import get_swaggerui_blueprint
 from pydantic import ValidationError
-from sqlalchemy import and_, distinct, func, or_, text
+from sqlalchemy import and_, distinct, text
 
 from src.config import get_config
 from src.models.landscape import Plant, Product, Supplier
+from src.models.photo import PhotoCategory
 from src.models.user import db
 from src.routes import n8n_receivers, webhooks
 from src.routes.ai_assistant import ai_assistant_bp
@@ -30,6 +31,7 @@ from src.routes.photos import photos_bp
 from src.routes.plant_recommendations import plant_recommendations_bp
 from src.routes.project_plants import project_plants_bp
 from src.routes.reports import reports_bp
+from src.routes.search import search_bp
 from src.routes.settings import settings_bp
 from src.schemas import (
     ClientCreateSchema,
@@ -51,7 +53,21 @@ from src.services import (
     SupplierService,
 )
 from src.services.analytics import AnalyticsService
+from src.services.analytics_rollups import rollups_cli
 from src.services.dashboard_service import DashboardService
+from src.services.export_service import ExportService
+from src.services.photo_pipeline import photo_pipeline, photos_cli
+from src.services.photo_service import PhotoService
+from src.services.photo_storage import IngestRequest
+from src.services.plant_suggestions import (
+    DEFAULT_SUGGESTION_LIMIT,
+    MAX_SUGGESTION_LIMIT,
+    plant_suggestions,
+    suggest_plants,
+)
+from src.services.report_scheduler import report_scheduler, reports_cli
+from src.services.search import matching, search_cli
+from src.services.supplier_metrics import get_supplier_metrics, ranked_supplier_metrics, supplier_metrics_cli
 from src.utils.db_init import initialize_database, populate_sample_data
 from src.utils.dependency_validator import DependencyValidator
 from src.utils.error_handlers import handle_errors, register_error_handlers
@@ -98,6 +114,7 @@ logger.setLevel(logging.ERROR)
 def create_app():
     """Application factory pattern"""
     app = Flask(__name__)
+    app.request_class = IngestRequest
 
     # Load configuration
     config = get_config()
@@ -180,6 +197,7 @@ def create_app():
     app.register_blueprint(invoices_bp, url_prefix="/api")
     app.register_blueprint(excel_import_bp, url_prefix="/api")
     app.register_blueprint(photos_bp, url_prefix="/api/photos")
+    app.register_blueprint(search_bp, url_prefix="/api")
 
     # Register user authentication blueprint
     from src.routes.auth import auth_bp
@@ -193,6 +211,22 @@ def create_app():
     # Register performance monitoring blueprint
     app.register_blueprint(performance_bp)
 
+    # Register CLI commands
+    app.cli.add_command(rollups_cli)
+    app.cli.add_command(reports_cli)
+    app.cli.add_command(supplier_metrics_cli)
+    app.cli.add_command(photos_cli)
+    app.cli.add_command(search_cli)
+
+    if app.config.get("REPORT_SCHEDULER_ENABLED"):
+        report_scheduler.start(app)
+
+    # Photos left pending by a previous run are processed in the background
+    photo_pipeline.start(app)
+
+    # Each process builds its plant suggestion index in the background
+    plant_suggestions.start(app)
+
     # Register N8n integration blueprints
     app.register_blueprint(webhooks.bp)
     app.register_blueprint(n8n_receivers.bp)
@@ -421,15 +455,7 @@ def create_app():
             # Filter suppliers by specialization manually for now
             query = Supplier.query
             if search:
-                search_term = f"%{search}%"
-                query = query.filter(
-                    or_(
-                        Supplier.name.ilike(search_term),
-                        Supplier.contact_person.ilike(search_term),
-                        Supplier.email.ilike(search_term),
-                        Supplier.city.ilike(search_term),
-                    )
-                )
+                query = query.filter(matching(Supplier, search))
 
             query = query.filter(Supplier.specialization.ilike(f"%{specialization}%"))
 
@@ -624,21 +650,9 @@ def create_app():
         if not supplier:
             return jsonify({"error": "Supplier not found"}), 404
 
-        # Count products and plants
-        product_count = Product.query.filter_by(supplier_id=supplier_id).count()
-        plant_count = Plant.query.filter_by(supplier_id=supplier_id).count()
-
-        # Calculate inventory value (products only, since they have stock_quantity)
-        products = Product.query.filter_by(supplier_id=supplier_id).all()
-        total_inventory_value = sum((product.price or 0) * (product.stock_quantity or 0) for product in products)
-
-        # Calculate average prices
-        product_prices = [product.price for product in products if product.price]
-        average_product_price = sum(product_prices) / len(product_prices) if product_prices else 0
-
-        plants = Plant.query.filter_by(supplier_id=supplier_id).all()
-        plant_prices = [plant.price for plant in plants if plant.price]
-        average_plant_price = sum(plant_prices) / len(plant_prices) if plant_prices else 0
+        metrics = get_supplier_metrics(supplier_id)
+        product_count = metrics.product_count
+        plant_count = metrics.plant_count
 
         return jsonify(
             {
@@ -649,9 +663,12 @@ def create_app():
                 "total_items": product_count + plant_count,
                 "total_products": product_count,  # For backward compatibility
                 "total_plants": plant_count,  # For backward compatibility
-                "total_inventory_value": total_inventory_value,
-                "average_product_price": average_product_price,
-                "average_plant_price": average_plant_price,
+                "total_inventory_value": metrics.inventory_value,
+                "average_product_price": metrics.average_product_price,
+                "average_plant_price": metrics.average_plant_price,
+                "project_count": metrics.project_count,
+                "total_quantity": metrics.total_quantity,
+                "revenue": metrics.revenue,
             }
         )
 
@@ -675,51 +692,15 @@ def create_app():
 
         limit = request.args.get("limit", 10, type=int)
 
-        # Get suppliers with their item counts using subqueries
-
-        # Subquery for product counts
-        product_counts = (
-            db.session.query(
-                Product.supplier_id,
-                func.count(Product.id).label("product_count"),
-            )
-            .group_by(Product.supplier_id)
-            .subquery()
-        )
-
-        # Subquery for plant counts
-        plant_counts = (
-            db.session.query(Plant.supplier_id, func.count(Plant.id).label("plant_count"))
-            .group_by(Plant.supplier_id)
-            .subquery()
-        )
-
-        # Main query
-        top_suppliers = (
-            db.session.query(
-                Supplier,
-                func.coalesce(product_counts.c.product_count, 0).label("product_count"),
-                func.coalesce(plant_counts.c.plant_count, 0).label("plant_count"),
-            )
-            .outerjoin(product_counts, Supplier.id == product_counts.c.supplier_id)
-            .outerjoin(plant_counts, Supplier.id == plant_counts.c.supplier_id)
-            .order_by(
-                (func.coalesce(product_counts.c.product_count, 0) + func.coalesce(plant_counts.c.plant_count, 0)).desc()
-            )
-            .limit(limit)
-            .all()
-        )
-
-        suppliers_list = []
-        for supplier, product_count, plant_count in top_suppliers:
-            suppliers_list.append(
-                {
-                    "supplier": supplier.to_dict(),
-                    "product_count": product_count,
-                    "plant_count": plant_count,
-                    "total_items": product_count + plant_count,
-                }
-            )
+        suppliers_list = [
+            {
+                "supplier": supplier.to_dict(),
+                "product_count": metrics.product_count,
+                "plant_count": metrics.plant_count,
+                "total_items": metrics.total_items,
+            }
+            for supplier, metrics in ranked_supplier_metrics(limit)
+        ]
 
         return jsonify({"suppliers": suppliers_list})
 
@@ -767,14 +748,12 @@ def create_app():
     @login_required
     @handle_errors
     def export_suppliers():
-        """Export suppliers data"""
+        """Stream suppliers data as JSON, NDJSON, CSV or XLSX"""
 
-        format_type = request.args.get("format", "json").lower()
-        suppliers = supplier_service.get_all()
-
-        if format_type == "json":
-            return jsonify(suppliers)
-        return jsonify({"error": "Unsupported format"}), 400
+        try:
+            return ExportService("suppliers").export_response(request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
     @app.route("/api/suppliers/bulk-import", methods=["POST"])
     @data_access_required
@@ -836,9 +815,7 @@ def create_app():
         # Apply filters
         filters = []
         if search:
-            filters.append(
-                Plant.name.contains(search) | Plant.common_name.contains(search) | Plant.category.contains(search)
-            )
+            filters.append(matching(Plant, search))
 
         if category:
             filters.append(Plant.category == category)
@@ -855,8 +832,9 @@ def create_app():
         # Apply pagination
         paginated = query.order_by(Plant.name).paginate(page=page, per_page=per_page, error_out=False)
 
+        photos = PhotoService.get_primary_photos(PhotoCategory.PLANT, [plant.id for plant in paginated.items])
         result = {
-            "plants": [plant.to_dict() for plant in paginated.items],
+            "plants": [{**plant.to_dict(), "primary_photo": photos.get(plant.id)} for plant in paginated.items],
             "total": paginated.total,
             "pages": paginated.pages,
             "current_page": page,
@@ -978,43 +956,23 @@ def create_app():
         query = request.args.get("q", "")
         if not query:
             return jsonify({"suggestions": []})
+        limit = request.args.get("limit", DEFAULT_SUGGESTION_LIMIT, type=int)
+        if not 1 <= limit <= MAX_SUGGESTION_LIMIT:
+            return jsonify({"error": f"limit must be between 1 and {MAX_SUGGESTION_LIMIT}"}), 400
 
-        # Search in name and common_name with limit
-        plants = (
-            Plant.query.filter(
-                or_(
-                    Plant.name.ilike(f"%{query}%"),
-                    Plant.common_name.ilike(f"%{query}%"),
-                )
-            )
-            .limit(10)
-            .all()
-        )
-
-        suggestions = [
-            {
-                "id": plant.id,
-                "name": plant.name,
-                "common_name": plant.common_name,
-                "category": plant.category,
-            }
-            for plant in plants
-        ]
-
-        return jsonify({"suggestions": suggestions})
+        # Served from the in-memory index of this process, or a search query while it is being built
+        return jsonify({"suggestions": suggest_plants(query, limit)})
 
     @app.route("/api/plants/export", methods=["GET"])
     @login_required
     @handle_errors
     def export_plants():
-        """Export plants data"""
-
-        format_type = request.args.get("format", "json").lower()
-        plants = plant_service.get_all(per_page=1000)  # Get all plants
+        """Stream plants data as JSON, NDJSON, CSV or XLSX"""
 
-        if format_type == "json":
-            return jsonify({"plants": plants["plants"]})
-        return jsonify({"error": "Unsupported format"}), 400
+        try:
+            return ExportService("plants").export_response(request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
     @app.route("/api/plants/bulk-import", methods=["POST"])
     @data_access_required
@@ -1148,6 +1106,17 @@ def create_app():
         result = client_service.get_all(search=search, page=page, per_page=per_page)
         return jsonify(result)
 
+    @app.route("/api/clients/export", methods=["GET"])
+    @data_access_required
+    @handle_errors
+    def export_clients():
+        """Stream clients data as JSON, NDJSON, CSV or XLSX"""
+
+        try:
+            return ExportService("clients").export_response(request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
     @app.route("/api/clients", methods=["POST"])
     @data_access_required
     @handle_errors
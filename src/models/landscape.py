@@ -1,7 +1,12 @@
 from datetime import datetime
 from typing import Any, Sequence, cast
 
+from sqlalchemy import event, func, inspect, select
+
 from src.models.user import db
+from src.utils.date_buckets import month_bucket, month_key
+from src.utils.full_text import create_search_indexes, drop_search_indexes
+from src.utils.natural_keys import client_key, plant_key, product_key, supplier_key
 
 
 class Supplier(db.Model):
@@ -18,6 +23,8 @@ class Supplier(db.Model):
     specialization = db.Column(db.String(200))
     website = db.Column(db.String(200))
     notes = db.Column(db.Text)
+    # Normalized duplicate-detection key, maintained by the listeners at the bottom of this module
+    natural_key = db.Column(db.String(255))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -63,6 +70,8 @@ class Product(db.Model):
     weight = db.Column(db.Float)
     dimensions = db.Column(db.String(100))
     notes = db.Column(db.Text)
+    # Normalized duplicate-detection key, maintained by the listeners at the bottom of this module
+    natural_key = db.Column(db.String(255))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -168,6 +177,8 @@ class Plant(db.Model):
     availability = db.Column(db.String(50))
     planting_season = db.Column(db.String(100))
     notes = db.Column(db.Text)
+    # Normalized duplicate-detection key, maintained by the listeners at the bottom of this module
+    natural_key = db.Column(db.String(255))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -360,6 +371,8 @@ class Client(db.Model):
     budget_range = db.Column(db.String(100))
     notes = db.Column(db.Text)
     registration_date = db.Column(db.String(20))
+    # Normalized duplicate-detection key, maintained by the listeners at the bottom of this module
+    natural_key = db.Column(db.String(255))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -487,6 +500,165 @@ class ProjectPlant(db.Model):
         }
 
 
+# Analytics rollups: monthly fact tables maintained from projects and project plants.
+# Months are "YYYY-MM" keys (see src.utils.date_buckets); projects without a
+# creation date are rolled up under ROLLUP_UNDATED_MONTH.
+ROLLUP_UNDATED_MONTH = "0000-00"
+
+
+class ProjectMonthlyRollup(db.Model):
+    """Project counts and budgets per month and project type"""
+
+    __tablename__ = "rollup_project_monthly"
+
+    id = db.Column(db.Integer, primary_key=True)
+    month = db.Column(db.String(7), nullable=False)
+    project_type = db.Column(db.String(50))
+    project_count = db.Column(db.Integer, nullable=False, default=0)
+    budgeted_count = db.Column(db.Integer, nullable=False, default=0)
+    budget_total = db.Column(db.Float)
+    planted_count = db.Column(db.Integer, nullable=False, default=0)  # projects with at least one plant
+
+
+class PlantMonthlyRollup(db.Model):
+    """Plant selections, quantities and costs per month and plant"""
+
+    __tablename__ = "rollup_plant_monthly"
+
+    id = db.Column(db.Integer, primary_key=True)
+    month = db.Column(db.String(7), nullable=False)
+    plant_id = db.Column(db.Integer, nullable=False)  # no foreign key: rows may outlive a plant until refreshed
+    selection_count = db.Column(db.Integer, nullable=False, default=0)
+    total_quantity = db.Column(db.Integer)
+    unit_cost_sum = db.Column(db.Float)
+    unit_cost_count = db.Column(db.Integer, nullable=False, default=0)
+    cost_total = db.Column(db.Float)
+
+
+class CategoryMonthlyRollup(db.Model):
+    """Plant category usage per month and client city"""
+
+    __tablename__ = "rollup_category_monthly"
+
+    id = db.Column(db.Integer, primary_key=True)
+    month = db.Column(db.String(7), nullable=False)
+    city = db.Column(db.String(50))
+    category = db.Column(db.String(50), nullable=False)
+    project_count = db.Column(db.Integer, nullable=False, default=0)
+    selection_count = db.Column(db.Integer, nullable=False, default=0)
+    total_quantity = db.Column(db.Integer)
+
+
+class LocationMonthlyRollup(db.Model):
+    """Project counts and budgets per month, client city and project location"""
+
+    __tablename__ = "rollup_location_monthly"
+
+    id = db.Column(db.Integer, primary_key=True)
+    month = db.Column(db.String(7), nullable=False)
+    city = db.Column(db.String(50))
+    location = db.Column(db.Text)
+    project_count = db.Column(db.Integer, nullable=False, default=0)
+    budget_total = db.Column(db.Float)
+
+
+class RollupDirtyMonth(db.Model):
+    """A month whose rollup rows must be recomputed before they are read"""
+
+    __tablename__ = "rollup_dirty_months"
+
+    id = db.Column(db.Integer, primary_key=True)
+    month = db.Column(db.String(7), nullable=False)
+
+
+class SupplierMetrics(db.Model):
+    """Product, plant and usage figures of one supplier, maintained by src.services.supplier_metrics"""
+
+    __tablename__ = "supplier_metrics"
+
+    supplier_id = db.Column(db.Integer, primary_key=True)  # no foreign key: removed by the refresh after a delete
+    product_count = db.Column(db.Integer, nullable=False, default=0)
+    plant_count = db.Column(db.Integer, nullable=False, default=0)
+    total_items = db.Column(db.Integer, nullable=False, default=0)  # products + plants, for ranking
+    inventory_value = db.Column(db.Float, nullable=False, default=0)  # product price x stock
+    # Sums and counts over the products and plants that have a (non-zero) price
+    product_price_sum = db.Column(db.Float, nullable=False, default=0)
+    product_price_count = db.Column(db.Integer, nullable=False, default=0)
+    plant_price_sum = db.Column(db.Float, nullable=False, default=0)
+    plant_price_count = db.Column(db.Integer, nullable=False, default=0)
+    # Use of the supplier's plants in projects
+    project_count = db.Column(db.Integer, nullable=False, default=0)
+    selection_count = db.Column(db.Integer, nullable=False, default=0)
+    total_quantity = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0)  # quantity x unit cost
+
+    @property
+    def average_product_price(self) -> float:
+        return self.product_price_sum / self.product_price_count if self.product_price_count else 0
+
+    @property
+    def average_plant_price(self) -> float:
+        return self.plant_price_sum / self.plant_price_count if self.plant_price_count else 0
+
+
+class SupplierMetricsDirty(db.Model):
+    """A supplier whose metrics row must be recomputed before it is read"""
+
+    __tablename__ = "supplier_metrics_dirty"
+
+    id = db.Column(db.Integer, primary_key=True)
+    supplier_id = db.Column(db.Integer, nullable=False)
+
+
+class GeneratedReport(db.Model):
+    """A report pre-generated by the report scheduler, served while its source tables are unchanged"""
+
+    __tablename__ = "generated_reports"
+    __table_args__ = (db.UniqueConstraint("report_type", "period", name="unique_generated_report_period"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    report_type = db.Column(db.String(50), nullable=False)
+    period = db.Column(db.String(20), nullable=False)  # "all", or a closed period such as "2026-09" or "2026-Q3"
+    start_date = db.Column(db.String(32))  # request parameters the report answers
+    end_date = db.Column(db.String(32))
+    data = db.Column(db.JSON, nullable=False)
+    data_version = db.Column(db.String(255), nullable=False)  # see src.utils.data_versions
+    pdf_cache_key = db.Column(db.String(64))
+    json_seconds = db.Column(db.Float)
+    pdf_seconds = db.Column(db.Float)
+    generated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "report_type": self.report_type,
+            "period": self.period,
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "data_version": self.data_version,
+            "has_pdf": self.pdf_cache_key is not None,
+            "json_seconds": self.json_seconds,
+            "pdf_seconds": self.pdf_seconds,
+            "generated_at": self.generated_at.isoformat() if self.generated_at else None,
+        }
+
+
+class PDFRenderJob(db.Model):
+    """A PDF render job, stored so that any worker can answer the client polling it"""
+
+    __tablename__ = "pdf_render_jobs"
+
+    id = db.Column(db.String(32), primary_key=True)  # the job ID handed to the client
+    filename = db.Column(db.String(255), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default="pending")  # pending, completed, failed
+    slots = db.Column(db.Integer, nullable=False, default=1)  # render pool slots taken while pending
+    path = db.Column(db.String(500))  # the finished PDF
+    cache_key = db.Column(db.String(64))
+    render_seconds = db.Column(db.Float)
+    section_seconds = db.Column(db.JSON)
+    submitted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+
+
 # Database Performance Optimization - Indexes for frequently queried fields
 # These indexes significantly improve query performance for large datasets
 
@@ -525,7 +697,156 @@ client_name_idx = db.Index("idx_client_name", Client.name)
 client_city_idx = db.Index("idx_client_city", Client.city)
 client_type_idx = db.Index("idx_client_type", Client.client_type)
 
+# Natural key indexes for import duplicate detection
+plant_natural_key_idx = db.Index("idx_plant_natural_key", Plant.natural_key)
+supplier_natural_key_idx = db.Index("idx_supplier_natural_key", Supplier.natural_key)
+product_natural_key_idx = db.Index("idx_product_natural_key", Product.natural_key)
+client_natural_key_idx = db.Index("idx_client_natural_key", Client.natural_key)
+
 # ProjectPlant indexes for relationships
 project_plant_project_idx = db.Index("idx_project_plant_project", ProjectPlant.project_id)
 project_plant_plant_idx = db.Index("idx_project_plant_plant", ProjectPlant.plant_id)
 project_plant_status_idx = db.Index("idx_project_plant_status", ProjectPlant.status)
+project_plant_updated_at_idx = db.Index("idx_project_plant_updated_at", ProjectPlant.updated_at)
+
+# Covering indexes for the per-supplier aggregates of the supplier metrics
+product_supplier_price_idx = db.Index(
+    "idx_product_supplier_price", Product.supplier_id, Product.price, Product.stock_quantity
+)
+plant_supplier_price_idx = db.Index("idx_plant_supplier_price", Plant.supplier_id, Plant.price)
+project_plant_usage_idx = db.Index(
+    "idx_project_plant_usage",
+    ProjectPlant.plant_id,
+    ProjectPlant.project_id,
+    ProjectPlant.quantity,
+    ProjectPlant.unit_cost,
+)
+supplier_metrics_total_items_idx = db.Index("idx_supplier_metrics_total_items", SupplierMetrics.total_items)
+
+# Project creation date for period filters and rollup refreshes
+project_created_at_idx = db.Index("idx_project_created_at", Project.created_at)
+
+# Last project update for the data versions of cached analytics and pre-generated reports
+project_updated_at_idx = db.Index("idx_project_updated_at", Project.updated_at)
+
+# Recent PDF render jobs for the shared pending count and their expiry
+pdf_render_job_submitted_at_idx = db.Index("idx_pdf_render_job_submitted_at", PDFRenderJob.submitted_at)
+
+# Last plant update for the change checks of the plant suggestion index
+plant_updated_at_idx = db.Index("idx_plant_updated_at", Plant.updated_at)
+
+# Rollup indexes for month range reads
+rollup_project_month_idx = db.Index("idx_rollup_project_month", ProjectMonthlyRollup.month)
+rollup_plant_month_idx = db.Index("idx_rollup_plant_month", PlantMonthlyRollup.month, PlantMonthlyRollup.plant_id)
+rollup_category_month_idx = db.Index("idx_rollup_category_month", CategoryMonthlyRollup.month)
+rollup_location_month_idx = db.Index("idx_rollup_location_month", LocationMonthlyRollup.month)
+
+
+# Natural keys are derived from the identifying columns on every insert and update.
+# Bulk inserts that bypass the ORM unit of work must set ``natural_key`` themselves.
+NATURAL_KEY_BUILDERS = {
+    Plant: lambda plant: plant_key(plant.name),
+    Supplier: lambda supplier: supplier_key(supplier.name, supplier.email),
+    Product: lambda product: product_key(product.name, product.supplier_id),
+    Client: lambda client: client_key(client.email),
+}
+
+
+def _set_natural_key(mapper, connection, target):
+    target.natural_key = NATURAL_KEY_BUILDERS[mapper.class_](target)
+
+
+for _model in NATURAL_KEY_BUILDERS:
+    event.listen(_model, "before_insert", _set_natural_key)
+    event.listen(_model, "before_update", _set_natural_key)
+
+
+# Writes that change rolled up figures mark the months of the affected projects as
+# dirty; the analytics rollups recompute those months before they are next read.
+# Bulk writes that bypass the ORM unit of work must rebuild the rollups instead.
+def project_month(created_at=Project.created_at):
+    """The rollup month of a project creation date column"""
+    return func.coalesce(month_bucket(created_at), ROLLUP_UNDATED_MONTH)
+
+
+def _mark_project_months(connection, condition):
+    connection.execute(
+        RollupDirtyMonth.__table__.insert().from_select(["month"], select(project_month()).where(condition).distinct())
+    )
+
+
+def _project_changed(mapper, connection, target):
+    created = {target.created_at, *inspect(target).attrs.created_at.history.deleted}
+    months = {month_key(value) or ROLLUP_UNDATED_MONTH for value in created}
+    connection.execute(RollupDirtyMonth.__table__.insert(), [{"month": month} for month in sorted(months)])
+
+
+def _project_plant_changed(mapper, connection, target):
+    project_ids = {target.project_id, *inspect(target).attrs.project_id.history.deleted} - {None}
+    _mark_project_months(connection, Project.id.in_(project_ids))
+
+
+def _plant_changed(mapper, connection, target):
+    if inspect(target).attrs.category.history.has_changes():
+        used_in = select(ProjectPlant.project_id).where(ProjectPlant.plant_id == target.id)
+        _mark_project_months(connection, Project.id.in_(used_in))
+
+
+def _client_changed(mapper, connection, target):
+    if inspect(target).attrs.city.history.has_changes():
+        _mark_project_months(connection, Project.client_id == target.id)
+
+
+for _event in ("after_insert", "after_update", "after_delete"):
+    event.listen(Project, _event, _project_changed)
+    event.listen(ProjectPlant, _event, _project_plant_changed)
+event.listen(Plant, "after_update", _plant_changed)
+event.listen(Client, "after_update", _client_changed)
+
+
+# Writes to suppliers, their products and plants, or the project plants using those
+# plants mark the suppliers as dirty; their supplier metrics are recomputed before
+# they are next read. Bulk writes that bypass the ORM must rebuild the metrics instead.
+def _mark_suppliers(connection, supplier_ids):
+    supplier_ids = sorted(set(supplier_ids) - {None})
+    if supplier_ids:
+        connection.execute(
+            SupplierMetricsDirty.__table__.insert(), [{"supplier_id": supplier_id} for supplier_id in supplier_ids]
+        )
+
+
+def _supplier_changed(mapper, connection, target):
+    _mark_suppliers(connection, [target.id])
+
+
+def _supplier_item_changed(mapper, connection, target):
+    _mark_suppliers(connection, [target.supplier_id, *inspect(target).attrs.supplier_id.history.deleted])
+
+
+def _supplier_usage_changed(mapper, connection, target):
+    plant_ids = {target.plant_id, *inspect(target).attrs.plant_id.history.deleted} - {None}
+    suppliers = select(Plant.supplier_id).where(Plant.id.in_(plant_ids), Plant.supplier_id.isnot(None)).distinct()
+    connection.execute(SupplierMetricsDirty.__table__.insert().from_select(["supplier_id"], suppliers))
+
+
+for _event in ("after_insert", "after_update", "after_delete"):
+    event.listen(Product, _event, _supplier_item_changed)
+    event.listen(Plant, _event, _supplier_item_changed)
+    event.listen(ProjectPlant, _event, _supplier_usage_changed)
+for _event in ("after_insert", "after_delete"):
+    event.listen(Supplier, _event, _supplier_changed)
+
+
+# Full-text search indexes (see src.utils.full_text) live outside the models: FTS5
+# tables on SQLite, generated tsvector columns on PostgreSQL. They are created with the
+# tables and dropped before them; the database keeps them in sync with every write.
+def _create_search_indexes(target, connection, **kw):
+    create_search_indexes(connection)
+
+
+def _drop_search_indexes(target, connection, **kw):
+    drop_search_indexes(connection)
+
+
+event.listen(db.metadata, "after_create", _create_search_indexes)
+event.listen(db.metadata, "before_drop", _drop_search_indexes)
@@ -1,9 +1,10 @@
 """Photo model for storing image metadata and organizing visual assets."""
 
 import enum
+import hashlib
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, Boolean, Column, DateTime, Enum, ForeignKey, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from src.models.user import db
@@ -21,6 +22,38 @@ class PhotoCategory(enum.Enum):
     REFERENCE = "reference"
 
 
+class PhotoProcessingState(enum.Enum):
+    """Where a photo is in the background image pipeline."""
+
+    PENDING = "pending"
+    PROCESSING = "processing"
+    READY = "ready"
+    FAILED = "failed"
+
+
+class PhotoBlob(db.Model):
+    """A stored original, shared by all photos with the same content."""
+
+    __tablename__ = "photo_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    file_path = Column(String(500), nullable=False)
+    file_size = Column(Integer)  # Size in bytes
+    # Photos referencing this blob; the files are removed when it drops to zero
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        """Convert blob to dictionary for JSON serialization."""
+        return {
+            "sha256": self.sha256,
+            "file_path": self.file_path,
+            "file_size": self.file_size,
+            "ref_count": self.ref_count,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
+
+
 class Photo(db.Model):
     """Model for storing photo metadata and file information."""
 
@@ -35,6 +68,17 @@ class Photo(db.Model):
     mime_type = Column(String(100))
     width = Column(Integer)
     height = Column(Integer)
+    # SHA-256 of the original; photos uploaded before content addressing have none
+    content_hash = Column(String(64), ForeignKey("photo_blobs.sha256"), index=True)
+
+    # Derivatives are generated after upload by src.services.photo_pipeline
+    processing_state = Column(
+        Enum(PhotoProcessingState), nullable=False, default=PhotoProcessingState.PENDING, index=True
+    )
+    processing_error = Column(Text)
+    processed_at = Column(DateTime)
+    # Downscaled copies: {"medium": {"width": 800, "height": 533, "jpeg": path, "webp": path}, ...}
+    derivatives = Column(JSON)
 
     # Categorization
     category = Column(Enum(PhotoCategory), nullable=False)
@@ -63,6 +107,22 @@ class Photo(db.Model):
     project = relationship("Project", back_populates="photos")
     uploaded_by = relationship("User")
 
+    @property
+    def version(self):
+        """Token that changes whenever the files served for this photo change."""
+        processed = self.processed_at.isoformat() if self.processed_at else ""
+        return hashlib.sha1(f"{self.filename}:{processed}".encode(), usedforsecurity=False).hexdigest()[:12]
+
+    @property
+    def file_url(self):
+        """Versioned URL of the original, cacheable forever."""
+        return f"/api/photos/file/{self.id}?v={self.version}"
+
+    @property
+    def thumbnail_url(self):
+        """Versioned URL of the thumbnail, cacheable forever."""
+        return f"/api/photos/thumbnail/{self.id}?v={self.version}"
+
     def to_dict(self):
         """Convert photo to dictionary for JSON serialization."""
         return {
@@ -73,8 +133,16 @@ class Photo(db.Model):
             "thumbnail_path": self.thumbnail_path,
             "file_size": self.file_size,
             "mime_type": self.mime_type,
+            "content_hash": self.content_hash,
             "width": self.width,
             "height": self.height,
+            "processing_state": self.processing_state.value if self.processing_state else None,
+            "processing_error": self.processing_error,
+            "processed_at": self.processed_at.isoformat() if self.processed_at else None,
+            "derivatives": self.derivatives,
+            "version": self.version,
+            "file_url": self.file_url,
+            "thumbnail_url": self.thumbnail_url,
             "category": self.category.value if self.category else None,
             "title": self.title,
             "description": self.description,
@@ -90,3 +158,14 @@ class Photo(db.Model):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
+
+
+# Gallery indexes: an entity's photos of a category, newest first. Primary photo
+# lookups use the same entity-leading indexes and filter the few rows found.
+photo_category_uploaded_idx = db.Index("idx_photo_category_uploaded", Photo.category, Photo.uploaded_at)
+photo_plant_uploaded_idx = db.Index("idx_photo_plant_uploaded", Photo.plant_id, Photo.category, Photo.uploaded_at)
+photo_material_uploaded_idx = db.Index(
+    "idx_photo_material_uploaded", Photo.material_id, Photo.category, Photo.uploaded_at
+)
+photo_client_uploaded_idx = db.Index("idx_photo_client_uploaded", Photo.client_id, Photo.category, Photo.uploaded_at)
+photo_project_uploaded_idx = db.Index("idx_photo_project_uploaded", Photo.project_id, Photo.category, Photo.uploaded_at)
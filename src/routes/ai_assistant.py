@@ -8,8 +8,9 @@ from datetime import UTC, datetime
 import openai
 from flask import Blueprint, jsonify, request
 
-from src.models.landscape import Client, Plant, Product, Project, Supplier, db
+from src.models.landscape import Plant
 from src.routes.user import login_required
+from src.services.business_summary import get_business_summary
 
 ai_assistant_bp = Blueprint("ai_assistant", __name__)
 
@@ -192,20 +193,13 @@ def ai_project_insights():
     try:
         language = request.args.get("language", "en")
 
-        # Get project statistics
-        total_projects = Project.query.count()
-        active_projects = Project.query.filter(Project.status == "active").count()
-        completed_projects = Project.query.filter(Project.status == "completed").count()
-
-        # Get budget statistics
-        budget_stats = (
-            db.session.query(db.func.sum(Project.budget), db.func.avg(Project.budget))
-            .filter(Project.budget.isnot(None))
-            .first()
-        )
-
-        total_budget = float(budget_stats[0]) if budget_stats[0] else 0
-        avg_budget = float(budget_stats[1]) if budget_stats[1] else 0
+        # Get project and budget statistics
+        summary = get_business_summary()
+        total_projects = summary.total_projects
+        active_projects = summary.status_count("active")
+        completed_projects = summary.status_count("completed")
+        total_budget = summary.total_budget
+        avg_budget = summary.avg_budget
 
         # Generate insights
         insights = []
@@ -307,12 +301,13 @@ def ai_project_insights():
 def get_landscape_stats():
     """Get current landscape architecture statistics"""
     try:
+        summary = get_business_summary(distributions=False)
         return {
-            "projects": Project.query.count(),
-            "clients": Client.query.count(),
-            "plants": Plant.query.count(),
-            "products": Product.query.count(),
-            "suppliers": Supplier.query.count(),
+            "projects": summary.total_projects,
+            "clients": summary.total_clients,
+            "plants": summary.total_plants,
+            "products": summary.total_products,
+            "suppliers": summary.total_suppliers,
         }
     except Exception as e:
         logging.error(f"Error getting landscape stats: {e!s}")
@@ -8,6 +8,7 @@ from flask import Blueprint, jsonify, request
 
 from src.models.landscape import Client, Project, db
 from src.routes.user import data_access_required, login_required
+from src.services.search import matching
 
 clients_bp = Blueprint("clients", __name__)
 
@@ -27,14 +28,7 @@ def get_clients():
 
         # Apply search filter
         if search:
-            query = query.filter(
-                db.or_(
-                    Client.name.ilike(f"%{search}%"),
-                    Client.email.ilike(f"%{search}%"),
-                    Client.company.ilike(f"%{search}%"),
-                    Client.phone.ilike(f"%{search}%"),
-                )
-            )
+            query = query.filter(matching(Client, search))
 
         # Execute query with pagination
         clients = query.paginate(page=page, per_page=per_page, error_out=False)
@@ -334,17 +328,7 @@ def search_clients():
         if not query:
             return jsonify({"clients": []})
 
-        clients = (
-            Client.query.filter(
-                db.or_(
-                    Client.name.ilike(f"%{query}%"),
-                    Client.email.ilike(f"%{query}%"),
-                    Client.company.ilike(f"%{query}%"),
-                )
-            )
-            .limit(limit)
-            .all()
-        )
+        clients = Client.query.filter(matching(Client, query)).limit(limit).all()
 
         clients_data = []
         for client in clients:
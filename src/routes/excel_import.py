@@ -2,12 +2,17 @@
 # File location: src/routes/excel_import.py
 # This file handles Excel file import operations for bulk data management
 
+import hashlib
 import io
+import json
 import logging
+import threading
 from typing import Any
 
 import pandas as pd
 from flask import Blueprint, jsonify, request, send_file
+from openpyxl import Workbook
+from openpyxl.styles import Font
 
 from src.models.landscape import (
     Client,
@@ -16,13 +21,246 @@ from src.models.landscape import (
     Supplier,
     db,
 )
+from src.services.import_dedup import NaturalKeyIndex
 from src.utils.decorators import data_access_required
+from src.utils.natural_keys import client_key, plant_key, product_key, supplier_key
 
 excel_import_bp = Blueprint("excel_import", __name__)
 
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {"xlsx", "xls", "csv"}
 
+# Rows whose duplicates are resolved with a single natural key lookup
+IMPORT_CHUNK_SIZE = 500
+
+
+REQUIRED_COLUMNS = {
+    "suppliers": [
+        "name",
+        "contact_person",
+        "email",
+        "phone",
+        "address",
+        "city",
+        "postal_code",
+    ],
+    "plants": [
+        "name",
+        "common_name",
+        "category",
+        "sun_requirements",
+        "water_needs",
+        "hardiness_zone",
+        "height_max",
+        "width_max",
+        "bloom_time",
+        "bloom_color",
+        "maintenance",
+        "supplier_id",
+    ],
+    "products": ["name", "category", "description", "price", "unit", "supplier_id"],
+    "clients": [
+        "name",
+        "email",
+        "phone",
+        "address",
+        "city",
+        "postal_code",
+        "country",
+        "client_type",
+    ],
+}
+
+OPTIONAL_COLUMNS = {
+    "suppliers": ["country", "website", "specialization", "notes"],
+    "plants": ["notes", "native_region", "soil_type"],
+    "products": ["stock_quantity", "notes"],
+    "clients": ["company", "notes"],
+}
+
+
+IMPORT_TEMPLATES = {
+    "suppliers": {
+        "columns": [
+            "name",
+            "contact_person",
+            "email",
+            "phone",
+            "address",
+            "city",
+            "postal_code",
+            "website",
+            "specialization",
+            "notes",
+        ],
+        "sample_data": [
+            [
+                "Boomkwekerij Peters",
+                "Jan Peters",
+                "info@boomkwekerij-peters.nl",
+                "+31 20 1234567",
+                "Kwekerslaan 1",
+                "Amsterdam",
+                "1000 AB",
+                "www.boomkwekerij-peters.nl",
+                "Bomen en heesters",
+                "Gespecialiseerd in grote bomen",
+            ],
+            [
+                "Tuincentrum De Groene Vingers",
+                "Marie de Vries",
+                "verkoop@groenvingers.nl",
+                "+31 30 9876543",
+                "Tuinstraat 15",
+                "Utrecht",
+                "3500 CD",
+                "www.groenvingers.nl",
+                "Tuinplanten",
+                "Breed assortiment tuinplanten",
+            ],
+        ],
+    },
+    "plants": {
+        "columns": [
+            "name",
+            "common_name",
+            "category",
+            "sun_requirements",
+            "water_needs",
+            "hardiness_zone",
+            "height_max",
+            "width_max",
+            "bloom_time",
+            "bloom_color",
+            "maintenance",
+            "supplier_id",
+            "notes",
+            "native_region",
+            "soil_type",
+        ],
+        "sample_data": [
+            [
+                "Acer palmatum",
+                "Japanse esdoorn",
+                "Boom",
+                "Halfschaduw",
+                "Gemiddeld",
+                "6",
+                "8.0",
+                "6.0",
+                "April-Mei",
+                "Rood",
+                "Gemiddeld",
+                "1",
+                "Prachtige herfstkleur",
+                "Japan",
+                "Humusrijk",
+            ],
+            [
+                "Lavandula angustifolia",
+                "Lavendel",
+                "Vaste plant",
+                "Zon",
+                "Weinig",
+                "5",
+                "0.6",
+                "0.8",
+                "Juli-September",
+                "Paars",
+                "Laag",
+                "2",
+                "Geurig en bijenvriendelijk",
+                "Middellandse Zee",
+                "Doorlatend",
+            ],
+        ],
+    },
+    "products": {
+        "columns": [
+            "name",
+            "category",
+            "description",
+            "price",
+            "unit",
+            "supplier_id",
+            "stock_quantity",
+            "notes",
+        ],
+        "sample_data": [
+            [
+                "Potgrond universeel 40L",
+                "Grond en voeding",
+                "Hoogwaardige potgrond voor alle planten",
+                "8.95",
+                "zak",
+                "1",
+                "50",
+                "Geschikt voor binnen en buiten",
+            ],
+            [
+                "Tuinslang 25m",
+                "Gereedschap",
+                "Flexibele tuinslang met spuitpistool",
+                "45.00",
+                "stuk",
+                "2",
+                "15",
+                "Inclusief koppelingen",
+            ],
+        ],
+    },
+    "clients": {
+        "columns": [
+            "name",
+            "email",
+            "phone",
+            "address",
+            "city",
+            "postal_code",
+            "country",
+            "client_type",
+            "company",
+            "notes",
+        ],
+        "sample_data": [
+            [
+                "Gemeente Amsterdam",
+                "projecten@amsterdam.nl",
+                "+31 20 5551234",
+                "Stopera 1",
+                "Amsterdam",
+                "1012 AB",
+                "Nederland",
+                "Zakelijk",
+                "Gemeente Amsterdam",
+                "Grote openbare projecten",
+            ],
+            [
+                "Familie Jansen",
+                "j.jansen@email.nl",
+                "+31 6 12345678",
+                "Dorpsstraat 25",
+                "Hilversum",
+                "1234 AB",
+                "Nederland",
+                "Particulier",
+                "",
+                "Privé tuin renovatie",
+            ],
+        ],
+    },
+}
+
+
+# Bump to force regeneration of cached templates when their layout changes
+TEMPLATE_SCHEMA_VERSION = 1
+# Templates are revalidated with their ETag after a day
+TEMPLATE_CACHE_MAX_AGE = 24 * 60 * 60
+
+# Rendered templates per import type: import_type -> (fingerprint, workbook bytes)
+_template_cache: dict[str, tuple[str, bytes]] = {}
+_template_cache_lock = threading.Lock()
+
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
@@ -71,51 +309,7 @@ def validate_import_file():
 def validate_file_structure(df: pd.DataFrame, import_type: str) -> dict[str, Any]:
     """Validate DataFrame structure for import type"""
 
-    required_columns = {
-        "suppliers": [
-            "name",
-            "contact_person",
-            "email",
-            "phone",
-            "address",
-            "city",
-            "postal_code",
-        ],
-        "plants": [
-            "name",
-            "common_name",
-            "category",
-            "sun_requirements",
-            "water_needs",
-            "hardiness_zone",
-            "height_max",
-            "width_max",
-            "bloom_time",
-            "bloom_color",
-            "maintenance",
-            "supplier_id",
-        ],
-        "products": ["name", "category", "description", "price", "unit", "supplier_id"],
-        "clients": [
-            "name",
-            "email",
-            "phone",
-            "address",
-            "city",
-            "postal_code",
-            "country",
-            "client_type",
-        ],
-    }
-
-    optional_columns = {
-        "suppliers": ["country", "website", "specialization", "notes"],
-        "plants": ["notes", "native_region", "soil_type"],
-        "products": ["stock_quantity", "notes"],
-        "clients": ["company", "notes"],
-    }
-
-    if import_type not in required_columns:
+    if import_type not in REQUIRED_COLUMNS:
         return {
             "valid": False,
             "error": f"Ongeldig import type: {import_type}",
@@ -125,8 +319,8 @@ def validate_file_structure(df: pd.DataFrame, import_type: str) -> dict[str, Any
             "sample_data": [],
         }
 
-    required_cols = required_columns[import_type]
-    optional_cols = optional_columns.get(import_type, [])
+    required_cols = REQUIRED_COLUMNS[import_type]
+    optional_cols = OPTIONAL_COLUMNS.get(import_type, [])
     all_expected_cols = required_cols + optional_cols
 
     # Check for missing required columns
@@ -281,42 +475,69 @@ def process_import():
         return jsonify({"error": f"Fout bij verwerken import: {e!s}"}), 500
 
 
+def _row_natural_key(import_type: str, row_dict: dict[str, Any]) -> str | None:
+    """Natural key of an import row; rows whose key cannot be built are not deduplicated"""
+    try:
+        if import_type == "suppliers":
+            return supplier_key(row_dict.get("name"), row_dict.get("email"))
+        if import_type == "plants":
+            return plant_key(row_dict.get("name"))
+        if import_type == "products":
+            return product_key(row_dict.get("name"), row_dict.get("supplier_id"))
+        return client_key(row_dict.get("email"))
+    except (TypeError, ValueError):
+        return None
+
+
 def process_import_data(df: pd.DataFrame, import_type: str, update_existing: bool) -> dict[str, Any]:
     """Process DataFrame and import data into database"""
 
+    row_importers = {
+        "suppliers": (Supplier, import_supplier_row),
+        "plants": (Plant, import_plant_row),
+        "products": (Product, import_product_row),
+        "clients": (Client, import_client_row),
+    }
+    if import_type not in row_importers:
+        raise ValueError(f"Ongeldig import type: {import_type}")
+    model, import_row = row_importers[import_type]
+
     successful_imports = 0
     failed_imports = 0
     updated_records = 0
     errors = []
+    warnings = []
+    key_index = NaturalKeyIndex(model)
 
     try:
-        for index, row in df.iterrows():
-            try:
-                row_dict = row.fillna("").to_dict()
-
-                if import_type == "suppliers":
-                    result = import_supplier_row(row_dict, update_existing)
-                elif import_type == "plants":
-                    result = import_plant_row(row_dict, update_existing)
-                elif import_type == "products":
-                    result = import_product_row(row_dict, update_existing)
-                elif import_type == "clients":
-                    result = import_client_row(row_dict, update_existing)
-                else:
-                    raise ValueError(f"Ongeldig import type: {import_type}")
-
-                if result["success"]:
-                    if result.get("updated"):
-                        updated_records += 1
+        for chunk_start in range(0, len(df), IMPORT_CHUNK_SIZE):
+            rows = df.iloc[chunk_start : chunk_start + IMPORT_CHUNK_SIZE].fillna("").to_dict("records")
+            keys = [_row_natural_key(import_type, row_dict) for row_dict in rows]
+
+            # One indexed lookup per chunk instead of one query per row
+            key_index.prime(keys)
+            near_duplicates = key_index.near_duplicates(keys)
+
+            for offset, (row_dict, key) in enumerate(zip(rows, keys, strict=True)):
+                row_num = chunk_start + offset + 2
+                try:
+                    result = import_row(row_dict, update_existing, key_index.get(key))
+
+                    if result["success"]:
+                        if result.get("updated"):
+                            updated_records += 1
+                        else:
+                            successful_imports += 1
+                            key_index.add(key, result["record"])
+                            if key in near_duplicates:
+                                warnings.append(f"Rij {row_num}: lijkt op bestaand record '{near_duplicates[key]}'")
                     else:
-                        successful_imports += 1
-                else:
-                    failed_imports += 1
-                    errors.append(f"Rij {index + 2}: {result['error']}")
+                        failed_imports += 1
+                        errors.append(f"Rij {row_num}: {result['error']}")
 
-            except Exception as e:
-                failed_imports += 1
-                errors.append(f"Rij {index + 2}: {e!s}")
+                except Exception as e:
+                    failed_imports += 1
+                    errors.append(f"Rij {row_num}: {e!s}")
 
         # Commit all changes
         db.session.commit()
@@ -328,6 +549,8 @@ def process_import_data(df: pd.DataFrame, import_type: str, update_existing: boo
             "updated_records": updated_records,
             "failed_imports": failed_imports,
             "errors": errors[:10],  # Limit to first 10 errors
+            "possible_duplicates": len(warnings),
+            "warnings": warnings[:10],
             "message": (
                 f"Import voltooid: {successful_imports} nieuwe records, "
                 f"{updated_records} bijgewerkt, {failed_imports} gefaald"
@@ -339,12 +562,11 @@ def process_import_data(df: pd.DataFrame, import_type: str, update_existing: boo
         raise e
 
 
-def import_supplier_row(row_dict: dict[str, Any], update_existing: bool) -> dict[str, Any]:
+def import_supplier_row(
+    row_dict: dict[str, Any], update_existing: bool, existing_supplier: Supplier | None = None
+) -> dict[str, Any]:
     """Import single supplier row"""
     try:
-        # Check if supplier already exists
-        existing_supplier = Supplier.query.filter_by(name=row_dict["name"], email=row_dict["email"]).first()
-
         if existing_supplier and not update_existing:
             return {"success": False, "error": "Leverancier bestaat al"}
 
@@ -369,18 +591,17 @@ def import_supplier_row(row_dict: dict[str, Any], update_existing: bool) -> dict
         # Create new supplier
         supplier = Supplier(**supplier_data)
         db.session.add(supplier)
-        return {"success": True, "updated": False}
+        return {"success": True, "updated": False, "record": supplier}
 
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
-def import_plant_row(row_dict: dict[str, Any], update_existing: bool) -> dict[str, Any]:
+def import_plant_row(
+    row_dict: dict[str, Any], update_existing: bool, existing_plant: Plant | None = None
+) -> dict[str, Any]:
     """Import single plant row"""
     try:
-        # Check if plant already exists
-        existing_plant = Plant.query.filter_by(name=row_dict["name"]).first()
-
         if existing_plant and not update_existing:
             return {"success": False, "error": "Plant bestaat al"}
 
@@ -419,21 +640,17 @@ def import_plant_row(row_dict: dict[str, Any], update_existing: bool) -> dict[st
         # Create new plant
         plant = Plant(**plant_data)
         db.session.add(plant)
-        return {"success": True, "updated": False}
+        return {"success": True, "updated": False, "record": plant}
 
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
-def import_product_row(row_dict: dict[str, Any], update_existing: bool) -> dict[str, Any]:
+def import_product_row(
+    row_dict: dict[str, Any], update_existing: bool, existing_product: Product | None = None
+) -> dict[str, Any]:
     """Import single product row"""
     try:
-        # Check if product already exists
-        existing_product = Product.query.filter_by(
-            name=row_dict["name"],
-            supplier_id=int(row_dict["supplier_id"]) if row_dict.get("supplier_id") else None,
-        ).first()
-
         if existing_product and not update_existing:
             return {"success": False, "error": "Product bestaat al"}
 
@@ -465,18 +682,17 @@ def import_product_row(row_dict: dict[str, Any], update_existing: bool) -> dict[
         # Create new product
         product = Product(**product_data)
         db.session.add(product)
-        return {"success": True, "updated": False}
+        return {"success": True, "updated": False, "record": product}
 
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
-def import_client_row(row_dict: dict[str, Any], update_existing: bool) -> dict[str, Any]:
+def import_client_row(
+    row_dict: dict[str, Any], update_existing: bool, existing_client: Client | None = None
+) -> dict[str, Any]:
     """Import single client row"""
     try:
-        # Check if client already exists
-        existing_client = Client.query.filter_by(email=row_dict["email"]).first()
-
         if existing_client and not update_existing:
             return {"success": False, "error": "Klant bestaat al"}
 
@@ -500,7 +716,7 @@ def import_client_row(row_dict: dict[str, Any], update_existing: bool) -> dict[s
         # Create new client
         client = Client(**client_data)
         db.session.add(client)
-        return {"success": True, "updated": False}
+        return {"success": True, "updated": False, "record": client}
 
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -511,213 +727,78 @@ def import_client_row(row_dict: dict[str, Any], update_existing: bool) -> dict[s
 def download_template(import_type):
     """Download Excel template for specific import type"""
     try:
-        templates = {
-            "suppliers": {
-                "columns": [
-                    "name",
-                    "contact_person",
-                    "email",
-                    "phone",
-                    "address",
-                    "city",
-                    "postal_code",
-                    "website",
-                    "specialization",
-                    "notes",
-                ],
-                "sample_data": [
-                    [
-                        "Boomkwekerij Peters",
-                        "Jan Peters",
-                        "info@boomkwekerij-peters.nl",
-                        "+31 20 1234567",
-                        "Kwekerslaan 1",
-                        "Amsterdam",
-                        "1000 AB",
-                        "www.boomkwekerij-peters.nl",
-                        "Bomen en heesters",
-                        "Gespecialiseerd in grote bomen",
-                    ],
-                    [
-                        "Tuincentrum De Groene Vingers",
-                        "Marie de Vries",
-                        "verkoop@groenvingers.nl",
-                        "+31 30 9876543",
-                        "Tuinstraat 15",
-                        "Utrecht",
-                        "3500 CD",
-                        "www.groenvingers.nl",
-                        "Tuinplanten",
-                        "Breed assortiment tuinplanten",
-                    ],
-                ],
-            },
-            "plants": {
-                "columns": [
-                    "name",
-                    "common_name",
-                    "category",
-                    "sun_requirements",
-                    "water_needs",
-                    "hardiness_zone",
-                    "height_max",
-                    "width_max",
-                    "bloom_time",
-                    "bloom_color",
-                    "maintenance",
-                    "supplier_id",
-                    "notes",
-                    "native_region",
-                    "soil_type",
-                ],
-                "sample_data": [
-                    [
-                        "Acer palmatum",
-                        "Japanse esdoorn",
-                        "Boom",
-                        "Halfschaduw",
-                        "Gemiddeld",
-                        "6",
-                        "8.0",
-                        "6.0",
-                        "April-Mei",
-                        "Rood",
-                        "Gemiddeld",
-                        "1",
-                        "Prachtige herfstkleur",
-                        "Japan",
-                        "Humusrijk",
-                    ],
-                    [
-                        "Lavandula angustifolia",
-                        "Lavendel",
-                        "Vaste plant",
-                        "Zon",
-                        "Weinig",
-                        "5",
-                        "0.6",
-                        "0.8",
-                        "Juli-September",
-                        "Paars",
-                        "Laag",
-                        "2",
-                        "Geurig en bijenvriendelijk",
-                        "Middellandse Zee",
-                        "Doorlatend",
-                    ],
-                ],
-            },
-            "products": {
-                "columns": [
-                    "name",
-                    "category",
-                    "description",
-                    "price",
-                    "unit",
-                    "supplier_id",
-                    "stock_quantity",
-                    "notes",
-                ],
-                "sample_data": [
-                    [
-                        "Potgrond universeel 40L",
-                        "Grond en voeding",
-                        "Hoogwaardige potgrond voor alle planten",
-                        "8.95",
-                        "zak",
-                        "1",
-                        "50",
-                        "Geschikt voor binnen en buiten",
-                    ],
-                    [
-                        "Tuinslang 25m",
-                        "Gereedschap",
-                        "Flexibele tuinslang met spuitpistool",
-                        "45.00",
-                        "stuk",
-                        "2",
-                        "15",
-                        "Inclusief koppelingen",
-                    ],
-                ],
-            },
-            "clients": {
-                "columns": [
-                    "name",
-                    "email",
-                    "phone",
-                    "address",
-                    "city",
-                    "postal_code",
-                    "country",
-                    "client_type",
-                    "company",
-                    "notes",
-                ],
-                "sample_data": [
-                    [
-                        "Gemeente Amsterdam",
-                        "projecten@amsterdam.nl",
-                        "+31 20 5551234",
-                        "Stopera 1",
-                        "Amsterdam",
-                        "1012 AB",
-                        "Nederland",
-                        "Zakelijk",
-                        "Gemeente Amsterdam",
-                        "Grote openbare projecten",
-                    ],
-                    [
-                        "Familie Jansen",
-                        "j.jansen@email.nl",
-                        "+31 6 12345678",
-                        "Dorpsstraat 25",
-                        "Hilversum",
-                        "1234 AB",
-                        "Nederland",
-                        "Particulier",
-                        "",
-                        "Privé tuin renovatie",
-                    ],
-                ],
-            },
-        }
-
-        if import_type not in templates:
+        if import_type not in IMPORT_TEMPLATES:
             return jsonify({"error": f"Ongeldig template type: {import_type}"}), 400
 
-        template_data = templates[import_type]
-
-        # Create Excel file
-        df = pd.DataFrame([template_data["columns"]] + template_data["sample_data"])
-        df.columns = range(len(df.columns))  # Reset column names to avoid header issues
-
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine="openpyxl") as writer:
-            df.to_excel(writer, sheet_name=f"{import_type}_template", index=False, header=False)
+        etag, workbook_bytes = get_template_workbook(import_type)
 
-            # Style the header row
-            worksheet = writer.sheets[f"{import_type}_template"]
-
-            # Bold header row
-            for col in range(len(template_data["columns"])):
-                cell = worksheet.cell(row=1, column=col + 1)
-                cell.font = cell.font.copy(bold=True)
-
-        output.seek(0)
-
-        return send_file(
-            output,
+        response = send_file(
+            io.BytesIO(workbook_bytes),
             as_attachment=True,
             download_name=f"{import_type}_import_template.xlsx",
             mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            etag=etag,
+            max_age=TEMPLATE_CACHE_MAX_AGE,
+            conditional=True,
         )
+        # Templates are served to authenticated users only; keep them out of shared caches
+        response.cache_control.public = False
+        response.cache_control.private = True
+        return response
 
     except Exception as e:
         logging.exception("Error generating template")
         return jsonify({"error": f"Fout bij genereren template: {e!s}"}), 500
 
 
+def template_fingerprint(import_type: str) -> str:
+    """Fingerprint of everything that shapes a template; changes whenever the column definitions change"""
+    definition = {
+        "version": TEMPLATE_SCHEMA_VERSION,
+        "required_columns": REQUIRED_COLUMNS.get(import_type, []),
+        "optional_columns": OPTIONAL_COLUMNS.get(import_type, []),
+        "template": IMPORT_TEMPLATES[import_type],
+    }
+    encoded = json.dumps(definition, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+
+def build_template_workbook(import_type: str) -> bytes:
+    """Render the Excel template for an import type"""
+    template_data = IMPORT_TEMPLATES[import_type]
+
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.title = f"{import_type}_template"
+
+    worksheet.append(template_data["columns"])
+    for cell in worksheet[1]:
+        cell.font = Font(bold=True)
+    for row in template_data["sample_data"]:
+        worksheet.append(row)
+
+    output = io.BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
+
+def get_template_workbook(import_type: str) -> tuple[str, bytes]:
+    """
+    Return (etag, workbook bytes) for an import type, building the workbook at most once per schema version.
+    """
+    fingerprint = template_fingerprint(import_type)
+    cached = _template_cache.get(import_type)
+    if cached and cached[0] == fingerprint:
+        return cached
+
+    with _template_cache_lock:
+        cached = _template_cache.get(import_type)
+        if not cached or cached[0] != fingerprint:
+            cached = (fingerprint, build_template_workbook(import_type))
+            _template_cache[import_type] = cached
+        return cached
+
+
 @excel_import_bp.route("/import/status", methods=["GET"])
 @data_access_required
 def get_import_status():
@@ -6,6 +6,8 @@ Provides endpoints for monitoring cache performance and system health.
 from flask import Blueprint, current_app, jsonify, request
 
 from src.routes.user import data_access_required, login_required
+from src.services.pdf_cache import get_pdf_cache
+from src.services.pdf_render import pdf_renderer
 from src.services.performance import (
     cache,
     get_cache_stats,
@@ -179,3 +181,17 @@ def get_performance_metrics():
     except Exception:
         current_app.logger.exception("Failed to get performance metrics")
         return jsonify({"error": "Failed to get performance metrics"}), 500
+
+
+@performance_bp.route("/pdf-rendering", methods=["GET"])
+@login_required
+def get_pdf_rendering_metrics():
+    """Get PDF render pool limits, queue depth, render timings and cache usage."""
+    try:
+        metrics = pdf_renderer.metrics()
+        pdf_cache = get_pdf_cache()
+        metrics["cache"] = pdf_cache.stats() if pdf_cache is not None else {"enabled": False}
+        return jsonify(metrics)
+    except Exception:
+        current_app.logger.exception("Failed to get PDF rendering metrics")
+        return jsonify({"error": "Failed to get PDF rendering metrics"}), 500
@@ -1,18 +1,23 @@
 """API routes for photo upload and management."""
 
-import os
+import zipfile
 
-from flask import Blueprint, current_app, jsonify, request, send_file, session
+from flask import Blueprint, current_app, jsonify, request, session
 from flask_cors import cross_origin
-from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.exceptions import RequestedRangeNotSatisfiable, RequestEntityTooLarge
 
 from src.models.photo import PhotoCategory
 from src.models.user import User
+from src.services.photo_delivery import PhotoFiles, serve_photo_files
+from src.services.photo_pipeline import photo_pipeline
 from src.services.photo_service import PhotoService
 from src.utils.decorators import login_required
 
 photos_bp = Blueprint("photos", __name__)
 
+# Entities per batch primary photo request, about two list pages
+MAX_PRIMARY_PHOTO_IDS = 200
+
 
 def get_photo_service():
     """Get photo service instance (lazy initialization)"""
@@ -31,6 +36,9 @@ def get_current_user():
 @login_required
 def upload_photo():
     """Upload a photo with metadata."""
+    service = get_photo_service()
+    # Hashed, size checked and sniffed while the request body is parsed
+    request.ingest_files(service.upload_folder, service.MAX_FILE_SIZE, service.ALLOWED_EXTENSIONS)
     try:
         # Check if file is present
         if "file" not in request.files:
@@ -59,7 +67,7 @@ def upload_photo():
             return jsonify({"error": "Authentication required"}), 401
 
         # Upload photo
-        result = get_photo_service().upload_photo(
+        result = service.upload_photo(
             file=file,
             category=category,
             entity_id=entity_id,
@@ -80,6 +88,69 @@ def upload_photo():
         return jsonify({"error": "Upload failed"}), 500
 
 
+@photos_bp.route("/upload/bulk", methods=["POST"])
+@cross_origin(supports_credentials=True)
+@login_required
+def upload_photos_bulk():
+    """
+    Upload many photos in one request.
+
+    Accepts any number of ``files`` parts and/or zip ``archive`` parts, plus
+    ``category`` and ``entity_id`` for all of them. Returns a result per file:
+    201 when all were stored, 207 when only some were.
+    """
+    # Raised for this endpoint only; every file is still limited to MAX_FILE_SIZE
+    request.max_content_length = current_app.config.get("PHOTO_BULK_MAX_CONTENT_LENGTH")
+    service = get_photo_service()
+    # Photos are parsed straight into blob storage; archives are spooled as usual
+    request.ingest_files(service.upload_folder, service.MAX_FILE_SIZE, service.ALLOWED_EXTENSIONS)
+    try:
+        category_str = request.form.get("category", "example")
+        entity_id = request.form.get("entity_id", type=int)
+        try:
+            category = PhotoCategory(category_str)
+        except ValueError:
+            return jsonify({"error": f"Invalid category: {category_str}"}), 400
+
+        current_user = get_current_user()
+        if not current_user:
+            return jsonify({"error": "Authentication required"}), 401
+
+        parts = [file for file in request.files.getlist("files") if file.filename]
+        archives = [archive for archive in request.files.getlist("archive") if archive.filename]
+        if not parts and not archives:
+            return jsonify({"error": "No files provided"}), 400
+        # Rejected before anything is stored
+        for archive in archives:
+            if not zipfile.is_zipfile(archive.stream):
+                return jsonify({"error": f"Invalid zip archive: {archive.filename}"}), 400
+            archive.stream.seek(0)
+
+        def uploads():
+            for file in parts:
+                yield file.filename, file.stream
+            for archive in archives:
+                yield from service.archive_entries(archive.stream)
+
+        result = service.upload_photos(
+            uploads(),
+            category=category,
+            entity_id=entity_id,
+            uploaded_by_id=current_user.id,
+            max_files=current_app.config.get("PHOTO_BULK_MAX_FILES"),
+        )
+
+        if not result["uploaded"]:
+            return jsonify({"error": "No photos uploaded", **result}), 400
+        return jsonify(result), 201 if not result["failed"] else 207
+
+    except RequestEntityTooLarge:
+        return jsonify({"error": "Upload too large"}), 413
+    except Exception as e:
+        current_app.logger.error(f"Bulk photo upload error: {e!s}")
+        return jsonify({"error": "Upload failed"}), 500
+
+
 @photos_bp.route("/", methods=["GET"])
 @cross_origin(supports_credentials=True)
 def get_photos():
@@ -114,6 +185,33 @@ def get_photos():
         return jsonify({"error": "Failed to fetch photos"}), 500
 
 
+@photos_bp.route("/primary", methods=["GET"])
+@cross_origin(supports_credentials=True)
+def get_primary_photos():
+    """Get the primary photos of many entities, e.g. ?category=plant&entity_ids=1,2,3"""
+    try:
+        try:
+            category = PhotoCategory(request.args.get("category", ""))
+        except ValueError:
+            return jsonify({"error": "A valid category is required"}), 400
+        if PhotoService.entity_column(category) is None:
+            return jsonify({"error": f"Photos of category {category.value} have no entity"}), 400
+
+        try:
+            entity_ids = [int(value) for value in request.args.get("entity_ids", "").split(",") if value.strip()]
+        except ValueError:
+            return jsonify({"error": "entity_ids must be a comma separated list of IDs"}), 400
+        if len(entity_ids) > MAX_PRIMARY_PHOTO_IDS:
+            return jsonify({"error": f"At most {MAX_PRIMARY_PHOTO_IDS} entity IDs per request"}), 400
+
+        photos = PhotoService.get_primary_photos(category, entity_ids)
+        return jsonify({"photos": {str(entity_id): photo for entity_id, photo in photos.items()}})
+
+    except Exception as e:
+        current_app.logger.error(f"Error fetching primary photos: {e!s}")
+        return jsonify({"error": "Failed to fetch primary photos"}), 500
+
+
 @photos_bp.route("/<int:photo_id>", methods=["GET"])
 @cross_origin(supports_credentials=True)
 def get_photo(photo_id):
@@ -137,23 +235,13 @@ def get_photo(photo_id):
 def serve_photo(photo_id):
     """Serve photo file."""
     try:
-        from src.models.photo import Photo
-
-        photo = Photo.query.get(photo_id)
-        if not photo:
-            return jsonify({"error": "Photo not found"}), 404
-
-        # Check if file exists
-        if not photo.file_path or not os.path.exists(photo.file_path):
+        response = serve_photo_files(photo_id, PhotoFiles.original)
+        if response is None:
             return jsonify({"error": "Photo file not found"}), 404
+        return response
 
-        return send_file(
-            photo.file_path,
-            mimetype=photo.mime_type,
-            as_attachment=False,
-            download_name=photo.original_filename,
-        )
-
+    except RequestedRangeNotSatisfiable as e:
+        return e.get_response()
     except Exception as e:
         current_app.logger.error(f"Error serving photo {photo_id}: {e!s}")
         return jsonify({"error": "Failed to serve photo"}), 500
@@ -162,33 +250,27 @@ def serve_photo(photo_id):
 @photos_bp.route("/thumbnail/<int:photo_id>", methods=["GET"])
 @cross_origin(supports_credentials=True)
 def serve_thumbnail(photo_id):
-    """Serve photo thumbnail."""
+    """
+    Serve a downscaled photo.
+
+    ``?size=`` picks the smallest derivative covering that many pixels on the
+    longest side, or a derivative by name (``thumb``, ``medium``, ``large``);
+    the default is the thumbnail. The original is served when no derivative
+    is large enough. WebP is served to clients that accept it.
+    """
     try:
-        from src.models.photo import Photo
-
-        photo = Photo.query.get(photo_id)
-        if not photo:
-            return jsonify({"error": "Photo not found"}), 404
-
-        # Check if thumbnail exists
-        if not photo.thumbnail_path or not os.path.exists(photo.thumbnail_path):
-            # Fall back to original file if thumbnail doesn't exist
-            if photo.file_path and os.path.exists(photo.file_path):
-                return send_file(
-                    photo.file_path,
-                    mimetype=photo.mime_type,
-                    as_attachment=False,
-                    download_name=f"thumb_{photo.original_filename}",
-                )
+        size = request.args.get("size")
+        webp = any(mimetype == "image/webp" for mimetype, _ in request.accept_mimetypes)
+        try:
+            response = serve_photo_files(photo_id, lambda files: files.thumbnail(size, webp), vary_accept=True)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if response is None:
             return jsonify({"error": "Thumbnail not found"}), 404
+        return response
 
-        return send_file(
-            photo.thumbnail_path,
-            mimetype="image/jpeg",
-            as_attachment=False,
-            download_name=f"thumb_{photo.original_filename}",
-        )
-
+    except RequestedRangeNotSatisfiable as e:
+        return e.get_response()
     except Exception as e:
         current_app.logger.error(f"Error serving thumbnail {photo_id}: {e!s}")
         return jsonify({"error": "Failed to serve thumbnail"}), 500
@@ -316,6 +398,33 @@ def delete_photo(photo_id):
         return jsonify({"error": "Failed to delete photo"}), 500
 
 
+@photos_bp.route("/reprocess", methods=["POST"])
+@cross_origin(supports_credentials=True)
+@login_required
+def reprocess_photos():
+    """Queue photos for processing again (admin only)."""
+    try:
+        current_user = get_current_user()
+        if not current_user:
+            return jsonify({"error": "Authentication required"}), 401
+        if current_user.role != "admin":
+            return jsonify({"error": "Permission denied"}), 403
+
+        data = request.get_json(silent=True) or {}
+        photo_ids = data.get("photo_ids")
+        if photo_ids is not None and (
+            not isinstance(photo_ids, list) or not all(isinstance(photo_id, int) for photo_id in photo_ids)
+        ):
+            return jsonify({"error": "photo_ids must be a list of photo IDs"}), 400
+
+        queued = photo_pipeline.reprocess(photo_ids, failed_only=bool(data.get("failed_only")))
+        return jsonify({"queued": queued, "message": f"{queued} photo(s) queued for processing"}), 202
+
+    except Exception as e:
+        current_app.logger.error(f"Error reprocessing photos: {e!s}")
+        return jsonify({"error": "Failed to reprocess photos"}), 500
+
+
 @photos_bp.route("/categories", methods=["GET"])
 @cross_origin(supports_credentials=True)
 def get_photo_categories():
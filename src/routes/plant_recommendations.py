@@ -16,6 +16,9 @@ from flask import Blueprint, Response, jsonify, request, session
 from src.models.landscape import Plant, PlantRecommendationRequest
 from src.models.user import db
 from src.routes.user import data_access_required
+from src.services.plant_csv_import import PlantCSVImportService
+from src.services.plant_csv_import import parse_bool as _parse_bool
+from src.services.plant_csv_import import parse_float as _parse_float
 from src.services.plant_recommendation import (
     PlantRecommendationEngine,
     RecommendationCriteria,
@@ -414,83 +417,20 @@ def import_plant_data():
         if not file.filename.lower().endswith(".csv"):
             return jsonify({"error": "Only CSV files are supported"}), 400
 
-        # Read and parse CSV
-        csv_content = file.read().decode("utf-8")
-        csv_reader = csv.DictReader(io.StringIO(csv_content))
-
-        imported_plants = []
-        errors = []
-
-        for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 (after header)
-            try:
-                # Create plant from CSV row
-                plant = Plant(
-                    name=row.get("name", "").strip(),
-                    common_name=row.get("common_name", "").strip() or None,
-                    category=row.get("category", "").strip() or None,
-                    height_min=_parse_float(row.get("height_min")),
-                    height_max=_parse_float(row.get("height_max")),
-                    width_min=_parse_float(row.get("width_min")),
-                    width_max=_parse_float(row.get("width_max")),
-                    sun_requirements=row.get("sun_requirements", "").strip() or None,
-                    soil_type=row.get("soil_type", "").strip() or None,
-                    water_needs=row.get("water_needs", "").strip() or None,
-                    hardiness_zone=row.get("hardiness_zone", "").strip() or None,
-                    bloom_time=row.get("bloom_time", "").strip() or None,
-                    bloom_color=row.get("bloom_color", "").strip() or None,
-                    foliage_color=row.get("foliage_color", "").strip() or None,
-                    native=_parse_bool(row.get("native", "")),
-                    maintenance=row.get("maintenance", "").strip() or None,
-                    price=_parse_float(row.get("price")),
-                    # Extended attributes
-                    temperature_min=_parse_float(row.get("temperature_min")),
-                    temperature_max=_parse_float(row.get("temperature_max")),
-                    humidity_preference=row.get("humidity_preference", "").strip() or None,
-                    wind_tolerance=row.get("wind_tolerance", "").strip() or None,
-                    soil_ph_min=_parse_float(row.get("soil_ph_min")),
-                    soil_ph_max=_parse_float(row.get("soil_ph_max")),
-                    soil_drainage=row.get("soil_drainage", "").strip() or None,
-                    soil_fertility=row.get("soil_fertility", "").strip() or None,
-                    pruning_needs=row.get("pruning_needs", "").strip() or None,
-                    fertilizer_needs=row.get("fertilizer_needs", "").strip() or None,
-                    pest_resistance=row.get("pest_resistance", "").strip() or None,
-                    disease_resistance=row.get("disease_resistance", "").strip() or None,
-                    plant_form=row.get("plant_form", "").strip() or None,
-                    foliage_texture=row.get("foliage_texture", "").strip() or None,
-                    seasonal_interest=row.get("seasonal_interest", "").strip() or None,
-                    fragrance=_parse_bool(row.get("fragrance", "")),
-                    growth_rate=row.get("growth_rate", "").strip() or None,
-                    mature_spread=_parse_float(row.get("mature_spread")),
-                    root_system=row.get("root_system", "").strip() or None,
-                    wildlife_value=row.get("wildlife_value", "").strip() or None,
-                    pollinator_friendly=_parse_bool(row.get("pollinator_friendly", "")),
-                    deer_resistant=_parse_bool(row.get("deer_resistant", "")),
-                    invasive_potential=row.get("invasive_potential", "").strip() or None,
-                    suitable_for_containers=_parse_bool(row.get("suitable_for_containers", "")),
-                    suitable_for_hedging=_parse_bool(row.get("suitable_for_hedging", "")),
-                    suitable_for_screening=_parse_bool(row.get("suitable_for_screening", "")),
-                    suitable_for_groundcover=_parse_bool(row.get("suitable_for_groundcover", "")),
-                    suitable_for_slopes=_parse_bool(row.get("suitable_for_slopes", "")),
-                )
-
-                if not plant.name:
-                    errors.append(f"Row {row_num}: Plant name is required")
-                    continue
-
-                db.session.add(plant)
-                imported_plants.append(plant.name)
-
-            except Exception as e:
-                logging.exception(f"Error processing row {row_num}: {e!s}")
-                errors.append(f"Row {row_num}: An error occurred while processing this row")
+        try:
+            result = PlantCSVImportService().import_stream(file.stream)
+        except UnicodeDecodeError:
+            db.session.rollback()
+            return jsonify({"error": "CSV file must be UTF-8 encoded"}), 400
 
         # Commit if no errors
-        if not errors:
+        if not result.errors:
             db.session.commit()
             return jsonify(
                 {
-                    "message": f"Successfully imported {len(imported_plants)} plants",
-                    "imported_plants": imported_plants,
+                    "message": f"Successfully imported {len(result.imported_plants)} plants",
+                    "imported_plants": result.imported_plants,
+                    "metrics": result.metrics,
                 }
             )
         db.session.rollback()
@@ -498,8 +438,9 @@ def import_plant_data():
             jsonify(
                 {
                     "error": "Import failed due to errors",
-                    "errors": errors[:10],  # Limit error messages
-                    "total_errors": len(errors),
+                    "errors": result.errors[:10],  # Limit error messages
+                    "total_errors": len(result.errors),
+                    "metrics": result.metrics,
                 }
             ),
             400,
@@ -556,21 +497,3 @@ def _format_request_criteria(req: PlantRecommendationRequest) -> dict[str, Any]:
         summary["Native Preference"] = "Yes"
 
     return summary
-
-
-def _parse_float(value: str) -> float:
-    """Safely parse float from string"""
-    if not value or value.strip() == "":
-        return None
-    try:
-        return float(value.strip())
-    except (ValueError, TypeError):
-        return None
-
-
-def _parse_bool(value: str) -> bool:
-    """Safely parse boolean from string"""
-    if not value:
-        return False
-    value = value.strip().lower()
-    return value in ["true", "1", "yes", "y", "on"]
@@ -6,12 +6,11 @@ import io
 import logging
 from datetime import UTC, datetime
 
-from flask import Blueprint, jsonify, request, send_file
-from reportlab.lib import colors
+from flask import Blueprint, jsonify, request, send_file, url_for
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.lib.units import inch
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table
+from sqlalchemy import select
 
 from src.models.landscape import (
     Client,
@@ -20,13 +19,88 @@ from src.models.landscape import (
     Project,
     ProjectPlant,
     Supplier,
+    SupplierMetrics,
     db,
 )
 from src.routes.user import login_required
+from src.services.business_summary import get_business_summary
+from src.services.pdf_cache import SUMMARY_TAG, project_tags
+from src.services.pdf_render import PDFRenderBusyError, can_merge_sections, pdf_renderer, render_wait
+from src.services.report_loaders import load_project_report
+from src.services.report_scheduler import (
+    ScheduledReport,
+    parse_report_range,
+    period_for_label,
+    pregenerated_report,
+    register_report,
+    scheduled_report_status,
+)
+from src.services.report_templates import (
+    ACCENT_AMOUNTS_TABLE_STYLE,
+    ACCENT_CLIENTS_TABLE_STYLE,
+    ACCENT_TABLE_STYLE,
+    BRAND_TABLE_STYLE,
+    BRAND_TABLE_STYLE_MEDIUM,
+    BRAND_TABLE_STYLE_SMALL,
+    STATS_AMOUNTS_TABLE_STYLE,
+    STATS_TABLE_STYLE,
+    STYLES,
+    report_translations,
+)
+from src.services.supplier_metrics import refresh_supplier_metrics
 
 reports_bp = Blueprint("reports", __name__)
 
 
+def pdf_job_response(job):
+    """Send a finished PDF render, or a job handle the client can poll while it is still rendering"""
+    if not job.done():
+        payload = job.to_dict()
+        payload["status_url"] = url_for("reports.get_pdf_job", job_id=job.id)
+        return jsonify(payload), 202
+
+    if job.path:
+        # Cached renders are served from disk with their content hash as ETag (supports Range requests)
+        response = send_file(
+            job.path,
+            as_attachment=True,
+            download_name=job.filename,
+            mimetype="application/pdf",
+            etag=job.cache_key,
+            conditional=True,
+            max_age=0,
+        )
+        response.cache_control.private = True
+    else:
+        response = send_file(
+            io.BytesIO(job.result()),
+            as_attachment=True,
+            download_name=job.filename,
+            mimetype="application/pdf",
+        )
+
+    if job.section_seconds:
+        # Per-section render times show up in the browser's network timing panel
+        response.headers["Server-Timing"] = ", ".join(
+            f"{name};dur={seconds * 1000:.1f}" for name, seconds in job.section_seconds.items()
+        )
+    return response
+
+
+@reports_bp.route("/api/reports/jobs/<job_id>", methods=["GET"])
+@login_required
+def get_pdf_job(job_id):
+    """Poll a PDF render job submitted to any worker; returns the PDF once it is finished"""
+    job = pdf_renderer.get_job(job_id)
+    if not job:
+        return jsonify({"error": "PDF job not found or expired"}), 404
+
+    if job.status == "failed":
+        return jsonify({**job.to_dict(), "error": "PDF generation failed"}), 500
+
+    return pdf_job_response(job)
+
+
 @reports_bp.route("/api/reports/business-summary", methods=["GET"])
 @login_required
 def generate_business_summary():
@@ -36,360 +110,217 @@ def generate_business_summary():
         start_date = request.args.get("start_date")
         end_date = request.args.get("end_date")
         format_type = request.args.get("format", "json")  # json or pdf
-
-        # Build date filter
-        date_filter = []
-        if start_date:
-            date_filter.append(Project.created_at >= datetime.fromisoformat(start_date))
-        if end_date:
-            date_filter.append(Project.created_at <= datetime.fromisoformat(end_date))
-
-        # Get statistics
-        total_projects = Project.query.filter(*date_filter).count()
-        total_clients = Client.query.count()
-        total_plants = Plant.query.count()
-        total_products = Product.query.count()
-        total_suppliers = Supplier.query.count()
-
-        # Project status distribution
-        status_stats = (
-            db.session.query(Project.status, db.func.count(Project.id))
-            .filter(*date_filter)
-            .group_by(Project.status)
-            .all()
+        # A named month or quarter, as pre-generated by the report scheduler
+        if label := request.args.get("period"):
+            period = period_for_label(label)
+            if period is None:
+                return jsonify({"error": "period must be a month (2026-09) or a quarter (2026-Q3)"}), 400
+            start_date, end_date = period.start_date, period.end_date
+
+        report_data = pregenerated_report("business_summary", start_date, end_date) or build_business_summary_report(
+            start_date, end_date
         )
 
-        status_distribution = dict(status_stats)
-
-        # Budget statistics
-        budget_stats = (
-            db.session.query(
-                db.func.sum(Project.budget),
-                db.func.avg(Project.budget),
-            )
-            .filter(Project.budget.isnot(None), *date_filter)
-            .first()
-        )
+        if format_type == "pdf":
+            return generate_business_summary_pdf(report_data)
 
-        total_budget = float(budget_stats[0]) if budget_stats[0] else 0
-        total_spent = 0  # No spent field in current model
-        avg_budget = float(budget_stats[1]) if budget_stats[1] else 0
-
-        # Top clients by project count
-        top_clients = (
-            db.session.query(
-                Client.name,
-                Client.client_type,
-                db.func.count(Project.id).label("project_count"),
-                db.func.sum(Project.budget).label("total_budget"),
-            )
-            .join(Project)
-            .filter(*date_filter)
-            .group_by(Client.id, Client.name, Client.client_type)
-            .order_by(db.desc("project_count"))
-            .limit(10)
-            .all()
-        )
+        return jsonify(report_data)
 
-        top_clients_data = []
-        for name, client_type, count, budget in top_clients:
-            top_clients_data.append(
-                {
-                    "name": name,
-                    "client_type": client_type,
-                    "project_count": count,
-                    "total_budget": float(budget) if budget else 0,
-                }
-            )
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
-        # Most used plants
-        plant_usage = (
-            db.session.query(
-                Plant.name,
-                Plant.common_name,
-                db.func.count(ProjectPlant.project_id.distinct()).label("project_count"),
-            )
-            .join(ProjectPlant, Plant.id == ProjectPlant.plant_id)
-            .join(Project, ProjectPlant.project_id == Project.id)
-            .filter(*date_filter)
-            .group_by(Plant.id, Plant.name, Plant.common_name)
-            .order_by(db.func.count(ProjectPlant.project_id.distinct()).desc())
-            .limit(10)
-            .all()
-        )
 
-        plant_usage_data = []
-        for name, common_name, count in plant_usage:
-            plant_usage_data.append(
-                {
-                    "name": name,
-                    "common_name": common_name,
-                    "project_count": count,
-                }
-            )
+def build_business_summary_report(start_date=None, end_date=None):
+    """Business summary report data for projects created between two ISO dates (both optional)"""
+    start, end = parse_report_range(start_date, end_date)
+    summary = get_business_summary(start=start, end=end)
 
-        # Most used products - disabled for now as Product-Project
-        # relationship not directly modeled
-        product_usage_data = []
+    total_budget = summary.total_budget
+    total_spent = 0  # No spent field in current model
 
-        report_data = {
-            "generated_at": datetime.now(UTC).isoformat(),
-            "period": {"start_date": start_date, "end_date": end_date},
-            "summary": {
-                "total_projects": total_projects,
-                "total_clients": total_clients,
-                "total_plants": total_plants,
-                "total_products": total_products,
-                "total_suppliers": total_suppliers,
-            },
-            "project_stats": {
-                "status_distribution": status_distribution,
-                "budget_stats": {
-                    "total_budget": total_budget,
-                    "total_spent": total_spent,
-                    "avg_budget": avg_budget,
-                    "utilization_rate": ((total_spent / total_budget * 100) if total_budget > 0 else 0),
-                },
-            },
-            "top_clients": top_clients_data,
-            "plant_usage": plant_usage_data,
-            "product_usage": product_usage_data,
+    top_clients_data = [
+        {
+            "name": client.name,
+            "client_type": client.client_type,
+            "project_count": client.project_count,
+            "total_budget": client.total_budget,
         }
+        for client in summary.top_clients
+    ]
 
-        if format_type == "pdf":
-            return generate_business_summary_pdf(report_data)
-
-        return jsonify(report_data)
+    plant_usage_data = [
+        {
+            "name": plant.name,
+            "common_name": plant.common_name,
+            "project_count": plant.project_count,
+        }
+        for plant in summary.plant_usage
+    ]
 
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    # Most used products - disabled for now as Product-Project
+    # relationship not directly modeled
+    product_usage_data = []
+
+    return {
+        "generated_at": datetime.now(UTC).isoformat(),
+        "period": {"start_date": start_date, "end_date": end_date},
+        "summary": {
+            "total_projects": summary.total_projects,
+            "total_clients": summary.total_clients,
+            "total_plants": summary.total_plants,
+            "total_products": summary.total_products,
+            "total_suppliers": summary.total_suppliers,
+        },
+        "project_stats": {
+            "status_distribution": summary.status_distribution,
+            "budget_stats": {
+                "total_budget": total_budget,
+                "total_spent": total_spent,
+                "avg_budget": summary.avg_budget,
+                "utilization_rate": ((total_spent / total_budget * 100) if total_budget > 0 else 0),
+            },
+        },
+        "top_clients": top_clients_data,
+        "plant_usage": plant_usage_data,
+        "product_usage": product_usage_data,
+    }
 
 
 def generate_business_summary_pdf(data):
     """Generate PDF version of business summary report"""
     try:
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4)
-        styles = getSampleStyleSheet()
-        story = []
-
-        # Title
-        title_style = ParagraphStyle(
-            "CustomTitle",
-            parent=styles["Heading1"],
-            fontSize=24,
-            spaceAfter=30,
-            textColor=colors.HexColor("#2D5016"),
+        job = pdf_renderer.render(
+            render_business_summary_pdf,
+            data,
+            filename=f'business_summary_{datetime.now(UTC).strftime("%Y%m%d")}.pdf',
+            wait=render_wait(request.args),
+            cache_tags=(SUMMARY_TAG,),
         )
-        story.append(Paragraph("Landscape Architecture Business Summary", title_style))
-        story.append(Spacer(1, 20))
+        return pdf_job_response(job)
 
-        # Generation info
+    except PDFRenderBusyError as e:
+        return jsonify(e.to_dict()), e.status_code
+    except Exception:
+        logging.exception("Error generating business summary PDF")
+        return jsonify({"error": "Failed to generate PDF report. Please try again later."}), 500
+
+
+def render_business_summary_pdf(data) -> bytes:
+    """Render the business summary report to PDF bytes"""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    styles = STYLES
+    story = []
+
+    # Title
+    story.append(Paragraph("Landscape Architecture Business Summary", styles["ReportTitle"]))
+    story.append(Spacer(1, 20))
+
+    # Generation info
+    story.append(
+        Paragraph(
+            (f"Generated: " f"{datetime.fromisoformat(data['generated_at']).strftime('%B %d, %Y at %H:%M')}"),
+            styles["Normal"],
+        )
+    )
+    if data["period"]["start_date"] and data["period"]["end_date"]:
         story.append(
             Paragraph(
-                (f"Generated: " f"{datetime.now(UTC).strftime('%B %d, %Y at %H:%M')}"),
+                f"Period: {data['period']['start_date']} " f"to {data['period']['end_date']}",
                 styles["Normal"],
             )
         )
-        if data["period"]["start_date"] and data["period"]["end_date"]:
-            story.append(
-                Paragraph(
-                    f"Period: {data['period']['start_date']} " f"to {data['period']['end_date']}",
-                    styles["Normal"],
-                )
-            )
+    story.append(Spacer(1, 20))
+
+    # Summary statistics
+    story.append(Paragraph("Business Overview", styles["Heading2"]))
+    summary_data = [
+        ["Metric", "Count"],
+        ["Total Projects", str(data["summary"]["total_projects"])],
+        ["Total Clients", str(data["summary"]["total_clients"])],
+        ["Total Plants", str(data["summary"]["total_plants"])],
+        ["Total Products", str(data["summary"]["total_products"])],
+        ["Total Suppliers", str(data["summary"]["total_suppliers"])],
+    ]
+
+    summary_table = Table(summary_data, colWidths=[3 * inch, 1.5 * inch])
+    summary_table.setStyle(BRAND_TABLE_STYLE)
+    story.append(summary_table)
+    story.append(Spacer(1, 20))
+
+    # Project status distribution
+    if data["project_stats"]["status_distribution"]:
+        story.append(Paragraph("Project Status Distribution", styles["Heading2"]))
+        status_data = [["Status", "Count"]]
+        for status, count in data["project_stats"]["status_distribution"].items():
+            status_data.append([status.replace("_", " ").title(), str(count)])
+
+        status_table = Table(status_data, colWidths=[3 * inch, 1.5 * inch])
+        status_table.setStyle(BRAND_TABLE_STYLE)
+        story.append(status_table)
         story.append(Spacer(1, 20))
 
-        # Summary statistics
-        story.append(Paragraph("Business Overview", styles["Heading2"]))
-        summary_data = [
-            ["Metric", "Count"],
-            ["Total Projects", str(data["summary"]["total_projects"])],
-            ["Total Clients", str(data["summary"]["total_clients"])],
-            ["Total Plants", str(data["summary"]["total_plants"])],
-            ["Total Products", str(data["summary"]["total_products"])],
-            ["Total Suppliers", str(data["summary"]["total_suppliers"])],
+    # Budget statistics
+    budget_stats = data["project_stats"]["budget_stats"]
+    if budget_stats["total_budget"] > 0:
+        story.append(Paragraph("Financial Overview", styles["Heading2"]))
+        budget_data = [
+            ["Metric", "Amount (€)"],
+            ["Total Budget", f"€{budget_stats['total_budget']:,.2f}"],
+            ["Total Spent", f"€{budget_stats['total_spent']:,.2f}"],
+            ["Average Budget", f"€{budget_stats['avg_budget']:,.2f}"],
+            [
+                "Utilization Rate",
+                f"{budget_stats['utilization_rate']:.1f}%",
+            ],
         ]
 
-        summary_table = Table(summary_data, colWidths=[3 * inch, 1.5 * inch])
-        summary_table.setStyle(
-            TableStyle(
+        budget_table = Table(budget_data, colWidths=[3 * inch, 1.5 * inch])
+        budget_table.setStyle(BRAND_TABLE_STYLE)
+        story.append(budget_table)
+        story.append(Spacer(1, 20))
+
+    # Top clients
+    if data["top_clients"]:
+        story.append(Paragraph("Top Clients by Project Count", styles["Heading2"]))
+        client_data = [["Client", "Type", "Projects", "Total Budget (€)"]]
+        for client in data["top_clients"][:5]:  # Top 5
+            client_data.append(
                 [
-                    (
-                        "BACKGROUND",
-                        (0, 0),
-                        (-1, 0),
-                        colors.HexColor("#2D5016"),
-                    ),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("FONTSIZE", (0, 0), (-1, 0), 12),
-                    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                    ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                    ("GRID", (0, 0), (-1, -1), 1, colors.black),
+                    client["name"],
+                    client["client_type"] or "-",
+                    str(client["project_count"]),
+                    (f"€{client['total_budget']:,.2f}" if client["total_budget"] else "€0.00"),
                 ]
             )
+
+        client_table = Table(
+            client_data,
+            colWidths=[1.5 * inch, 1.5 * inch, 1 * inch, 1.5 * inch],
         )
-        story.append(summary_table)
+        client_table.setStyle(BRAND_TABLE_STYLE_MEDIUM)
+        story.append(client_table)
         story.append(Spacer(1, 20))
 
-        # Project status distribution
-        if data["project_stats"]["status_distribution"]:
-            story.append(Paragraph("Project Status Distribution", styles["Heading2"]))
-            status_data = [["Status", "Count"]]
-            for status, count in data["project_stats"]["status_distribution"].items():
-                status_data.append([status.replace("_", " ").title(), str(count)])
-
-            status_table = Table(status_data, colWidths=[3 * inch, 1.5 * inch])
-            status_table.setStyle(
-                TableStyle(
-                    [
-                        (
-                            "BACKGROUND",
-                            (0, 0),
-                            (-1, 0),
-                            colors.HexColor("#2D5016"),
-                        ),
-                        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                        ("FONTSIZE", (0, 0), (-1, 0), 12),
-                        ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                        ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                        ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                    ]
-                )
-            )
-            story.append(status_table)
-            story.append(Spacer(1, 20))
-
-        # Budget statistics
-        budget_stats = data["project_stats"]["budget_stats"]
-        if budget_stats["total_budget"] > 0:
-            story.append(Paragraph("Financial Overview", styles["Heading2"]))
-            budget_data = [
-                ["Metric", "Amount (€)"],
-                ["Total Budget", f"€{budget_stats['total_budget']:,.2f}"],
-                ["Total Spent", f"€{budget_stats['total_spent']:,.2f}"],
-                ["Average Budget", f"€{budget_stats['avg_budget']:,.2f}"],
+    # Most used plants
+    if data["plant_usage"]:
+        story.append(Paragraph("Most Used Plants", styles["Heading2"]))
+        plant_data = [["Plant Name", "Common Name", "Projects"]]
+        for plant in data["plant_usage"][:5]:  # Top 5
+            plant_data.append(
                 [
-                    "Utilization Rate",
-                    f"{budget_stats['utilization_rate']:.1f}%",
-                ],
-            ]
-
-            budget_table = Table(budget_data, colWidths=[3 * inch, 1.5 * inch])
-            budget_table.setStyle(
-                TableStyle(
-                    [
-                        (
-                            "BACKGROUND",
-                            (0, 0),
-                            (-1, 0),
-                            colors.HexColor("#2D5016"),
-                        ),
-                        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                        ("FONTSIZE", (0, 0), (-1, 0), 12),
-                        ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                        ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                        ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                    ]
-                )
-            )
-            story.append(budget_table)
-            story.append(Spacer(1, 20))
-
-        # Top clients
-        if data["top_clients"]:
-            story.append(Paragraph("Top Clients by Project Count", styles["Heading2"]))
-            client_data = [["Client", "Type", "Projects", "Total Budget (€)"]]
-            for client in data["top_clients"][:5]:  # Top 5
-                client_data.append(
-                    [
-                        client["name"],
-                        client["client_type"] or "-",
-                        str(client["project_count"]),
-                        (f"€{client['total_budget']:,.2f}" if client["total_budget"] else "€0.00"),
-                    ]
-                )
-
-            client_table = Table(
-                client_data,
-                colWidths=[1.5 * inch, 1.5 * inch, 1 * inch, 1.5 * inch],
-            )
-            client_table.setStyle(
-                TableStyle(
-                    [
-                        (
-                            "BACKGROUND",
-                            (0, 0),
-                            (-1, 0),
-                            colors.HexColor("#2D5016"),
-                        ),
-                        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                        ("FONTSIZE", (0, 0), (-1, 0), 10),
-                        ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                        ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                        ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                    ]
-                )
-            )
-            story.append(client_table)
-            story.append(Spacer(1, 20))
-
-        # Most used plants
-        if data["plant_usage"]:
-            story.append(Paragraph("Most Used Plants", styles["Heading2"]))
-            plant_data = [["Plant Name", "Common Name", "Projects"]]
-            for plant in data["plant_usage"][:5]:  # Top 5
-                plant_data.append(
-                    [
-                        plant["name"],
-                        plant["common_name"] or "-",
-                        str(plant["project_count"]),
-                    ]
-                )
-
-            plant_table = Table(plant_data, colWidths=[2 * inch, 2 * inch, 1 * inch])
-            plant_table.setStyle(
-                TableStyle(
-                    [
-                        (
-                            "BACKGROUND",
-                            (0, 0),
-                            (-1, 0),
-                            colors.HexColor("#2D5016"),
-                        ),
-                        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                        ("FONTSIZE", (0, 0), (-1, 0), 10),
-                        ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                        ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                        ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                    ]
-                )
+                    plant["name"],
+                    plant["common_name"] or "-",
+                    str(plant["project_count"]),
+                ]
             )
-            story.append(plant_table)
 
-        doc.build(story)
-        buffer.seek(0)
+        plant_table = Table(plant_data, colWidths=[2 * inch, 2 * inch, 1 * inch])
+        plant_table.setStyle(BRAND_TABLE_STYLE_MEDIUM)
+        story.append(plant_table)
 
-        return send_file(
-            buffer,
-            as_attachment=True,
-            download_name=(f'business_summary_{datetime.now(UTC).strftime("%Y%m%d")}.pdf'),
-            mimetype="application/pdf",
-        )
-
-    except Exception:
-        logging.exception("Error generating business summary PDF")
-        return jsonify({"error": "Failed to generate PDF report. Please try again later."}), 500
+    doc.build(story)
+    return buffer.getvalue()
 
 
 @reports_bp.route("/api/reports/project/<int:project_id>", methods=["GET"])
@@ -398,38 +329,35 @@ def generate_project_report(project_id):
     try:
         format_type = request.args.get("format", "json")  # json or pdf
 
-        project = db.session.get(Project, project_id)
+        project = load_project_report(project_id)
         if not project:
             return jsonify({"error": "Project not found"}), 404
 
-        # Get project plants with details
-        plants_data = []
-        for project_plant in project.project_plants:
-            plant = project_plant.plant
-            if plant:
-                plants_data.append(
-                    {
-                        "name": plant.name,
-                        "common_name": plant.common_name,
-                        "category": plant.category,
-                        "sun_requirements": plant.sun_requirements,
-                        "water_needs": plant.water_needs,
-                        "hardiness_zone": plant.hardiness_zone,
-                        "height_max": plant.height_max,
-                        "width_max": plant.width_max,
-                        "bloom_time": plant.bloom_time,
-                        "bloom_color": plant.bloom_color,
-                        "maintenance": plant.maintenance,
-                        "quantity": project_plant.quantity,
-                        "unit_cost": project_plant.unit_cost,
-                    }
-                )
+        plants_data = [
+            {
+                "name": plant.name,
+                "common_name": plant.common_name,
+                "category": plant.category,
+                "sun_requirements": plant.sun_requirements,
+                "water_needs": plant.water_needs,
+                "hardiness_zone": plant.hardiness_zone,
+                "height_max": plant.height_max,
+                "width_max": plant.width_max,
+                "bloom_time": plant.bloom_time,
+                "bloom_color": plant.bloom_color,
+                "maintenance": plant.maintenance,
+                "quantity": plant.quantity,
+                "unit_cost": plant.unit_cost,
+            }
+            for plant in project.plants
+        ]
 
         # Get project products with details - disabled as no direct
         # Product-Project relationship
         products_data = []
         total_product_cost = 0
 
+        client = project.client
         report_data = {
             "generated_at": datetime.now(UTC).isoformat(),
             "project": {
@@ -441,19 +369,19 @@ def generate_project_report(project_id):
                 "spent": 0,  # No spent field in current model
                 "location": project.location,
                 "area_size": (float(project.area_size) if project.area_size else 0),
-                "start_date": (project.start_date.isoformat() if project.start_date else None),
-                "end_date": (project.end_date.isoformat() if project.end_date else None),
+                "start_date": project.start_date,
+                "end_date": project.end_date,
                 "notes": project.notes,
-                "created_at": (project.created_at.isoformat() if project.created_at else None),
+                "created_at": project.created_at,
             },
             "client": {
-                "name": project.client.name if project.client else "Unknown",
-                "email": project.client.email if project.client else "",
-                "phone": project.client.phone if project.client else "",
-                "client_type": project.client.client_type if project.client else "",
-                "address": project.client.address if project.client else "",
-                "city": project.client.city if project.client else "",
-                "postal_code": project.client.postal_code if project.client else "",
+                "name": client.name if client else "Unknown",
+                "email": client.email if client else "",
+                "phone": client.phone if client else "",
+                "client_type": client.client_type if client else "",
+                "address": client.address if client else "",
+                "city": client.city if client else "",
+                "postal_code": client.postal_code if client else "",
             },
             "plants": plants_data,
             "products": products_data,
@@ -466,7 +394,7 @@ def generate_project_report(project_id):
         }
 
         if format_type == "pdf":
-            return generate_project_report_pdf(report_data)
+            return generate_project_report_pdf(report_data, cache_tags=project_tags(project.id, project.client_id))
 
         return jsonify(report_data)
 
@@ -474,345 +402,267 @@ def generate_project_report(project_id):
         return jsonify({"error": str(e)}), 500
 
 
-def generate_project_report_pdf(data):
+def generate_project_report_pdf(data, cache_tags=()):
     """Generate PDF version of project report"""
     try:
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4)
-        styles = getSampleStyleSheet()
-        story = []
+        project_name = data["project"]["name"].replace(" ", "_")
+        job = pdf_renderer.render(
+            render_project_report_pdf,
+            data,
+            filename=f'project_{project_name}_{datetime.now(UTC).strftime("%Y%m%d")}.pdf',
+            wait=render_wait(request.args),
+            cache_tags=cache_tags,
+        )
+        return pdf_job_response(job)
 
-        project = data["project"]
-        client = data["client"]
+    except PDFRenderBusyError as e:
+        return jsonify(e.to_dict()), e.status_code
+    except Exception as e:
+        return jsonify({"error": f"PDF generation failed: {e!s}"}), 500
 
-        # Title
-        title_style = ParagraphStyle(
-            "CustomTitle",
-            parent=styles["Heading1"],
-            fontSize=20,
-            spaceAfter=30,
-            textColor=colors.HexColor("#2D5016"),
-        )
-        story.append(Paragraph(f"Project Report: {project['name']}", title_style))
-        story.append(Spacer(1, 20))
 
-        # Project details
-        story.append(Paragraph("Project Information", styles["Heading2"]))
-        project_data = [
-            ["Field", "Value"],
-            ["Project Name", project["name"]],
-            ["Status", project["status"].replace("_", " ").title()],
-            ["Location", project["location"] or "-"],
-            [
-                "Area Size",
-                f"{project['area_size']} m²" if project["area_size"] else "-",
-            ],
-            [
-                "Budget",
-                f"€{project['budget']:,.2f}" if project["budget"] else "-",
-            ],
-            [
-                "Spent",
-                f"€{project['spent']:,.2f}" if project["spent"] else "-",
-            ],
-            [
-                "Start Date",
-                project["start_date"][:10] if project["start_date"] else "-",
-            ],
-            [
-                "End Date",
-                project["end_date"][:10] if project["end_date"] else "-",
-            ],
-        ]
+def render_project_report_pdf(data) -> bytes:
+    """Render the project report to PDF bytes"""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    styles = STYLES
+    story = []
+
+    project = data["project"]
+    client = data["client"]
+
+    # Title
+    story.append(Paragraph(f"Project Report: {project['name']}", styles["ProjectReportTitle"]))
+    story.append(Spacer(1, 20))
+
+    # Project details
+    story.append(Paragraph("Project Information", styles["Heading2"]))
+    project_data = [
+        ["Field", "Value"],
+        ["Project Name", project["name"]],
+        ["Status", project["status"].replace("_", " ").title()],
+        ["Location", project["location"] or "-"],
+        [
+            "Area Size",
+            f"{project['area_size']} m²" if project["area_size"] else "-",
+        ],
+        [
+            "Budget",
+            f"€{project['budget']:,.2f}" if project["budget"] else "-",
+        ],
+        [
+            "Spent",
+            f"€{project['spent']:,.2f}" if project["spent"] else "-",
+        ],
+        [
+            "Start Date",
+            project["start_date"][:10] if project["start_date"] else "-",
+        ],
+        [
+            "End Date",
+            project["end_date"][:10] if project["end_date"] else "-",
+        ],
+    ]
 
-        project_table = Table(project_data, colWidths=[2 * inch, 3 * inch])
-        project_table.setStyle(
-            TableStyle(
+    project_table = Table(project_data, colWidths=[2 * inch, 3 * inch])
+    project_table.setStyle(BRAND_TABLE_STYLE)
+    story.append(project_table)
+    story.append(Spacer(1, 20))
+
+    # Client information
+    story.append(Paragraph("Client Information", styles["Heading2"]))
+    client_data = [
+        ["Field", "Value"],
+        ["Name", client["name"]],
+        ["Type", client["client_type"] or "-"],
+        ["Email", client["email"]],
+        ["Phone", client["phone"] or "-"],
+        ["Address", client["address"] or "-"],
+        ["City", client["city"] or "-"],
+        ["Postal Code", client["postal_code"] or "-"],
+    ]
+
+    client_table = Table(client_data, colWidths=[2 * inch, 3 * inch])
+    client_table.setStyle(BRAND_TABLE_STYLE)
+    story.append(client_table)
+    story.append(Spacer(1, 20))
+
+    # Plants list
+    if data["plants"]:
+        story.append(Paragraph("Plant List", styles["Heading2"]))
+        plant_data = [["Plant Name", "Common Name", "Category", "Sun", "Water"]]
+        for plant in data["plants"]:
+            plant_data.append(
                 [
-                    (
-                        "BACKGROUND",
-                        (0, 0),
-                        (-1, 0),
-                        colors.HexColor("#2D5016"),
-                    ),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("FONTSIZE", (0, 0), (-1, 0), 12),
-                    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                    ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                    ("GRID", (0, 0), (-1, -1), 1, colors.black),
+                    plant["name"],
+                    plant["common_name"] or "-",
+                    plant["category"] or "-",
+                    plant["sun_requirements"] or "-",
+                    plant["water_needs"] or "-",
                 ]
             )
+
+        plant_table = Table(
+            plant_data,
+            colWidths=[
+                1.5 * inch,
+                1.5 * inch,
+                1 * inch,
+                0.8 * inch,
+                0.8 * inch,
+            ],
         )
-        story.append(project_table)
+        plant_table.setStyle(BRAND_TABLE_STYLE_SMALL)
+        story.append(plant_table)
         story.append(Spacer(1, 20))
 
-        # Client information
-        story.append(Paragraph("Client Information", styles["Heading2"]))
-        client_data = [
-            ["Field", "Value"],
-            ["Name", client["name"]],
-            ["Type", client["client_type"] or "-"],
-            ["Email", client["email"]],
-            ["Phone", client["phone"] or "-"],
-            ["Address", client["address"] or "-"],
-            ["City", client["city"] or "-"],
-            ["Postal Code", client["postal_code"] or "-"],
-        ]
-
-        client_table = Table(client_data, colWidths=[2 * inch, 3 * inch])
-        client_table.setStyle(
-            TableStyle(
+    # Products list
+    if data["products"]:
+        story.append(Paragraph("Product List", styles["Heading2"]))
+        product_data = [["Product Name", "Category", "Price (€)", "Supplier"]]
+        for product in data["products"]:
+            product_data.append(
                 [
-                    (
-                        "BACKGROUND",
-                        (0, 0),
-                        (-1, 0),
-                        colors.HexColor("#2D5016"),
-                    ),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("FONTSIZE", (0, 0), (-1, 0), 12),
-                    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                    ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                    ("GRID", (0, 0), (-1, -1), 1, colors.black),
+                    product["name"],
+                    product["category"] or "-",
+                    (f"€{product['price']:,.2f}" if product["price"] else "-"),
+                    product["supplier_name"] or "-",
                 ]
             )
+
+        product_table = Table(
+            product_data,
+            colWidths=[2 * inch, 1.2 * inch, 1 * inch, 1.3 * inch],
         )
-        story.append(client_table)
+        product_table.setStyle(BRAND_TABLE_STYLE_MEDIUM)
+        story.append(product_table)
         story.append(Spacer(1, 20))
 
-        # Plants list
-        if data["plants"]:
-            story.append(Paragraph("Plant List", styles["Heading2"]))
-            plant_data = [["Plant Name", "Common Name", "Category", "Sun", "Water"]]
-            for plant in data["plants"]:
-                plant_data.append(
-                    [
-                        plant["name"],
-                        plant["common_name"] or "-",
-                        plant["category"] or "-",
-                        plant["sun_requirements"] or "-",
-                        plant["water_needs"] or "-",
-                    ]
-                )
-
-            plant_table = Table(
-                plant_data,
-                colWidths=[
-                    1.5 * inch,
-                    1.5 * inch,
-                    1 * inch,
-                    0.8 * inch,
-                    0.8 * inch,
-                ],
-            )
-            plant_table.setStyle(
-                TableStyle(
-                    [
-                        (
-                            "BACKGROUND",
-                            (0, 0),
-                            (-1, 0),
-                            colors.HexColor("#2D5016"),
-                        ),
-                        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                        ("FONTSIZE", (0, 0), (-1, 0), 9),
-                        ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                        ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                        ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                    ]
-                )
-            )
-            story.append(plant_table)
-            story.append(Spacer(1, 20))
-
-        # Products list
-        if data["products"]:
-            story.append(Paragraph("Product List", styles["Heading2"]))
-            product_data = [["Product Name", "Category", "Price (€)", "Supplier"]]
-            for product in data["products"]:
-                product_data.append(
-                    [
-                        product["name"],
-                        product["category"] or "-",
-                        (f"€{product['price']:,.2f}" if product["price"] else "-"),
-                        product["supplier_name"] or "-",
-                    ]
-                )
-
-            product_table = Table(
-                product_data,
-                colWidths=[2 * inch, 1.2 * inch, 1 * inch, 1.3 * inch],
-            )
-            product_table.setStyle(
-                TableStyle(
-                    [
-                        (
-                            "BACKGROUND",
-                            (0, 0),
-                            (-1, 0),
-                            colors.HexColor("#2D5016"),
-                        ),
-                        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                        ("FONTSIZE", (0, 0), (-1, 0), 10),
-                        ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                        ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                        ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                    ]
-                )
-            )
-            story.append(product_table)
-            story.append(Spacer(1, 20))
-
-        # Project description and notes
-        if project["description"]:
-            story.append(Paragraph("Project Description", styles["Heading2"]))
-            story.append(Paragraph(project["description"], styles["Normal"]))
-            story.append(Spacer(1, 20))
-
-        if project["notes"]:
-            story.append(Paragraph("Project Notes", styles["Heading2"]))
-            story.append(Paragraph(project["notes"], styles["Normal"]))
+    # Project description and notes
+    if project["description"]:
+        story.append(Paragraph("Project Description", styles["Heading2"]))
+        story.append(Paragraph(project["description"], styles["Normal"]))
+        story.append(Spacer(1, 20))
 
-        doc.build(story)
-        buffer.seek(0)
+    if project["notes"]:
+        story.append(Paragraph("Project Notes", styles["Heading2"]))
+        story.append(Paragraph(project["notes"], styles["Normal"]))
 
-        return send_file(
-            buffer,
-            as_attachment=True,
-            download_name=(
-                f'project_{project["name"].replace(" ", "_")}_' f'{datetime.now(UTC).strftime("%Y%m%d")}.pdf'
-            ),
-            mimetype="application/pdf",
-        )
-
-    except Exception as e:
-        return jsonify({"error": f"PDF generation failed: {e!s}"}), 500
+    doc.build(story)
+    return buffer.getvalue()
 
 
 @reports_bp.route("/api/reports/plant-usage", methods=["GET"])
 def generate_plant_usage_report():
     """Generate plant usage statistics report"""
     try:
-        # Get plant usage statistics
-        plant_usage = (
-            db.session.query(
-                Plant.name,
-                Plant.common_name,
-                Plant.category,
-                db.func.count(db.distinct(ProjectPlant.project_id)).label("project_count"),
-            )
-            .join(ProjectPlant, Plant.id == ProjectPlant.plant_id)
-            .group_by(Plant.id, Plant.name, Plant.common_name, Plant.category)
-            .order_by(db.desc("project_count"))
-            .all()
-        )
+        return jsonify(pregenerated_report("plant_usage") or build_plant_usage_report())
 
-        usage_data = []
-        for name, common_name, category, count in plant_usage:
-            usage_data.append(
-                {
-                    "name": name,
-                    "common_name": common_name,
-                    "category": category,
-                    "project_count": count,
-                }
-            )
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
-        # Category distribution
-        category_stats = (
-            db.session.query(
-                Plant.category,
-                db.func.count(db.distinct(ProjectPlant.project_id)).label("project_count"),
-            )
-            .join(ProjectPlant, Plant.id == ProjectPlant.plant_id)
-            .filter(Plant.category.isnot(None))
-            .group_by(Plant.category)
-            .order_by(db.desc("project_count"))
-            .all()
-        )
 
-        category_distribution = dict(category_stats)
+def build_plant_usage_report():
+    """Plant usage report data"""
+    # Get plant usage statistics
+    plant_usage = (
+        db.session.query(
+            Plant.name,
+            Plant.common_name,
+            Plant.category,
+            db.func.count(db.distinct(ProjectPlant.project_id)).label("project_count"),
+        )
+        .join(ProjectPlant, Plant.id == ProjectPlant.plant_id)
+        .group_by(Plant.id, Plant.name, Plant.common_name, Plant.category)
+        .order_by(db.desc("project_count"))
+        .all()
+    )
 
-        return jsonify(
+    usage_data = []
+    for name, common_name, category, count in plant_usage:
+        usage_data.append(
             {
-                "generated_at": datetime.now(UTC).isoformat(),
-                "plant_usage": usage_data,
-                "category_distribution": category_distribution,
-                "total_unique_plants": len(usage_data),
-                "most_popular_plant": usage_data[0] if usage_data else None,
+                "name": name,
+                "common_name": common_name,
+                "category": category,
+                "project_count": count,
             }
         )
 
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    # Category distribution
+    category_stats = (
+        db.session.query(
+            Plant.category,
+            db.func.count(db.distinct(ProjectPlant.project_id)).label("project_count"),
+        )
+        .join(ProjectPlant, Plant.id == ProjectPlant.plant_id)
+        .filter(Plant.category.isnot(None))
+        .group_by(Plant.category)
+        .order_by(db.desc("project_count"))
+        .all()
+    )
+
+    category_distribution = dict(category_stats)
+
+    return {
+        "generated_at": datetime.now(UTC).isoformat(),
+        "plant_usage": usage_data,
+        "category_distribution": category_distribution,
+        "total_unique_plants": len(usage_data),
+        "most_popular_plant": usage_data[0] if usage_data else None,
+    }
 
 
 @reports_bp.route("/api/reports/supplier-performance", methods=["GET"])
 def generate_supplier_performance_report():
     """Generate supplier performance report"""
     try:
-        # Get supplier statistics
-        supplier_stats = (
-            db.session.query(
-                Supplier.name,
-                Supplier.contact_person,
-                Supplier.email,
-                db.func.count(db.distinct(Product.id)).label("product_count"),
-                db.func.count(db.distinct(Project.id)).label("project_count"),
-            )
-            .outerjoin(Product, Supplier.id == Product.supplier_id)
-            .outerjoin(Plant, Supplier.id == Plant.supplier_id)
-            .outerjoin(ProjectPlant, Plant.id == ProjectPlant.plant_id)
-            .outerjoin(Project, ProjectPlant.project_id == Project.id)
-            .group_by(
-                Supplier.id,
-                Supplier.name,
-                Supplier.contact_person,
-                Supplier.email,
-            )
-            .order_by(db.desc("product_count"))
-            .all()
-        )
-
-        supplier_data = []
-        for (
-            name,
-            contact,
-            email,
-            product_count,
-            project_count,
-        ) in supplier_stats:
-            supplier_data.append(
-                {
-                    "name": name,
-                    "contact_person": contact,
-                    "email": email,
-                    "product_count": product_count,
-                    "project_count": project_count or 0,
-                }
-            )
-
-        return jsonify(
-            {
-                "generated_at": datetime.now(UTC).isoformat(),
-                "suppliers": supplier_data,
-                "total_suppliers": len(supplier_data),
-                "top_supplier": supplier_data[0] if supplier_data else None,
-            }
-        )
+        return jsonify(pregenerated_report("supplier_performance") or build_supplier_performance_report())
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+def build_supplier_performance_report():
+    """Supplier performance report data, read from the supplier metrics"""
+    refresh_supplier_metrics()
+    supplier_stats = db.session.execute(
+        select(Supplier.name, Supplier.contact_person, Supplier.email, SupplierMetrics)
+        .join(SupplierMetrics, SupplierMetrics.supplier_id == Supplier.id)
+        .order_by(SupplierMetrics.product_count.desc(), Supplier.id)
+    ).all()
+    total_revenue = sum(metrics.revenue for *_, metrics in supplier_stats)
+
+    supplier_data = [
+        {
+            "name": name,
+            "contact_person": contact,
+            "email": email,
+            "product_count": metrics.product_count,
+            "plant_count": metrics.plant_count,
+            "project_count": metrics.project_count,
+            "total_quantity": metrics.total_quantity,
+            "revenue": metrics.revenue,
+            "revenue_share": round(metrics.revenue / total_revenue * 100, 2) if total_revenue else 0,
+        }
+        for name, contact, email, metrics in supplier_stats
+    ]
+
+    return {
+        "generated_at": datetime.now(UTC).isoformat(),
+        "suppliers": supplier_data,
+        "total_suppliers": len(supplier_data),
+        "top_supplier": supplier_data[0] if supplier_data else None,
+    }
+
+
+@reports_bp.route("/api/reports/scheduled", methods=["GET"])
+@login_required
+def get_scheduled_reports():
+    """Auto-generation schedule and the pre-generated reports with their generation timings"""
+    return jsonify(scheduled_report_status())
+
+
 @reports_bp.route("/api/reports/generate-pdf", methods=["POST"])
 @login_required
 def generate_comprehensive_pdf():
@@ -820,120 +670,111 @@ def generate_comprehensive_pdf():
     try:
         data = request.get_json()
         report_type = data.get("type", "overview")
-        date_range = data.get("dateRange", {})
+        # The render time travels with the date range so that the PDF cache key covers its date
+        date_range = {**(data.get("dateRange") or {}), "generated_at": datetime.now().isoformat()}
         report_data = data.get("data", {})
         language = data.get("language", "en")
 
-        # Translations for Dutch reports
-        translations = {
-            "en": {
-                "title": "Landscape Architecture Report",
-                "generated_on": "Generated on",
-                "date_range": "Date Range",
-                "overview": "Business Overview",
-                "clients": "Client Analysis",
-                "projects": "Project Performance",
-                "plants": "Plant Analytics",
-                "financial": "Financial Summary",
-                "total_projects": "Total Projects",
-                "total_clients": "Total Clients",
-                "total_plants": "Total Plants",
-                "total_budget": "Total Budget",
-                "average_budget": "Average Budget",
-                "project_status": "Project Status Distribution",
-                "top_clients": "Top Clients",
-                "plant_categories": "Plant Category Distribution",
-                "monthly_revenue": "Monthly Revenue",
-                "page": "Page",
-            },
-            "nl": {
-                "title": "Landschapsarchitectuur Rapport",
-                "generated_on": "Gegenereerd op",
-                "date_range": "Datumbereik",
-                "overview": "Bedrijfsoverzicht",
-                "clients": "Klantanalyse",
-                "projects": "Projectprestaties",
-                "plants": "Plant Analytics",
-                "financial": "Financieel Overzicht",
-                "total_projects": "Totaal Projecten",
-                "total_clients": "Totaal Klanten",
-                "total_plants": "Totaal Planten",
-                "total_budget": "Totaal Budget",
-                "average_budget": "Gemiddeld Budget",
-                "project_status": "Project Status Verdeling",
-                "top_clients": "Top Klanten",
-                "plant_categories": "Plant Categorie Verdeling",
-                "monthly_revenue": "Maandelijkse Omzet",
-                "page": "Pagina",
-            },
-        }
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"landscape_report_{report_type}_{timestamp}.pdf"
+        sections = report_sections(report_type, data.get("sections"))
+        if len(sections) > 1 and can_merge_sections():
+            # Sections render in parallel as separate PDFs and are merged in order
+            job = pdf_renderer.render_sections(
+                render_comprehensive_section,
+                [
+                    (section, (report_type, section, date_range, report_data.get(section, {}), language, index == 0))
+                    for index, section in enumerate(sections)
+                ],
+                filename=filename,
+                wait=render_wait(request.args),
+            )
+        else:
+            job = pdf_renderer.render(
+                render_comprehensive_pdf,
+                report_type,
+                date_range,
+                report_data,
+                language,
+                sections,
+                filename=filename,
+                wait=render_wait(request.args),
+            )
+        return pdf_job_response(job)
+
+    except PDFRenderBusyError as e:
+        return jsonify(e.to_dict()), e.status_code
+    except Exception as e:
+        logging.error(f"Error generating PDF report: {e!s}")
+        return jsonify({"error": str(e)}), 500
 
-        t = translations.get(language, translations["en"])
-
-        # Create PDF buffer
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-
-        # Get styles
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            "CustomTitle",
-            parent=styles["Heading1"],
-            fontSize=24,
-            spaceAfter=30,
-            textColor=colors.HexColor("#10b981"),
-            alignment=1,  # Center alignment
-        )
 
-        # Build PDF content
-        story = []
+def report_sections(report_type, requested=None):
+    """
+    Sections of a comprehensive report.
 
-        # Title
-        report_titles = {
-            "overview": t["overview"],
-            "clients": t["clients"],
-            "projects": t["projects"],
-            "plants": t["plants"],
-            "financial": t["financial"],
-        }
+    A single report type is one section; ``"comprehensive"`` covers all
+    sections, or the ``requested`` ones in the requested order.
+    """
+    if report_type != COMPREHENSIVE_REPORT:
+        return [report_type]
+    return [section for section in (requested or SECTION_CONTENT) if section in SECTION_CONTENT]
 
-        title = f"{t['title']} - {report_titles.get(report_type, t['overview'])}"
-        story.append(Paragraph(title, title_style))
+
+def _section_story(report_type, section, date_range, data, t, first):
+    styles = STYLES
+    story = []
+    if first:
+        # Title
+        known_type = report_type == COMPREHENSIVE_REPORT or report_type in SECTION_CONTENT
+        title = f"{t['title']} - {t[report_type] if known_type else t['overview']}"
+        story.append(Paragraph(title, styles["ComprehensiveReportTitle"]))
         story.append(Spacer(1, 20))
 
         # Generation info
-        generation_info = f"{t['generated_on']}: {datetime.now().strftime('%d-%m-%Y %H:%M')}"
+        generated_at = (
+            datetime.fromisoformat(date_range["generated_at"]) if "generated_at" in date_range else datetime.now()
+        )
+        generation_info = f"{t['generated_on']}: {generated_at.strftime('%d-%m-%Y %H:%M')}"
         if date_range.get("start") and date_range.get("end"):
             generation_info += f"<br/>{t['date_range']}: {date_range['start']} - {date_range['end']}"
 
         story.append(Paragraph(generation_info, styles["Normal"]))
         story.append(Spacer(1, 30))
 
-        # Report-specific content
-        if report_type == "overview":
-            story.extend(generate_overview_pdf_content(report_data, t, styles))
-        elif report_type == "clients":
-            story.extend(generate_clients_pdf_content(report_data, t, styles))
-        elif report_type == "projects":
-            story.extend(generate_projects_pdf_content(report_data, t, styles))
-        elif report_type == "plants":
-            story.extend(generate_plants_pdf_content(report_data, t, styles))
-        elif report_type == "financial":
-            story.extend(generate_financial_pdf_content(report_data, t, styles))
-
-        # Build PDF
-        doc.build(story)
-        buffer.seek(0)
-
-        # Generate filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"landscape_report_{report_type}_{timestamp}.pdf"
+    if report_type == COMPREHENSIVE_REPORT:
+        story.append(Paragraph(t[section], styles["Heading1"]))
+        story.append(Spacer(1, 12))
 
-        return send_file(buffer, as_attachment=True, download_name=filename, mimetype="application/pdf")
+    # Report-specific content
+    content = SECTION_CONTENT.get(section)
+    if content:
+        story.extend(content(data, t, styles))
+    return story
+
+
+def _build_pdf(story) -> bytes:
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
+    doc.build(story)
+    return buffer.getvalue()
 
-    except Exception as e:
-        logging.error(f"Error generating PDF report: {e!s}")
-        return jsonify({"error": str(e)}), 500
+
+def render_comprehensive_pdf(report_type, date_range, report_data, language, sections=None) -> bytes:
+    """Render a comprehensive report to PDF bytes, each section of a comprehensive report on new pages"""
+    t = report_translations(language)
+    story = []
+    for index, section in enumerate(sections or report_sections(report_type)):
+        if index:
+            story.append(PageBreak())
+        data = report_data.get(section, {}) if report_type == COMPREHENSIVE_REPORT else report_data
+        story.extend(_section_story(report_type, section, date_range, data, t, first=index == 0))
+    return _build_pdf(story)
+
+
+def render_comprehensive_section(report_type, section, date_range, data, language, first) -> bytes:
+    """Render one section of a comprehensive report as a PDF of its own (merged by the render pool)"""
+    return _build_pdf(_section_story(report_type, section, date_range, data, report_translations(language), first))
 
 
 def generate_overview_pdf_content(data, t, styles):
@@ -954,20 +795,7 @@ def generate_overview_pdf_content(data, t, styles):
         ]
 
         stats_table = Table(stats_data, colWidths=[3 * inch, 2 * inch])
-        stats_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#f3f4f6")),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
-                    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("FONTSIZE", (0, 0), (-1, 0), 12),
-                    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                    ("BACKGROUND", (0, 1), (-1, -1), colors.white),
-                    ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                ]
-            )
-        )
+        stats_table.setStyle(STATS_TABLE_STYLE)
 
         content.append(stats_table)
         content.append(Spacer(1, 20))
@@ -981,20 +809,7 @@ def generate_overview_pdf_content(data, t, styles):
             client_data.append([client.get("name", ""), client.get("email", ""), client.get("city", "")])
 
         client_table = Table(client_data, colWidths=[2 * inch, 2.5 * inch, 1.5 * inch])
-        client_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#10b981")),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("FONTSIZE", (0, 0), (-1, 0), 10),
-                    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                    ("BACKGROUND", (0, 1), (-1, -1), colors.white),
-                    ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                ]
-            )
-        )
+        client_table.setStyle(ACCENT_TABLE_STYLE)
 
         content.append(client_table)
         content.append(Spacer(1, 20))
@@ -1021,21 +836,7 @@ def generate_clients_pdf_content(data, t, styles):
             )
 
         client_table = Table(client_data, colWidths=[2 * inch, 2 * inch, 1 * inch, 1.5 * inch])
-        client_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#10b981")),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                    ("ALIGN", (2, 0), (-1, -1), "RIGHT"),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("FONTSIZE", (0, 0), (-1, 0), 10),
-                    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                    ("BACKGROUND", (0, 1), (-1, -1), colors.white),
-                    ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                ]
-            )
-        )
+        client_table.setStyle(ACCENT_CLIENTS_TABLE_STYLE)
 
         content.append(client_table)
         content.append(Spacer(1, 20))
@@ -1057,21 +858,7 @@ def generate_projects_pdf_content(data, t, styles):
     ]
 
     stats_table = Table(project_stats, colWidths=[3 * inch, 2 * inch])
-    stats_table.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#f3f4f6")),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
-                ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                ("ALIGN", (1, 0), (-1, -1), "RIGHT"),
-                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ("FONTSIZE", (0, 0), (-1, 0), 12),
-                ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                ("BACKGROUND", (0, 1), (-1, -1), colors.white),
-                ("GRID", (0, 0), (-1, -1), 1, colors.black),
-            ]
-        )
-    )
+    stats_table.setStyle(STATS_AMOUNTS_TABLE_STYLE)
 
     content.append(stats_table)
     content.append(Spacer(1, 20))
@@ -1085,21 +872,7 @@ def generate_projects_pdf_content(data, t, styles):
             status_data.append([status.get("name", ""), str(status.get("value", 0))])
 
         status_table = Table(status_data, colWidths=[3 * inch, 2 * inch])
-        status_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#10b981")),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                    ("ALIGN", (1, 0), (-1, -1), "RIGHT"),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("FONTSIZE", (0, 0), (-1, 0), 10),
-                    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                    ("BACKGROUND", (0, 1), (-1, -1), colors.white),
-                    ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                ]
-            )
-        )
+        status_table.setStyle(ACCENT_AMOUNTS_TABLE_STYLE)
 
         content.append(status_table)
         content.append(Spacer(1, 20))
@@ -1121,21 +894,7 @@ def generate_plants_pdf_content(data, t, styles):
     ]
 
     stats_table = Table(plant_stats, colWidths=[3 * inch, 2 * inch])
-    stats_table.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#f3f4f6")),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
-                ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                ("ALIGN", (1, 0), (-1, -1), "RIGHT"),
-                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ("FONTSIZE", (0, 0), (-1, 0), 12),
-                ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                ("BACKGROUND", (0, 1), (-1, -1), colors.white),
-                ("GRID", (0, 0), (-1, -1), 1, colors.black),
-            ]
-        )
-    )
+    stats_table.setStyle(STATS_AMOUNTS_TABLE_STYLE)
 
     content.append(stats_table)
     content.append(Spacer(1, 20))
@@ -1149,21 +908,7 @@ def generate_plants_pdf_content(data, t, styles):
             category_data.append([category.get("name", ""), str(category.get("value", 0))])
 
         category_table = Table(category_data, colWidths=[3 * inch, 2 * inch])
-        category_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#10b981")),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                    ("ALIGN", (1, 0), (-1, -1), "RIGHT"),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("FONTSIZE", (0, 0), (-1, 0), 10),
-                    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                    ("BACKGROUND", (0, 1), (-1, -1), colors.white),
-                    ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                ]
-            )
-        )
+        category_table.setStyle(ACCENT_AMOUNTS_TABLE_STYLE)
 
         content.append(category_table)
         content.append(Spacer(1, 20))
@@ -1185,21 +930,7 @@ def generate_financial_pdf_content(data, t, styles):
     ]
 
     stats_table = Table(financial_stats, colWidths=[3 * inch, 2 * inch])
-    stats_table.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#f3f4f6")),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
-                ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                ("ALIGN", (1, 0), (-1, -1), "RIGHT"),
-                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ("FONTSIZE", (0, 0), (-1, 0), 12),
-                ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                ("BACKGROUND", (0, 1), (-1, -1), colors.white),
-                ("GRID", (0, 0), (-1, -1), 1, colors.black),
-            ]
-        )
-    )
+    stats_table.setStyle(STATS_AMOUNTS_TABLE_STYLE)
 
     content.append(stats_table)
     content.append(Spacer(1, 20))
@@ -1213,23 +944,41 @@ def generate_financial_pdf_content(data, t, styles):
             revenue_data.append([month_data.get("month", ""), f"€{month_data.get('revenue', 0):,.2f}"])
 
         revenue_table = Table(revenue_data, colWidths=[3 * inch, 2 * inch])
-        revenue_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#10b981")),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                    ("ALIGN", (1, 0), (-1, -1), "RIGHT"),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("FONTSIZE", (0, 0), (-1, 0), 10),
-                    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                    ("BACKGROUND", (0, 1), (-1, -1), colors.white),
-                    ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                ]
-            )
-        )
+        revenue_table.setStyle(ACCENT_AMOUNTS_TABLE_STYLE)
 
         content.append(revenue_table)
         content.append(Spacer(1, 20))
 
     return content
+
+
+# Comprehensive report sections, in report order
+COMPREHENSIVE_REPORT = "comprehensive"
+SECTION_CONTENT = {
+    "overview": generate_overview_pdf_content,
+    "clients": generate_clients_pdf_content,
+    "projects": generate_projects_pdf_content,
+    "plants": generate_plants_pdf_content,
+    "financial": generate_financial_pdf_content,
+}
+
+
+# Reports pre-generated according to the auto_generation settings (see src.services.report_scheduler)
+register_report(
+    ScheduledReport(
+        "business_summary",
+        build_business_summary_report,
+        tables=(Client, Plant, Product, Project, ProjectPlant, Supplier),
+        periodic=True,
+        render_pdf=render_business_summary_pdf,
+        pdf_cache_tags=(SUMMARY_TAG,),
+    )
+)
+register_report(ScheduledReport("plant_usage", build_plant_usage_report, tables=(Plant, ProjectPlant)))
+register_report(
+    ScheduledReport(
+        "supplier_performance",
+        build_supplier_performance_report,
+        tables=(Supplier, Product, Plant, ProjectPlant, Project),
+    )
+)
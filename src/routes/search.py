@@ -0,0 +1,34 @@
+"""API route for searching plants, clients, projects and suppliers at once."""
+
+from flask import Blueprint, current_app, jsonify, request
+from flask_cors import cross_origin
+
+from src.services.search import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT, search
+from src.utils.decorators import login_required
+
+search_bp = Blueprint("search", __name__)
+
+
+@search_bp.route("/search", methods=["GET"])
+@cross_origin(supports_credentials=True)
+@login_required
+def search_all():
+    """Search all entity types, e.g. ?q=acer&types=plant,supplier&limit=10"""
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"error": "A search query (q) is required"}), 400
+
+    limit = request.args.get("limit", DEFAULT_SEARCH_LIMIT, type=int)
+    if not 1 <= limit <= MAX_SEARCH_LIMIT:
+        return jsonify({"error": f"limit must be between 1 and {MAX_SEARCH_LIMIT}"}), 400
+    types = [value.strip() for value in request.args.get("types", "").split(",") if value.strip()]
+
+    try:
+        results = search(query, types=types or None, limit=limit)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        current_app.logger.error(f"Error searching for {query!r}: {e!s}")
+        return jsonify({"error": "Search failed"}), 500
+
+    return jsonify({"query": query, "results": results, "count": len(results)})
@@ -3,7 +3,10 @@ from datetime import datetime
 from typing import Any
 
 from src.models.landscape import Client, Plant, Product, Project, Supplier
+from src.models.photo import PhotoCategory
 from src.models.user import db
+from src.services.photo_service import PhotoService
+from src.services.search import matching
 
 logger = logging.getLogger(__name__)
 
@@ -169,11 +172,7 @@ class SupplierService(BaseService):
             query = Supplier.query
 
             if search:
-                query = query.filter(
-                    Supplier.name.contains(search)
-                    | Supplier.contact_person.contains(search)
-                    | Supplier.city.contains(search)
-                )
+                query = query.filter(matching(Supplier, search))
 
             paginated = query.order_by(Supplier.name).paginate(page=page, per_page=per_page, error_out=False)
 
@@ -231,9 +230,7 @@ class PlantService(BaseService):
             query = Plant.query
 
             if search:
-                query = query.filter(
-                    Plant.name.contains(search) | Plant.common_name.contains(search) | Plant.category.contains(search)
-                )
+                query = query.filter(matching(Plant, search))
 
             paginated = query.order_by(Plant.name).paginate(page=page, per_page=per_page, error_out=False)
 
@@ -291,9 +288,7 @@ class ClientService(BaseService):
             query = Client.query
 
             if search:
-                query = query.filter(
-                    Client.name.contains(search) | Client.contact_person.contains(search) | Client.city.contains(search)
-                )
+                query = query.filter(matching(Client, search))
 
             paginated = query.order_by(Client.name).paginate(page=page, per_page=per_page, error_out=False)
 
@@ -329,16 +324,15 @@ class ProjectService(BaseService):
                 query = query.filter(Project.client_id == client_id)
 
             if search:
-                query = query.filter(
-                    Project.name.contains(search)
-                    | Project.description.contains(search)
-                    | Project.location.contains(search)
-                )
+                query = query.filter(matching(Project, search))
 
             paginated = query.order_by(Project.id.desc()).paginate(page=page, per_page=per_page, error_out=False)
+            photos = PhotoService.get_primary_photos(PhotoCategory.PROJECT, [project.id for project in paginated.items])
 
             return {
-                "projects": [project.to_dict() for project in paginated.items],
+                "projects": [
+                    {**project.to_dict(), "primary_photo": photos.get(project.id)} for project in paginated.items
+                ],
                 "total": paginated.total,
                 "pages": paginated.pages,
                 "current_page": page,
@@ -5,9 +5,15 @@ This service provides AI-powered data mapping functionality for Excel imports,
 helping users automatically map columns to database fields and validate data.
 """
 
+import functools
 import json
 import logging
+import math
+import re
+import unicodedata
+from collections import Counter
 
+import numpy as np
 import openai
 import pandas as pd
 
@@ -15,6 +21,58 @@ from src.utils.error_handlers import LandscapeError
 
 logger = logging.getLogger(__name__)
 
+# Header matching configuration
+NGRAM_SIZE = 3
+EXACT_MATCH_CONFIDENCE = 1.0
+CONTAINED_MATCH_CONFIDENCE = 0.7
+MIN_SUGGESTION_CONFIDENCE = 0.45
+FALLBACK_CONFIDENCE = 0.3
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Dutch/English header synonyms per database field
+HEADER_SYNONYMS: dict[str, tuple[str, ...]] = {
+    "name": ("naam", "name", "bedrijf", "company", "leverancier", "bedrijfsnaam", "latijnse naam", "botanical name"),
+    "company": ("bedrijf", "bedrijfsnaam", "company", "firma", "organisatie", "organization"),
+    "common_name": ("nederlandse naam", "common name", "volksnaam", "roepnaam"),
+    "email": ("email", "e-mail", "mail", "emailadres", "e-mailadres"),
+    "phone": ("telefoon", "phone", "tel", "gsm", "mobiel", "telefoonnummer", "phone number"),
+    "address": ("adres", "address", "straat", "street", "straatnaam"),
+    "city": ("stad", "city", "plaats", "woonplaats", "gemeente"),
+    "postal_code": ("postcode", "postal", "zip", "zip code"),
+    "country": ("land", "country"),
+    "contact_person": ("contact", "contactpersoon", "persoon", "contact person"),
+    "description": ("beschrijving", "description", "omschrijving"),
+    "price": ("prijs", "price", "cost", "kosten", "stukprijs", "unit price"),
+    "category": ("categorie", "category", "type", "soort", "groep"),
+    "specialization": ("specialisatie", "specialization", "specialisme", "expertise"),
+    "website": ("website", "web", "url", "site", "internet"),
+    "notes": ("opmerkingen", "notities", "notes", "remarks", "toelichting"),
+    "unit": ("eenheid", "unit", "per"),
+    "sku": ("sku", "artikelnummer", "artikelnr", "article number", "code"),
+    "stock_quantity": ("voorraad", "stock", "aantal op voorraad", "stock quantity"),
+    "weight": ("gewicht", "weight"),
+    "dimensions": ("afmetingen", "dimensions", "maten", "size"),
+    "supplier_id": ("leverancier id", "supplier id", "leverancier nummer"),
+    "height_min": ("min hoogte", "minimale hoogte", "height min", "min height"),
+    "height_max": ("max hoogte", "maximale hoogte", "height max", "max height", "hoogte"),
+    "width_min": ("min breedte", "minimale breedte", "width min", "min width"),
+    "width_max": ("max breedte", "maximale breedte", "width max", "max width", "breedte"),
+    "sun_requirements": ("zon", "standplaats", "lichtbehoefte", "sun", "sun requirements", "light"),
+    "sun_exposure": ("zonligging", "blootstelling", "sun exposure"),
+    "soil_type": ("grondsoort", "bodem", "bodemtype", "soil", "soil type"),
+    "water_needs": ("water", "waterbehoefte", "water needs", "watering"),
+    "hardiness_zone": ("winterhardheid", "hardheidszone", "hardiness", "hardiness zone"),
+    "bloom_time": ("bloeitijd", "bloeiperiode", "bloom time", "flowering"),
+    "bloom_color": ("bloeikleur", "bloemkleur", "bloom color", "flower colour"),
+    "native": ("inheems", "native"),
+    "availability": ("beschikbaarheid", "availability", "leverbaar"),
+    "planting_season": ("plantseizoen", "planttijd", "planting season"),
+    "client_type": ("klanttype", "type klant", "client type", "customer type"),
+    "budget_range": ("budget", "budgetrange", "budget range"),
+    "registration_date": ("registratiedatum", "inschrijfdatum", "registration date"),
+}
+
 
 class AIDataMappingService:
     """AI-powered service for intelligent data mapping during Excel imports."""
@@ -209,76 +267,58 @@ Check for:
             return {"issues": [], "recommendations": [], "quality_score": 0.5}
 
     def _fallback_mapping(self, excel_columns: list[str], target_schema: dict[str, str]) -> dict[str, dict[str, float]]:
-        """Fallback column mapping without AI."""
-        mapping = {}
-
-        # Simple keyword-based matching
-        mapping_rules = {
-            "name": ["naam", "name", "bedrijf", "company", "leverancier"],
-            "email": ["email", "e-mail", "mail"],
-            "phone": ["telefoon", "phone", "tel", "gsm", "mobiel"],
-            "address": ["adres", "address", "straat", "street"],
-            "city": ["stad", "city", "plaats", "woonplaats"],
-            "postal_code": ["postcode", "postal", "zip"],
-            "country": ["land", "country"],
-            "contact_person": ["contact", "contactpersoon", "persoon"],
-            "description": ["beschrijving", "description", "omschrijving"],
-            "price": ["prijs", "price", "cost", "kosten"],
-            "category": ["categorie", "category", "type"],
-        }
-
-        for excel_col in excel_columns:
-            excel_lower = excel_col.lower().strip()
-            suggestions = {}
-
-            for field, keywords in mapping_rules.items():
-                if field in target_schema:
-                    for keyword in keywords:
-                        if keyword in excel_lower:
-                            confidence = 1.0 if keyword == excel_lower else 0.7
-                            suggestions[field] = confidence
-                            break
-
-            if suggestions:
-                mapping[excel_col] = suggestions
-            else:
-                # Default low-confidence mapping to first available field
-                first_field = next(iter(target_schema.keys()))
-                mapping[excel_col] = {first_field: 0.3}
-
-        return mapping
+        """Fallback column mapping without AI, backed by the cached header similarity index."""
+        if not target_schema:
+            return {}
+        cached_mapping = _memoized_mapping(tuple(excel_columns), tuple(target_schema))
+        # Hand out copies so callers can adjust suggestions without poisoning the memo
+        return {column: dict(suggestions) for column, suggestions in cached_mapping.items()}
 
     def _fallback_validation(self, data: pd.DataFrame, column_mapping: dict[str, str]) -> dict[str, list[str]]:
         """Fallback data validation without AI."""
         issues = []
         recommendations = []
 
-        # Basic validation checks
-        for col in column_mapping:
-            if col in data.columns:
-                null_count = data[col].isnull().sum()
-                if null_count > 0:
-                    issues.append(
-                        {
-                            "type": "missing_data",
-                            "column": col,
-                            "suggestion": f"{null_count} empty values found in {col}",
-                        }
-                    )
+        mapped_columns = [col for col in column_mapping if col in data.columns]
+        email_cols = {col for col in mapped_columns if "email" in column_mapping[col].lower()}
 
-        # Email validation
-        email_cols = [col for col, field in column_mapping.items() if "email" in field.lower()]
+        # Basic validation checks, computed column-wise for all plain columns in one pass
+        null_counts = data[[col for col in mapped_columns if col not in email_cols]].isna().sum().to_dict()
+        invalid_email_counts = {}
         for col in email_cols:
-            if col in data.columns:
-                invalid_emails = data[~data[col].str.contains("@", na=False)][col].count()
-                if invalid_emails > 0:
-                    issues.append(
-                        {
-                            "type": "invalid_format",
-                            "column": col,
-                            "suggestion": f"{invalid_emails} invalid email formats in {col}",
-                        }
-                    )
+            # Factorizing yields the null count and lets the "@" check run once per distinct value
+            codes, uniques = pd.factorize(data[col], use_na_sentinel=True)
+            null_counts[col] = int((codes < 0).sum())
+            invalid_uniques = np.fromiter(
+                ("@" not in value if isinstance(value, str) else True for value in uniques),
+                dtype=bool,
+                count=len(uniques),
+            )
+            invalid_emails = np.bincount(codes[codes >= 0], minlength=len(uniques))[invalid_uniques].sum()
+            invalid_email_counts[col] = int(invalid_emails)
+
+        for col in mapped_columns:
+            null_count = null_counts[col]
+            if null_count > 0:
+                issues.append(
+                    {
+                        "type": "missing_data",
+                        "column": col,
+                        "suggestion": f"{null_count} empty values found in {col}",
+                    }
+                )
+
+        # Email validation
+        for col in mapped_columns:
+            invalid_emails = invalid_email_counts.get(col, 0)
+            if invalid_emails > 0:
+                issues.append(
+                    {
+                        "type": "invalid_format",
+                        "column": col,
+                        "suggestion": f"{invalid_emails} invalid email formats in {col}",
+                    }
+                )
 
         recommendations.append("Consider reviewing data for completeness")
         recommendations.append("Verify email addresses and contact information")
@@ -286,5 +326,113 @@ Check for:
         return {"issues": issues, "recommendations": recommendations, "quality_score": 0.7}
 
 
+def normalize_header(header: str) -> str:
+    """Normalize a spreadsheet header: accent-stripped, case-folded, punctuation collapsed to single spaces."""
+    decomposed = unicodedata.normalize("NFKD", str(header))
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(_TOKEN_PATTERN.findall(stripped.casefold()))
+
+
+def _char_ngrams(text: str, size: int = NGRAM_SIZE) -> list[str]:
+    """Return the padded character n-grams of a normalized string."""
+    padded = f" {text} "
+    if len(padded) <= size:
+        return [padded]
+    return [padded[i : i + size] for i in range(len(padded) - size + 1)]
+
+
+class HeaderSimilarityIndex:
+    """
+    Precomputed n-gram index over the terms (field names and synonyms) of a target schema.
+
+    Term vectors are built once per schema; scoring a batch of headers is a single
+    matrix product followed by a per-field maximum over each field's terms.
+    """
+
+    def __init__(self, target_fields: tuple[str, ...]):
+        self.fields = target_fields
+
+        terms: list[str] = []
+        owners: list[int] = []
+        for field_index, field in enumerate(target_fields):
+            field_terms = {normalize_header(field)}
+            field_terms.update(normalize_header(synonym) for synonym in HEADER_SYNONYMS.get(field, ()))
+            for term in sorted(field_terms):
+                if term:
+                    terms.append(term)
+                    owners.append(field_index)
+
+        self.terms = terms
+        self._owners = np.asarray(owners, dtype=np.intp)
+        self._vocabulary: dict[str, int] = {}
+        for term in terms:
+            for gram in _char_ngrams(term):
+                self._vocabulary.setdefault(gram, len(self._vocabulary))
+        self._term_matrix = self._vectorize(terms)
+
+    def _vectorize(self, texts: list[str]) -> np.ndarray:
+        """Build L2-normalized n-gram count vectors; n-grams outside the vocabulary only add to the norm."""
+        matrix = np.zeros((len(texts), len(self._vocabulary)), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts = Counter(_char_ngrams(text))
+            norm = math.sqrt(sum(count * count for count in counts.values()))
+            for gram, count in counts.items():
+                column = self._vocabulary.get(gram)
+                if column is not None:
+                    matrix[row, column] = count / norm
+        return matrix
+
+    def score(self, headers: list[str]) -> np.ndarray:
+        """
+        Score headers against every field.
+
+        Returns:
+            Array of shape (len(headers), len(fields)) with confidences in [0, 1]
+        """
+        normalized = [normalize_header(header) for header in headers]
+        term_scores = self._vectorize(normalized) @ self._term_matrix.T
+
+        # Exact and contained term matches keep the confidence levels of the keyword matcher
+        for row, header in enumerate(normalized):
+            if not header:
+                continue
+            for column, term in enumerate(self.terms):
+                if term == header:
+                    term_scores[row, column] = EXACT_MATCH_CONFIDENCE
+                elif term in header:
+                    term_scores[row, column] = max(term_scores[row, column], CONTAINED_MATCH_CONFIDENCE)
+
+        field_scores = np.zeros((len(headers), len(self.fields)), dtype=np.float32)
+        if self.terms:
+            np.maximum.at(field_scores.T, self._owners, term_scores.T)
+        return field_scores
+
+    def suggest(self, headers: list[str]) -> dict[str, dict[str, float]]:
+        """Suggest field mappings for each header, best match first."""
+        scores = self.score(headers)
+        mapping = {}
+        for row, header in enumerate(headers):
+            candidates = np.flatnonzero(scores[row] >= MIN_SUGGESTION_CONFIDENCE)
+            if candidates.size:
+                ordered = candidates[np.argsort(-scores[row, candidates], kind="stable")]
+                mapping[header] = {self.fields[i]: round(float(scores[row, i]), 2) for i in ordered}
+            else:
+                # Default low-confidence mapping to first available field
+                mapping[header] = {self.fields[0]: FALLBACK_CONFIDENCE}
+        return mapping
+
+
+@functools.lru_cache(maxsize=64)
+def get_header_index(target_fields: tuple[str, ...]) -> HeaderSimilarityIndex:
+    """Return the (cached) similarity index for a target schema."""
+    return HeaderSimilarityIndex(target_fields)
+
+
+@functools.lru_cache(maxsize=256)
+def _memoized_mapping(excel_columns: tuple[str, ...], target_fields: tuple[str, ...]) -> dict[str, dict[str, float]]:
+    """Memoize mappings per header signature; re-uploads of the same template skip scoring entirely."""
+    return get_header_index(target_fields).suggest(list(excel_columns))
+
+
 # Singleton instance
 ai_mapping_service = AIDataMappingService()
@@ -10,46 +10,68 @@ from datetime import datetime
 from sqlalchemy import func
 
 from src.models.landscape import (
+    ROLLUP_UNDATED_MONTH,
     Client,
     Plant,
     PlantRecommendationRequest,
     Project,
-    ProjectPlant,
 )
 from src.models.user import db
+from src.services.analytics_rollups import (
+    CATEGORY_ROLLUP,
+    LOCATION_ROLLUP,
+    PLANT_ROLLUP,
+    PROJECT_ROLLUP,
+    refresh_dirty_months,
+    rollup_facts,
+)
+from src.services.business_summary import BusinessSummary, get_business_summary
+from src.services.project_timeline import get_timeline_analysis
+from src.utils.date_buckets import month_bucket, month_number
 
 
 class AnalyticsService:
     """Service for generating analytics and reports"""
 
+    @staticmethod
+    def _parse_period(date_range: tuple | None) -> tuple[datetime | None, datetime | None]:
+        start_date, end_date = date_range if date_range and len(date_range) == 2 else (None, None)
+        return (
+            datetime.fromisoformat(start_date) if start_date else None,
+            datetime.fromisoformat(end_date) if end_date else None,
+        )
+
+    def get_business_summary(self, date_range: tuple | None = None) -> BusinessSummary:
+        """Totals, status distribution, budget statistics and rankings for a period"""
+        start, end = self._parse_period(date_range)
+        return get_business_summary(start=start, end=end)
+
     def get_plant_usage_analytics(self, date_range: tuple | None = None) -> dict:
         """Get plant usage statistics and trends"""
         try:
-            # Build date filter
-            date_filter = []
-            if date_range and len(date_range) == 2:
-                start_date, end_date = date_range
-                if start_date:
-                    date_filter.append(Project.created_at >= datetime.fromisoformat(start_date))
-                if end_date:
-                    date_filter.append(Project.created_at <= datetime.fromisoformat(end_date))
+            start, end = self._parse_period(date_range)
+            refresh_dirty_months()
+            plants = rollup_facts(PLANT_ROLLUP, start, end)
+            categories = rollup_facts(CATEGORY_ROLLUP, start, end)
+            projects = rollup_facts(PROJECT_ROLLUP, start, end)
 
             # Most used plants by project count
+            project_count = func.sum(plants.c.selection_count)
             plant_usage = (
                 db.session.query(
                     Plant.id,
                     Plant.name,
                     Plant.common_name,
                     Plant.category,
-                    func.count(ProjectPlant.project_id.distinct()).label("project_count"),
-                    func.sum(ProjectPlant.quantity).label("total_quantity"),
-                    func.avg(ProjectPlant.unit_cost).label("avg_cost"),
+                    project_count.label("project_count"),
+                    func.sum(plants.c.total_quantity).label("total_quantity"),
+                    (func.sum(plants.c.unit_cost_sum) / func.nullif(func.sum(plants.c.unit_cost_count), 0)).label(
+                        "avg_cost"
+                    ),
                 )
-                .join(ProjectPlant, Plant.id == ProjectPlant.plant_id)
-                .join(Project, ProjectPlant.project_id == Project.id)
-                .filter(*date_filter)
+                .join(plants, plants.c.plant_id == Plant.id)
                 .group_by(Plant.id, Plant.name, Plant.common_name, Plant.category)
-                .order_by(func.count(ProjectPlant.project_id.distinct()).desc())
+                .order_by(project_count.desc())
                 .limit(20)
                 .all()
             )
@@ -76,18 +98,15 @@ class AnalyticsService:
             ]
 
             # Category distribution
+            category_count = func.sum(categories.c.project_count)
             category_stats = (
                 db.session.query(
-                    Plant.category,
-                    func.count(ProjectPlant.project_id.distinct()).label("project_count"),
-                    func.sum(ProjectPlant.quantity).label("total_quantity"),
+                    categories.c.category,
+                    category_count.label("project_count"),
+                    func.sum(categories.c.total_quantity).label("total_quantity"),
                 )
-                .join(ProjectPlant, Plant.id == ProjectPlant.plant_id)
-                .join(Project, ProjectPlant.project_id == Project.id)
-                .filter(*date_filter)
-                .filter(Plant.category.isnot(None))
-                .group_by(Plant.category)
-                .order_by(func.count(ProjectPlant.project_id.distinct()).desc())
+                .group_by(categories.c.category)
+                .order_by(category_count.desc())
                 .all()
             )
 
@@ -103,20 +122,18 @@ class AnalyticsService:
             # Usage trends over time
             usage_trends = (
                 db.session.query(
-                    func.strftime("%Y-%m", Project.created_at).label("month"),
-                    func.count(ProjectPlant.id.distinct()).label("plant_selections"),
-                    func.sum(ProjectPlant.quantity).label("total_quantity"),
+                    plants.c.month,
+                    func.sum(plants.c.selection_count).label("plant_selections"),
+                    func.sum(plants.c.total_quantity).label("total_quantity"),
                 )
-                .join(ProjectPlant, Project.id == ProjectPlant.project_id)
-                .filter(*date_filter)
-                .group_by(func.strftime("%Y-%m", Project.created_at))
-                .order_by(func.strftime("%Y-%m", Project.created_at))
+                .group_by(plants.c.month)
+                .order_by(plants.c.month)
                 .all()
             )
 
             trends = [
                 {
-                    "month": month if month else "",
+                    "month": "" if month == ROLLUP_UNDATED_MONTH else month,
                     "plant_selections": plant_selections,
                     "total_quantity": int(total_quantity) if total_quantity else 0,
                 }
@@ -124,10 +141,8 @@ class AnalyticsService:
             ]
 
             # Total statistics
-            total_plants_used = db.session.query(func.sum(ProjectPlant.quantity)).filter(*date_filter).scalar() or 0
-            total_projects_with_plants = (
-                db.session.query(func.count(func.distinct(ProjectPlant.project_id))).filter(*date_filter).scalar() or 0
-            )
+            total_plants_used = sum(total_quantity or 0 for _, _, total_quantity in usage_trends)
+            total_projects_with_plants = db.session.query(func.sum(projects.c.planted_count)).scalar() or 0
 
             return {
                 "most_used_plants": most_used_plants,
@@ -153,67 +168,11 @@ class AnalyticsService:
     def get_project_performance_metrics(self, project_id: int | None = None) -> dict:
         """Get project performance and timeline analytics"""
         try:
-            query = db.session.query(Project)
-            if project_id:
-                query = query.filter(Project.id == project_id)
-
-            projects = query.all()
-
-            # Status distribution
-            status_stats = (
-                db.session.query(Project.status, func.count(Project.id).label("count")).group_by(Project.status).all()
-            )
-
-            status_distribution = dict(status_stats)
-
-            # Budget analysis
-            budget_stats = (
-                db.session.query(
-                    func.sum(Project.budget).label("total_budget"),
-                    func.avg(Project.budget).label("avg_budget"),
-                    func.min(Project.budget).label("min_budget"),
-                    func.max(Project.budget).label("max_budget"),
-                    func.count(Project.id).label("project_count"),
-                )
-                .filter(Project.budget.isnot(None))
-                .first()
-            )
+            # Status distribution and budget analysis
+            summary = get_business_summary()
 
             # Project timeline analysis
-            timeline_stats = []
-            for project in projects:
-                start_date_val = project.start_date
-                end_date_val = project.end_date or project.actual_completion_date
-
-                if start_date_val and end_date_val:
-                    try:
-                        # Handle different date formats
-                        if isinstance(start_date_val, str):
-                            start = datetime.fromisoformat(start_date_val)
-                        else:
-                            start = start_date_val
-
-                        end = datetime.fromisoformat(end_date_val) if isinstance(end_date_val, str) else end_date_val
-
-                        # Convert to dates if they're datetimes
-                        if hasattr(start, "date"):
-                            start = start.date() if hasattr(start, "date") else start
-                        if hasattr(end, "date"):
-                            end = end.date() if hasattr(end, "date") else end
-
-                        duration = (end - start).days
-
-                        timeline_stats.append(
-                            {
-                                "id": project.id,
-                                "name": project.name,
-                                "duration_days": duration,
-                                "status": project.status,
-                                "budget": (float(project.budget) if project.budget else 0),
-                            }
-                        )
-                    except (ValueError, TypeError, AttributeError):
-                        continue
+            timeline = get_timeline_analysis(project_id)
 
             # Performance by project type
             type_performance = (
@@ -237,15 +196,16 @@ class AnalyticsService:
             ]
 
             return {
-                "status_distribution": status_distribution,
+                "status_distribution": summary.status_distribution,
                 "budget_analysis": {
-                    "total_budget": (float(budget_stats.total_budget) if budget_stats.total_budget else 0),
-                    "avg_budget": (float(budget_stats.avg_budget) if budget_stats.avg_budget else 0),
-                    "min_budget": (float(budget_stats.min_budget) if budget_stats.min_budget else 0),
-                    "max_budget": (float(budget_stats.max_budget) if budget_stats.max_budget else 0),
-                    "project_count": (budget_stats.project_count if budget_stats.project_count else 0),
+                    "total_budget": summary.total_budget,
+                    "avg_budget": summary.avg_budget,
+                    "min_budget": summary.min_budget,
+                    "max_budget": summary.max_budget,
+                    "project_count": summary.budgeted_projects,
                 },
-                "timeline_analysis": timeline_stats,
+                "timeline_analysis": timeline["projects"],
+                "timeline_summary": timeline["summary"],
                 "type_performance": type_stats,
             }
 
@@ -330,72 +290,51 @@ class AnalyticsService:
         """Get financial performance and budget analytics"""
         try:
             start_date, end_date = date_range
-
-            # Build date filter
-            date_filter = []
-            if start_date:
-                date_filter.append(Project.created_at >= datetime.fromisoformat(start_date))
-            if end_date:
-                date_filter.append(Project.created_at <= datetime.fromisoformat(end_date))
-
-            # Revenue analytics
-            revenue_stats = (
+            start, end = self._parse_period(date_range)
+            refresh_dirty_months()
+            projects = rollup_facts(PROJECT_ROLLUP, start, end)
+            plants = rollup_facts(PLANT_ROLLUP, start, end)
+
+            # Revenue per month and project type; the budgeted rows are few, so totals, monthly
+            # trends and per-type figures are folded from one read of the rollup
+            budgeted_count = func.sum(projects.c.budgeted_count)
+            revenue_rows = (
                 db.session.query(
-                    func.sum(Project.budget).label("total_revenue"),
-                    func.count(Project.id).label("project_count"),
-                    func.avg(Project.budget).label("avg_project_value"),
+                    projects.c.month,
+                    projects.c.project_type,
+                    func.sum(projects.c.budget_total).label("revenue"),
+                    budgeted_count.label("project_count"),
                 )
-                .filter(Project.budget.isnot(None))
-                .filter(*date_filter)
-                .first()
-            )
-
-            # Revenue by month
-            monthly_revenue = (
-                db.session.query(
-                    func.strftime("%Y-%m", Project.created_at).label("month"),
-                    func.sum(Project.budget).label("revenue"),
-                    func.count(Project.id).label("project_count"),
-                )
-                .filter(Project.budget.isnot(None))
-                .filter(*date_filter)
-                .group_by(func.strftime("%Y-%m", Project.created_at))
-                .order_by(func.strftime("%Y-%m", Project.created_at))
+                .group_by(projects.c.month, projects.c.project_type)
+                .having(budgeted_count > 0)
                 .all()
             )
 
+            revenue_by_month = {}
+            revenue_by_type = {}
+            for month, project_type, revenue, project_count in revenue_rows:
+                month_revenue, month_count = revenue_by_month.get(month, (0.0, 0))
+                revenue_by_month[month] = (month_revenue + (revenue or 0), month_count + project_count)
+                if project_type is not None:
+                    type_revenue, type_count = revenue_by_type.get(project_type, (0.0, 0))
+                    revenue_by_type[project_type] = (type_revenue + (revenue or 0), type_count + project_count)
+
+            total_revenue = sum(revenue for revenue, _ in revenue_by_month.values())
+            total_count = sum(project_count for _, project_count in revenue_by_month.values())
+
             revenue_trends = [
                 {
-                    "month": month if month else "",
+                    "month": "" if month == ROLLUP_UNDATED_MONTH else month,
                     "revenue": float(revenue) if revenue else 0,
                     "project_count": project_count,
                 }
-                for month, revenue, project_count in monthly_revenue
+                for month, (revenue, project_count) in sorted(revenue_by_month.items())
             ]
 
             # Cost analysis (from project plants)
-            cost_analysis = (
-                db.session.query(func.sum(ProjectPlant.quantity * ProjectPlant.unit_cost).label("total_plant_costs"))
-                .join(Project)
-                .filter(*date_filter)
-                .filter(ProjectPlant.unit_cost.isnot(None))
-                .first()
-            )
+            cost_analysis = db.session.query(func.sum(plants.c.cost_total).label("total_plant_costs")).first()
 
             # Profitability by project type
-            profitability_by_type = (
-                db.session.query(
-                    Project.project_type,
-                    func.sum(Project.budget).label("revenue"),
-                    func.count(Project.id).label("project_count"),
-                )
-                .filter(Project.budget.isnot(None))
-                .filter(Project.project_type.isnot(None))
-                .filter(*date_filter)
-                .group_by(Project.project_type)
-                .all()
-            )
-
             profitability_stats = [
                 {
                     "project_type": project_type,
@@ -403,16 +342,14 @@ class AnalyticsService:
                     "project_count": project_count,
                     "avg_revenue": (float(revenue / project_count) if revenue and project_count > 0 else 0),
                 }
-                for project_type, revenue, project_count in profitability_by_type
+                for project_type, (revenue, project_count) in sorted(revenue_by_type.items())
             ]
 
             return {
                 "revenue_summary": {
-                    "total_revenue": (float(revenue_stats.total_revenue) if revenue_stats.total_revenue else 0),
-                    "project_count": (revenue_stats.project_count if revenue_stats.project_count else 0),
-                    "avg_project_value": (
-                        float(revenue_stats.avg_project_value) if revenue_stats.avg_project_value else 0
-                    ),
+                    "total_revenue": float(total_revenue) if total_revenue else 0,
+                    "project_count": total_count,
+                    "avg_project_value": float(total_revenue / total_count) if total_revenue and total_count else 0,
                 },
                 "revenue_trends": revenue_trends,
                 "cost_analysis": {
@@ -478,11 +415,11 @@ class AnalyticsService:
             # Usage trends
             usage_trends = (
                 db.session.query(
-                    func.strftime("%Y-%m", PlantRecommendationRequest.created_at).label("month"),
+                    month_bucket(PlantRecommendationRequest.created_at).label("month"),
                     func.count(PlantRecommendationRequest.id).label("request_count"),
                 )
-                .group_by(func.strftime("%Y-%m", PlantRecommendationRequest.created_at))
-                .order_by(func.strftime("%Y-%m", PlantRecommendationRequest.created_at))
+                .group_by(month_bucket(PlantRecommendationRequest.created_at))
+                .order_by(month_bucket(PlantRecommendationRequest.created_at))
                 .all()
             )
 
@@ -621,17 +558,22 @@ class AnalyticsService:
     def get_seasonal_analytics(self) -> dict:
         """Get seasonal analytics"""
         try:
-            # Projects by month
-            projects_by_month = (
-                db.session.query(
-                    func.strftime("%m", Project.created_at).label("month_num"),
-                    func.count(Project.id).label("project_count"),
-                )
-                .filter(Project.created_at.isnot(None))
-                .group_by(func.strftime("%m", Project.created_at))
-                .order_by(func.strftime("%m", Project.created_at))
+            refresh_dirty_months()
+            projects = rollup_facts(PROJECT_ROLLUP)
+            plants = rollup_facts(PLANT_ROLLUP)
+
+            # Projects by month of the year, folded from the monthly rollup
+            counts_by_month_num = {}
+            monthly_counts = (
+                db.session.query(projects.c.month, func.sum(projects.c.project_count))
+                .filter(projects.c.month != ROLLUP_UNDATED_MONTH)
+                .group_by(projects.c.month)
                 .all()
             )
+            for month, project_count in monthly_counts:
+                month_num = month_number(month)
+                counts_by_month_num[month_num] = counts_by_month_num.get(month_num, 0) + project_count
+            projects_by_month = sorted(counts_by_month_num.items())
 
             # Convert month numbers to month names
             month_names = {
@@ -661,9 +603,9 @@ class AnalyticsService:
             seasonal_usage = (
                 db.session.query(
                     Plant.bloom_time,
-                    func.sum(ProjectPlant.quantity).label("total_quantity"),
+                    func.sum(plants.c.total_quantity).label("total_quantity"),
                 )
-                .join(ProjectPlant, Plant.id == ProjectPlant.plant_id)
+                .join(plants, plants.c.plant_id == Plant.id)
                 .filter(Plant.bloom_time.isnot(None))
                 .group_by(Plant.bloom_time)
                 .all()
@@ -694,16 +636,21 @@ class AnalyticsService:
     def get_geographic_analytics(self) -> dict:
         """Get geographic analytics"""
         try:
+            refresh_dirty_months()
+            locations = rollup_facts(LOCATION_ROLLUP)
+            categories = rollup_facts(CATEGORY_ROLLUP)
+
             # Projects by location
+            location_count = func.sum(locations.c.project_count)
             projects_by_location = (
                 db.session.query(
-                    Project.location,
-                    func.count(Project.id).label("project_count"),
-                    func.sum(Project.budget).label("total_budget"),
+                    locations.c.location,
+                    location_count.label("project_count"),
+                    func.sum(locations.c.budget_total).label("total_budget"),
                 )
-                .filter(Project.location.isnot(None))
-                .group_by(Project.location)
-                .order_by(func.count(Project.id).desc())
+                .filter(locations.c.location.isnot(None))
+                .group_by(locations.c.location)
+                .order_by(location_count.desc())
                 .limit(20)
                 .all()
             )
@@ -720,16 +667,12 @@ class AnalyticsService:
             # Regional plant preferences (by client city)
             regional_preferences = (
                 db.session.query(
-                    Client.city,
-                    Plant.category,
-                    func.count(ProjectPlant.id).label("usage_count"),
+                    categories.c.city,
+                    categories.c.category,
+                    func.sum(categories.c.selection_count).label("usage_count"),
                 )
-                .join(Project, Client.id == Project.client_id)
-                .join(ProjectPlant, Project.id == ProjectPlant.project_id)
-                .join(Plant, ProjectPlant.plant_id == Plant.id)
-                .filter(Client.city.isnot(None))
-                .filter(Plant.category.isnot(None))
-                .group_by(Client.city, Plant.category)
+                .filter(categories.c.city.isnot(None))
+                .group_by(categories.c.city, categories.c.category)
                 .all()
             )
 
@@ -741,7 +684,11 @@ class AnalyticsService:
 
             # Coverage areas (unique cities with projects)
             coverage_areas = (
-                db.session.query(Client.city).join(Project).filter(Client.city.isnot(None)).distinct().all()
+                db.session.query(locations.c.city)
+                .filter(locations.c.city.isnot(None))
+                .group_by(locations.c.city)
+                .having(func.sum(locations.c.project_count) > 0)
+                .all()
             )
 
             coverage_list = [city[0] for city in coverage_areas]
@@ -0,0 +1,234 @@
+"""
+Analytics Rollups
+
+Monthly fact tables behind the financial, plant usage, seasonal and
+geographic analytics. Each rollup is defined by a fact query that aggregates
+projects and project plants into rows of its table; the same query refreshes
+the stored months and computes the partial months at the edges of a period on
+the fly, so a period read combines O(months) stored rows with at most two
+small raw ranges.
+
+Model events record the months touched by every write in
+``rollup_dirty_months``; ``refresh_dirty_months`` recomputes them before a
+read. ``rebuild_rollups`` recomputes everything and is exposed as
+``flask rollups rebuild`` for scheduled runs and after bulk imports.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import and_, case, delete, distinct, func, insert, or_, select, union_all
+
+from src.models.landscape import (
+    ROLLUP_UNDATED_MONTH,
+    CategoryMonthlyRollup,
+    Client,
+    LocationMonthlyRollup,
+    Plant,
+    PlantMonthlyRollup,
+    Project,
+    ProjectMonthlyRollup,
+    ProjectPlant,
+    RollupDirtyMonth,
+    project_month,
+)
+from src.models.user import db
+from src.utils.date_buckets import add_months, month_key, month_start
+
+
+@dataclass(frozen=True)
+class Rollup:
+    """A fact table and the query that computes its rows for the projects matching some conditions"""
+
+    model: type
+    facts: Callable[[list], object]
+
+    def columns(self) -> list[str]:
+        return [column.name for column in self.facts([]).selected_columns]
+
+
+def _project_facts(conditions: list):
+    has_plants = select(ProjectPlant.id).where(ProjectPlant.project_id == Project.id).exists()
+    month = project_month()
+    return (
+        select(
+            month.label("month"),
+            Project.project_type.label("project_type"),
+            func.count(Project.id).label("project_count"),
+            func.count(Project.budget).label("budgeted_count"),
+            func.sum(Project.budget).label("budget_total"),
+            func.sum(case((has_plants, 1), else_=0)).label("planted_count"),
+        )
+        .where(*conditions)
+        .group_by(month, Project.project_type)
+    )
+
+
+def _plant_facts(conditions: list):
+    month = project_month()
+    return (
+        select(
+            month.label("month"),
+            ProjectPlant.plant_id.label("plant_id"),
+            func.count(ProjectPlant.id).label("selection_count"),
+            func.sum(ProjectPlant.quantity).label("total_quantity"),
+            func.sum(ProjectPlant.unit_cost).label("unit_cost_sum"),
+            func.count(ProjectPlant.unit_cost).label("unit_cost_count"),
+            func.sum(ProjectPlant.quantity * ProjectPlant.unit_cost).label("cost_total"),
+        )
+        .join(Project, ProjectPlant.project_id == Project.id)
+        .where(*conditions)
+        .group_by(month, ProjectPlant.plant_id)
+    )
+
+
+def _category_facts(conditions: list):
+    # A project has one client, so distinct project counts add up across cities and months
+    month = project_month()
+    return (
+        select(
+            month.label("month"),
+            Client.city.label("city"),
+            Plant.category.label("category"),
+            func.count(distinct(ProjectPlant.project_id)).label("project_count"),
+            func.count(ProjectPlant.id).label("selection_count"),
+            func.sum(ProjectPlant.quantity).label("total_quantity"),
+        )
+        .join(Project, ProjectPlant.project_id == Project.id)
+        .join(Plant, ProjectPlant.plant_id == Plant.id)
+        .outerjoin(Client, Project.client_id == Client.id)
+        .where(Plant.category.isnot(None), *conditions)
+        .group_by(month, Client.city, Plant.category)
+    )
+
+
+def _location_facts(conditions: list):
+    month = project_month()
+    return (
+        select(
+            month.label("month"),
+            Client.city.label("city"),
+            Project.location.label("location"),
+            func.count(Project.id).label("project_count"),
+            func.sum(Project.budget).label("budget_total"),
+        )
+        .outerjoin(Client, Project.client_id == Client.id)
+        .where(*conditions)
+        .group_by(month, Client.city, Project.location)
+    )
+
+
+PROJECT_ROLLUP = Rollup(ProjectMonthlyRollup, _project_facts)
+PLANT_ROLLUP = Rollup(PlantMonthlyRollup, _plant_facts)
+CATEGORY_ROLLUP = Rollup(CategoryMonthlyRollup, _category_facts)
+LOCATION_ROLLUP = Rollup(LocationMonthlyRollup, _location_facts)
+ROLLUPS = (PROJECT_ROLLUP, PLANT_ROLLUP, CATEGORY_ROLLUP, LOCATION_ROLLUP)
+
+
+def _months_condition(months: list[str]):
+    """Projects created in one of ``months``, as created_at ranges so the index can be used"""
+    ranges = []
+    for month in months:
+        if month == ROLLUP_UNDATED_MONTH:
+            ranges.append(Project.created_at.is_(None))
+        else:
+            start = datetime.strptime(month, "%Y-%m")
+            ranges.append(and_(Project.created_at >= start, Project.created_at < add_months(start, 1)))
+    return or_(*ranges)
+
+
+def _recompute(months: list[str] | None) -> None:
+    for rollup in ROLLUPS:
+        table = rollup.model.__table__
+        conditions = [] if months is None else [_months_condition(months)]
+        clear = delete(table) if months is None else delete(table).where(table.c.month.in_(months))
+        db.session.execute(clear)
+        db.session.execute(insert(table).from_select(rollup.columns(), rollup.facts(conditions)))
+
+
+def refresh_dirty_months() -> list[str]:
+    """
+    Recompute the rollups for the months changed since the last refresh.
+
+    The dirty rows are claimed by deleting them, so a concurrent refresh of
+    the same months finds nothing left to do. Returns the refreshed months.
+    """
+    dirty = db.session.execute(select(RollupDirtyMonth.id, RollupDirtyMonth.month)).all()
+    if not dirty:
+        return []
+
+    claimed = db.session.execute(delete(RollupDirtyMonth).where(RollupDirtyMonth.id.in_([row.id for row in dirty])))
+    if not claimed.rowcount:
+        return []
+
+    months = sorted({row.month for row in dirty})
+    _recompute(months)
+    db.session.commit()
+    return months
+
+
+def rebuild_rollups() -> None:
+    """Recompute every rollup from the project tables"""
+    db.session.execute(delete(RollupDirtyMonth))
+    _recompute(None)
+    db.session.commit()
+
+
+def rollup_facts(rollup: Rollup, start: datetime | None = None, end: datetime | None = None):
+    """
+    Fact rows of ``rollup`` for projects created between ``start`` and ``end`` (inclusive, both optional).
+
+    Whole months in the period are read from the rollup table; the partial
+    months at its edges are aggregated from the project tables with the same
+    fact query. Every project falls in exactly one part, so additive measures
+    can be summed over the result. Returns a subquery with the rollup columns.
+    """
+    table = rollup.model.__table__
+    columns = rollup.columns()
+    stored = select(*(table.c[name] for name in columns))
+    if start is None and end is None:
+        return stored.subquery()
+
+    # Whole months are [first, last) where either bound may be open
+    first = None if start is None else month_start(start)
+    if first is not None and first != start.replace(tzinfo=None):
+        first = add_months(first, 1)
+    last = None if end is None else month_start(end)
+    if last is not None and end.replace(tzinfo=None) >= add_months(last, 1) - timedelta(microseconds=1):
+        last = add_months(last, 1)
+
+    if first is not None and last is not None and first >= last:
+        parts = [rollup.facts([Project.created_at >= start, Project.created_at <= end])]
+    else:
+        stored = stored.where(table.c.month != ROLLUP_UNDATED_MONTH)
+        if first is not None:
+            stored = stored.where(table.c.month >= month_key(first))
+        if last is not None:
+            stored = stored.where(table.c.month < month_key(last))
+        parts = [stored]
+        if start is not None and first != start.replace(tzinfo=None):
+            parts.append(rollup.facts([Project.created_at >= start, Project.created_at < first]))
+        if end is not None and last <= end.replace(tzinfo=None):
+            parts.append(rollup.facts([Project.created_at >= last, Project.created_at <= end]))
+
+    return (parts[0] if len(parts) == 1 else union_all(*parts)).subquery()
+
+
+rollups_cli = AppGroup("rollups", help="Maintain the analytics rollup tables.")
+
+
+@rollups_cli.command("refresh")
+def refresh_command():
+    """Recompute the months changed since the last refresh."""
+    months = refresh_dirty_months()
+    click.echo(f"Refreshed {len(months)} month(s)")
+
+
+@rollups_cli.command("rebuild")
+def rebuild_command():
+    """Recompute all rollups, e.g. nightly or after bulk imports."""
+    rebuild_rollups()
+    click.echo("Rebuilt analytics rollups")
@@ -0,0 +1,205 @@
+"""
+Business Summary Query Engine
+
+Computes the business summary (entity totals, project status distribution,
+budget statistics, top clients and most used plants) in two SQL statements.
+The projects in the requested period are selected once in a CTE per
+statement: the first statement aggregates them into a single row together
+with the entity totals, the second returns the grouped distributions as one
+UNION ALL result. The summary is shared by the business summary report, the
+analytics service and the AI project insights.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import Float, String, cast, func, literal, null, select, union_all
+
+from src.models.landscape import Client, Plant, Product, Project, ProjectPlant, Supplier
+from src.models.user import db
+
+TOP_CLIENTS_LIMIT = 10
+TOP_PLANTS_LIMIT = 10
+
+
+@dataclass(frozen=True)
+class ClientRanking:
+    name: str
+    client_type: str | None
+    project_count: int
+    total_budget: float
+
+
+@dataclass(frozen=True)
+class PlantRanking:
+    name: str
+    common_name: str | None
+    project_count: int
+
+
+@dataclass(frozen=True)
+class BusinessSummary:
+    """Aggregated business figures for projects created in a period"""
+
+    total_projects: int = 0
+    total_clients: int = 0
+    total_plants: int = 0
+    total_products: int = 0
+    total_suppliers: int = 0
+    # Budget statistics over projects that have a budget
+    budgeted_projects: int = 0
+    total_budget: float = 0.0
+    avg_budget: float = 0.0
+    min_budget: float = 0.0
+    max_budget: float = 0.0
+    status_distribution: dict[str, int] = field(default_factory=dict)
+    top_clients: list[ClientRanking] = field(default_factory=list)
+    plant_usage: list[PlantRanking] = field(default_factory=list)
+
+    def status_count(self, *statuses: str) -> int:
+        return sum(self.status_distribution.get(status, 0) for status in statuses)
+
+
+def _period_conditions(start: datetime | None, end: datetime | None) -> list:
+    conditions = []
+    if start:
+        conditions.append(Project.created_at >= start)
+    if end:
+        conditions.append(Project.created_at <= end)
+    return conditions
+
+
+def _period_projects(start: datetime | None, end: datetime | None):
+    return (
+        select(Project.id, Project.client_id, Project.status, Project.budget)
+        .where(*_period_conditions(start, end))
+        .cte("period_projects")
+    )
+
+
+def _totals_statement(start: datetime | None, end: datetime | None):
+    projects = _period_projects(start, end)
+    return select(
+        func.count(projects.c.id).label("total_projects"),
+        func.count(projects.c.budget).label("budgeted_projects"),
+        func.sum(projects.c.budget).label("total_budget"),
+        func.avg(projects.c.budget).label("avg_budget"),
+        func.min(projects.c.budget).label("min_budget"),
+        func.max(projects.c.budget).label("max_budget"),
+        select(func.count(Client.id)).scalar_subquery().label("total_clients"),
+        select(func.count(Plant.id)).scalar_subquery().label("total_plants"),
+        select(func.count(Product.id)).scalar_subquery().label("total_products"),
+        select(func.count(Supplier.id)).scalar_subquery().label("total_suppliers"),
+    ).select_from(projects)
+
+
+def _distributions_statement(start: datetime | None, end: datetime | None):
+    projects = _period_projects(start, end)
+    statuses = select(
+        literal("status").label("kind"),
+        literal(0).label("id"),
+        projects.c.status.label("name"),
+        cast(null(), String).label("detail"),
+        func.count(projects.c.id).label("project_count"),
+        cast(null(), Float).label("amount"),
+    ).group_by(projects.c.status)
+
+    # Rank on the foreign keys first and join names for the top rows only
+    client_count = func.count(projects.c.id)
+    client_ranking = (
+        select(
+            projects.c.client_id,
+            client_count.label("project_count"),
+            func.sum(projects.c.budget).label("amount"),
+        )
+        .group_by(projects.c.client_id)
+        .order_by(client_count.desc(), projects.c.client_id)
+        .limit(TOP_CLIENTS_LIMIT)
+        .subquery()
+    )
+    top_clients = select(
+        literal("client").label("kind"),
+        Client.id.label("id"),
+        Client.name.label("name"),
+        Client.client_type.label("detail"),
+        client_ranking.c.project_count,
+        cast(client_ranking.c.amount, Float).label("amount"),
+    ).join(client_ranking, client_ranking.c.client_id == Client.id)
+
+    # (project_id, plant_id) is unique, so counting rows counts distinct projects and
+    # COUNT(*) can be answered from the plant_id index alone. A semi-join on the
+    # period lets the database probe project_plants by project instead of joining
+    # every row; without a period no project filter is needed.
+    plant_count = func.count()
+    plant_ranking = (
+        select(ProjectPlant.plant_id, plant_count.label("project_count"))
+        .where(*([ProjectPlant.project_id.in_(select(projects.c.id))] if _period_conditions(start, end) else []))
+        .group_by(ProjectPlant.plant_id)
+        .order_by(plant_count.desc(), ProjectPlant.plant_id)
+        .limit(TOP_PLANTS_LIMIT)
+        .subquery()
+    )
+    top_plants = select(
+        literal("plant").label("kind"),
+        Plant.id.label("id"),
+        Plant.name.label("name"),
+        Plant.common_name.label("detail"),
+        plant_ranking.c.project_count,
+        cast(null(), Float).label("amount"),
+    ).join(plant_ranking, plant_ranking.c.plant_id == Plant.id)
+
+    return union_all(statuses, top_clients, top_plants)
+
+
+def get_business_summary(
+    start: datetime | None = None, end: datetime | None = None, distributions: bool = True
+) -> BusinessSummary:
+    """
+    Business summary for projects created between ``start`` and ``end`` (inclusive, both optional).
+
+    With ``distributions=False`` only the totals statement runs and the status
+    distribution and rankings are left empty.
+    """
+    totals = db.session.execute(_totals_statement(start, end)).one()
+
+    status_distribution = {}
+    clients = []
+    plants = []
+    rows = db.session.execute(_distributions_statement(start, end)) if distributions else ()
+    for row in rows:
+        if row.kind == "status":
+            status_distribution[row.name] = row.project_count
+        elif row.kind == "client":
+            clients.append(row)
+        else:
+            plants.append(row)
+
+    # UNION ALL does not preserve the order of its members
+    clients.sort(key=lambda row: (-row.project_count, row.id))
+    plants.sort(key=lambda row: (-row.project_count, row.id))
+
+    return BusinessSummary(
+        total_projects=totals.total_projects,
+        total_clients=totals.total_clients,
+        total_plants=totals.total_plants,
+        total_products=totals.total_products,
+        total_suppliers=totals.total_suppliers,
+        budgeted_projects=totals.budgeted_projects,
+        total_budget=float(totals.total_budget or 0),
+        avg_budget=float(totals.avg_budget or 0),
+        min_budget=float(totals.min_budget or 0),
+        max_budget=float(totals.max_budget or 0),
+        status_distribution=status_distribution,
+        top_clients=[
+            ClientRanking(
+                name=row.name,
+                client_type=row.detail,
+                project_count=row.project_count,
+                total_budget=float(row.amount or 0),
+            )
+            for row in clients
+        ],
+        plant_usage=[
+            PlantRanking(name=row.name, common_name=row.detail, project_count=row.project_count) for row in plants
+        ],
+    )
@@ -0,0 +1,298 @@
+"""
+Export Service
+
+Streams catalogue exports (plants, suppliers, clients) as JSON, NDJSON, CSV or XLSX.
+Rows are read with a server-side cursor (``yield_per``) as plain column tuples and
+serialized batch by batch, so memory use does not grow with the size of the table.
+"""
+
+import csv
+import io
+import json
+import tempfile
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime
+
+from flask import Response, stream_with_context
+from openpyxl import Workbook
+from sqlalchemy import Boolean, Integer, func, or_, select
+
+from src.models.landscape import Client, Plant, Product, Project, Supplier
+from src.models.user import db
+
+# Rows fetched per round trip from the database cursor
+EXPORT_BATCH_SIZE = 1000
+# Size of the chunks used when streaming a finished XLSX file
+XLSX_CHUNK_SIZE = 64 * 1024
+
+EXPORT_MIMETYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+# Bookkeeping columns that are never part of an export
+INTERNAL_COLUMNS = ("natural_key",)
+
+
+# Fields of Plant.to_dict(), in the same order
+# fmt: off
+PLANT_EXPORT_COLUMNS = (
+    "id", "name", "common_name", "category", "height_min", "height_max", "width_min", "width_max",
+    "sun_requirements", "sun_exposure", "soil_type", "water_needs", "moisture_level", "hardiness_zone",
+    "bloom_time", "bloom_color", "foliage_color", "native", "temperature_min", "temperature_max",
+    "humidity_preference", "wind_tolerance", "soil_ph_min", "soil_ph_max", "soil_drainage", "soil_fertility",
+    "maintenance", "pruning_needs", "fertilizer_needs", "pest_resistance", "disease_resistance",
+    "plant_form", "foliage_texture", "seasonal_interest", "fragrance", "growth_rate", "mature_spread",
+    "root_system", "wildlife_value", "pollinator_friendly", "deer_resistant", "invasive_potential",
+    "suitable_for_containers", "suitable_for_hedging", "suitable_for_screening", "suitable_for_groundcover",
+    "suitable_for_slopes", "supplier_id", "supplier_name", "price", "availability", "planting_season",
+    "notes", "created_at", "updated_at",
+)
+# fmt: on
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    """Describes how an entity is exported
+
+    ``default_columns`` mirror the fields of the model's ``to_dict()`` so an export
+    without a column selection keeps its familiar shape. ``derived_columns`` are
+    values computed per row (such as counts) that are not stored on the table.
+    """
+
+    model: type
+    collection: str
+    default_columns: tuple[str, ...]
+    search_columns: tuple[str, ...]
+    filter_columns: tuple[str, ...]
+    derived_columns: Mapping[str, Callable[[], object]] = field(default_factory=dict)
+    order_by: str = "name"
+    # Extra top level JSON keys, kept from the export this one replaced
+    json_envelope: Callable[[int], dict] | None = None
+
+
+EXPORT_SPECS = {
+    "plants": ExportSpec(
+        model=Plant,
+        collection="plants",
+        default_columns=PLANT_EXPORT_COLUMNS,
+        search_columns=("name", "common_name", "category"),
+        filter_columns=("category", "sun_exposure", "sun_requirements", "native", "supplier_id", "availability"),
+        derived_columns={
+            "supplier_name": lambda: select(Supplier.name).where(Supplier.id == Plant.supplier_id).scalar_subquery(),
+        },
+    ),
+    "suppliers": ExportSpec(
+        model=Supplier,
+        collection="suppliers",
+        default_columns=(
+            "id",
+            "name",
+            "contact_person",
+            "email",
+            "phone",
+            "address",
+            "city",
+            "postal_code",
+            "specialization",
+            "website",
+            "notes",
+            "product_count",
+            "created_at",
+            "updated_at",
+        ),
+        search_columns=("name", "contact_person", "email", "city"),
+        filter_columns=("city", "specialization"),
+        derived_columns={
+            "product_count": lambda: select(func.count(Product.id))
+            .where(Product.supplier_id == Supplier.id)
+            .scalar_subquery(),
+        },
+        # The supplier list endpoint's pagination keys, as a single page holding every row
+        json_envelope=lambda count: {"total": count, "pages": 1, "current_page": 1},
+    ),
+    "clients": ExportSpec(
+        model=Client,
+        collection="clients",
+        default_columns=(
+            "id",
+            "name",
+            "company",
+            "contact_person",
+            "email",
+            "phone",
+            "address",
+            "city",
+            "postal_code",
+            "client_type",
+            "budget_range",
+            "notes",
+            "registration_date",
+            "project_count",
+            "created_at",
+            "updated_at",
+        ),
+        search_columns=("name", "company", "contact_person", "email", "city"),
+        filter_columns=("city", "client_type"),
+        derived_columns={
+            "project_count": lambda: select(func.count(Project.id))
+            .where(Project.client_id == Client.id)
+            .scalar_subquery(),
+        },
+    ),
+}
+
+
+def _serialize_value(value):
+    """Convert database values into JSON/CSV friendly scalars"""
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    return value
+
+
+class ExportService:
+    """Service class for streaming entity exports"""
+
+    def __init__(self, entity: str):
+        if entity not in EXPORT_SPECS:
+            raise ValueError(f"Unsupported export entity: {entity}")
+        self.entity = entity
+        self.spec = EXPORT_SPECS[entity]
+        self.table = self.spec.model.__table__
+
+    @property
+    def available_columns(self) -> list[str]:
+        """All columns that can be selected for export"""
+        stored = [column.name for column in self.table.columns if column.name not in INTERNAL_COLUMNS]
+        return stored + list(self.spec.derived_columns)
+
+    def resolve_columns(self, requested: str | None = None) -> list[str]:
+        """Resolve a comma separated column selection, defaulting to the ``to_dict()`` fields"""
+        if not requested:
+            return list(self.spec.default_columns)
+
+        columns = [name.strip() for name in requested.split(",") if name.strip()]
+        available = set(self.available_columns)
+        unknown = [name for name in columns if name not in available]
+        if unknown:
+            raise ValueError(f"Unknown export columns: {', '.join(unknown)}")
+        return columns
+
+    def build_query(self, columns: list[str], search: str | None = None, filters: Mapping[str, str] | None = None):
+        """Build a column-only select statement with search and equality filters applied"""
+        statement = select(*(self._column(name) for name in columns))
+
+        if search:
+            search_term = f"%{search}%"
+            statement = statement.where(
+                or_(*(self.table.c[name].ilike(search_term) for name in self.spec.search_columns))
+            )
+
+        for name in self.spec.filter_columns:
+            raw_value = (filters or {}).get(name)
+            if raw_value in (None, ""):
+                continue
+            column = self.table.c[name]
+            if isinstance(column.type, Boolean):
+                value = raw_value.lower() in ("true", "1", "yes")
+            elif isinstance(column.type, Integer):
+                value = int(raw_value)
+            else:
+                value = raw_value
+            statement = statement.where(column == value)
+
+        return statement.order_by(self.table.c[self.spec.order_by], self.table.c.id)
+
+    def _column(self, name: str):
+        if name in self.spec.derived_columns:
+            return self.spec.derived_columns[name]().label(name)
+        return self.table.c[name]
+
+    def iter_batches(self, statement) -> Iterator[list[tuple]]:
+        """Yield result rows in batches from a server-side cursor"""
+        result = db.session.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for partition in result.partitions():
+            yield [tuple(row) for row in partition]
+
+    def stream(self, export_format: str, columns: list[str], statement) -> Iterator[bytes]:
+        """Serialize the query result in the requested format"""
+        writers = {
+            "json": self._stream_json,
+            "ndjson": self._stream_ndjson,
+            "csv": self._stream_csv,
+            "xlsx": self._stream_xlsx,
+        }
+        return writers[export_format](columns, statement)
+
+    def _stream_json(self, columns: list[str], statement) -> Iterator[bytes]:
+        yield f'{{"{self.spec.collection}": ['.encode()
+        count = 0
+        for batch in self.iter_batches(statement):
+            parts = []
+            for row in batch:
+                record = json.dumps({name: _serialize_value(value) for name, value in zip(columns, row, strict=True)})
+                parts.append(record if count == 0 else "," + record)
+                count += 1
+            yield "".join(parts).encode()
+        trailer = self.spec.json_envelope(count) if self.spec.json_envelope else {}
+        trailer.update(count=count, exported_at=datetime.now(UTC).isoformat())
+        yield ("], " + json.dumps(trailer)[1:]).encode()
+
+    def _stream_ndjson(self, columns: list[str], statement) -> Iterator[bytes]:
+        for batch in self.iter_batches(statement):
+            lines = (
+                json.dumps({name: _serialize_value(value) for name, value in zip(columns, row, strict=True)})
+                for row in batch
+            )
+            yield ("\n".join(lines) + "\n").encode()
+
+    def _stream_csv(self, columns: list[str], statement) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for batch in self.iter_batches(statement):
+            writer.writerows([[_serialize_value(value) for value in row] for row in batch])
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+    def _stream_xlsx(self, columns: list[str], statement) -> Iterator[bytes]:
+        # Write-only workbooks spool rows to disk; the finished archive is streamed from a temp file
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet(title=self.entity.capitalize())
+        worksheet.append(columns)
+        for batch in self.iter_batches(statement):
+            for row in batch:
+                worksheet.append(list(row))
+
+        with tempfile.TemporaryFile() as spool:
+            workbook.save(spool)
+            spool.seek(0)
+            while chunk := spool.read(XLSX_CHUNK_SIZE):
+                yield chunk
+
+    def export_response(self, args: Mapping[str, str]) -> Response:
+        """Create a streaming Flask response for the export described by the request arguments"""
+        export_format = args.get("format", "json").lower()
+        if export_format not in EXPORT_MIMETYPES:
+            raise ValueError(f"Unsupported format: {export_format}")
+
+        columns = self.resolve_columns(args.get("columns"))
+        statement = self.build_query(columns, search=args.get("search"), filters=args)
+
+        response = Response(
+            stream_with_context(self.stream(export_format, columns, statement)),
+            mimetype=EXPORT_MIMETYPES[export_format],
+        )
+        if export_format != "json":
+            timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+            response.headers["Content-Disposition"] = (
+                f"attachment; filename={self.entity}_export_{timestamp}.{export_format}"
+            )
+        return response
@@ -0,0 +1,90 @@
+"""
+Import Deduplication Service
+
+Resolves import rows to existing records through their normalized natural keys
+(see ``src.utils.natural_keys``). Keys are looked up per chunk with a single
+indexed ``IN`` query instead of one query per row, and rows without an exact
+match can be checked for near-duplicates with one indexed prefix scan per chunk.
+"""
+
+import difflib
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import and_, or_, select
+
+from src.models.user import db
+
+# Keys per IN (...) / OR query, well below the bound parameter limits of SQLite
+LOOKUP_BATCH_SIZE = 500
+# Near-duplicate candidates must share this many leading characters
+NEAR_DUPLICATE_PREFIX_LENGTH = 4
+# Minimum difflib similarity ratio for a near-duplicate
+NEAR_DUPLICATE_THRESHOLD = 0.9
+
+
+def _batches(values: list[str], size: int) -> Iterable[list[str]]:
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+class NaturalKeyIndex:
+    """In-memory view of the natural keys of one model, filled chunk by chunk"""
+
+    def __init__(self, model):
+        self.model = model
+        self.column = model.natural_key
+        self._records: dict[str, Any] = {}
+        self._resolved: set[str] = set()
+        self.queries = 0
+
+    def prime(self, keys: Iterable[str | None]) -> None:
+        """Load the existing records for all keys that have not been resolved yet"""
+        missing = sorted({key for key in keys if key and key not in self._resolved})
+        for batch in _batches(missing, LOOKUP_BATCH_SIZE):
+            self.queries += 1
+            for record in db.session.scalars(select(self.model).where(self.column.in_(batch))):
+                self._records.setdefault(record.natural_key, record)
+        self._resolved.update(missing)
+
+    def get(self, key: str | None) -> Any | None:
+        """Return the record for a primed key, if it exists"""
+        if not key:
+            return None
+        return self._records.get(key)
+
+    def add(self, key: str | None, record: Any) -> None:
+        """Register a record created during the import so later rows see it"""
+        if key:
+            self._records.setdefault(key, record)
+            self._resolved.add(key)
+
+    def near_duplicates(
+        self, keys: Iterable[str | None], threshold: float = NEAR_DUPLICATE_THRESHOLD
+    ) -> dict[str, str]:
+        """
+        Find existing keys that are nearly identical to keys without an exact match.
+
+        Returns:
+            Mapping of new key to the closest existing key
+        """
+        unmatched = sorted({key for key in keys if key and key not in self._records})
+        prefixes = sorted({key[:NEAR_DUPLICATE_PREFIX_LENGTH] for key in unmatched})
+        candidates: dict[str, list[str]] = defaultdict(list)
+
+        # Prefix ranges instead of LIKE so the natural key index is used on every dialect
+        for batch in _batches(prefixes, LOOKUP_BATCH_SIZE):
+            self.queries += 1
+            ranges = [and_(self.column >= prefix, self.column < prefix + "\uffff") for prefix in batch]
+            for existing_key in db.session.scalars(select(self.column).where(or_(*ranges)).distinct()):
+                candidates[existing_key[:NEAR_DUPLICATE_PREFIX_LENGTH]].append(existing_key)
+
+        matches = {}
+        for key in unmatched:
+            close = difflib.get_close_matches(
+                key, candidates.get(key[:NEAR_DUPLICATE_PREFIX_LENGTH], []), n=1, cutoff=threshold
+            )
+            if close:
+                matches[key] = close[0]
+        return matches
@@ -0,0 +1,270 @@
+"""
+PDF Cache
+
+Content-addressed disk cache for rendered PDFs. Entries are keyed by a hash of
+the render function, the template version and the report data (which includes
+the language), so a changed project or client automatically produces a new key
+and a stale PDF can never be served. Entries are tagged with the projects and
+clients they were built from and are removed eagerly when those rows change.
+
+The directory is shared by every worker of a server and by the report
+pre-generation command, so it is the source of truth. A lookup of a key the
+in-memory index does not know checks the disk and adopts a PDF another process
+wrote. Hits touch the file's modification time, which orders entries for
+eviction across processes. The cache is bounded by the total bytes in the
+directory: every store rescans it and evicts the least recently used entries,
+whichever process wrote them.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+
+from src.models.landscape import Client, Project, ProjectPlant
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever a PDF layout changes so previously cached renders are not reused
+PDF_TEMPLATE_VERSION = 1
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Fields that change on every request; only their date part identifies a render
+VOLATILE_FIELDS = frozenset(["generated_at", "valid_until", "invoice_date", "due_date"])
+# Tag shared by all reports that aggregate over every project
+SUMMARY_TAG = "summary"
+# Subdirectory of the cache directory holding the PDFs of render jobs (see src.services.pdf_render)
+JOBS_DIRECTORY = "jobs"
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: (str(item)[:10] if key in VOLATILE_FIELDS and item else _normalize(item))
+            for key, item in value.items()
+        }
+    if isinstance(value, list | tuple):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def cache_key(render: Callable, args: Iterable[Any]) -> str:
+    """Content hash identifying the PDF a render call produces"""
+    payload = {
+        "renderer": f"{render.__module__}.{render.__qualname__}",
+        "template_version": PDF_TEMPLATE_VERSION,
+        "args": _normalize(list(args)),
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class PDFCache:
+    """LRU-bounded, content-addressed PDF store in one directory"""
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._tags: dict[str, set[str]] = defaultdict(set)
+        self._total_bytes = 0
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.pdf")
+
+    def _load(self) -> None:
+        if not self._loaded:
+            self._scan()
+
+    def _scan(self) -> None:
+        """Re-index the directory, least recently used first"""
+        # Entries used at the same time keep the order this process saw them in
+        rank = {key: position for position, key in enumerate(self._entries)}
+        found = []
+        if os.path.isdir(self.directory):
+            for root, dirs, files in os.walk(self.directory):
+                # Job PDFs are not cache entries
+                dirs[:] = [name for name in dirs if name != JOBS_DIRECTORY]
+                for name in files:
+                    if not name.endswith(".pdf"):
+                        continue
+                    try:
+                        stat = os.stat(os.path.join(root, name))
+                    except FileNotFoundError:
+                        # Evicted by another process during the scan
+                        continue
+                    key = name[:-4]
+                    found.append((stat.st_mtime_ns, rank.get(key, -1), key, stat.st_size))
+        self._entries = OrderedDict((key, size) for _mtime, _rank, key, size in sorted(found))
+        self._total_bytes = sum(self._entries.values())
+        self._loaded = True
+
+    @staticmethod
+    def _touch(path: str) -> None:
+        # Exact times: the coarse clock the kernel stamps files with would tie entries used together
+        now = time.time_ns()
+        os.utime(path, ns=(now, now))
+
+    def get(self, key: str) -> str | None:
+        """Path of a cached PDF, or None on a miss"""
+        with self._lock:
+            self._load()
+            path = self.path_for(key)
+            try:
+                self._touch(path)
+                size = os.path.getsize(path)
+            except FileNotFoundError:
+                # Never stored, or evicted by another process
+                self._discard(key)
+                self.misses += 1
+                return None
+            if key not in self._entries:
+                # Stored by another worker or the pre-generation command
+                self._entries[key] = size
+                self._total_bytes += size
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return path
+
+    def put(self, key: str, pdf_bytes: bytes, tags: Iterable[str] = ()) -> str | None:
+        """Store a rendered PDF; returns its path, or None when it is not cacheable"""
+        if not pdf_bytes.startswith(b"%PDF") or len(pdf_bytes) > self.max_bytes:
+            return None
+
+        path = self.path_for(key)
+        with self._lock:
+            self._load()
+            if key not in self._entries:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Write then rename so concurrent readers never see a partial file
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+                with os.fdopen(fd, "wb") as tmp_file:
+                    tmp_file.write(pdf_bytes)
+                os.replace(tmp_path, path)
+                self._entries[key] = len(pdf_bytes)
+            self._touch(path)
+            self._entries.move_to_end(key)
+            for tag in tags:
+                self._tags[tag].add(key)
+            # The other processes' entries count against the same bound
+            self._scan()
+            self._evict()
+        return path
+
+    def _discard(self, key: str) -> None:
+        size = self._entries.pop(key, None)
+        if size is None:
+            return
+        self._total_bytes -= size
+        try:
+            os.remove(self.path_for(key))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self) -> None:
+        while self._total_bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Remove every entry built from one of the tagged rows"""
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    if key in self._entries:
+                        self._discard(key)
+                        removed += 1
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._load()
+            for key in list(self._entries):
+                self._discard(key)
+            self._tags.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "directory": self.directory,
+                "entries": len(self._entries),
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups * 100, 1) if lookups else 0,
+            }
+
+
+_caches: dict[str, PDFCache] = {}
+_caches_lock = threading.Lock()
+
+
+def pdf_cache_directory() -> str:
+    """The PDF cache directory of the current app; shared by the workers of one server"""
+    return current_app.config.get("PDF_CACHE_DIR") or os.path.join(current_app.instance_path, "pdf_cache")
+
+
+def get_pdf_cache() -> PDFCache | None:
+    """The PDF cache configured for the current app, or None when caching is disabled"""
+    if not has_app_context() or not current_app.config.get("PDF_CACHE_ENABLED", True):
+        return None
+    directory = pdf_cache_directory()
+    with _caches_lock:
+        if directory not in _caches:
+            _caches[directory] = PDFCache(
+                directory, int(current_app.config.get("PDF_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+            )
+        return _caches[directory]
+
+
+def project_tags(project_id: int | None, client_id: int | None = None) -> tuple[str, ...]:
+    """Cache tags for a PDF built from a project (and its client)"""
+    tags = []
+    if project_id is not None:
+        tags.append(f"project:{project_id}")
+    if client_id is not None:
+        tags.append(f"client:{client_id}")
+    return tuple(tags)
+
+
+def invalidate_tags(tags: Iterable[str]) -> None:
+    """Drop tagged entries from every cache in this process"""
+    tags = list(tags)
+    with _caches_lock:
+        caches = list(_caches.values())
+    for pdf_cache in caches:
+        removed = pdf_cache.invalidate_tags(tags)
+        if removed:
+            logger.debug("Invalidated %d cached PDFs for %s", removed, tags)
+
+
+def _row_tags(target) -> list[str]:
+    if isinstance(target, Project):
+        return [SUMMARY_TAG, *project_tags(target.id, target.client_id)]
+    if isinstance(target, Client):
+        return [SUMMARY_TAG, *project_tags(None, target.id)]
+    return [SUMMARY_TAG, *project_tags(target.project_id)]
+
+
+def _invalidate_row(mapper, connection, target) -> None:
+    invalidate_tags(_row_tags(target))
+
+
+for _model in (Project, Client, ProjectPlant):
+    for _event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event_name, _invalidate_row)
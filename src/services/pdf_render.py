@@ -0,0 +1,637 @@
+"""
+PDF Rendering Service
+
+Runs CPU-bound ReportLab layout outside the request worker. Report data is
+shipped to a bounded process pool; callers get a job handle back and may wait
+for it with a deadline. When the pool is saturated new jobs are rejected
+instead of queueing without limit, so a burst of PDF requests cannot starve
+regular API traffic. Queue depth and render timings are tracked for monitoring.
+
+Render functions must be module-level callables that take plain (picklable)
+data and return the PDF as bytes. A document made of independent sections can
+be submitted with ``submit_sections``: every section is rendered as its own
+PDF in the pool and the parts are merged in order (with pypdf), so the
+sections render in parallel and their timings are reported per section.
+
+Jobs are stored in the ``pdf_render_jobs`` table and finished PDFs in the
+``jobs`` directory of the PDF cache directory, so a client polling a job can
+reach any worker. Each worker has its own pool and pending limit;
+``PDF_RENDER_MAX_PENDING_TOTAL`` caps the pending renders of all workers
+together, counted from the stored jobs.
+"""
+
+import io
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterable
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from flask import current_app, has_app_context
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.models.landscape import PDFRenderJob
+from src.models.user import db
+from src.services.pdf_cache import JOBS_DIRECTORY, PDFCache, cache_key, get_pdf_cache, pdf_cache_directory
+from src.utils.error_handlers import LandscapeError
+
+try:
+    from pypdf import PdfWriter
+except ImportError:
+    PdfWriter = None
+
+logger = logging.getLogger(__name__)
+
+# Defaults, overridable through the PDF_RENDER_* app config keys
+DEFAULT_WORKERS = min(2, os.cpu_count() or 1)
+DEFAULT_MAX_PENDING = 8
+# Short enough that a request does not hold a sync gunicorn worker for long
+DEFAULT_WAIT_SECONDS = 5.0
+# Jobs are kept this long so their result can still be downloaded; a job still
+# pending after this long was lost with its worker
+JOB_RETENTION_SECONDS = 300
+# Expired jobs are removed from the job store at most this often by each worker
+EXPIRE_INTERVAL_SECONDS = 60
+
+
+class PDFRenderBusyError(LandscapeError):
+    """Raised when the render queue is full"""
+
+    def __init__(self, pending: int):
+        super().__init__(
+            "PDF rendering is busy, please try again shortly",
+            status_code=503,
+            payload={"pending_jobs": pending},
+        )
+
+
+def render_wait(args) -> float | None:
+    """Wait time requested by the client: ``?async=1`` returns a job handle immediately"""
+    if str(args.get("async", "")).lower() in ("1", "true", "yes"):
+        return 0
+    return None
+
+
+def _timed_render(render: Callable[..., bytes], args: tuple) -> tuple[bytes, float]:
+    """Run a render function and report how long it took (runs in the worker)"""
+    started = time.perf_counter()
+    pdf_bytes = render(*args)
+    return pdf_bytes, time.perf_counter() - started
+
+
+def _utcnow() -> datetime:
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def can_merge_sections() -> bool:
+    """Whether sectioned documents can be merged (pypdf is installed)"""
+    return PdfWriter is not None
+
+
+def merge_pdfs(parts: Iterable[bytes]) -> bytes:
+    """Concatenate PDF documents in order"""
+    writer = PdfWriter()
+    for part in parts:
+        writer.append(io.BytesIO(part))
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+@dataclass
+class RenderJob:
+    """Handle for a submitted PDF render"""
+
+    id: str
+    filename: str
+    future: Future
+    submitted_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    render_seconds: float | None = None
+    # Where the finished PDF is cached, if caching is enabled
+    cache: PDFCache | None = None
+    cache_key: str | None = None
+    cache_tags: tuple[str, ...] = ()
+    path: str | None = None
+    # Pool slots taken while pending: one per section of a sectioned render
+    slots: int = 1
+    section_seconds: dict[str, float] | None = None
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def wait(self, timeout: float | None) -> bool:
+        """Wait up to ``timeout`` seconds; returns whether the job finished"""
+        try:
+            self.future.exception(timeout=timeout)
+        except FutureTimeoutError:
+            return False
+        except CancelledError:
+            return True
+        return True
+
+    def result(self) -> bytes:
+        """The rendered PDF; re-raises the render error if rendering failed"""
+        pdf_bytes = self.future.result()[0]
+        if pdf_bytes is None and self.path:
+            with open(self.path, "rb") as pdf_file:
+                return pdf_file.read()
+        return pdf_bytes
+
+    @property
+    def status(self) -> str:
+        if not self.future.done():
+            return "pending"
+        if self.future.cancelled() or self.future.exception():
+            return "failed"
+        return "completed"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "filename": self.filename,
+            "submitted_at": self.submitted_at,
+            "render_seconds": self.render_seconds,
+            **({"section_seconds": self.section_seconds} if self.section_seconds is not None else {}),
+        }
+
+
+class PDFRenderService:
+    """Bounded process pool for PDF rendering"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+        self._executor_pid: int | None = None
+        self._jobs: dict[str, RenderJob] = {}
+        self._pending = 0
+        self._expired_at = float("-inf")
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "total_render_seconds": 0.0,
+            "max_render_seconds": 0.0,
+        }
+        # Render timings per section name of sectioned documents
+        self._section_stats: dict[str, dict[str, float]] = {}
+
+    @staticmethod
+    def _config(key: str, default):
+        if has_app_context():
+            return current_app.config.get(key, default)
+        return default
+
+    @property
+    def mode(self) -> str:
+        """``process`` renders in the pool, ``inline`` in the calling thread (used in tests)"""
+        return self._config("PDF_RENDER_MODE", "process")
+
+    @property
+    def max_workers(self) -> int:
+        return int(self._config("PDF_RENDER_WORKERS", DEFAULT_WORKERS))
+
+    @property
+    def max_pending(self) -> int:
+        return int(self._config("PDF_RENDER_MAX_PENDING", DEFAULT_MAX_PENDING))
+
+    @property
+    def max_pending_total(self) -> int | None:
+        """Pending slots allowed on all workers together; None for no shared limit"""
+        return int(self._config("PDF_RENDER_MAX_PENDING_TOTAL", 0)) or None
+
+    @property
+    def default_wait(self) -> float:
+        return float(self._config("PDF_RENDER_WAIT_SECONDS", DEFAULT_WAIT_SECONDS))
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Created lazily and per process: gunicorn preloads the app before forking workers
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            self._executor_pid = os.getpid()
+        return self._executor
+
+    def _prune_jobs(self) -> None:
+        cutoff = time.time() - JOB_RETENTION_SECONDS
+        expired = [job_id for job_id, job in self._jobs.items() if job.finished_at and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _record(self, job: RenderJob, raw: Future) -> bytes | None:
+        """Count a finished render; returns the PDF, or None when rendering failed"""
+        with self._lock:
+            self._pending -= job.slots
+            job.finished_at = time.time()
+            if raw.cancelled() or raw.exception() is not None:
+                self._stats["failed"] += 1
+                return None
+            pdf_bytes, render_seconds = raw.result()
+            job.render_seconds = round(render_seconds, 4)
+            self._stats["completed"] += 1
+            self._stats["total_render_seconds"] += job.render_seconds
+            self._stats["max_render_seconds"] = max(self._stats["max_render_seconds"], job.render_seconds)
+            for name, seconds in (job.section_seconds or {}).items():
+                stats = self._section_stats.setdefault(name, {"renders": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+                stats["renders"] += 1
+                stats["total_seconds"] += seconds
+                stats["max_seconds"] = max(stats["max_seconds"], seconds)
+        return pdf_bytes
+
+    def _finish(self, app, job: RenderJob, raw: Future) -> None:
+        # The job resolves once its outcome is stored, so a waiting request and a poll agree
+        pdf_bytes = self._record(job, raw)
+        if pdf_bytes is not None and job.cache is not None:
+            try:
+                job.path = job.cache.put(job.cache_key, pdf_bytes, job.cache_tags)
+            except OSError:
+                logger.exception("Could not cache rendered PDF %s", job.filename)
+
+        if app is not None and has_app_context():
+            self._store_outcome(job, pdf_bytes)
+        elif app is not None:
+            # Called from a thread of the pool
+            with app.app_context():
+                self._store_outcome(job, pdf_bytes)
+
+        if raw.cancelled():
+            job.future.cancel()
+        elif raw.exception() is not None:
+            job.future.set_exception(raw.exception())
+        else:
+            # A PDF on disk is read from there; jobs are kept in memory for JOB_RETENTION_SECONDS
+            job.future.set_result((None if job.path else pdf_bytes, job.render_seconds))
+
+    # Job store shared by the workers. Its rows are written through a connection of their own, so
+    # submitting a job never commits or discards what the calling request has pending in its session.
+    def _expire_stored_jobs(self, connection) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._expired_at < EXPIRE_INTERVAL_SECONDS:
+                return
+            self._expired_at = now
+        cutoff = _utcnow() - timedelta(seconds=JOB_RETENTION_SECONDS)
+        expired = connection.execute(
+            select(PDFRenderJob.id, PDFRenderJob.path).where(PDFRenderJob.submitted_at < cutoff)
+        ).all()
+        for job_id, path in expired:
+            # Cached renders are left to the cache
+            if path and os.path.basename(path) == f"{job_id}.pdf":
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+        if expired:
+            connection.execute(delete(PDFRenderJob).where(PDFRenderJob.id.in_([job_id for job_id, _path in expired])))
+
+    def _store_job(self, job: RenderJob) -> None:
+        try:
+            with db.engine.begin() as connection:
+                self._expire_stored_jobs(connection)
+                connection.execute(
+                    insert(PDFRenderJob).values(
+                        id=job.id,
+                        filename=job.filename,
+                        status="pending",
+                        slots=job.slots,
+                        cache_key=job.cache_key,
+                        submitted_at=_utcnow(),
+                    )
+                )
+        except SQLAlchemyError:
+            logger.exception("Could not store PDF job %s; only this worker can report on it", job.id)
+
+    @staticmethod
+    def _write_job_pdf(job_id: str, pdf_bytes: bytes) -> str:
+        directory = os.path.join(pdf_cache_directory(), JOBS_DIRECTORY)
+        os.makedirs(directory, exist_ok=True)
+        # Write then rename so a worker serving the job never reads a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(pdf_bytes)
+        path = os.path.join(directory, f"{job_id}.pdf")
+        os.replace(tmp_path, path)
+        return path
+
+    def _store_outcome(self, job: RenderJob, pdf_bytes: bytes | None) -> None:
+        try:
+            if pdf_bytes is not None and job.path is None:
+                # A cached render is already on shared disk
+                job.path = self._write_job_pdf(job.id, pdf_bytes)
+            with db.engine.begin() as connection:
+                connection.execute(
+                    update(PDFRenderJob)
+                    .where(PDFRenderJob.id == job.id)
+                    .values(
+                        path=job.path,
+                        status="completed" if job.path else "failed",
+                        render_seconds=job.render_seconds,
+                        section_seconds=job.section_seconds,
+                        finished_at=_utcnow(),
+                    )
+                )
+        except (OSError, SQLAlchemyError):
+            logger.exception("Could not store the outcome of PDF job %s", job.id)
+
+    @staticmethod
+    def _shared_pending() -> int | None:
+        """Slots pending on all workers, counted from the stored jobs; None when they cannot be counted"""
+        if not has_app_context():
+            return None
+        cutoff = _utcnow() - timedelta(seconds=JOB_RETENTION_SECONDS)
+        try:
+            with db.engine.connect() as connection:
+                return int(
+                    connection.scalar(
+                        select(func.coalesce(func.sum(PDFRenderJob.slots), 0)).where(
+                            PDFRenderJob.status == "pending", PDFRenderJob.submitted_at >= cutoff
+                        )
+                    )
+                )
+        except SQLAlchemyError:
+            logger.exception("Could not count pending PDF jobs")
+            return None
+
+    @staticmethod
+    def _stored_job(job_id: str) -> RenderJob | None:
+        with db.engine.connect() as connection:
+            row = connection.execute(select(PDFRenderJob.__table__).where(PDFRenderJob.id == job_id)).first()
+        if row is None:
+            return None
+        future = Future()
+        if row.status == "completed":
+            if not row.path or not os.path.exists(row.path):
+                return None
+            future.set_result((None, row.render_seconds or 0.0))
+        elif row.status == "failed" or row.submitted_at < _utcnow() - timedelta(seconds=JOB_RETENTION_SECONDS):
+            future.set_exception(RuntimeError(f"PDF job {job_id} failed or was lost with its worker"))
+        return RenderJob(
+            id=row.id,
+            filename=row.filename,
+            future=future,
+            submitted_at=row.submitted_at.replace(tzinfo=UTC).timestamp(),
+            render_seconds=row.render_seconds,
+            cache_key=row.cache_key,
+            path=row.path,
+            slots=row.slots,
+            section_seconds=row.section_seconds,
+        )
+
+    @staticmethod
+    def _cached_job(pdf_cache: PDFCache | None, key: str | None, filename: str) -> RenderJob | None:
+        # A cached render is returned as a finished job without touching the pool
+        cached_path = pdf_cache.get(key) if pdf_cache is not None else None
+        if not cached_path:
+            return None
+        future = Future()
+        future.set_result((None, 0.0))
+        return RenderJob(id=uuid.uuid4().hex, filename=filename, future=future, cache_key=key, path=cached_path)
+
+    def _reserve(self, slots: int) -> None:
+        max_pending_total = self.max_pending_total
+        # Counted before taking the lock: it queries the database
+        shared = self._shared_pending() if max_pending_total else None
+        with self._lock:
+            self._prune_jobs()
+            # Every slot counts against the limit, so a sectioned job cannot overshoot it
+            # (and one with more sections than the limit is never accepted)
+            full_here = self._pending + slots > self.max_pending
+            full_everywhere = shared is not None and shared + slots > max_pending_total
+            if full_here or full_everywhere:
+                self._stats["rejected"] += 1
+                logger.warning(
+                    "PDF render of %d slot(s) rejected: %d pending here, %s on all workers",
+                    slots,
+                    self._pending,
+                    shared,
+                )
+                raise PDFRenderBusyError(self._pending if full_here else shared)
+            self._pending += slots
+            self._stats["submitted"] += 1
+
+    def _start(self, render: Callable[..., bytes], args: tuple) -> Future:
+        if self.mode == "inline":
+            future = Future()
+            try:
+                future.set_result(_timed_render(render, args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        return self._get_executor().submit(_timed_render, render, args)
+
+    def _track(self, job: RenderJob, raw: Future) -> RenderJob:
+        """Store the job and resolve it when ``raw`` (the render) finishes"""
+        # Pool callbacks run in another thread and need the app to store the outcome
+        app = current_app._get_current_object() if has_app_context() else None
+        with self._lock:
+            self._jobs[job.id] = job
+        if app is not None:
+            self._store_job(job)
+        raw.add_done_callback(lambda done: self._finish(app, job, done))
+        return job
+
+    def submit(
+        self, render: Callable[..., bytes], *args, filename: str, cache_tags: Iterable[str] | None = None
+    ) -> RenderJob:
+        """
+        Queue a render and return its handle.
+
+        When the PDF cache is enabled a cached render is returned as a finished job
+        without touching the pool; new renders are stored under ``cache_tags``.
+
+        Raises:
+            PDFRenderBusyError: If the job does not fit under this worker's or the shared pending limit
+        """
+        pdf_cache = get_pdf_cache()
+        key = cache_key(render, args) if pdf_cache is not None else None
+        cached = self._cached_job(pdf_cache, key, filename)
+        if cached:
+            return cached
+
+        self._reserve(1)
+        try:
+            raw = self._start(render, args)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+        return self._track(
+            RenderJob(
+                id=uuid.uuid4().hex,
+                filename=filename,
+                future=Future(),
+                cache=pdf_cache,
+                cache_key=key,
+                cache_tags=tuple(cache_tags or ()),
+            ),
+            raw,
+        )
+
+    def submit_sections(
+        self,
+        render: Callable[..., bytes],
+        sections: list[tuple[str, tuple]],
+        *,
+        filename: str,
+        cache_tags: Iterable[str] | None = None,
+    ) -> RenderJob:
+        """
+        Queue a document whose sections render in parallel and are merged in order.
+
+        ``sections`` holds ``(name, args)`` pairs; ``render(*args)`` must return
+        one section as a complete PDF. Each section takes a pool slot while it
+        is pending, and the finished job reports ``section_seconds`` per name.
+        Requires pypdf (see ``can_merge_sections``).
+
+        Raises:
+            PDFRenderBusyError: If the job does not fit under this worker's or the shared pending limit
+        """
+        pdf_cache = get_pdf_cache()
+        key = cache_key(render, sections) if pdf_cache is not None else None
+        cached = self._cached_job(pdf_cache, key, filename)
+        if cached:
+            return cached
+
+        self._reserve(len(sections))
+        parts = []
+        try:
+            for _name, args in sections:
+                parts.append(self._start(render, args))
+        except Exception:
+            for part in parts:
+                part.cancel()
+            with self._lock:
+                self._pending -= len(sections)
+            raise
+
+        merged = Future()
+        job = self._track(
+            RenderJob(
+                id=uuid.uuid4().hex,
+                filename=filename,
+                future=Future(),
+                cache=pdf_cache,
+                cache_key=key,
+                cache_tags=tuple(cache_tags or ()),
+                slots=len(sections),
+            ),
+            merged,
+        )
+        remaining = [len(parts)]
+        remaining_lock = threading.Lock()
+
+        def part_done(_part: Future) -> None:
+            with remaining_lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            self._merge_sections(job, [name for name, _args in sections], parts, merged)
+
+        for part in parts:
+            part.add_done_callback(part_done)
+        return job
+
+    @staticmethod
+    def _merge_sections(job: RenderJob, names: list[str], parts: list[Future], merged: Future) -> None:
+        # Runs once every section has finished, in the thread that completed the last one
+        try:
+            results = [part.result() for part in parts]
+            started = time.perf_counter()
+            pdf_bytes = merge_pdfs(pdf for pdf, _seconds in results)
+            merge_seconds = time.perf_counter() - started
+        except BaseException as e:
+            merged.set_exception(e)
+            return
+        job.section_seconds = {name: round(seconds, 4) for name, (_pdf, seconds) in zip(names, results, strict=True)}
+        merged.set_result((pdf_bytes, sum(seconds for _pdf, seconds in results) + merge_seconds))
+
+    def render(
+        self,
+        render: Callable[..., bytes],
+        *args,
+        filename: str,
+        wait: float | None = None,
+        cache_tags: Iterable[str] | None = None,
+    ) -> RenderJob:
+        """Submit a render and wait for it up to ``wait`` seconds (the configured deadline by default)"""
+        job = self.submit(render, *args, filename=filename, cache_tags=cache_tags)
+        job.wait(self.default_wait if wait is None else wait)
+        return job
+
+    def render_sections(
+        self,
+        render: Callable[..., bytes],
+        sections: list[tuple[str, tuple]],
+        *,
+        filename: str,
+        wait: float | None = None,
+        cache_tags: Iterable[str] | None = None,
+    ) -> RenderJob:
+        """Submit a sectioned render and wait for it up to ``wait`` seconds (the configured deadline by default)"""
+        job = self.submit_sections(render, sections, filename=filename, cache_tags=cache_tags)
+        job.wait(self.default_wait if wait is None else wait)
+        return job
+
+    def get_job(self, job_id: str) -> RenderJob | None:
+        """A job submitted to any worker; those of other workers are read from the job store"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None or not has_app_context():
+            return job
+        return self._stored_job(job_id)
+
+    def metrics(self) -> dict[str, Any]:
+        """Queue depth, limits and render timings"""
+        pending_total = self._shared_pending()
+        with self._lock:
+            completed = self._stats["completed"]
+            pending = self._pending
+            return {
+                "mode": self.mode,
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": pending,
+                "max_pending_total": self.max_pending_total,
+                "pending_total": pending_total,
+                "queued": max(0, pending - self.max_workers),
+                "tracked_jobs": len(self._jobs),
+                "submitted": self._stats["submitted"],
+                "completed": completed,
+                "failed": self._stats["failed"],
+                "rejected": self._stats["rejected"],
+                "avg_render_seconds": (
+                    round(self._stats["total_render_seconds"] / completed, 4) if completed else None
+                ),
+                "max_render_seconds": round(self._stats["max_render_seconds"], 4),
+                "sections": {
+                    name: {
+                        "renders": stats["renders"],
+                        "avg_render_seconds": round(stats["total_seconds"] / stats["renders"], 4),
+                        "max_render_seconds": round(stats["max_seconds"], 4),
+                    }
+                    for name, stats in self._section_stats.items()
+                },
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None and self._executor_pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._executor_pid = None
+
+
+pdf_renderer = PDFRenderService()
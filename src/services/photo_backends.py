@@ -0,0 +1,353 @@
+"""
+Photo Storage Backends
+
+Where photo files are kept. Photo rows keep the paths they always had, rooted
+at ``UPLOAD_FOLDER``; a backend maps such a path to an object key (the path
+relative to ``UPLOAD_FOLDER``) and keeps the file under that key:
+
+- ``local`` keeps the files under ``UPLOAD_FOLDER`` (the default; every node
+  needs the same disk)
+- ``s3`` keeps them in an S3-compatible bucket (AWS, MinIO, ...) and needs boto3
+- ``fake`` keeps them in a local directory that behaves like an object store,
+  with signed URLs; it stands in for S3 in tests and development
+
+With an object store ``UPLOAD_FOLDER`` is only a staging area on each node:
+uploads and derivatives are written there, stored in the bucket and removed,
+and originals are fetched there for processing. Files are transferred
+concurrently, and uploads and downloads of large files are split into parts
+by boto3. Reads are redirected to presigned URLs, so the API nodes do not
+serve image bytes themselves.
+"""
+
+import abc
+import base64
+import hashlib
+import hmac
+import mimetypes
+import os
+import shutil
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import parse_qs, quote, urlencode, urlsplit
+
+from flask import current_app
+
+try:
+    import boto3
+except ImportError:
+    boto3 = None
+
+# Defaults, overridable through the PHOTO_STORAGE_* app config keys
+DEFAULT_URL_EXPIRES = 3600
+# Concurrent transfers of one batch of files to or from an object store
+TRANSFER_WORKERS = 8
+
+
+class StorageBackend(abc.ABC):
+    """
+    Keeps photo files by their path under ``root``.
+
+    ``local`` backends serve files from disk; the others are object stores
+    whose files are fetched into and stored from the staging area under
+    ``root``, and served through ``url``.
+    """
+
+    name = "base"
+    local = False
+
+    def __init__(self, root: str, url_expires: int = DEFAULT_URL_EXPIRES):
+        self.root = os.path.abspath(root)
+        self.url_expires = url_expires
+
+    def key(self, path: str) -> str:
+        """Object key of a path under ``root``"""
+        relative = os.path.relpath(os.path.abspath(path), self.root)
+        if relative == os.curdir or relative.startswith(os.pardir):
+            raise ValueError(f"{path} is not under {self.root}")
+        return relative.replace(os.sep, "/")
+
+    @staticmethod
+    def content_type(path: str) -> str:
+        return mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+    @abc.abstractmethod
+    def store(self, local_path: str, path: str) -> None:
+        """Store a finished local file as ``path``; the local file is consumed"""
+
+    @abc.abstractmethod
+    def exists(self, path: str) -> bool:
+        """Whether ``path`` is stored"""
+
+    @abc.abstractmethod
+    def delete(self, path: str) -> None:
+        """Remove ``path``; a missing file is not an error"""
+
+    @abc.abstractmethod
+    def download(self, path: str, local_path: str) -> None:
+        """Copy ``path`` to ``local_path``"""
+
+    def url(self, path: str, content_type: str | None = None, download_name: str | None = None) -> str | None:
+        """A URL the client can read ``path`` from directly, None when it is served from disk"""
+        return None
+
+    def store_many(self, paths: Iterable[str]) -> None:
+        """Store files written to the staging area at their own paths"""
+        paths = list(paths)
+        if self.local or not paths:
+            return
+        with ThreadPoolExecutor(max_workers=min(TRANSFER_WORKERS, len(paths))) as pool:
+            list(pool.map(lambda path: self.store(path, path), paths))
+
+    @contextmanager
+    def local_copies(self, paths: Iterable[str]) -> Iterator[dict[str, Exception]]:
+        """
+        Make files available at their own paths on the local disk while the context lasts.
+
+        The files are fetched concurrently. Yields the error for each path that
+        could not be fetched; fetched copies are removed afterwards.
+        """
+        paths = list(dict.fromkeys(paths))
+        if self.local or not paths:
+            yield {}
+            return
+
+        def fetch(path: str) -> Exception | None:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.download"
+            try:
+                self.download(path, temp_path)
+                os.replace(temp_path, path)
+            except Exception as e:
+                return e
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            return None
+
+        with ThreadPoolExecutor(max_workers=min(TRANSFER_WORKERS, len(paths))) as pool:
+            outcomes = dict(zip(paths, pool.map(fetch, paths), strict=True))
+        fetched = [path for path, error in outcomes.items() if error is None]
+        try:
+            yield {path: error for path, error in outcomes.items() if error is not None}
+        finally:
+            for path in fetched:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+
+class LocalStorage(StorageBackend):
+    """Files on the local (or shared) disk under ``UPLOAD_FOLDER``"""
+
+    name = "local"
+    local = True
+
+    def store(self, local_path: str, path: str) -> None:
+        if os.path.abspath(local_path) != os.path.abspath(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(local_path, path)
+
+    def exists(self, path: str) -> bool:
+        return os.path.exists(path)
+
+    def delete(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def download(self, path: str, local_path: str) -> None:
+        shutil.copyfile(path, local_path)
+
+
+class S3Storage(StorageBackend):
+    """Files in an S3-compatible bucket, under ``prefix``"""
+
+    name = "s3"
+
+    def __init__(
+        self,
+        root: str,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: str | None = None,
+        region: str | None = None,
+        url_expires: int = DEFAULT_URL_EXPIRES,
+        client=None,
+    ):
+        super().__init__(root, url_expires)
+        if not bucket:
+            raise ValueError("PHOTO_STORAGE_BUCKET is required for the s3 photo storage backend")
+        if client is None:
+            if boto3 is None:
+                raise RuntimeError("The s3 photo storage backend needs boto3")
+            client = boto3.client("s3", endpoint_url=endpoint_url, region_name=region)
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+
+    def object_key(self, path: str) -> str:
+        return self.prefix + self.key(path)
+
+    def store(self, local_path: str, path: str) -> None:
+        # upload_file switches to a multipart upload for large files
+        self.client.upload_file(
+            local_path, self.bucket, self.object_key(path), ExtraArgs={"ContentType": self.content_type(path)}
+        )
+        os.remove(local_path)
+
+    def exists(self, path: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.object_key(path))
+        except self.client.exceptions.ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    def delete(self, path: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self.object_key(path))
+
+    def download(self, path: str, local_path: str) -> None:
+        self.client.download_file(self.bucket, self.object_key(path), local_path)
+
+    def url(self, path: str, content_type: str | None = None, download_name: str | None = None) -> str:
+        params = {"Bucket": self.bucket, "Key": self.object_key(path)}
+        if content_type:
+            params["ResponseContentType"] = content_type
+        if download_name:
+            params["ResponseContentDisposition"] = f"inline; filename*=UTF-8''{quote(download_name)}"
+        return self.client.generate_presigned_url("get_object", Params=params, ExpiresIn=self.url_expires)
+
+
+class FakeObjectStorage(StorageBackend):
+    """
+    Object store in a local directory, like a single-node MinIO.
+
+    Objects live under ``<directory>/<bucket>/<key>`` and are only reached
+    through the backend; URLs are signed and expire like presigned S3 URLs
+    and can be checked and read back with ``read_url``.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        root: str,
+        directory: str,
+        bucket: str = "photos",
+        base_url: str = "http://objects.local",
+        secret: str = "fake-object-storage",  # noqa: S107
+        url_expires: int = DEFAULT_URL_EXPIRES,
+    ):
+        super().__init__(root, url_expires)
+        self.directory = os.path.abspath(directory)
+        self.bucket = bucket
+        self.base_url = base_url.rstrip("/")
+        self._secret = secret.encode()
+        self._lock = threading.Lock()
+        self.requests = {"put": 0, "get": 0, "head": 0, "delete": 0}
+
+    def _count(self, request: str) -> None:
+        with self._lock:
+            self.requests[request] += 1
+
+    def object_path(self, path: str) -> str:
+        return os.path.join(self.directory, self.bucket, *self.key(path).split("/"))
+
+    def store(self, local_path: str, path: str) -> None:
+        self._count("put")
+        target = self.object_path(path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.move(local_path, target)
+
+    def exists(self, path: str) -> bool:
+        self._count("head")
+        return os.path.exists(self.object_path(path))
+
+    def delete(self, path: str) -> None:
+        self._count("delete")
+        try:
+            os.remove(self.object_path(path))
+        except FileNotFoundError:
+            pass
+
+    def download(self, path: str, local_path: str) -> None:
+        self._count("get")
+        shutil.copyfile(self.object_path(path), local_path)
+
+    def _signature(self, key: str, expires: int) -> str:
+        digest = hmac.new(self._secret, f"{self.bucket}/{key}:{expires}".encode(), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).decode().rstrip("=")
+
+    def url(self, path: str, content_type: str | None = None, download_name: str | None = None) -> str:
+        key = self.key(path)
+        expires = int(time.time()) + self.url_expires
+        query = urlencode({"expires": expires, "signature": self._signature(key, expires)})
+        return f"{self.base_url}/{self.bucket}/{quote(key)}?{query}"
+
+    def read_url(self, url: str) -> bytes:
+        """The object a URL from ``url`` points to; raises PermissionError when it is invalid or expired"""
+        parts = urlsplit(url)
+        query = parse_qs(parts.query)
+        bucket_prefix = f"/{self.bucket}/"
+        if not parts.path.startswith(bucket_prefix) or not {"expires", "signature"} <= query.keys():
+            raise PermissionError("Not a signed object URL")
+        key = parts.path[len(bucket_prefix) :]
+        expires = int(query["expires"][0])
+        if expires < time.time() or not hmac.compare_digest(query["signature"][0], self._signature(key, expires)):
+            raise PermissionError("Invalid or expired signature")
+        self._count("get")
+        with open(os.path.join(self.directory, self.bucket, *key.split("/")), "rb") as stored:
+            return stored.read()
+
+
+_backends: dict[tuple, StorageBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_photo_storage() -> StorageBackend:
+    """The photo storage backend configured for the current app (PHOTO_STORAGE_BACKEND)"""
+    config = current_app.config
+    root = os.path.abspath(config.get("UPLOAD_FOLDER", "uploads"))
+    name = config.get("PHOTO_STORAGE_BACKEND") or "local"
+    url_expires = int(config.get("PHOTO_STORAGE_URL_EXPIRES", DEFAULT_URL_EXPIRES))
+    bucket = config.get("PHOTO_STORAGE_BUCKET")
+    settings = (
+        name,
+        root,
+        url_expires,
+        bucket,
+        config.get("PHOTO_STORAGE_PREFIX", ""),
+        config.get("PHOTO_STORAGE_ENDPOINT_URL"),
+        config.get("PHOTO_STORAGE_FAKE_DIR"),
+    )
+    with _backends_lock:
+        if settings not in _backends:
+            if name == "local":
+                backend = LocalStorage(root, url_expires)
+            elif name == "s3":
+                backend = S3Storage(
+                    root,
+                    bucket,
+                    prefix=config.get("PHOTO_STORAGE_PREFIX", ""),
+                    endpoint_url=config.get("PHOTO_STORAGE_ENDPOINT_URL"),
+                    region=config.get("PHOTO_STORAGE_REGION"),
+                    url_expires=url_expires,
+                )
+            elif name == "fake":
+                backend = FakeObjectStorage(
+                    root,
+                    config.get("PHOTO_STORAGE_FAKE_DIR") or os.path.join(current_app.instance_path, "objects"),
+                    bucket=bucket or "photos",
+                    secret=config.get("SECRET_KEY") or "fake-object-storage",
+                    url_expires=url_expires,
+                )
+            else:
+                raise ValueError(f"Unknown photo storage backend: {name}")
+            _backends[settings] = backend
+        return _backends[settings]
@@ -0,0 +1,253 @@
+"""
+Photo Delivery
+
+Builds the responses for the photo file and thumbnail routes.
+
+What the routes need to know about a photo (its files, mimetype and version)
+is kept in a bounded in-memory cache, so serving a gallery does not query the
+database for every image. Entries expire after a TTL (other processes may
+have changed the row), are dropped when the photo row changes in this process
+and are re-read when a cached file turns out to be missing.
+
+Responses carry a strong ETag derived from the photo version, so they stay
+valid across servers, and support conditional and range requests. URLs that
+carry the current version (``?v=``, see ``Photo.file_url``) never change their
+content and are served as immutable. Behind nginx the file itself can be
+handed off with X-Accel-Redirect (``PHOTO_X_ACCEL_REDIRECT_PREFIX``); Flask's
+``USE_X_SENDFILE`` does the same for X-Sendfile servers.
+
+With an object storage backend (see src.services.photo_backends) the routes
+redirect to a presigned URL of the file instead of serving it. The redirect
+is cached for at most half the URL lifetime, so a cached one still works.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import quote
+
+from flask import Response, current_app, redirect, request, send_file
+from sqlalchemy import event
+
+from src.models.photo import Photo
+from src.models.user import db
+from src.services.photo_backends import get_photo_storage
+from src.services.photo_pipeline import pick_derivative
+
+DEFAULT_CACHE_SIZE = 4096
+DEFAULT_CACHE_TTL_SECONDS = 300
+# Versioned URLs never change their content
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
+@dataclass(frozen=True)
+class PhotoFiles:
+    """The files of a photo as far as serving them is concerned"""
+
+    photo_id: int
+    version: str
+    file_path: str | None
+    mime_type: str | None
+    original_filename: str
+    thumbnail_path: str | None
+    derivatives: dict[str, dict] | None
+    is_public: bool
+
+    @classmethod
+    def from_photo(cls, photo: Photo) -> "PhotoFiles":
+        return cls(
+            photo_id=photo.id,
+            version=photo.version,
+            file_path=photo.file_path,
+            mime_type=photo.mime_type,
+            original_filename=photo.original_filename,
+            thumbnail_path=photo.thumbnail_path,
+            derivatives=photo.derivatives or None,
+            is_public=photo.is_public is not False,
+        )
+
+    def original(self) -> list[tuple[str, str | None, str]]:
+        """Candidates for the original as (path, mimetype, download name)"""
+        return [(self.file_path, self.mime_type, self.original_filename)] if self.file_path else []
+
+    def thumbnail(self, size: str | None, webp: bool) -> list[tuple[str, str | None, str]]:
+        """
+        Candidates for a downscaled copy, best first.
+
+        Raises ValueError for an invalid ``size`` (see pick_derivative).
+        """
+        candidates = []
+        if self.derivatives:
+            derivative = pick_derivative(self.derivatives, size, webp=webp)
+            if derivative is None:
+                # No derivative is large enough
+                return self.original()
+            path, mimetype = derivative
+            candidates.append((path, mimetype, os.path.basename(path)))
+        if self.thumbnail_path:
+            candidates.append((self.thumbnail_path, "image/jpeg", f"thumb_{self.original_filename}"))
+        if self.file_path:
+            candidates.append((self.file_path, self.mime_type, f"thumb_{self.original_filename}"))
+        return candidates
+
+
+class PhotoPathCache:
+    """Bounded LRU of PhotoFiles by photo ID with a time to live"""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE, ttl: float = DEFAULT_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[int, tuple[float, PhotoFiles]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def get(self, photo_id: int) -> PhotoFiles | None:
+        with self._lock:
+            cached = self._entries.get(photo_id)
+            if cached is None or cached[0] <= time.monotonic():
+                self._entries.pop(photo_id, None)
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(photo_id)
+            self._stats["hits"] += 1
+            return cached[1]
+
+    def put(self, files: PhotoFiles) -> None:
+        with self._lock:
+            self._entries[files.photo_id] = (time.monotonic() + self.ttl, files)
+            self._entries.move_to_end(files.photo_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, photo_id: int) -> None:
+        with self._lock:
+            self._entries.pop(photo_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self.max_entries, **self._stats}
+
+
+photo_path_cache = PhotoPathCache()
+
+
+def _configure_cache() -> None:
+    photo_path_cache.max_entries = int(current_app.config.get("PHOTO_PATH_CACHE_SIZE", DEFAULT_CACHE_SIZE))
+    photo_path_cache.ttl = float(current_app.config.get("PHOTO_PATH_CACHE_TTL", DEFAULT_CACHE_TTL_SECONDS))
+
+
+def get_photo_files(photo_id: int, refresh: bool = False) -> PhotoFiles | None:
+    """The files of a photo, from the cache when possible; None when the photo does not exist"""
+    _configure_cache()
+    files = None if refresh else photo_path_cache.get(photo_id)
+    if files is None:
+        photo = db.session.get(Photo, photo_id, populate_existing=refresh)
+        if photo is None:
+            return None
+        files = PhotoFiles.from_photo(photo)
+        photo_path_cache.put(files)
+    return files
+
+
+def _etag(files: PhotoFiles, path: str) -> str:
+    return hashlib.sha1(f"{files.version}:{path}".encode(), usedforsecurity=False).hexdigest()[:20]
+
+
+def _set_cache_headers(response: Response, files: PhotoFiles) -> Response:
+    response.cache_control.public = files.is_public or None
+    response.cache_control.private = not files.is_public or None
+    if response.status_code == 302:
+        # Presigned URLs expire, so neither is the redirect immutable
+        response.cache_control.max_age = get_photo_storage().url_expires // 2
+    elif request.args.get("v") == files.version:
+        response.cache_control.no_cache = None
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        # Unversioned URLs revalidate, which is a cheap 304 thanks to the ETag
+        response.cache_control.no_cache = True
+        response.cache_control.max_age = None
+    return response
+
+
+def _accel_redirect(path: str, mimetype: str | None, download_name: str, etag: str) -> Response | None:
+    """Hand the file to nginx; None when it is not served from an internal location"""
+    prefix = current_app.config.get("PHOTO_X_ACCEL_REDIRECT_PREFIX")
+    if not prefix:
+        return None
+    root = os.path.abspath(current_app.config.get("UPLOAD_FOLDER", "uploads"))
+    relative = os.path.relpath(os.path.abspath(path), root)
+    if relative.startswith(os.pardir):
+        return None
+
+    response = Response(mimetype=mimetype or "application/octet-stream")
+    response.headers["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + quote(relative.replace(os.sep, "/"))
+    response.headers["Content-Disposition"] = f"inline; filename*=UTF-8''{quote(download_name)}"
+    response.set_etag(etag)
+    # nginx answers range requests itself; answer revalidation here without touching the disk
+    return response.make_conditional(request)
+
+
+def _send(files: PhotoFiles, candidates: list[tuple[str, str | None, str]]) -> Response | None:
+    storage = get_photo_storage()
+    if not storage.local:
+        # Recorded files are stored before the row points at them; checking would cost a request
+        for path, mimetype, download_name in candidates[:1]:
+            return redirect(storage.url(path, mimetype, download_name))
+        return None
+    for path, mimetype, download_name in candidates:
+        etag = _etag(files, path)
+        response = _accel_redirect(path, mimetype, download_name, etag)
+        if response is None:
+            try:
+                response = send_file(
+                    path, mimetype=mimetype, as_attachment=False, download_name=download_name, etag=etag
+                )
+            except FileNotFoundError:
+                continue
+        return response
+    return None
+
+
+def serve_photo_files(photo_id: int, pick, vary_accept: bool = False) -> Response | None:
+    """
+    Serve the first existing file of a photo.
+
+    ``pick`` maps the photo's PhotoFiles to its candidate files. Returns None
+    when the photo does not exist or none of its files do; raises what
+    ``pick`` raises. ``vary_accept`` marks responses that depend on the
+    Accept header (WebP negotiation).
+    """
+    files = get_photo_files(photo_id)
+    if files is None:
+        return None
+    response = _send(files, pick(files)[:1])
+    if response is None:
+        # The preferred file is gone: the cached entry may be out of date, e.g. after
+        # reprocessing in another process, so re-read it before falling back
+        files = get_photo_files(photo_id, refresh=True)
+        if files is None:
+            return None
+        response = _send(files, pick(files))
+    if response is None:
+        photo_path_cache.invalidate(photo_id)
+        return None
+    if vary_accept and files.derivatives:
+        response.vary.add("Accept")
+    return _set_cache_headers(response, files)
+
+
+def _photo_changed(mapper, connection, target) -> None:
+    photo_path_cache.invalidate(target.id)
+
+
+for _event_name in ("after_update", "after_delete"):
+    event.listen(Photo, _event_name, _photo_changed)
@@ -0,0 +1,638 @@
+"""
+Photo Processing Pipeline
+
+Generates photo derivatives outside the upload request. An upload only
+stores the original and commits the photo row in the ``pending`` state; the
+pipeline then decodes the image, writes a set of downscaled derivatives
+(thumb, medium and large, as JPEG and WebP by default) in a bounded thread
+pool (Pillow releases the GIL while decoding and resampling) and records the
+outcome in ``processing_state``.
+
+The photos table is the queue: a photo is claimed by moving it from
+``pending`` to ``processing`` in a single UPDATE, so every photo is processed
+once even with several application processes. Photos still pending after a
+restart, and photos left in ``processing`` by a worker that died, are picked
+up again by ``process_pending`` (run on start-up and by
+``flask photos process``). ``reprocess`` queues existing photos again, for
+example after changing the derivative sizes or to retry failures.
+
+Bulk uploads are processed as one batch: the originals are decoded in
+parallel in a process pool with one worker per available core.
+
+Photos with the same content (see src.services.photo_storage) share their
+derivative files: a photo whose content was already processed with the
+current settings takes over those derivatives without decoding anything.
+
+With an object storage backend (see src.services.photo_backends) the
+originals are fetched into ``UPLOAD_FOLDER`` before decoding, concurrently
+for a batch, and the derivatives written there are stored in the bucket
+before the photos are marked ready.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import click
+from flask import current_app, has_app_context
+from flask.cli import AppGroup
+from PIL import Image, features
+from sqlalchemy import select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.models.photo import Photo, PhotoProcessingState
+from src.models.user import db
+from src.services.photo_backends import get_photo_storage
+from src.services.photo_storage import remove_files
+
+logger = logging.getLogger(__name__)
+
+# Defaults, overridable through the PHOTO_PIPELINE_* and PHOTO_DERIVATIVE_* app config keys
+DEFAULT_WORKERS = min(2, os.cpu_count() or 1)
+# Bulk uploads decode in a process pool with one worker per available core
+DEFAULT_PROCESS_WORKERS = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+# A photo in ``processing`` for longer than this is assumed to be abandoned
+DEFAULT_STALE_SECONDS = 600
+# Bounding boxes of the derivatives; images are never enlarged
+DEFAULT_DERIVATIVE_SIZES = {"thumb": (300, 300), "medium": (800, 600), "large": (1600, 1200)}
+DEFAULT_DERIVATIVE_FORMATS = ("jpeg", "webp")
+
+# Pillow format, file extension, mimetype and save options per derivative format
+DERIVATIVE_FORMATS = {
+    "jpeg": ("JPEG", "jpg", "image/jpeg", {"quality": 85, "optimize": True, "progressive": True}),
+    "webp": ("WEBP", "webp", "image/webp", {"quality": 80, "method": 4}),
+}
+
+
+def _utcnow() -> datetime:
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def derivative_path(upload_folder: str, file_path: str, name: str, fmt: str) -> str:
+    """Where derivative ``name`` of an original is stored in format ``fmt``"""
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(upload_folder, "derivatives", name, f"{stem}.{DERIVATIVE_FORMATS[fmt][1]}")
+
+
+def _derivative_paths(thumbnail_path: str | None, derivatives: dict[str, dict] | None) -> set[str]:
+    paths = {thumbnail_path} if thumbnail_path else set()
+    for entry in (derivatives or {}).values():
+        paths.update(entry[fmt] for fmt in DERIVATIVE_FORMATS if fmt in entry)
+    return paths
+
+
+def derivative_files(photo: Photo) -> set[str]:
+    """Paths of the thumbnail and all derivatives recorded for a photo"""
+    return _derivative_paths(photo.thumbnail_path, photo.derivatives)
+
+
+def _fit(size: tuple[int, int], box: tuple[int, int]) -> tuple[int, int]:
+    """``size`` scaled down to fit in ``box`` with the same aspect ratio; never enlarged"""
+    width, height = size
+    scale = min(box[0] / width, box[1] / height, 1)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def process_photo_file(
+    file_path: str,
+    upload_folder: str,
+    sizes: dict[str, tuple[int, int]] = DEFAULT_DERIVATIVE_SIZES,
+    formats: tuple[str, ...] = DEFAULT_DERIVATIVE_FORMATS,
+) -> dict[str, Any]:
+    """
+    Read the dimensions of an image and write its derivatives.
+
+    The original is decoded once, at the smallest scale that still covers the
+    largest derivative (JPEG decoders scale by 1/2, 1/4 or 1/8 while decoding,
+    see ``Image.draft``). Each derivative is resized from the next larger one
+    (large -> medium -> thumb) rather than from the original, with a reducing
+    gap so big steps start with a fast integer ``reduce``.
+
+    Works on plain paths without an application context. Raises when the
+    image cannot be read or a derivative cannot be written.
+    """
+    # Largest first, so every derivative can be made from the previous one
+    ordered = sorted(sizes.items(), key=lambda item: item[1][0] * item[1][1], reverse=True)
+    with Image.open(file_path) as img:
+        width, height = img.size
+        if ordered:
+            img.draft("RGB", _fit(img.size, ordered[0][1]))
+        # JPEG has no alpha channel or palette
+        current = img.convert("RGB")
+
+    derivatives = {}
+    for name, box in ordered:
+        target = _fit((width, height), box)
+        if current.size != target:
+            current = current.resize(target, Image.Resampling.LANCZOS, reducing_gap=2.0)
+        entry = {"width": target[0], "height": target[1]}
+        for fmt in formats:
+            pil_format, _, _, options = DERIVATIVE_FORMATS[fmt]
+            path = derivative_path(upload_folder, file_path, name, fmt)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Derivatives may be shared with other photos: replace them atomically
+            temp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+            try:
+                current.save(temp_path, pil_format, **options)
+                os.replace(temp_path, path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            entry[fmt] = path
+        derivatives[name] = entry
+
+    # The smallest derivative doubles as the thumbnail, preferably as JPEG
+    smallest = derivatives[ordered[-1][0]] if ordered else {}
+    thumbnail_path = smallest.get("jpeg") or next((smallest[fmt] for fmt in formats if fmt in smallest), None)
+    return {"width": width, "height": height, "thumbnail_path": thumbnail_path, "derivatives": derivatives}
+
+
+def _call(fn: Callable, *args) -> Future:
+    """Run ``fn`` in the calling thread, with the outcome in a completed future like a pool's"""
+    future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def derivatives_current(
+    derivatives: dict[str, dict] | None,
+    width: int | None,
+    height: int | None,
+    sizes: dict[str, tuple[int, int]],
+    formats: tuple[str, ...],
+    exists: Callable[[str], bool] = os.path.exists,
+) -> bool:
+    """Whether recorded derivatives match the given settings and all of their files exist"""
+    if not derivatives or not width or not height or set(derivatives) != set(sizes):
+        return False
+    for name, box in sizes.items():
+        entry = derivatives[name]
+        if (entry["width"], entry["height"]) != _fit((width, height), box):
+            return False
+        if set(entry) - {"width", "height"} != set(formats):
+            return False
+        if not all(exists(entry[fmt]) for fmt in formats):
+            return False
+    return True
+
+
+def pick_derivative(derivatives: dict[str, dict], size: str | None, webp: bool = False) -> tuple[str, str] | None:
+    """
+    The derivative to serve for a requested size, as (path, mimetype).
+
+    ``size`` is a derivative name or a pixel count for the longest side, in
+    which case the smallest derivative at least that large is chosen; without
+    a size the smallest derivative is used. WebP is preferred when ``webp``.
+    Returns None when no derivative is large enough (the original is).
+    Raises ValueError for an unknown derivative name or an invalid size.
+    """
+    by_size = sorted(derivatives.items(), key=lambda item: max(item[1]["width"], item[1]["height"]))
+    if size is None:
+        entry = by_size[0][1] if by_size else None
+    elif size.isdigit():
+        pixels = int(size)
+        if pixels <= 0:
+            raise ValueError(f"Invalid size: {size}")
+        entry = next((entry for _, entry in by_size if max(entry["width"], entry["height"]) >= pixels), None)
+    elif size in derivatives:
+        entry = derivatives[size]
+    else:
+        raise ValueError(f"Unknown size: {size}. Available: {', '.join(name for name, _ in by_size)}")
+    if entry is None:
+        return None
+
+    preference = ("webp", "jpeg") if webp else ("jpeg", "webp")
+    fmt = next((fmt for fmt in preference if fmt in entry), None)
+    return (entry[fmt], DERIVATIVE_FORMATS[fmt][2]) if fmt else None
+
+
+class PhotoPipeline:
+    """Bounded thread pool that processes pending photos"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_pid: int | None = None
+        self._process_pool: ProcessPoolExecutor | None = None
+        self._process_pool_pid: int | None = None
+        self._stats = {"queued": 0, "processed": 0, "shared": 0, "failed": 0, "skipped": 0}
+
+    @staticmethod
+    def _config(key: str, default):
+        if has_app_context():
+            return current_app.config.get(key, default)
+        return default
+
+    @property
+    def mode(self) -> str:
+        """``thread`` processes in the pool, ``inline`` in the calling thread (used in tests)"""
+        return self._config("PHOTO_PIPELINE_MODE", "thread")
+
+    @property
+    def max_workers(self) -> int:
+        return int(self._config("PHOTO_PIPELINE_WORKERS", DEFAULT_WORKERS))
+
+    @property
+    def process_workers(self) -> int:
+        return int(self._config("PHOTO_PROCESS_WORKERS", None) or DEFAULT_PROCESS_WORKERS)
+
+    @property
+    def derivative_sizes(self) -> dict[str, tuple[int, int]]:
+        sizes = self._config("PHOTO_DERIVATIVE_SIZES", None) or DEFAULT_DERIVATIVE_SIZES
+        return {name: (int(box[0]), int(box[1])) for name, box in sizes.items()}
+
+    @property
+    def derivative_formats(self) -> tuple[str, ...]:
+        formats = self._config("PHOTO_DERIVATIVE_FORMATS", None) or DEFAULT_DERIVATIVE_FORMATS
+        # WebP needs a Pillow built with libwebp
+        return tuple(fmt for fmt in formats if fmt in DERIVATIVE_FORMATS and (fmt != "webp" or features.check("webp")))
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created lazily and per process: gunicorn preloads the app before forking workers
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="photo-pipeline")
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._process_pool is None or self._process_pool_pid != os.getpid():
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.process_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                self._process_pool_pid = os.getpid()
+            return self._process_pool
+
+    def _count(self, outcome: str, count: int = 1) -> None:
+        with self._lock:
+            self._stats[outcome] += count
+
+    @staticmethod
+    def _claim(photo_id: int) -> bool:
+        """Move a pending photo to ``processing``; False when it is gone or claimed by another worker"""
+        claimed = db.session.execute(
+            update(Photo)
+            .where(Photo.id == photo_id, Photo.processing_state == PhotoProcessingState.PENDING)
+            .values(processing_state=PhotoProcessingState.PROCESSING, updated_at=_utcnow())
+        )
+        db.session.commit()
+        return bool(claimed.rowcount)
+
+    def process(self, photo_id: int) -> PhotoProcessingState | None:
+        """
+        Process one pending photo in the current app context.
+
+        Returns the resulting state, or None when the photo was not pending
+        (deleted, already processed or claimed elsewhere).
+        """
+        if not self._claim(photo_id):
+            self._count("skipped")
+            return None
+
+        photo = db.session.get(Photo, photo_id)
+        if photo is None:
+            return None
+        shared = self._shared_result(photo)
+        info = shared or self._decode([photo.file_path])[photo.file_path]
+        if isinstance(info, Exception):
+            logger.error("Processing photo %s failed: %s", photo_id, info)
+        return self._record(photo, info, shared=shared is not None)
+
+    def _decode(self, paths: list[str], parallel: bool = False) -> dict[str, dict[str, Any] | Exception]:
+        """
+        Decode originals and store their derivatives; the result or error per path.
+
+        Originals kept in an object store are fetched first, concurrently. With
+        ``parallel`` several originals are decoded in the process pool.
+        """
+        storage = get_photo_storage()
+        args = (self._upload_folder(), self.derivative_sizes, self.derivative_formats)
+        with storage.local_copies(paths) as results:
+            paths = [path for path in paths if path not in results]
+            if parallel and len(paths) > 1:
+                pool = self._get_process_pool()
+                futures = {path: pool.submit(process_photo_file, path, *args) for path in paths}
+            else:
+                futures = {path: _call(process_photo_file, path, *args) for path in paths}
+            results.update({path: future.exception() or future.result() for path, future in futures.items()})
+
+        for path, info in results.items():
+            if isinstance(info, Exception):
+                continue
+            try:
+                storage.store_many(_derivative_paths(info["thumbnail_path"], info["derivatives"]))
+            except Exception as e:
+                results[path] = e
+        return results
+
+    @staticmethod
+    def _upload_folder() -> str:
+        return current_app.config.get("UPLOAD_FOLDER", "uploads")
+
+    def _record(self, photo: Photo, info: dict[str, Any] | Exception, shared: bool = False) -> PhotoProcessingState:
+        """Store the outcome of processing a claimed photo: its derivatives or the error"""
+        previous_files = derivative_files(photo)
+        if isinstance(info, Exception):
+            photo.processing_state = PhotoProcessingState.FAILED
+            photo.processing_error = str(info)[:500]
+            self._count("failed")
+        else:
+            photo.width = info["width"]
+            photo.height = info["height"]
+            photo.thumbnail_path = info["thumbnail_path"]
+            photo.derivatives = info["derivatives"]
+            photo.processing_state = PhotoProcessingState.READY
+            photo.processing_error = None
+            self._count("shared" if shared else "processed")
+        photo.processed_at = _utcnow()
+        if photo.processing_state == PhotoProcessingState.READY and photo.content_hash and not shared:
+            # The derivative files were rewritten for every photo with this content
+            db.session.execute(
+                update(Photo)
+                .where(
+                    Photo.content_hash == photo.content_hash,
+                    Photo.id != photo.id,
+                    Photo.processing_state == PhotoProcessingState.READY,
+                )
+                .values(
+                    width=photo.width,
+                    height=photo.height,
+                    thumbnail_path=photo.thumbnail_path,
+                    derivatives=photo.derivatives,
+                    processed_at=photo.processed_at,
+                )
+            )
+        db.session.commit()
+        if photo.processing_state == PhotoProcessingState.READY:
+            # Derivatives of earlier settings that were not written again
+            remove_files(previous_files - derivative_files(photo))
+        return photo.processing_state
+
+    def process_batch(self, photo_ids: list[int], parallel: bool | None = None) -> dict[str, int]:
+        """
+        Process several pending photos, decoding them in parallel.
+
+        Every distinct original is decoded once, in the process pool (or in
+        the calling thread when not ``parallel``; by default only in
+        ``thread`` mode), while the rows are updated here. Photos that are not
+        pending are skipped. Returns the number of photos per resulting state.
+        """
+        if parallel is None:
+            parallel = self.mode != "inline"
+        outcome = {state.value: 0 for state in (PhotoProcessingState.READY, PhotoProcessingState.FAILED)}
+        photos = []
+        for photo_id in photo_ids:
+            if not self._claim(photo_id):
+                self._count("skipped")
+                continue
+            photo = db.session.get(Photo, photo_id)
+            if photo is not None:
+                photos.append(photo)
+
+        # Derivatives already made for the same content are reused; the rest is decoded
+        shared = {photo.id: self._shared_result(photo) for photo in photos}
+        paths = list(dict.fromkeys(photo.file_path for photo in photos if shared[photo.id] is None))
+        results = self._decode(paths, parallel=parallel)
+
+        recorded = set()
+        for photo in photos:
+            info = shared[photo.id] or results[photo.file_path]
+            if isinstance(info, Exception):
+                logger.error("Processing photo %s failed: %s", photo.id, info)
+            # Later photos with the same original share the derivatives of the first
+            state = self._record(photo, info, shared=shared[photo.id] is not None or photo.file_path in recorded)
+            recorded.add(photo.file_path)
+            outcome[state.value] += 1
+        return outcome
+
+    def _shared_result(self, photo: Photo) -> dict[str, Any] | None:
+        """The derivatives of a processed photo with the same content, if still up to date"""
+        if not photo.content_hash:
+            return None
+        donor = db.session.execute(
+            select(Photo)
+            .where(
+                Photo.content_hash == photo.content_hash,
+                Photo.id != photo.id,
+                Photo.processing_state == PhotoProcessingState.READY,
+                Photo.derivatives.isnot(None),
+            )
+            .order_by(Photo.processed_at.desc())
+            .limit(1)
+        ).scalar_one_or_none()
+        if donor is None or not derivatives_current(
+            donor.derivatives,
+            donor.width,
+            donor.height,
+            self.derivative_sizes,
+            self.derivative_formats,
+            exists=get_photo_storage().exists,
+        ):
+            return None
+        return {
+            "width": donor.width,
+            "height": donor.height,
+            "thumbnail_path": donor.thumbnail_path,
+            "derivatives": donor.derivatives,
+        }
+
+    def _run(self, app, photo_id: int) -> None:
+        with app.app_context():
+            try:
+                self.process(photo_id)
+            except Exception:
+                db.session.rollback()
+                logger.exception("Photo pipeline failed on photo %s", photo_id)
+            finally:
+                db.session.remove()
+
+    def enqueue(self, photo_id: int) -> Future | None:
+        """
+        Process a committed pending photo in the background.
+
+        In ``inline`` mode the photo is processed before returning. A photo
+        that cannot be queued stays pending for the next ``process_pending``.
+        """
+        self._count("queued")
+        if self.mode == "inline":
+            self.process(photo_id)
+            return None
+        # The worker needs its own app context and session
+        app = current_app._get_current_object()
+        try:
+            return self._get_executor().submit(self._run, app, photo_id)
+        except RuntimeError:
+            logger.warning("Photo pipeline is shut down, photo %s left pending", photo_id)
+            return None
+
+    def _run_batch(self, app, photo_ids: list[int]) -> None:
+        with app.app_context():
+            try:
+                self.process_batch(photo_ids)
+            except Exception:
+                db.session.rollback()
+                logger.exception("Photo pipeline failed on a batch of %d photos", len(photo_ids))
+            finally:
+                db.session.remove()
+
+    def enqueue_batch(self, photo_ids: list[int]) -> Future | None:
+        """
+        Process committed pending photos in the background as one batch (see ``process_batch``).
+
+        In ``inline`` mode the photos are processed before returning.
+        """
+        if not photo_ids:
+            return None
+        self._count("queued", len(photo_ids))
+        if self.mode == "inline":
+            self.process_batch(photo_ids)
+            return None
+        app = current_app._get_current_object()
+        try:
+            return self._get_executor().submit(self._run_batch, app, list(photo_ids))
+        except RuntimeError:
+            logger.warning("Photo pipeline is shut down, %d photos left pending", len(photo_ids))
+            return None
+
+    def _requeue_stale(self) -> int:
+        stale_seconds = float(self._config("PHOTO_PIPELINE_STALE_SECONDS", DEFAULT_STALE_SECONDS))
+        cutoff = _utcnow() - timedelta(seconds=stale_seconds)
+        requeued = db.session.execute(
+            update(Photo)
+            .where(Photo.processing_state == PhotoProcessingState.PROCESSING, Photo.updated_at < cutoff)
+            .values(processing_state=PhotoProcessingState.PENDING)
+        )
+        db.session.commit()
+        return requeued.rowcount
+
+    def process_pending(self, limit: int | None = None) -> dict[str, int]:
+        """
+        Process the photos waiting in the queue, oldest first, in the calling thread.
+
+        Photos abandoned in ``processing`` by a worker that died are put back
+        first. Returns the number of photos per resulting state.
+        """
+        self._requeue_stale()
+        query = select(Photo.id).where(Photo.processing_state == PhotoProcessingState.PENDING).order_by(Photo.id)
+        if limit is not None:
+            query = query.limit(limit)
+        outcome = {state.value: 0 for state in (PhotoProcessingState.READY, PhotoProcessingState.FAILED)}
+        for photo_id in db.session.execute(query).scalars().all():
+            state = self.process(photo_id)
+            if state is not None:
+                outcome[state.value] += 1
+        return outcome
+
+    def reprocess(self, photo_ids: list[int] | None = None, failed_only: bool = False, enqueue: bool = True) -> int:
+        """
+        Queue existing photos for processing again and return how many were queued.
+
+        Selects ``photo_ids`` (all photos when None), optionally only those that
+        failed; photos being processed right now are left alone. With
+        ``enqueue=False`` they are only marked pending, for ``process_pending``.
+        """
+        conditions = [Photo.processing_state != PhotoProcessingState.PROCESSING]
+        if photo_ids is not None:
+            conditions.append(Photo.id.in_(photo_ids))
+        if failed_only:
+            conditions.append(Photo.processing_state == PhotoProcessingState.FAILED)
+        queued = db.session.execute(select(Photo.id).where(*conditions).order_by(Photo.id)).scalars().all()
+        if not queued:
+            return 0
+        db.session.execute(
+            update(Photo)
+            .where(Photo.id.in_(queued), *conditions)
+            .values(processing_state=PhotoProcessingState.PENDING, processing_error=None)
+        )
+        db.session.commit()
+        if enqueue:
+            for photo_id in queued:
+                self.enqueue(photo_id)
+        return len(queued)
+
+    def start(self, app) -> None:
+        """Pick up photos left pending or abandoned by a previous run once the app serves its first request"""
+        if app.config.get("PHOTO_PIPELINE_MODE", "thread") != "thread":
+            return
+        pending = [True]
+
+        # Deferred so that building an app (CLI commands, tests) does not touch the database
+        @app.before_request
+        def _recover_once():
+            with self._lock:
+                if not pending:
+                    return
+                pending.clear()
+            self._get_executor().submit(self._recover, app)
+
+    def _recover(self, app) -> None:
+        with app.app_context():
+            try:
+                outcome = self.process_pending()
+                if any(outcome.values()):
+                    logger.info("Photo pipeline caught up: %s", outcome)
+            except SQLAlchemyError as e:
+                # For example before the database has been created or migrated
+                db.session.rollback()
+                logger.warning("Photo pipeline recovery skipped: %s", e.__class__.__name__)
+            except Exception:
+                db.session.rollback()
+                logger.exception("Photo pipeline recovery failed")
+            finally:
+                db.session.remove()
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "max_workers": self.max_workers,
+                "process_workers": self.process_workers,
+                **self._stats,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the pool; ``wait`` finishes the queued photos first, otherwise they stay pending"""
+        with self._lock:
+            executor = self._executor if self._executor_pid == os.getpid() else None
+            process_pool = self._process_pool if self._process_pool_pid == os.getpid() else None
+            self._executor = None
+            self._executor_pid = None
+            self._process_pool = None
+            self._process_pool_pid = None
+        # Outside the lock: finishing workers still update the counters
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+        if process_pool is not None:
+            process_pool.shutdown(wait=wait, cancel_futures=not wait)
+
+
+photo_pipeline = PhotoPipeline()
+
+photos_cli = AppGroup("photos", help="Process uploaded photos.")
+
+
+@photos_cli.command("process")
+@click.option("--limit", type=int, default=None, help="Process at most this many photos.")
+def process_command(limit):
+    """Process the photos waiting in the queue."""
+    outcome = photo_pipeline.process_pending(limit=limit)
+    click.echo(f"Processed {outcome['ready']} photo(s), {outcome['failed']} failed")
+
+
+@photos_cli.command("reprocess")
+@click.option("--failed", "failed_only", is_flag=True, help="Only photos whose processing failed.")
+@click.option("--id", "photo_ids", type=int, multiple=True, help="Only this photo (repeatable).")
+def reprocess_command(failed_only, photo_ids):
+    """Generate the derivatives of existing photos again."""
+    queued = photo_pipeline.reprocess(list(photo_ids) or None, failed_only=failed_only, enqueue=False)
+    outcome = photo_pipeline.process_pending()
+    click.echo(f"Reprocessed {queued} photo(s): {outcome['ready']} ready, {outcome['failed']} failed")
@@ -2,16 +2,27 @@
 
 import os
 import uuid
+import zipfile
+from collections.abc import Iterable, Iterator
 from datetime import datetime
-from typing import Any
+from typing import Any, BinaryIO
 
 from flask import current_app
-from PIL import Image
 from werkzeug.datastructures import FileStorage
 from werkzeug.utils import secure_filename
 
-from src.models.photo import Photo, PhotoCategory
+from src.models.photo import Photo, PhotoCategory, PhotoProcessingState
 from src.models.user import db
+from src.services.photo_backends import get_photo_storage
+from src.services.photo_pipeline import (
+    DEFAULT_DERIVATIVE_SIZES,
+    derivative_files,
+    photo_pipeline,
+    process_photo_file,
+)
+from src.services.photo_storage import FileTooLargeError, acquire_blob, ingest_stream, release_blob, remove_files
+
+NOT_AN_IMAGE = "File is not a supported image"
 
 
 class PhotoService:
@@ -19,8 +30,8 @@ class PhotoService:
 
     ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "gif", "webp"}
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
-    THUMBNAIL_SIZE = (300, 300)
-    MEDIUM_SIZE = (800, 600)
+    THUMBNAIL_SIZE = DEFAULT_DERIVATIVE_SIZES["thumb"]
+    MEDIUM_SIZE = DEFAULT_DERIVATIVE_SIZES["medium"]
 
     def __init__(self):
         self.upload_folder = current_app.config.get("UPLOAD_FOLDER", "uploads")
@@ -46,7 +57,7 @@ class PhotoService:
         return "." in filename and filename.rsplit(".", 1)[1].lower() in self.ALLOWED_EXTENSIONS
 
     def validate_file(self, file: FileStorage) -> dict[str, Any]:
-        """Validate uploaded file."""
+        """Validate uploaded file name; size and content are checked while the file is stored."""
         if not file or not file.filename:
             return {"valid": False, "error": "No file provided"}
 
@@ -56,18 +67,7 @@ class PhotoService:
                 "error": f'File type not allowed. Allowed: {", ".join(self.ALLOWED_EXTENSIONS)}',
             }
 
-        # Check file size (approximate)
-        file.seek(0, 2)  # Seek to end
-        size = file.tell()
-        file.seek(0)  # Reset to beginning
-
-        if size > self.MAX_FILE_SIZE:
-            return {
-                "valid": False,
-                "error": f"File too large. Maximum size: {self.MAX_FILE_SIZE // (1024*1024)}MB",
-            }
-
-        return {"valid": True, "size": size}
+        return {"valid": True}
 
     def generate_filename(self, original_filename: str) -> tuple:
         """Generate unique filename while preserving extension."""
@@ -91,42 +91,40 @@ class PhotoService:
         return os.path.join(self.upload_folder, "photos", category_folders.get(category, "general"))
 
     def process_image(self, file_path: str) -> dict[str, Any]:
-        """Process image to get dimensions and create thumbnail."""
+        """Process image to get dimensions and create its derivatives."""
         try:
-            with Image.open(file_path) as img:
-                width, height = img.size
-
-                # Create thumbnail
-                thumbnail_path = self._create_thumbnail(img, file_path)
-
-                return {"width": width, "height": height, "thumbnail_path": thumbnail_path}
+            return process_photo_file(
+                file_path, self.upload_folder, photo_pipeline.derivative_sizes, photo_pipeline.derivative_formats
+            )
         except Exception as e:
             current_app.logger.error(f"Error processing image {file_path}: {e!s}")
-            return {"width": None, "height": None, "thumbnail_path": None}
-
-    def _create_thumbnail(self, img: Image.Image, original_path: str) -> str | None:
-        """Create thumbnail for image."""
+            return {"width": None, "height": None, "thumbnail_path": None, "derivatives": None}
+
+    @staticmethod
+    def entity_column(category: PhotoCategory | None):
+        """Photo column holding the entity a photo of ``category`` belongs to, if any."""
+        return {
+            PhotoCategory.PLANT: Photo.plant_id,
+            PhotoCategory.MATERIAL: Photo.material_id,
+            PhotoCategory.PROPERTY: Photo.client_id,
+            PhotoCategory.PROJECT: Photo.project_id,
+        }.get(category)
+
+    @classmethod
+    def entity_fields(cls, category: PhotoCategory, entity_id: int | None) -> dict[str, int]:
+        """Foreign key linking a photo of ``category`` to its entity."""
+        column = cls.entity_column(category)
+        if not entity_id or column is None:
+            return {}
+        return {column.key: entity_id}
+
+    def _queue_processing(self, photo_id: int) -> None:
+        """Hand a stored photo to the pipeline; one that cannot be queued stays pending for the next run."""
         try:
-            # Create thumbnail
-            img_copy = img.copy()
-            img_copy.thumbnail(self.THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
-
-            # Generate thumbnail filename
-            base_name = os.path.basename(original_path)
-            name, ext = os.path.splitext(base_name)
-            thumbnail_name = f"thumb_{name}{ext}"
-            thumbnail_path = os.path.join(self.upload_folder, "thumbnails", thumbnail_name)
-
-            # Convert to RGB if necessary (for JPEG)
-            if img_copy.mode in ("RGBA", "LA", "P"):
-                img_copy = img_copy.convert("RGB")
-
-            img_copy.save(thumbnail_path, "JPEG", quality=85)
-            return thumbnail_path
-
+            photo_pipeline.enqueue(photo_id)
         except Exception as e:
-            current_app.logger.error(f"Error creating thumbnail: {e!s}")
-            return None
+            db.session.rollback()
+            current_app.logger.error(f"Error queueing photo {photo_id} for processing: {e!s}")
 
     def upload_photo(
         self,
@@ -145,29 +143,29 @@ class PhotoService:
             if not validation["valid"]:
                 return {"success": False, "error": validation["error"]}
 
-            # Generate filename
-            filename, extension = self.generate_filename(file.filename)
-
-            # Get category folder
-            category_folder = self.get_category_folder(category)
-            file_path = os.path.join(category_folder, filename)
-
-            # Save file
-            file.save(file_path)
-
-            # Process image
-            image_info = self.process_image(file_path)
+            # Store the content once, under its SHA-256 digest
+            extension = file.filename.rsplit(".", 1)[1].lower()
+            try:
+                ingest = ingest_stream(file.stream, self.upload_folder, self.MAX_FILE_SIZE)
+            except FileTooLargeError as e:
+                return {"success": False, "error": str(e)}
+            with ingest:
+                mime_type = ingest.mimetype
+                if mime_type is None:
+                    return {"success": False, "error": NOT_AN_IMAGE}
+                digest, size = ingest.digest, ingest.size
+                blob, blob_created = acquire_blob(digest, ingest.path, self.upload_folder, extension, size)
+            file_path = blob.file_path
 
             # Create photo record
             photo_data = {
-                "filename": filename,
+                "filename": os.path.basename(file_path),
                 "original_filename": secure_filename(file.filename),
                 "file_path": file_path,
-                "thumbnail_path": image_info.get("thumbnail_path"),
-                "file_size": validation["size"],
-                "mime_type": file.content_type,
-                "width": image_info.get("width"),
-                "height": image_info.get("height"),
+                "file_size": size,
+                "content_hash": digest,
+                "mime_type": mime_type,
+                "processing_state": PhotoProcessingState.PENDING,
                 "category": category,
                 "title": title or file.filename,
                 "description": description,
@@ -176,20 +174,14 @@ class PhotoService:
             }
 
             # Set entity relationship based on category
-            if entity_id:
-                if category == PhotoCategory.PLANT:
-                    photo_data["plant_id"] = entity_id
-                elif category == PhotoCategory.MATERIAL:
-                    photo_data["material_id"] = entity_id
-                elif category == PhotoCategory.PROPERTY:
-                    photo_data["client_id"] = entity_id
-                elif category == PhotoCategory.PROJECT:
-                    photo_data["project_id"] = entity_id
+            photo_data.update(self.entity_fields(category, entity_id))
 
             photo = Photo(**photo_data)
             db.session.add(photo)
             db.session.commit()
 
+            self._queue_processing(photo.id)
+
             return {
                 "success": True,
                 "photo": photo.to_dict(),
@@ -200,15 +192,120 @@ class PhotoService:
             db.session.rollback()
             current_app.logger.error(f"Error uploading photo: {e!s}")
 
-            # Clean up file if it was saved
-            if "file_path" in locals() and os.path.exists(file_path):
+            # Clean up the file if this upload stored it
+            if locals().get("blob_created"):
                 try:
-                    os.remove(file_path)
-                except OSError as cleanup_error:
+                    get_photo_storage().delete(file_path)
+                except Exception as cleanup_error:
                     current_app.logger.error(f"Error cleaning up file {file_path}: {cleanup_error!s}")
 
             return {"success": False, "error": f"Upload failed: {e!s}"}
 
+    def archive_entries(self, archive: BinaryIO) -> Iterator[tuple[str, BinaryIO]]:
+        """
+        Photos in a zip archive as (filename, stream).
+
+        Directories and hidden or macOS metadata entries are skipped; other
+        files are left to ``upload_photos`` to validate. Raises
+        zipfile.BadZipFile when the archive cannot be read.
+        """
+        with zipfile.ZipFile(archive) as zip_file:
+            for info in zip_file.infolist():
+                name = os.path.basename(info.filename)
+                if info.is_dir() or not name or name.startswith(".") or info.filename.startswith("__MACOSX/"):
+                    continue
+                with zip_file.open(info) as stream:
+                    yield name, stream
+
+    def upload_photos(
+        self,
+        files: Iterable[tuple[str, BinaryIO]],
+        category: PhotoCategory,
+        entity_id: int | None = None,
+        uploaded_by_id: int | None = None,
+        max_files: int | None = None,
+    ) -> dict[str, Any]:
+        """
+        Upload many photos at once.
+
+        ``files`` yields (filename, stream); each file is streamed
+        into storage as it is read. All photo rows are inserted in a single
+        transaction and processed as one batch. Returns a result per file.
+        """
+        results = []
+        stored = []
+        created_files = []
+        try:
+            for index, (filename, stream) in enumerate(files):
+                if max_files is not None and index >= max_files:
+                    results.append(
+                        {"filename": filename, "success": False, "error": f"Too many files (max {max_files})"}
+                    )
+                    continue
+                if not self.allowed_file(filename):
+                    results.append(
+                        {
+                            "filename": filename,
+                            "success": False,
+                            "error": f'File type not allowed. Allowed: {", ".join(self.ALLOWED_EXTENSIONS)}',
+                        }
+                    )
+                    continue
+                try:
+                    ingest = ingest_stream(stream, self.upload_folder, self.MAX_FILE_SIZE)
+                except (FileTooLargeError, zipfile.BadZipFile) as e:
+                    # Too large, or a corrupt archive entry
+                    results.append({"filename": filename, "success": False, "error": str(e)})
+                    continue
+                with ingest:
+                    if ingest.mimetype is None:
+                        results.append({"filename": filename, "success": False, "error": NOT_AN_IMAGE})
+                        continue
+                    digest, size = ingest.digest, ingest.size
+                    extension = filename.rsplit(".", 1)[1].lower()
+                    blob, blob_created = acquire_blob(digest, ingest.path, self.upload_folder, extension, size)
+                if blob_created:
+                    created_files.append(blob.file_path)
+
+                photo = Photo(
+                    filename=os.path.basename(blob.file_path),
+                    original_filename=secure_filename(filename),
+                    file_path=blob.file_path,
+                    file_size=size,
+                    content_hash=digest,
+                    mime_type=ingest.mimetype,
+                    processing_state=PhotoProcessingState.PENDING,
+                    category=category,
+                    title=filename,
+                    uploaded_by_id=uploaded_by_id,
+                    **self.entity_fields(category, entity_id),
+                )
+                db.session.add(photo)
+                stored.append(photo)
+                results.append({"filename": filename, "success": True})
+
+            db.session.commit()
+        except Exception:
+            # Nothing is stored unless every accepted file is
+            db.session.rollback()
+            storage = get_photo_storage()
+            for path in created_files:
+                storage.delete(path)
+            raise
+
+        try:
+            photo_pipeline.enqueue_batch([photo.id for photo in stored])
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Error queueing {len(stored)} photos for processing: {e!s}")
+
+        photos = iter(stored)
+        for result in results:
+            if result["success"]:
+                result["photo"] = next(photos).to_dict()
+        uploaded = len(stored)
+        return {"results": results, "uploaded": uploaded, "failed": len(results) - uploaded}
+
     def get_photos(
         self,
         category: PhotoCategory | None = None,
@@ -222,19 +319,35 @@ class PhotoService:
         if category:
             query = query.filter(Photo.category == category)
 
-        if entity_id:
-            if category == PhotoCategory.PLANT:
-                query = query.filter(Photo.plant_id == entity_id)
-            elif category == PhotoCategory.MATERIAL:
-                query = query.filter(Photo.material_id == entity_id)
-            elif category == PhotoCategory.PROPERTY:
-                query = query.filter(Photo.client_id == entity_id)
-            elif category == PhotoCategory.PROJECT:
-                query = query.filter(Photo.project_id == entity_id)
+        column = self.entity_column(category)
+        if entity_id and column is not None:
+            query = query.filter(column == entity_id)
 
+        # Served by the (entity, category, uploaded_at) gallery indexes
         photos = query.order_by(Photo.uploaded_at.desc()).offset(offset).limit(limit).all()
         return [photo.to_dict() for photo in photos]
 
+    @classmethod
+    def get_primary_photos(cls, category: PhotoCategory, entity_ids: Iterable[int]) -> dict[int, dict[str, Any]]:
+        """
+        Primary photos of many entities of ``category`` in one query.
+
+        Returns {entity_id: photo dict} for the entities that have a primary
+        photo, so list pages can attach thumbnails without a query per row.
+        """
+        column = cls.entity_column(category)
+        entity_ids = {entity_id for entity_id in entity_ids if entity_id}
+        if column is None or not entity_ids:
+            return {}
+
+        photos = (
+            Photo.query.filter(column.in_(entity_ids), Photo.category == category, Photo.is_primary)
+            .order_by(Photo.uploaded_at, Photo.id)
+            .all()
+        )
+        # Should an entity have several primary photos, the latest one wins
+        return {getattr(photo, column.key): photo.to_dict() for photo in photos}
+
     def delete_photo(self, photo_id: int) -> dict[str, Any]:
         """Delete photo and associated files."""
         try:
@@ -242,17 +355,20 @@ class PhotoService:
             if not photo:
                 return {"success": False, "error": "Photo not found"}
 
-            # Delete files
-            if photo.file_path and os.path.exists(photo.file_path):
-                os.remove(photo.file_path)
+            files = derivative_files(photo)
+            if photo.file_path:
+                files.add(photo.file_path)
+            digest = photo.content_hash
 
-            if photo.thumbnail_path and os.path.exists(photo.thumbnail_path):
-                os.remove(photo.thumbnail_path)
-
-            # Delete database record
+            # Delete database record; files shared with other photos stay until the last one goes
             db.session.delete(photo)
+            db.session.flush()
+            last_reference = release_blob(digest) if digest else True
             db.session.commit()
 
+            if last_reference:
+                remove_files(files, digest)
+
             return {"success": True, "message": "Photo deleted successfully"}
 
         except Exception as e:
@@ -266,14 +382,9 @@ class PhotoService:
             # Clear existing primary photos for this entity
             query = Photo.query.filter(Photo.category == category, Photo.is_primary)
 
-            if category == PhotoCategory.PLANT:
-                query = query.filter(Photo.plant_id == entity_id)
-            elif category == PhotoCategory.MATERIAL:
-                query = query.filter(Photo.material_id == entity_id)
-            elif category == PhotoCategory.PROPERTY:
-                query = query.filter(Photo.client_id == entity_id)
-            elif category == PhotoCategory.PROJECT:
-                query = query.filter(Photo.project_id == entity_id)
+            column = self.entity_column(category)
+            if column is not None:
+                query = query.filter(column == entity_id)
 
             # Clear existing primary flags
             query.update({"is_primary": False})
@@ -0,0 +1,256 @@
+"""
+Photo Storage
+
+Content-addressed storage for photo originals. An upload is hashed (SHA-256)
+while it is streamed to a temporary file and then stored once per content as
+``<UPLOAD_FOLDER>/blobs/<ab>/<digest>.<ext>``. Identical uploads share the
+stored file and, because derivatives are named after the original, its
+derivatives as well.
+
+Uploads are ingested in a single pass: ``IngestFile`` hashes, measures and
+sniffs what is written to it, and ``IngestRequest`` has the multipart parser
+write file parts straight into it, so a request body is copied once, in the
+parser's chunks, to where the blob is stored.
+
+``PhotoBlob`` rows count the photos referencing each blob. The files of a
+blob are removed once the last photo referencing it is deleted.
+
+Blobs and derivatives are kept by the configured storage backend (see
+src.services.photo_backends); the temporary files are always local.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+from collections.abc import Iterable
+from typing import BinaryIO
+
+from flask import Request
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+
+from src.models.photo import PhotoBlob
+from src.models.user import db
+from src.services.photo_backends import get_photo_storage
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+# Enough of the file to recognise every supported image format
+HEADER_SIZE = 16
+
+IMAGE_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+def sniff_image(header: bytes) -> str | None:
+    """MIME type of a supported image from its first bytes, or None"""
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    for signature, mimetype in IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return mimetype
+    return None
+
+
+def blob_path(upload_folder: str, digest: str, extension: str) -> str:
+    """Where the original with this SHA-256 digest is stored"""
+    return os.path.join(upload_folder, "blobs", digest[:2], f"{digest}.{extension}")
+
+
+class FileTooLargeError(ValueError):
+    """Raised when an upload exceeds the allowed size while it is being read"""
+
+
+class IngestFile:
+    """
+    Temporary blob file that hashes, measures and sniffs what is written to it.
+
+    The file is created next to the blobs so that storing it is a rename.
+    Writing stops once more than ``max_bytes`` have arrived: the rest of the
+    upload is counted but not stored, and ``check_size`` raises
+    FileTooLargeError. Closing removes the file unless it has been stored.
+    """
+
+    _file = None
+
+    def __init__(self, upload_folder: str, max_bytes: int | None = None):
+        temp_dir = os.path.join(upload_folder, "blobs", "tmp")
+        os.makedirs(temp_dir, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(dir=temp_dir, suffix=".upload")
+        self._file = os.fdopen(fd, "w+b")
+        self._digest = hashlib.sha256()
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.header = b""
+
+    @property
+    def digest(self) -> str:
+        """SHA-256 hex digest of the content written so far"""
+        return self._digest.hexdigest()
+
+    @property
+    def too_large(self) -> bool:
+        return self.max_bytes is not None and self.size > self.max_bytes
+
+    @property
+    def mimetype(self) -> str | None:
+        """Image type sniffed from the first bytes, None when not a supported image"""
+        return sniff_image(self.header)
+
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+        if self.too_large:
+            return len(data)
+        if len(self.header) < HEADER_SIZE:
+            self.header += data[: HEADER_SIZE - len(self.header)]
+        self._digest.update(data)
+        return self._file.write(data)
+
+    def check_size(self) -> None:
+        if self.too_large:
+            raise FileTooLargeError(f"File too large. Maximum size: {self.max_bytes // (1024 * 1024)}MB")
+
+    def close(self) -> None:
+        self._file.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass  # Stored as a blob
+
+    def __getattr__(self, name):
+        # read, seek, tell and the rest of the file interface
+        return getattr(self._file, name)
+
+    def __del__(self):
+        # Parts of a request that failed to parse are never closed by Werkzeug
+        if self._file is not None and not self._file.closed:
+            self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def ingest_stream(stream: BinaryIO, upload_folder: str, max_bytes: int | None = None) -> IngestFile:
+    """
+    Copy an upload into an IngestFile in CHUNK_SIZE chunks.
+
+    A stream the multipart parser already wrote into an IngestFile is
+    returned as is. Raises FileTooLargeError once more than ``max_bytes``
+    have been read.
+    """
+    if isinstance(stream, IngestFile):
+        ingest = stream
+    else:
+        ingest = IngestFile(upload_folder, max_bytes)
+        try:
+            while chunk := stream.read(CHUNK_SIZE):
+                ingest.write(chunk)
+                ingest.check_size()
+        except BaseException:
+            ingest.close()
+            raise
+    ingest.check_size()
+    # Everything written is on disk before the file is stored as a blob
+    ingest.flush()
+    return ingest
+
+
+class IngestRequest(Request):
+    """
+    Request that can have file parts written straight into blob storage.
+
+    A view calls ``ingest_files`` before touching ``request.files``; parts
+    with an allowed extension are then parsed into IngestFile streams.
+    """
+
+    ingest_folder: str | None = None
+    ingest_max_bytes: int | None = None
+    ingest_extensions: frozenset[str] = frozenset()
+
+    def ingest_files(self, upload_folder: str, max_bytes: int | None, extensions: Iterable[str]) -> None:
+        self.ingest_folder = upload_folder
+        self.ingest_max_bytes = max_bytes
+        self.ingest_extensions = frozenset(extensions)
+
+    def _get_file_stream(
+        self,
+        total_content_length: int | None,
+        content_type: str | None,
+        filename: str | None = None,
+        content_length: int | None = None,
+    ) -> BinaryIO:
+        extension = filename.rsplit(".", 1)[-1].lower() if filename and "." in filename else None
+        if self.ingest_folder is None or extension not in self.ingest_extensions:
+            return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+        return IngestFile(self.ingest_folder, self.ingest_max_bytes)
+
+
+def acquire_blob(digest: str, temp_path: str, upload_folder: str, extension: str, size: int) -> tuple[PhotoBlob, bool]:
+    """
+    Add a reference to the blob with this digest in the current transaction.
+
+    A new blob is stored from ``temp_path``; otherwise the temporary file is
+    discarded (or restores the blob file if that went missing). Returns the
+    blob and whether it was created by this call.
+    """
+    bumped = db.session.execute(
+        update(PhotoBlob).where(PhotoBlob.sha256 == digest).values(ref_count=PhotoBlob.ref_count + 1)
+    )
+    created = not bumped.rowcount
+    if created:
+        blob = PhotoBlob(
+            sha256=digest, file_path=blob_path(upload_folder, digest, extension), file_size=size, ref_count=1
+        )
+        try:
+            with db.session.begin_nested():
+                db.session.add(blob)
+        except IntegrityError:
+            # Stored by a concurrent upload of the same content
+            return acquire_blob(digest, temp_path, upload_folder, extension, size)
+    else:
+        blob = db.session.get(PhotoBlob, digest, populate_existing=True)
+
+    storage = get_photo_storage()
+    if created or not storage.exists(blob.file_path):
+        storage.store(temp_path, blob.file_path)
+    else:
+        os.remove(temp_path)
+    return blob, created
+
+
+def release_blob(digest: str) -> bool:
+    """
+    Drop a reference to a blob in the current transaction.
+
+    Returns True when it was the last one: the blob row is deleted and its
+    files should be removed (with ``remove_files``) once committed.
+    """
+    db.session.execute(update(PhotoBlob).where(PhotoBlob.sha256 == digest).values(ref_count=PhotoBlob.ref_count - 1))
+    released = db.session.execute(delete(PhotoBlob).where(PhotoBlob.sha256 == digest, PhotoBlob.ref_count <= 0))
+    return bool(released.rowcount)
+
+
+def remove_files(paths: Iterable[str], digest: str | None = None) -> None:
+    """
+    Remove photo files that are no longer referenced.
+
+    With a ``digest`` the files belong to a released blob and are kept when
+    the same content has been uploaded again in the meantime.
+    """
+    if digest is not None and db.session.get(PhotoBlob, digest) is not None:
+        return
+    storage = get_photo_storage()
+    for path in paths:
+        try:
+            storage.delete(path)
+        except Exception:
+            logger.warning("Could not remove photo file %s", path)
@@ -4,10 +4,9 @@ Plant Service
 Handles all plant-related business logic and database operations.
 """
 
-from sqlalchemy import or_
-
 from src.models.landscape import Plant
 from src.models.user import db
+from src.services.search import matching
 
 
 class PlantService:
@@ -28,8 +27,7 @@ class PlantService:
 
         # Apply filters
         if search:
-            search_term = f"%{search}%"
-            query = query.filter(or_(Plant.name.ilike(search_term), Plant.common_name.ilike(search_term)))
+            query = query.filter(matching(Plant, search))
 
         if category:
             query = query.filter(Plant.category == category)
@@ -100,12 +98,7 @@ class PlantService:
     @staticmethod
     def search_plants(search_term: str) -> list[Plant]:
         """Search plants by name or common name"""
-        search_term = f"%{search_term}%"
-        return (
-            Plant.query.filter(or_(Plant.name.ilike(search_term), Plant.common_name.ilike(search_term)))
-            .order_by(Plant.name)
-            .all()
-        )
+        return Plant.query.filter(matching(Plant, search_term)).order_by(Plant.name).all()
 
     @staticmethod
     def get_plant_categories() -> list[str]:
@@ -0,0 +1,455 @@
+"""
+Plant Suggestions
+
+Search-as-you-type suggestions for plants, served from an in-memory index so
+a keystroke does not query the database.
+
+The index is a sorted array of keys: the case-folded, accent-free words of a
+plant's name and common name, each followed by the rest of that name
+("acer palmatum", "palmatum"). A suggestion query is folded the same way and
+matched as a key prefix by bisection, so "acer pal", "PALM" and "Palmatum"
+all find "Acer palmatum". Plants whose name or common name starts with the
+query come first, then plants used in more projects, then by name. Short
+prefixes that match many keys have their best plants ranked ahead of time.
+
+The index follows catalogue changes incrementally:
+
+- plant and project plant writes in this process are noted by model events
+  and those plants are re-read before the next suggestion
+- changes by other processes (and bulk writes that bypass the ORM) are found
+  by comparing the row counts and latest ``updated_at`` of both tables, at
+  most every ``PLANT_SUGGESTIONS_REFRESH_SECONDS``, and only the plants they
+  touched are re-read
+
+Bulk updates that bypass the ORM and do not set ``updated_at`` are not
+detected, as for the data versions in src.utils.data_versions.
+
+Building the index of a large catalogue takes seconds, so each process builds
+it in a background thread as soon as it starts (from gunicorn's ``post_fork``
+hook, or on its first request). Until it is ready suggestions come from a
+search query.
+"""
+
+import heapq
+import logging
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any
+
+from flask import current_app
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.models.landscape import Plant, ProjectPlant
+from src.models.user import db
+from src.services.search import matching
+from src.utils.natural_keys import normalize_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SUGGESTION_LIMIT = 10
+MAX_SUGGESTION_LIMIT = 20
+DEFAULT_REFRESH_SECONDS = 30
+# Prefixes matching more keys than this have their best plants ranked ahead of time
+HEAVY_PREFIX_KEYS = 256
+# Plants kept per ranked prefix; a prefix is re-ranked once fewer than MAX_SUGGESTION_LIMIT remain
+RANKED_PLANTS = 2 * MAX_SUGGESTION_LIMIT
+# Plants re-read per query when applying changes
+_LOAD_BATCH = 500
+
+# After every key with a given prefix
+_KEY_END = "\U0010ffff"
+# Letters and digits; everything else separates words
+_WORD_RE = re.compile(r"[^\W_]+")
+_SUGGESTION_COLUMNS = (Plant.id, Plant.name, Plant.common_name, Plant.category)
+
+
+def fold(value: Any) -> str:
+    """Case-folded words without accents or punctuation, separated by single spaces"""
+    return " ".join(_WORD_RE.findall(normalize_key(value)))
+
+
+@dataclass(frozen=True)
+class PlantSuggestion:
+    """What a suggestion shows of a plant, and how it ranks"""
+
+    id: int
+    name: str
+    common_name: str | None
+    category: str | None
+    usage: int = 0
+
+    @cached_property
+    def folded_names(self) -> tuple[str, str]:
+        return fold(self.name), fold(self.common_name)
+
+    def keys(self) -> dict[str, bool]:
+        """Index keys of the plant, each with whether it is the start of a name"""
+        keys: dict[str, bool] = {}
+        for folded in self.folded_names:
+            words = folded.split()
+            for position in range(len(words)):
+                key = " ".join(words[position:])
+                keys[key] = keys.get(key, False) or position == 0
+        return keys
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"id": self.id, "name": self.name, "common_name": self.common_name, "category": self.category}
+
+
+class PlantSuggestionIndex:
+    """Sorted prefix index of plant names; not tied to the database"""
+
+    def __init__(self):
+        self._keys: list[str] = []
+        self._ids = array("q")
+        self._starts = bytearray()
+        self._plants: dict[int, PlantSuggestion] = {}
+        # What ranks a plant apart from where a query matches it
+        self._orders: dict[int, tuple] = {}
+        # Ranked plant IDs per heavy prefix, best first
+        self._ranked: dict[str, list[int]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._plants)
+
+    def plant_ids(self) -> set[int]:
+        with self._lock:
+            return set(self._plants)
+
+    def usage(self, plant_id: int) -> int | None:
+        plant = self._plants.get(plant_id)
+        return None if plant is None else plant.usage
+
+    def build(self, plants) -> None:
+        """Replace the index with ``plants`` (PlantSuggestion)"""
+        entries = []
+        suggestions = {}
+        for plant in plants:
+            suggestions[plant.id] = plant
+            entries.extend((key, plant.id, start) for key, start in plant.keys().items())
+        entries.sort()
+        with self._lock:
+            self._plants = suggestions
+            self._orders = {plant.id: self._order(plant) for plant in suggestions.values()}
+            self._keys = [key for key, _, _ in entries]
+            self._ids = array("q", (plant_id for _, plant_id, _ in entries))
+            self._starts = bytearray(start for _, _, start in entries)
+            self._ranked = {}
+            self._rank_heavy_prefixes(0, len(self._keys), 1)
+
+    def update(self, plants=(), removed=()) -> None:
+        """Add or replace ``plants`` (PlantSuggestion) and drop the plants with IDs in ``removed``"""
+        with self._lock:
+            for plant_id in removed:
+                self._remove(plant_id)
+            for plant in plants:
+                self._remove(plant.id)
+                self._add(plant)
+
+    def suggest(self, query: str, limit: int = DEFAULT_SUGGESTION_LIMIT) -> list[dict[str, Any]]:
+        """Plants with a name or common name word starting with ``query``, best first"""
+        prefix = fold(query)
+        if not prefix:
+            return []
+        with self._lock:
+            ranked = self._ranked.get(prefix)
+            if ranked is None or len(ranked) < limit:
+                lo, hi = self._range(prefix)
+                ranked = self._rank(lo, hi, limit)
+            return [self._plants[plant_id].to_dict() for plant_id in ranked[:limit]]
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"plants": len(self._plants), "keys": len(self._keys), "ranked_prefixes": len(self._ranked)}
+
+    # Ranking
+    @staticmethod
+    def _order(plant: PlantSuggestion) -> tuple:
+        return (-plant.usage, plant.folded_names[0], plant.id)
+
+    def _rank_key(self, plant_id: int, start: bool) -> tuple:
+        # Smaller is better: name starts first, then the most used, then by name
+        return (not start, self._orders[plant_id])
+
+    def _range(self, prefix: str) -> tuple[int, int]:
+        lo = bisect_left(self._keys, prefix)
+        return lo, bisect_left(self._keys, prefix + _KEY_END, lo)
+
+    def _rank(self, lo: int, hi: int, limit: int) -> list[int]:
+        # Each plant ranks by its best key in the range
+        best: dict[int, int] = {}
+        for plant_id, start in zip(self._ids[lo:hi], self._starts[lo:hi], strict=True):
+            if start or plant_id not in best:
+                best[plant_id] = start
+        orders = self._orders
+        ranks = heapq.nsmallest(limit, ((not start, orders[plant_id]) for plant_id, start in best.items()))
+        return [order[-1] for _, order in ranks]
+
+    def _rank_heavy_prefixes(self, lo: int, hi: int, length: int) -> None:
+        """Rank the prefixes of ``length`` characters (and longer) in keys[lo:hi] that match many keys"""
+        position = lo
+        while position < hi:
+            prefix = self._keys[position][:length]
+            if len(prefix) < length:
+                # A key shorter than the prefixes of this level; it was part of its own prefix's range
+                position = bisect_right(self._keys, prefix, position, hi)
+                continue
+            end = bisect_left(self._keys, prefix + _KEY_END, position, hi)
+            if end - position > HEAVY_PREFIX_KEYS:
+                self._ranked[prefix] = self._rank(position, end, RANKED_PLANTS)
+                self._rank_heavy_prefixes(position, end, length + 1)
+            position = end
+
+    def _heavy_prefixes(self, keys) -> set[str]:
+        return {key[:length] for key in keys for length in range(1, len(key) + 1) if key[:length] in self._ranked}
+
+    # Changes
+    def _remove(self, plant_id: int) -> None:
+        plant = self._plants.get(plant_id)
+        if plant is None:
+            return
+        keys = plant.keys()
+        for key in keys:
+            position = bisect_left(self._keys, key)
+            while position < len(self._keys) and self._keys[position] == key:
+                if self._ids[position] == plant_id:
+                    del self._keys[position], self._ids[position], self._starts[position]
+                    break
+                position += 1
+        for prefix in self._heavy_prefixes(keys):
+            ranked = self._ranked[prefix]
+            if plant_id in ranked:
+                ranked.remove(plant_id)
+                if len(ranked) < MAX_SUGGESTION_LIMIT:
+                    self._ranked[prefix] = self._rank(*self._range(prefix), RANKED_PLANTS)
+        del self._plants[plant_id]
+        del self._orders[plant_id]
+
+    def _add(self, plant: PlantSuggestion) -> None:
+        self._plants[plant.id] = plant
+        self._orders[plant.id] = self._order(plant)
+        keys = plant.keys()
+        for key, start in keys.items():
+            position = bisect_right(self._keys, key)
+            self._keys.insert(position, key)
+            self._ids.insert(position, plant.id)
+            self._starts.insert(position, start)
+        # A ranked prefix keeps its exact best plants: the new plant joins them if it ranks among them
+        for prefix in self._heavy_prefixes(keys):
+            ranked = self._ranked[prefix]
+            rank = self._rank_key(plant.id, self._starts_with(plant.id, prefix))
+            ranks = [self._rank_key(plant_id, self._starts_with(plant_id, prefix)) for plant_id in ranked]
+            if ranks and rank < ranks[-1]:
+                ranked.insert(bisect_left(ranks, rank), plant.id)
+                del ranked[RANKED_PLANTS:]
+
+    def _starts_with(self, plant_id: int, prefix: str) -> bool:
+        return any(folded.startswith(prefix) for folded in self._plants[plant_id].folded_names)
+
+
+class PlantSuggestions:
+    """The index of this process and its synchronization with the database"""
+
+    def __init__(self, refresh_seconds: float = DEFAULT_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self.index = PlantSuggestionIndex()
+        self._state: tuple | None = None
+        self._checked_at = 0.0
+        self._changed: set[int] = set()
+        # Model events note changes while a synchronization may be flushing; they only take this lock
+        self._changed_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._app = None
+        self._warm_thread: threading.Thread | None = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the index has been built"""
+        return self._state is not None
+
+    def start(self, app) -> None:
+        """Build the index in the background once this process serves its first request"""
+        if not app.config.get("PLANT_SUGGESTIONS_BACKGROUND_BUILD", True):
+            return
+        self._app = app
+        pending = [True]
+
+        # Deferred so that building an app (CLI commands, tests) does not touch the database;
+        # gunicorn workers start earlier, from the post_fork hook
+        @app.before_request
+        def _warm_once():
+            with self._changed_lock:
+                if not pending:
+                    return
+                pending.clear()
+            self.warm()
+
+    def warm(self, app=None) -> threading.Thread | None:
+        """Build the index in a background thread, unless it is built or being built"""
+        app = app or self._app
+        if app is None or self.ready:
+            return None
+        with self._changed_lock:
+            # Threads do not survive a fork, so a thread of the parent process is not alive here
+            if self._warm_thread is not None and self._warm_thread.is_alive():
+                return self._warm_thread
+            self._warm_thread = threading.Thread(target=self._warm, args=(app,), name="plant-suggestions", daemon=True)
+            self._warm_thread.start()
+            return self._warm_thread
+
+    def _warm(self, app) -> None:
+        with app.app_context():
+            try:
+                started = time.monotonic()
+                self.synchronize()
+                logger.info("Plant suggestion index built in %.1fs: %s", time.monotonic() - started, self.index.stats())
+            except SQLAlchemyError as e:
+                # For example before the database has been created or migrated; retried by the next suggestion
+                db.session.rollback()
+                logger.warning("Plant suggestion index not built: %s", e.__class__.__name__)
+            except Exception:
+                db.session.rollback()
+                logger.exception("Plant suggestion index build failed")
+            finally:
+                db.session.remove()
+
+    def suggest(self, query: str, limit: int = DEFAULT_SUGGESTION_LIMIT) -> list[dict[str, Any]]:
+        self.synchronize()
+        return self.index.suggest(query, limit)
+
+    def plant_changed(self, plant_id: int | None) -> None:
+        """Re-read the plant before the next suggestion"""
+        if plant_id is not None:
+            with self._changed_lock:
+                self._changed.add(plant_id)
+
+    def reset(self) -> None:
+        """Rebuild the index on the next suggestion"""
+        with self._lock:
+            self._state = None
+
+    def synchronize(self, force: bool = False) -> None:
+        """Apply the changes noted in this process, and those of other processes when due"""
+        with self._lock:
+            with self._changed_lock:
+                changed, self._changed = self._changed, set()
+            if self._state is None:
+                self._rebuild()
+                return
+            if changed:
+                self._apply(changed)
+            if force or time.monotonic() - self._checked_at >= self.refresh_seconds:
+                self._apply(self._changes_since_check())
+
+    def _read_state(self) -> tuple:
+        # Counts and latest updates of both tables, each answered from an index
+        columns = [
+            select(func.count(Plant.id)).scalar_subquery(),
+            select(func.max(Plant.updated_at)).scalar_subquery(),
+            select(func.count(ProjectPlant.id)).scalar_subquery(),
+            select(func.max(ProjectPlant.updated_at)).scalar_subquery(),
+        ]
+        self._checked_at = time.monotonic()
+        return tuple(db.session.execute(select(*columns)).one())
+
+    def _rebuild(self) -> None:
+        # The state is read first so that changes made during the build are found by the next check;
+        # it is set last so that the index is not ready before it is built
+        state = self._read_state()
+        self.index.build(self._suggestions(select(*_SUGGESTION_COLUMNS)))
+        self._state = state
+
+    def _changes_since_check(self) -> set[int]:
+        """IDs of the plants added, changed or deleted, or whose usage changed, since the last check"""
+        previous, self._state = self._state, self._read_state()
+        plant_count, plants_updated, usage_count, usage_updated = self._state
+        if self._state == previous:
+            return set()
+
+        changed = set()
+        # Rows updated at the last time seen may have been written after that check
+        if plants_updated is not None and plants_updated != previous[1]:
+            query = select(Plant.id)
+            if previous[1] is not None:
+                query = query.where(Plant.updated_at >= previous[1])
+            changed.update(db.session.scalars(query))
+        if usage_updated is not None and usage_updated != previous[3]:
+            query = select(ProjectPlant.plant_id).distinct()
+            if previous[3] is not None:
+                query = query.where(ProjectPlant.updated_at >= previous[3])
+            changed.update(db.session.scalars(query))
+        indexed = self.index.plant_ids()
+        if plant_count != len(indexed | changed):
+            # Plants were deleted, or inserted without an update time
+            changed |= indexed ^ set(db.session.scalars(select(Plant.id)))
+        if usage_count != previous[2]:
+            # Project plants were deleted; compare the usage of every plant
+            usage = self._usage()
+            changed.update(plant_id for plant_id in indexed if self.index.usage(plant_id) != usage.get(plant_id, 0))
+        return changed
+
+    def _apply(self, plant_ids: set[int]) -> None:
+        if not plant_ids:
+            return
+        loaded = []
+        ordered = sorted(plant_ids)
+        for offset in range(0, len(ordered), _LOAD_BATCH):
+            batch = ordered[offset : offset + _LOAD_BATCH]
+            loaded.extend(self._suggestions(select(*_SUGGESTION_COLUMNS).where(Plant.id.in_(batch)), batch))
+        self.index.update(loaded, removed=plant_ids - {plant.id for plant in loaded})
+
+    def _usage(self, plant_ids=None) -> dict[int, int]:
+        """Number of projects using each plant"""
+        query = select(ProjectPlant.plant_id, func.count(ProjectPlant.id)).group_by(ProjectPlant.plant_id)
+        if plant_ids is not None:
+            query = query.where(ProjectPlant.plant_id.in_(plant_ids))
+        return dict(db.session.execute(query).all())
+
+    def _suggestions(self, query, plant_ids=None) -> list[PlantSuggestion]:
+        usage = self._usage(plant_ids)
+        return [PlantSuggestion(*row, usage=usage.get(row.id, 0)) for row in db.session.execute(query)]
+
+
+plant_suggestions = PlantSuggestions()
+
+
+def suggest_plants(query: str, limit: int = DEFAULT_SUGGESTION_LIMIT) -> list[dict[str, Any]]:
+    """Suggestions for a partly typed plant name, best first"""
+    config = current_app.config
+    plant_suggestions.refresh_seconds = float(config.get("PLANT_SUGGESTIONS_REFRESH_SECONDS", DEFAULT_REFRESH_SECONDS))
+    if not plant_suggestions.ready and config.get("PLANT_SUGGESTIONS_BACKGROUND_BUILD", True):
+        plant_suggestions.warm(current_app._get_current_object())
+        return _search_suggestions(query, limit)
+    return plant_suggestions.suggest(query, limit)
+
+
+def _search_suggestions(query: str, limit: int) -> list[dict[str, Any]]:
+    """Suggestions from a search query, while the index is being built"""
+    if not fold(query):
+        return []
+    statement = select(*_SUGGESTION_COLUMNS).where(matching(Plant, query)).order_by(Plant.name).limit(limit)
+    return [PlantSuggestion(*row).to_dict() for row in db.session.execute(statement)]
+
+
+def _plant_changed(mapper, connection, target) -> None:
+    plant_suggestions.plant_changed(target.id)
+
+
+def _project_plant_changed(mapper, connection, target) -> None:
+    plant_suggestions.plant_changed(target.plant_id)
+    # A project plant moved to another plant changes the usage of both
+    history = inspect(target).attrs.plant_id.history
+    for plant_id in history.deleted or ():
+        plant_suggestions.plant_changed(plant_id)
+
+
+for _event_name in ("after_insert", "after_update", "after_delete"):
+    event.listen(Plant, _event_name, _plant_changed)
+    event.listen(ProjectPlant, _event_name, _project_plant_changed)
@@ -0,0 +1,119 @@
+"""
+Project Timeline Analytics
+
+Project durations and on-time statistics computed column-wise. The date
+columns are streamed as plain tuples (no ORM objects) into a pandas frame,
+parsed in one vectorized pass and reduced with NumPy. Results are cached per
+project-set version: a fingerprint of the projects table that changes with
+every insert, update and delete, so a cached result is never served for a
+different set of projects.
+"""
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Date, String, and_, cast, or_, select
+
+from src.models.landscape import Project
+from src.models.user import db
+from src.services.performance import cache
+from src.utils.data_versions import table_version
+
+CACHE_KEY_PREFIX = "project_timeline"
+CACHE_TIMEOUT = 600
+
+TIMELINE_COLUMNS = (
+    "id",
+    "name",
+    "status",
+    "budget",
+    "start_date",
+    "end_date",
+    "actual_completion_date",
+    "target_completion_date",
+)
+
+
+def project_set_version() -> str:
+    """Fingerprint of the projects table; changes with every insert, delete and ORM update"""
+    return table_version(Project)
+
+
+def _parse_dates(values: pd.Series) -> pd.DatetimeIndex:
+    # Dates are ISO strings, sometimes with a time part; casting to 10 characters keeps the date
+    return pd.to_datetime(values.to_numpy(dtype="U10"), format="%Y-%m-%d", errors="coerce")
+
+
+def _load_frame(project_id: int | None) -> pd.DataFrame:
+    # Date columns are read as text and parsed in bulk instead of row by row by the driver
+    columns = [
+        cast(column, String).label(name) if isinstance(column.type, Date) else column
+        for name in TIMELINE_COLUMNS
+        if (column := getattr(Project, name))
+    ]
+    has_end = or_(Project.end_date != "", Project.actual_completion_date.isnot(None))
+    query = select(*columns).where(and_(Project.start_date != "", has_end)).order_by(Project.id)
+    if project_id:
+        query = query.where(Project.id == project_id)
+    # Plain Core rows on the session's connection skip ORM result processing
+    return pd.DataFrame.from_records(db.session.connection().execute(query).all(), columns=TIMELINE_COLUMNS)
+
+
+def _analyze(frame: pd.DataFrame) -> dict:
+    start = _parse_dates(frame["start_date"])
+    actual = _parse_dates(frame["actual_completion_date"])
+    # A recorded end date wins over the completion date, even when it cannot be parsed
+    has_end_date = (frame["end_date"].fillna("") != "").to_numpy()
+    end = pd.DatetimeIndex(np.where(has_end_date, _parse_dates(frame["end_date"]), actual))
+
+    dated = start.notna() & end.notna()
+    durations = (end[dated] - start[dated]).days.to_numpy(dtype=np.int64)
+    projects = frame.loc[dated]
+
+    # On time: completed no later than the target completion date
+    target = _parse_dates(frame["target_completion_date"])
+    scheduled = actual.notna() & target.notna()
+    delays = (actual[scheduled] - target[scheduled]).days.to_numpy(dtype=np.int64)
+    late = delays[delays > 0]
+
+    rows = zip(
+        projects["id"].tolist(),
+        projects["name"].tolist(),
+        durations.tolist(),
+        projects["status"].tolist(),
+        projects["budget"].astype(float).fillna(0).tolist(),
+        strict=True,
+    )
+    return {
+        "projects": [
+            {"id": project_id, "name": name, "duration_days": duration, "status": status, "budget": budget}
+            for project_id, name, duration, status, budget in rows
+        ],
+        "summary": {
+            "project_count": int(durations.size),
+            "avg_duration_days": float(durations.mean()) if durations.size else 0,
+            "median_duration_days": float(np.median(durations)) if durations.size else 0,
+            "completed_with_target": int(delays.size),
+            "on_time_count": int(delays.size - late.size),
+            "on_time_rate": float((delays.size - late.size) / delays.size * 100) if delays.size else 0,
+            "avg_delay_days": float(late.mean()) if late.size else 0,
+        },
+    }
+
+
+def get_timeline_analysis(project_id: int | None = None) -> dict:
+    """
+    Durations per project and on-time statistics, for one project or all of them.
+
+    Returns ``{"projects": [...], "summary": {...}}``. Projects without a
+    parseable start date and end (or completion) date are left out.
+    """
+    version = project_set_version()
+    cache_key = f"{CACHE_KEY_PREFIX}:{project_id or 'all'}"
+    cached = cache.get(cache_key)
+    if cached and cached.get("version") == version:
+        return cached["analysis"]
+
+    analysis = _analyze(_load_frame(project_id))
+    # One entry per scope holding its version, so outdated versions do not pile up
+    cache.set(cache_key, {"version": version, "analysis": analysis}, timeout=CACHE_TIMEOUT)
+    return analysis
@@ -0,0 +1,197 @@
+"""
+Report Data Loaders
+
+Load everything a report, quote or invoice needs for a project in a fixed
+number of queries instead of walking lazy relationships row by row. Loaders
+return plain frozen dataclasses so the JSON and PDF variants of a report build
+from the same data and never touch the session again.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload
+
+from src.models.landscape import Client, Project, ProjectPlant
+from src.models.user import db
+
+
+def _isoformat(value: Any) -> str | None:
+    # Project dates are stored as ISO strings; created_at is a datetime
+    if value is None:
+        return None
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+@dataclass(frozen=True)
+class ClientDetails:
+    """Contact details of a project's client"""
+
+    id: int
+    name: str
+    email: str | None
+    phone: str | None
+    client_type: str | None
+    address: str | None
+    city: str | None
+    postal_code: str | None
+
+
+@dataclass(frozen=True)
+class PlantLine:
+    """A plant used in a project, with its quantity and price"""
+
+    name: str
+    common_name: str | None
+    category: str | None
+    sun_requirements: str | None
+    water_needs: str | None
+    hardiness_zone: str | None
+    height_max: float | None
+    width_max: float | None
+    bloom_time: str | None
+    bloom_color: str | None
+    maintenance: str | None
+    quantity: int | None
+    unit_cost: float | None
+
+
+@dataclass(frozen=True)
+class ProjectReportData:
+    """A project with its client and plant lines"""
+
+    id: int
+    name: str
+    description: str | None
+    status: str | None
+    budget: float | None
+    location: str | None
+    area_size: float | None
+    start_date: str | None
+    end_date: str | None
+    notes: str | None
+    created_at: str | None
+    client_id: int | None
+    client: ClientDetails | None
+    plants: tuple[PlantLine, ...]
+
+
+@dataclass(frozen=True)
+class InvoiceableProject:
+    """Summary row for the list of projects that can be invoiced"""
+
+    id: int
+    name: str
+    client_name: str | None
+    status: str | None
+    budget: float | None
+    area_size: float | None
+    plant_count: int
+    created_at: str | None
+
+
+def load_project_report(project_id: int) -> ProjectReportData | None:
+    """Load a project, its client and its plants in a single query"""
+    project = (
+        db.session.execute(
+            select(Project)
+            .where(Project.id == project_id)
+            .options(
+                joinedload(Project.client),
+                joinedload(Project.project_plants).joinedload(ProjectPlant.plant),
+            )
+        )
+        .unique()
+        .scalar_one_or_none()
+    )
+    if project is None:
+        return None
+
+    client = project.client
+    plants = tuple(
+        PlantLine(
+            name=plant.name,
+            common_name=plant.common_name,
+            category=plant.category,
+            sun_requirements=plant.sun_requirements,
+            water_needs=plant.water_needs,
+            hardiness_zone=plant.hardiness_zone,
+            height_max=plant.height_max,
+            width_max=plant.width_max,
+            bloom_time=plant.bloom_time,
+            bloom_color=plant.bloom_color,
+            maintenance=plant.maintenance,
+            quantity=project_plant.quantity,
+            unit_cost=project_plant.unit_cost,
+        )
+        for project_plant in sorted(project.project_plants, key=lambda line: line.id)
+        if (plant := project_plant.plant) is not None
+    )
+    return ProjectReportData(
+        id=project.id,
+        name=project.name,
+        description=project.description,
+        status=project.status,
+        budget=project.budget,
+        location=project.location,
+        area_size=project.area_size,
+        start_date=_isoformat(project.start_date),
+        end_date=_isoformat(project.end_date),
+        notes=project.notes,
+        created_at=_isoformat(project.created_at),
+        client_id=project.client_id,
+        client=(
+            ClientDetails(
+                id=client.id,
+                name=client.name,
+                email=client.email,
+                phone=client.phone,
+                client_type=client.client_type,
+                address=client.address,
+                city=client.city,
+                postal_code=client.postal_code,
+            )
+            if client
+            else None
+        ),
+        plants=plants,
+    )
+
+
+def load_invoiceable_projects(statuses: list[str]) -> list[InvoiceableProject]:
+    """Projects in one of ``statuses`` with their client name and plant count, in one aggregate query"""
+    plant_counts = (
+        select(ProjectPlant.project_id, func.count(ProjectPlant.id).label("plant_count"))
+        .group_by(ProjectPlant.project_id)
+        .subquery()
+    )
+    rows = db.session.execute(
+        select(
+            Project.id,
+            Project.name,
+            Client.name.label("client_name"),
+            Project.status,
+            Project.budget,
+            Project.area_size,
+            func.coalesce(plant_counts.c.plant_count, 0).label("plant_count"),
+            Project.created_at,
+        )
+        .outerjoin(Client, Client.id == Project.client_id)
+        .outerjoin(plant_counts, plant_counts.c.project_id == Project.id)
+        .where(Project.status.in_(statuses))
+        .order_by(Project.id)
+    )
+    return [
+        InvoiceableProject(
+            id=row.id,
+            name=row.name,
+            client_name=row.client_name,
+            status=row.status,
+            budget=row.budget,
+            area_size=row.area_size,
+            plant_count=row.plant_count,
+            created_at=_isoformat(row.created_at),
+        )
+        for row in rows
+    ]
@@ -0,0 +1,369 @@
+"""
+Report Scheduler
+
+Pre-generates the reports configured under ``reports.auto_generation`` in the
+application settings, so the first requests of a month read finished
+artifacts instead of building them live. Each scheduled report is stored in
+``generated_reports`` as JSON for the current state ("all") and, when the
+report accepts a period, for the last closed month or quarter; reports with a
+PDF variant are rendered into the PDF cache as well. Build and render timings
+are recorded with every artifact.
+
+An artifact carries the data version of the tables it was built from (see
+``src.utils.data_versions``) and is only served while that version is
+unchanged. Generation runs from ``flask reports pregenerate`` (for cron) or
+from the in-process ``report_scheduler`` during off-peak hours.
+
+Reports are registered by the module that builds them (``register_report``).
+"""
+
+import logging
+import re
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import select
+
+from src.models.landscape import GeneratedReport
+from src.models.user import db
+from src.routes.settings import load_settings
+from src.services.pdf_cache import get_pdf_cache
+from src.services.pdf_render import PDFRenderBusyError, pdf_renderer
+from src.utils.data_versions import table_version
+from src.utils.date_buckets import add_months, month_key, month_start
+
+logger = logging.getLogger(__name__)
+
+# Supported auto_generation frequencies and their length in months
+FREQUENCY_MONTHS = {"monthly": 1, "quarterly": 3}
+DEFAULT_INTERVAL_SECONDS = 900
+DEFAULT_OFF_PEAK_HOURS = "1-5"
+
+
+@dataclass(frozen=True)
+class ScheduledReport:
+    """A report the scheduler can pre-generate"""
+
+    name: str
+    # Builds the JSON data; takes (start_date, end_date) ISO strings when ``periodic``
+    build: Callable[..., dict]
+    # Tables the report reads; their data version decides whether an artifact is current
+    tables: tuple
+    periodic: bool = False
+    render_pdf: Callable[[dict], bytes] | None = None
+    pdf_cache_tags: tuple[str, ...] = ()
+
+    def version(self) -> str:
+        return table_version(*self.tables)
+
+
+@dataclass(frozen=True)
+class ReportPeriod:
+    """The request parameters an artifact answers; ``label`` is stored as its period"""
+
+    label: str
+    start_date: str | None = None
+    end_date: str | None = None
+
+
+ALL_TIME = ReportPeriod("all")
+
+_MONTH_LABEL_RE = re.compile(r"(?P<year>\d{4})-(?P<month>0[1-9]|1[0-2])")
+_QUARTER_LABEL_RE = re.compile(r"(?P<year>\d{4})-Q(?P<quarter>[1-4])")
+
+_reports: dict[str, ScheduledReport] = {}
+
+
+def register_report(report: ScheduledReport) -> None:
+    _reports[report.name] = report
+
+
+def registered_reports() -> dict[str, ScheduledReport]:
+    return dict(_reports)
+
+
+def auto_generation_schedule() -> dict[str, str]:
+    """Report name -> frequency from the application settings"""
+    return dict(load_settings().get("reports", {}).get("auto_generation") or {})
+
+
+def _period(start: datetime, months: int) -> ReportPeriod:
+    """The calendar month or quarter starting at ``start``"""
+    label = month_key(start) if months == 1 else f"{start.year}-Q{(start.month - 1) // 3 + 1}"
+    end = add_months(start, months) - timedelta(microseconds=1)
+    return ReportPeriod(label, start.isoformat(), end.isoformat())
+
+
+def last_closed_period(frequency: str, now: datetime) -> ReportPeriod | None:
+    """The last calendar month or quarter that ended before ``now``, or None for an unknown frequency"""
+    months = FREQUENCY_MONTHS.get(frequency)
+    if months is None:
+        return None
+    # Quarters start in January, April, July and October
+    current = month_start(now)
+    current = add_months(current, -((current.month - 1) % months))
+    return _period(add_months(current, -months), months)
+
+
+def period_for_label(label: str) -> ReportPeriod | None:
+    """The month (``2026-09``) or quarter (``2026-Q3``) a period label names, or None"""
+    if match := _MONTH_LABEL_RE.fullmatch(label):
+        return _period(datetime(int(match["year"]), int(match["month"]), 1), 1)
+    if match := _QUARTER_LABEL_RE.fullmatch(label):
+        return _period(datetime(int(match["year"]), int(match["quarter"]) * 3 - 2, 1), 3)
+    return None
+
+
+def parse_report_range(start_date: str | None, end_date: str | None) -> tuple[datetime | None, datetime | None]:
+    """
+    Request dates as naive UTC datetimes; an end given as a plain date covers that whole day.
+
+    Raises:
+        ValueError: If a date is not in ISO format
+    """
+
+    def parse(value: str | None) -> datetime | None:
+        if not value:
+            return None
+        parsed = datetime.fromisoformat(value)
+        return parsed.astimezone(UTC).replace(tzinfo=None) if parsed.tzinfo else parsed
+
+    end = parse(end_date)
+    if end is not None and len(end_date) == len("YYYY-MM-DD"):
+        end += timedelta(days=1, microseconds=-1)
+    return parse(start_date), end
+
+
+def period_for_range(start_date: str | None, end_date: str | None) -> ReportPeriod | None:
+    """The period an artifact may be stored under for a requested date range, or None"""
+    if not start_date and not end_date:
+        return ALL_TIME
+    try:
+        start, end = parse_report_range(start_date, end_date)
+    except ValueError:
+        return None
+    if start is None or end is None or start != month_start(start):
+        return None
+    for months in FREQUENCY_MONTHS.values():
+        if (start.month - 1) % months == 0 and end == add_months(start, months) - timedelta(microseconds=1):
+            return _period(start, months)
+    return None
+
+
+def report_periods(report: ScheduledReport, frequency: str, now: datetime) -> list[ReportPeriod]:
+    periods = [ALL_TIME]
+    if report.periodic and (period := last_closed_period(frequency, now)):
+        periods.append(period)
+    return periods
+
+
+def _stored_artifact(name: str, label: str) -> GeneratedReport | None:
+    return db.session.execute(
+        select(GeneratedReport).where(GeneratedReport.report_type == name, GeneratedReport.period == label)
+    ).scalar_one_or_none()
+
+
+def pregenerated_report(name: str, start_date: str | None = None, end_date: str | None = None) -> dict | None:
+    """
+    The pre-generated data of a report for these request parameters, or None.
+
+    The requested range is matched to the month or quarter it spans, however its
+    dates are written (``2026-09-01`` to ``2026-09-30`` finds ``2026-09``). Returns
+    None when nothing was pre-generated for it or the report's tables changed
+    since, so the caller builds the report live.
+    """
+    report = _reports.get(name)
+    period = period_for_range(start_date, end_date)
+    if report is None or period is None:
+        return None
+    artifact = _stored_artifact(name, period.label)
+    if artifact is None or artifact.data_version != report.version():
+        return None
+    return artifact.data
+
+
+def _render_pdf(report: ScheduledReport, data: dict) -> tuple[str | None, float | None]:
+    # Only worth rendering when the result is kept for the request that needs it
+    if report.render_pdf is None or get_pdf_cache() is None:
+        return None, None
+    started = time.perf_counter()
+    try:
+        job = pdf_renderer.render(
+            report.render_pdf, data, filename=f"{report.name}.pdf", cache_tags=report.pdf_cache_tags
+        )
+        job.result()
+    except PDFRenderBusyError:
+        logger.warning("PDF render queue busy, %s PDF left for the next run", report.name)
+        return None, None
+    return job.cache_key, round(time.perf_counter() - started, 4)
+
+
+def _is_due(report: ScheduledReport, artifact: GeneratedReport | None, version: str) -> bool:
+    if artifact is None or artifact.data_version != version:
+        return True
+    # A PDF that was rejected earlier or has been evicted from the cache is rendered again
+    pdf_cache = get_pdf_cache()
+    if report.render_pdf is None or pdf_cache is None:
+        return False
+    return artifact.pdf_cache_key is None or pdf_cache.get(artifact.pdf_cache_key) is None
+
+
+def generate_report(report: ScheduledReport, period: ReportPeriod, version: str | None = None) -> GeneratedReport:
+    """Build (and render) a report for ``period`` and store it with its timings"""
+    # Read before building: a write during the build leaves the artifact outdated rather than hiding the write
+    version = version or report.version()
+    started = time.perf_counter()
+    data = report.build(period.start_date, period.end_date) if report.periodic else report.build()
+    json_seconds = round(time.perf_counter() - started, 4)
+    pdf_cache_key, pdf_seconds = _render_pdf(report, data)
+
+    artifact = _stored_artifact(report.name, period.label) or GeneratedReport(
+        report_type=report.name, period=period.label
+    )
+    artifact.start_date = period.start_date
+    artifact.end_date = period.end_date
+    artifact.data = data
+    artifact.data_version = version
+    artifact.pdf_cache_key = pdf_cache_key
+    artifact.json_seconds = json_seconds
+    artifact.pdf_seconds = pdf_seconds
+    artifact.generated_at = datetime.now(UTC).replace(tzinfo=None)
+    db.session.add(artifact)
+    db.session.commit()
+    logger.info(
+        "Pre-generated %s [%s] in %.3fs (PDF %s)",
+        report.name,
+        period.label,
+        json_seconds,
+        f"{pdf_seconds:.3f}s" if pdf_seconds is not None else "skipped",
+    )
+    return artifact
+
+
+def pregenerate_reports(
+    now: datetime | None = None,
+    force: bool = False,
+    only: tuple[str, ...] | None = None,
+    schedule: dict[str, str] | None = None,
+) -> list[GeneratedReport]:
+    """
+    Generate the scheduled reports that are missing or outdated.
+
+    ``schedule`` maps report names to frequencies and defaults to the
+    ``auto_generation`` settings; unknown reports and frequencies (for example
+    ``"never"``) are skipped. ``force`` regenerates current artifacts too.
+    A failing report is logged and does not stop the others.
+    """
+    now = now or datetime.now(UTC).replace(tzinfo=None)
+    schedule = auto_generation_schedule() if schedule is None else schedule
+    generated = []
+    for name, frequency in schedule.items():
+        report = _reports.get(name)
+        if report is None or frequency not in FREQUENCY_MONTHS or (only and name not in only):
+            continue
+        version = report.version()
+        for period in report_periods(report, frequency, now):
+            if not force and not _is_due(report, _stored_artifact(name, period.label), version):
+                continue
+            try:
+                generated.append(generate_report(report, period, version))
+            except Exception:
+                db.session.rollback()
+                logger.exception("Pre-generating %s [%s] failed", name, period.label)
+    return generated
+
+
+def scheduled_report_status() -> dict[str, Any]:
+    """The configured schedule and every stored artifact with its timings and whether it is still current"""
+    versions = {name: report.version() for name, report in _reports.items()}
+    artifacts = db.session.execute(
+        select(GeneratedReport).order_by(GeneratedReport.report_type, GeneratedReport.period)
+    ).scalars()
+    return {
+        "schedule": auto_generation_schedule(),
+        "reports": [
+            {**artifact.to_dict(), "current": artifact.data_version == versions.get(artifact.report_type)}
+            for artifact in artifacts
+        ],
+    }
+
+
+def _off_peak_hours(window: str) -> set[int]:
+    # "1-5" covers 01:00 up to 05:00; windows may wrap past midnight ("22-4")
+    start, end = (int(hour) % 24 for hour in window.split("-", 1))
+    hours = set()
+    hour = start
+    while hour != end or not hours:
+        hours.add(hour)
+        hour = (hour + 1) % 24
+    return hours
+
+
+class ReportScheduler:
+    """
+    Runs ``pregenerate_reports`` in a daemon thread during off-peak hours.
+
+    Meant for single-process deployments; with several workers, schedule
+    ``flask reports pregenerate`` from cron instead.
+    """
+
+    def __init__(self):
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def start(self, app) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        interval = float(app.config.get("REPORT_SCHEDULER_INTERVAL_SECONDS", DEFAULT_INTERVAL_SECONDS))
+        hours = _off_peak_hours(app.config.get("REPORT_SCHEDULER_HOURS", DEFAULT_OFF_PEAK_HOURS))
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(app, interval, hours), name="report-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, app, interval: float, hours: set[int]) -> None:
+        while not self._stop.wait(interval):
+            if datetime.now().hour not in hours:
+                continue
+            with app.app_context():
+                try:
+                    pregenerate_reports()
+                except Exception:
+                    logger.exception("Scheduled report pre-generation failed")
+                finally:
+                    db.session.remove()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+report_scheduler = ReportScheduler()
+
+reports_cli = AppGroup("reports", help="Pre-generate the scheduled reports.")
+
+
+@reports_cli.command("pregenerate")
+@click.option("--force", is_flag=True, help="Also regenerate reports that are still current.")
+@click.option("--report", "reports", multiple=True, help="Only generate this report (repeatable).")
+def pregenerate_command(force, reports):
+    """Generate missing or outdated scheduled reports, e.g. from cron during off-peak hours."""
+    generated = pregenerate_reports(force=force, only=reports or None)
+    for artifact in generated:
+        pdf = f"{artifact.pdf_seconds:.3f}s" if artifact.pdf_seconds is not None else "-"
+        click.echo(f"{artifact.report_type} [{artifact.period}]: JSON {artifact.json_seconds:.3f}s, PDF {pdf}")
+    click.echo(f"Generated {len(generated)} report(s)")
+
+
+@reports_cli.command("status")
+def status_command():
+    """List the pre-generated reports with their timings."""
+    for report in scheduled_report_status()["reports"]:
+        state = "current" if report["current"] else "outdated"
+        click.echo(f"{report['report_type']} [{report['period']}] {report['generated_at']} {state}")
@@ -0,0 +1,176 @@
+"""
+Report Templates
+
+ReportLab styles, table styles, fonts and translations shared by every PDF the
+application renders (reports, quotes and invoices). They are built once when
+this module is imported - in the web worker and in each PDF render process -
+instead of on every request. All objects here are shared between documents and
+must be treated as read-only; derive a new style when a document needs a
+variation.
+"""
+
+from reportlab.lib import colors
+from reportlab.lib.styles import ParagraphStyle, StyleSheet1, getSampleStyleSheet
+from reportlab.pdfbase import pdfmetrics
+from reportlab.platypus import TableStyle
+
+BRAND_GREEN = colors.HexColor("#2D5016")
+ACCENT_GREEN = colors.HexColor("#10b981")
+HEADER_GREY = colors.HexColor("#f3f4f6")
+
+# Standard Type 1 fonts used by the templates; their metrics are loaded up front
+FONTS = ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique", "Helvetica-BoldOblique")
+
+
+def _build_styles() -> StyleSheet1:
+    styles = getSampleStyleSheet()
+    styles.add(
+        ParagraphStyle(
+            "ReportTitle",
+            parent=styles["Heading1"],
+            fontSize=24,
+            spaceAfter=30,
+            textColor=BRAND_GREEN,
+        )
+    )
+    styles.add(
+        ParagraphStyle(
+            "ProjectReportTitle",
+            parent=styles["Heading1"],
+            fontSize=20,
+            spaceAfter=30,
+            textColor=BRAND_GREEN,
+        )
+    )
+    styles.add(
+        ParagraphStyle(
+            "ComprehensiveReportTitle",
+            parent=styles["Heading1"],
+            fontSize=24,
+            spaceAfter=30,
+            textColor=ACCENT_GREEN,
+            alignment=1,  # Center alignment
+        )
+    )
+    return styles
+
+
+def header_table_style(
+    header_background,
+    header_text_color,
+    body_background,
+    header_font_size: int,
+    right_align_from: int | None = None,
+) -> TableStyle:
+    """Table style with a bold coloured header row and a grid; columns from ``right_align_from`` are right aligned"""
+    commands = [
+        ("BACKGROUND", (0, 0), (-1, 0), header_background),
+        ("TEXTCOLOR", (0, 0), (-1, 0), header_text_color),
+        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+    ]
+    if right_align_from is not None:
+        commands.append(("ALIGN", (right_align_from, 0), (-1, -1), "RIGHT"))
+    commands.extend(
+        [
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ("FONTSIZE", (0, 0), (-1, 0), header_font_size),
+            ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+            ("BACKGROUND", (0, 1), (-1, -1), body_background),
+            ("GRID", (0, 0), (-1, -1), 1, colors.black),
+        ]
+    )
+    return TableStyle(commands)
+
+
+def load_fonts() -> None:
+    """Load font metrics so the first document in a process does not pay for parsing them"""
+    for font_name in FONTS:
+        pdfmetrics.getFont(font_name)
+
+
+STYLES = _build_styles()
+
+# Business summary and project report tables
+BRAND_TABLE_STYLE = header_table_style(BRAND_GREEN, colors.whitesmoke, colors.beige, 12)
+BRAND_TABLE_STYLE_MEDIUM = header_table_style(BRAND_GREEN, colors.whitesmoke, colors.beige, 10)
+BRAND_TABLE_STYLE_SMALL = header_table_style(BRAND_GREEN, colors.whitesmoke, colors.beige, 9)
+# Quote and invoice line items
+LINE_ITEMS_TABLE_STYLE = header_table_style(BRAND_GREEN, colors.whitesmoke, colors.beige, 10, right_align_from=1)
+
+# Comprehensive report tables
+STATS_TABLE_STYLE = header_table_style(HEADER_GREY, colors.black, colors.white, 12)
+STATS_AMOUNTS_TABLE_STYLE = header_table_style(HEADER_GREY, colors.black, colors.white, 12, right_align_from=1)
+ACCENT_TABLE_STYLE = header_table_style(ACCENT_GREEN, colors.whitesmoke, colors.white, 10)
+ACCENT_AMOUNTS_TABLE_STYLE = header_table_style(ACCENT_GREEN, colors.whitesmoke, colors.white, 10, right_align_from=1)
+ACCENT_CLIENTS_TABLE_STYLE = header_table_style(ACCENT_GREEN, colors.whitesmoke, colors.white, 10, right_align_from=2)
+
+# Quote and invoice layout
+DOCUMENT_HEADER_TABLE_STYLE = TableStyle(
+    [
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("ALIGN", (1, 0), (1, 0), "RIGHT"),
+    ]
+)
+TOTALS_TABLE_STYLE = TableStyle(
+    [
+        ("ALIGN", (0, 0), (-1, -1), "RIGHT"),
+        ("FONTNAME", (0, 3), (1, 3), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 3), (1, 3), 12),
+        ("LINEABOVE", (0, 3), (1, 3), 2, colors.black),
+        ("BACKGROUND", (0, 3), (1, 3), colors.lightgrey),
+    ]
+)
+
+# Labels of the comprehensive report, per language
+REPORT_TRANSLATIONS = {
+    "en": {
+        "title": "Landscape Architecture Report",
+        "generated_on": "Generated on",
+        "date_range": "Date Range",
+        "overview": "Business Overview",
+        "clients": "Client Analysis",
+        "projects": "Project Performance",
+        "plants": "Plant Analytics",
+        "financial": "Financial Summary",
+        "comprehensive": "Complete Report",
+        "total_projects": "Total Projects",
+        "total_clients": "Total Clients",
+        "total_plants": "Total Plants",
+        "total_budget": "Total Budget",
+        "average_budget": "Average Budget",
+        "project_status": "Project Status Distribution",
+        "top_clients": "Top Clients",
+        "plant_categories": "Plant Category Distribution",
+        "monthly_revenue": "Monthly Revenue",
+        "page": "Page",
+    },
+    "nl": {
+        "title": "Landschapsarchitectuur Rapport",
+        "generated_on": "Gegenereerd op",
+        "date_range": "Datumbereik",
+        "overview": "Bedrijfsoverzicht",
+        "clients": "Klantanalyse",
+        "projects": "Projectprestaties",
+        "plants": "Plant Analytics",
+        "financial": "Financieel Overzicht",
+        "comprehensive": "Volledig Rapport",
+        "total_projects": "Totaal Projecten",
+        "total_clients": "Totaal Klanten",
+        "total_plants": "Totaal Planten",
+        "total_budget": "Totaal Budget",
+        "average_budget": "Gemiddeld Budget",
+        "project_status": "Project Status Verdeling",
+        "top_clients": "Top Klanten",
+        "plant_categories": "Plant Categorie Verdeling",
+        "monthly_revenue": "Maandelijkse Omzet",
+        "page": "Pagina",
+    },
+}
+
+
+def report_translations(language: str) -> dict[str, str]:
+    """Labels for ``language``, falling back to English"""
+    return REPORT_TRANSLATIONS.get(language, REPORT_TRANSLATIONS["en"])
+
+
+load_fonts()
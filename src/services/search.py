@@ -0,0 +1,175 @@
+"""
+Search
+
+Full-text search over plants, clients, projects and suppliers, backed by the
+indexes described in src.utils.full_text. ``matching`` is the filter the list
+endpoints use for their ``search`` parameter; ``search`` ranks the best
+matches of several entity types for the unified ``/api/search`` endpoint.
+
+Every search term matches as a word prefix ("ros" finds "Rosa rugosa" and
+"Climbing Rose"), all terms must match, and matches in the first indexed
+columns rank highest. On databases without full-text support, or for searches
+without any words, both fall back to ``LIKE`` over the indexed columns.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import column, func, literal_column, or_, select, table
+
+from src.models.landscape import Client, Plant, Project, Supplier
+from src.models.user import db
+from src.utils.full_text import (
+    SEARCH_COLUMNS,
+    SEARCH_VECTOR_COLUMN,
+    SUPPORTED_DIALECTS,
+    bm25_weights,
+    fts_table,
+    match_expression,
+    rebuild_search_index,
+    search_terms,
+)
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+
+@dataclass(frozen=True)
+class SearchType:
+    """An entity type of the unified search and how its matches are shown"""
+
+    name: str
+    model: type
+    subtitle: tuple[str, ...]
+
+    @property
+    def table(self) -> str:
+        return self.model.__tablename__
+
+    def result(self, entity, score: float) -> dict[str, Any]:
+        details = [getattr(entity, field) for field in self.subtitle]
+        return {
+            "type": self.name,
+            "id": entity.id,
+            "title": entity.name,
+            "subtitle": " · ".join(str(detail) for detail in details if detail) or None,
+            "score": round(score, 4),
+        }
+
+
+SEARCH_TYPES = {
+    search_type.name: search_type
+    for search_type in (
+        SearchType("plant", Plant, ("common_name", "category")),
+        SearchType("client", Client, ("company", "city")),
+        SearchType("project", Project, ("location", "status")),
+        SearchType("supplier", Supplier, ("specialization", "city")),
+    )
+}
+
+
+def _dialect() -> str:
+    return db.session.get_bind().dialect.name
+
+
+def _like(model, value: str):
+    return or_(*(getattr(model, name).contains(value) for name in SEARCH_COLUMNS[model.__tablename__]))
+
+
+def _fts(name: str):
+    return table(fts_table(name), column("rowid"))
+
+
+def matching(model, value: str):
+    """Filter clause for the rows of ``model`` (a searchable model) matching a search"""
+    terms = search_terms(value)
+    dialect = _dialect()
+    if not terms or dialect not in SUPPORTED_DIALECTS:
+        return _like(model, value)
+
+    expression = match_expression(dialect, terms)
+    if dialect == "postgresql":
+        vector = literal_column(f"{model.__tablename__}.{SEARCH_VECTOR_COLUMN}")
+        return vector.op("@@")(func.to_tsquery("simple", expression))
+    fts = _fts(model.__tablename__)
+    return model.id.in_(select(fts.c.rowid).where(literal_column(fts.name).op("MATCH")(expression)))
+
+
+def _ranked_ids(search_type: SearchType, value: str, limit: int) -> list[tuple[int, float]]:
+    """IDs and scores (higher is better) of the best matches of one type"""
+    terms = search_terms(value)
+    dialect = _dialect()
+    model = search_type.model
+    if not terms or dialect not in SUPPORTED_DIALECTS:
+        # Without an index every match scores the same; names starting with the search first
+        starts = func.lower(model.name).startswith(value.lower())
+        query = select(model.id).where(_like(model, value)).order_by(starts.desc(), model.name).limit(limit)
+        return [(entity_id, 0.0) for entity_id in db.session.scalars(query)]
+
+    expression = match_expression(dialect, terms)
+    if dialect == "postgresql":
+        vector = literal_column(f"{search_type.table}.{SEARCH_VECTOR_COLUMN}")
+        tsquery = func.to_tsquery("simple", expression)
+        score = func.ts_rank(vector, tsquery)
+        query = select(model.id, score).where(vector.op("@@")(tsquery)).order_by(score.desc()).limit(limit)
+        return [(entity_id, float(rank)) for entity_id, rank in db.session.execute(query)]
+
+    # bm25 is lower for better matches
+    fts = _fts(search_type.table)
+    rank = func.bm25(literal_column(fts.name), *bm25_weights(search_type.table))
+    query = (
+        select(fts.c.rowid, rank).where(literal_column(fts.name).op("MATCH")(expression)).order_by(rank).limit(limit)
+    )
+    return [(entity_id, -float(bm25)) for entity_id, bm25 in db.session.execute(query)]
+
+
+def search(value: str, types: list[str] | None = None, limit: int = DEFAULT_SEARCH_LIMIT) -> list[dict[str, Any]]:
+    """
+    The best matches of a search across entity types, best first.
+
+    ``types`` limits the search to some of SEARCH_TYPES; raises ValueError
+    for unknown types.
+    """
+    unknown = set(types or ()) - SEARCH_TYPES.keys()
+    if unknown:
+        raise ValueError(f"Unknown search type(s): {', '.join(sorted(unknown))}")
+    value = (value or "").strip()
+    if not value:
+        return []
+
+    hits = []
+    for name in types or SEARCH_TYPES:
+        search_type = SEARCH_TYPES[name]
+        hits.extend((score, search_type, entity_id) for entity_id, score in _ranked_ids(search_type, value, limit))
+    hits.sort(key=lambda hit: -hit[0])
+    hits = hits[:limit]
+
+    # One query per type for the entities of the hits that made the cut
+    entities = {}
+    for search_type in {search_type for _, search_type, _ in hits}:
+        ids = [entity_id for _, hit_type, entity_id in hits if hit_type is search_type]
+        for entity in search_type.model.query.filter(search_type.model.id.in_(ids)):
+            entities[search_type.name, entity.id] = entity
+    return [
+        search_type.result(entities[search_type.name, entity_id], score)
+        for score, search_type, entity_id in hits
+        if (search_type.name, entity_id) in entities
+    ]
+
+
+def rebuild_search_indexes() -> None:
+    """Re-read every row into the search indexes"""
+    rebuild_search_index(db.session.connection())
+    db.session.commit()
+
+
+search_cli = AppGroup("search", help="Maintain the full-text search indexes.")
+
+
+@search_cli.command("rebuild")
+def rebuild_command():
+    """Rebuild the search indexes, e.g. after restoring a backup."""
+    rebuild_search_indexes()
+    click.echo("Rebuilt search indexes")
@@ -0,0 +1,180 @@
+"""
+Supplier Metrics
+
+Per-supplier product and plant counts, price and inventory figures and the
+use of the supplier's plants in projects (projects, quantity and revenue),
+stored one row per supplier in ``supplier_metrics``. The supplier statistics,
+top supplier ranking and supplier performance report read these rows instead
+of aggregating the product, plant and project plant tables per request.
+
+Model events record the suppliers touched by every write in
+``supplier_metrics_dirty``; ``refresh_supplier_metrics`` recomputes them
+before a read. ``rebuild_supplier_metrics`` recomputes every row and is
+exposed as ``flask supplier-metrics rebuild`` for use after bulk imports.
+"""
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import case, delete, distinct, func, insert, select
+
+from src.models.landscape import Plant, Product, ProjectPlant, Supplier, SupplierMetrics, SupplierMetricsDirty
+from src.models.user import db
+
+
+def _metrics_facts(supplier_ids: list[int] | None):
+    """Metrics rows of all suppliers, or of ``supplier_ids``"""
+
+    def scoped(query, column):
+        return query if supplier_ids is None else query.where(column.in_(supplier_ids))
+
+    # Prices of zero or without a value are left out of the averages
+    product_price = case((Product.price != 0, Product.price))
+    products = scoped(
+        select(
+            Product.supplier_id.label("supplier_id"),
+            func.count(Product.id).label("product_count"),
+            func.sum(func.coalesce(Product.price, 0) * func.coalesce(Product.stock_quantity, 0)).label(
+                "inventory_value"
+            ),
+            func.sum(product_price).label("price_sum"),
+            func.count(product_price).label("price_count"),
+        ).group_by(Product.supplier_id),
+        Product.supplier_id,
+    ).subquery()
+
+    plant_price = case((Plant.price != 0, Plant.price))
+    plants = scoped(
+        select(
+            Plant.supplier_id.label("supplier_id"),
+            func.count(Plant.id).label("plant_count"),
+            func.sum(plant_price).label("price_sum"),
+            func.count(plant_price).label("price_count"),
+        ).group_by(Plant.supplier_id),
+        Plant.supplier_id,
+    ).subquery()
+
+    usage = scoped(
+        select(
+            Plant.supplier_id.label("supplier_id"),
+            func.count(distinct(ProjectPlant.project_id)).label("project_count"),
+            func.count(ProjectPlant.id).label("selection_count"),
+            func.sum(ProjectPlant.quantity).label("total_quantity"),
+            func.sum(ProjectPlant.quantity * ProjectPlant.unit_cost).label("revenue"),
+        )
+        .join(Plant, ProjectPlant.plant_id == Plant.id)
+        .group_by(Plant.supplier_id),
+        Plant.supplier_id,
+    ).subquery()
+
+    def zero(column):
+        return func.coalesce(column, 0)
+
+    return scoped(
+        select(
+            Supplier.id.label("supplier_id"),
+            zero(products.c.product_count).label("product_count"),
+            zero(plants.c.plant_count).label("plant_count"),
+            (zero(products.c.product_count) + zero(plants.c.plant_count)).label("total_items"),
+            zero(products.c.inventory_value).label("inventory_value"),
+            zero(products.c.price_sum).label("product_price_sum"),
+            zero(products.c.price_count).label("product_price_count"),
+            zero(plants.c.price_sum).label("plant_price_sum"),
+            zero(plants.c.price_count).label("plant_price_count"),
+            zero(usage.c.project_count).label("project_count"),
+            zero(usage.c.selection_count).label("selection_count"),
+            zero(usage.c.total_quantity).label("total_quantity"),
+            zero(usage.c.revenue).label("revenue"),
+        )
+        .outerjoin(products, products.c.supplier_id == Supplier.id)
+        .outerjoin(plants, plants.c.supplier_id == Supplier.id)
+        .outerjoin(usage, usage.c.supplier_id == Supplier.id),
+        Supplier.id,
+    )
+
+
+def _recompute(supplier_ids: list[int] | None) -> None:
+    table = SupplierMetrics.__table__
+    facts = _metrics_facts(supplier_ids)
+    clear = delete(table) if supplier_ids is None else delete(table).where(table.c.supplier_id.in_(supplier_ids))
+    db.session.execute(clear)
+    # Deleted suppliers have no facts row, so their metrics are only cleared
+    db.session.execute(insert(table).from_select([column.name for column in facts.selected_columns], facts))
+
+
+def refresh_supplier_metrics() -> list[int]:
+    """
+    Recompute the metrics of the suppliers changed since the last refresh.
+
+    The dirty rows are claimed by deleting them, so a concurrent refresh of
+    the same suppliers finds nothing left to do. Returns the refreshed ids.
+    """
+    dirty = db.session.execute(select(SupplierMetricsDirty.id, SupplierMetricsDirty.supplier_id)).all()
+    if not dirty:
+        return []
+
+    claimed = db.session.execute(
+        delete(SupplierMetricsDirty).where(SupplierMetricsDirty.id.in_([row.id for row in dirty]))
+    )
+    if not claimed.rowcount:
+        return []
+
+    supplier_ids = sorted({row.supplier_id for row in dirty})
+    _recompute(supplier_ids)
+    db.session.commit()
+    return supplier_ids
+
+
+def rebuild_supplier_metrics() -> None:
+    """Recompute the metrics of every supplier"""
+    db.session.execute(delete(SupplierMetricsDirty))
+    _recompute(None)
+    db.session.commit()
+
+
+def get_supplier_metrics(supplier_id: int) -> SupplierMetrics | None:
+    """The current metrics of a supplier, or None for an unknown supplier"""
+    refresh_supplier_metrics()
+    metrics = db.session.get(SupplierMetrics, supplier_id)
+    if metrics is None and db.session.get(Supplier, supplier_id) is not None:
+        # Suppliers written outside the ORM get their row on first read
+        _recompute([supplier_id])
+        db.session.commit()
+        metrics = db.session.get(SupplierMetrics, supplier_id)
+    return metrics
+
+
+def ranked_supplier_metrics(limit: int | None = None, with_items_only: bool = False):
+    """
+    (supplier, metrics) pairs ordered by total items, most first.
+
+    Ranking reads the ``total_items`` index, so only ``limit`` rows are
+    fetched. ``with_items_only`` leaves out suppliers without products or plants.
+    """
+    refresh_supplier_metrics()
+    query = (
+        select(Supplier, SupplierMetrics)
+        .join(SupplierMetrics, SupplierMetrics.supplier_id == Supplier.id)
+        .order_by(SupplierMetrics.total_items.desc(), Supplier.id)
+    )
+    if with_items_only:
+        query = query.where(SupplierMetrics.total_items > 0)
+    if limit is not None:
+        query = query.limit(limit)
+    return db.session.execute(query).all()
+
+
+supplier_metrics_cli = AppGroup("supplier-metrics", help="Maintain the supplier metrics table.")
+
+
+@supplier_metrics_cli.command("refresh")
+def refresh_command():
+    """Recompute the suppliers changed since the last refresh."""
+    supplier_ids = refresh_supplier_metrics()
+    click.echo(f"Refreshed {len(supplier_ids)} supplier(s)")
+
+
+@supplier_metrics_cli.command("rebuild")
+def rebuild_command():
+    """Recompute all supplier metrics, e.g. after bulk imports."""
+    rebuild_supplier_metrics()
+    click.echo("Rebuilt supplier metrics")
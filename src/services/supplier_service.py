@@ -10,6 +10,7 @@ from sqlalchemy import or_
 
 from src.models.landscape import Plant, Product, Supplier
 from src.models.user import db
+from src.services.supplier_metrics import get_supplier_metrics, ranked_supplier_metrics
 
 
 class SupplierService:
@@ -109,22 +110,17 @@ class SupplierService:
         if not supplier:
             return {}
 
-        products = Product.query.filter_by(supplier_id=supplier_id).all()
-        plants = Plant.query.filter_by(supplier_id=supplier_id).all()
-
-        total_products = len(products)
-        total_plants = len(plants)
-        total_inventory_value = sum((p.price or 0) * (p.stock_quantity or 0) for p in products)
-
-        average_product_price = sum(p.price or 0 for p in products) / total_products if total_products > 0 else 0
-        average_plant_price = sum(p.price or 0 for p in plants) / total_plants if total_plants > 0 else 0
+        metrics = get_supplier_metrics(supplier_id)
+        # Averages over all items, counting items without a price as zero
+        average_product_price = metrics.product_price_sum / metrics.product_count if metrics.product_count else 0
+        average_plant_price = metrics.plant_price_sum / metrics.plant_count if metrics.plant_count else 0
 
         return {
             "supplier_id": supplier_id,
             "supplier_name": supplier.name,
-            "total_products": total_products,
-            "total_plants": total_plants,
-            "total_inventory_value": total_inventory_value,
+            "total_products": metrics.product_count,
+            "total_plants": metrics.plant_count,
+            "total_inventory_value": metrics.inventory_value,
             "average_product_price": average_product_price,
             "average_plant_price": average_plant_price,
         }
@@ -209,27 +205,15 @@ class SupplierService:
     @staticmethod
     def get_top_suppliers_by_products(limit: int = 10) -> list[dict]:
         """Get top suppliers by number of products"""
-        suppliers = Supplier.query.all()
-        supplier_stats = []
-
-        for supplier in suppliers:
-            product_count = Product.query.filter_by(supplier_id=supplier.id).count()
-            plant_count = Plant.query.filter_by(supplier_id=supplier.id).count()
-            total_items = product_count + plant_count
-
-            if total_items > 0:
-                supplier_stats.append(
-                    {
-                        "supplier": supplier.to_dict(),
-                        "product_count": product_count,
-                        "plant_count": plant_count,
-                        "total_items": total_items,
-                    }
-                )
-
-        # Sort by total items and limit
-        supplier_stats.sort(key=lambda x: x["total_items"], reverse=True)
-        return supplier_stats[:limit]
+        return [
+            {
+                "supplier": supplier.to_dict(),
+                "product_count": metrics.product_count,
+                "plant_count": metrics.plant_count,
+                "total_items": metrics.total_items,
+            }
+            for supplier, metrics in ranked_supplier_metrics(limit, with_items_only=True)
+        ]
 
     @staticmethod
     def get_supplier_contact_info(supplier_id: int) -> dict:
@@ -0,0 +1,33 @@
+"""
+Data Versions
+
+Cheap fingerprints of table contents for validating cached and pre-generated
+results. A table's version combines its row count, highest id and latest
+``updated_at``: inserts change the count and the highest id, deletes change
+the count and ORM updates move ``updated_at``. Bulk updates that bypass the
+ORM and do not set ``updated_at`` are not detected.
+"""
+
+from sqlalchemy import func, select
+
+from src.models.user import db
+
+
+def table_version(*models) -> str:
+    """
+    Fingerprint of the tables behind ``models`` (each needs ``id`` and ``updated_at``).
+
+    All aggregates are fetched in one statement; separate scalar subqueries
+    let each of them be answered from an index.
+    """
+    columns = []
+    for model in models:
+        columns.extend(
+            [
+                select(func.count(model.id)).scalar_subquery(),
+                select(func.max(model.id)).scalar_subquery(),
+                select(func.max(model.updated_at)).scalar_subquery(),
+            ]
+        )
+    row = db.session.execute(select(*columns)).one()
+    return "|".join(f"{row[i]}:{row[i + 1]}:{row[i + 2]}" for i in range(0, len(row), 3))
@@ -0,0 +1,72 @@
+"""
+Date Bucketing
+
+Dialect-portable month buckets for grouping timestamps in SQL, with the
+matching Python helpers. ``month_bucket(column)`` renders ``'YYYY-MM'`` with
+``strftime`` on SQLite, ``to_char`` on PostgreSQL and ``date_format`` on
+MySQL, so analytics queries no longer depend on SQLite-only functions.
+Month keys sort lexicographically in calendar order.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import String
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+MONTH_KEY_FORMAT = "%Y-%m"
+
+
+class month_bucket(FunctionElement):
+    """The ``'YYYY-MM'`` month of a timestamp column, or NULL when it is NULL"""
+
+    type = String(7)
+    name = "month_bucket"
+    inherit_cache = True
+
+
+@compiles(month_bucket)
+def _month_bucket_default(element, compiler, **kw):
+    # to_char is understood by PostgreSQL and Oracle style databases
+    return f"to_char({compiler.process(element.clauses, **kw)}, 'YYYY-MM')"
+
+
+def _strftime_format(compiler) -> str:
+    # Drivers with format/pyformat parameters need literal percent signs doubled
+    return (
+        MONTH_KEY_FORMAT.replace("%", "%%")
+        if compiler.dialect.paramstyle in ("format", "pyformat")
+        else MONTH_KEY_FORMAT
+    )
+
+
+@compiles(month_bucket, "sqlite")
+def _month_bucket_sqlite(element, compiler, **kw):
+    return f"strftime('{_strftime_format(compiler)}', {compiler.process(element.clauses, **kw)})"
+
+
+@compiles(month_bucket, "mysql")
+@compiles(month_bucket, "mariadb")
+def _month_bucket_mysql(element, compiler, **kw):
+    return f"date_format({compiler.process(element.clauses, **kw)}, '{_strftime_format(compiler)}')"
+
+
+def month_key(value: datetime | None) -> str | None:
+    """The month key of a datetime, as ``month_bucket`` computes it in SQL"""
+    return value.strftime(MONTH_KEY_FORMAT) if value else None
+
+
+def month_start(value: datetime) -> datetime:
+    """Midnight on the first day of the month of ``value``, without timezone"""
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    """The first day of the month ``months`` after the month of ``value``"""
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def month_number(key: str) -> str:
+    """The two-digit month of the year of a month key (``'2026-03'`` -> ``'03'``)"""
+    return key[5:7]
@@ -1,7 +1,9 @@
 import logging
 
-from src.models.landscape import Client, Plant, Product, Project, Supplier
+from src.models.landscape import Client, Plant, Product, Project, ProjectMonthlyRollup, Supplier, SupplierMetrics
 from src.models.user import User, db
+from src.services.analytics_rollups import rebuild_rollups
+from src.services.supplier_metrics import rebuild_supplier_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -11,6 +13,14 @@ def initialize_database():
     try:
         db.create_all()
         logger.info("Database tables created successfully")
+
+        # Rollup tables created next to existing projects start out empty
+        if Project.query.first() is not None and ProjectMonthlyRollup.query.first() is None:
+            rebuild_rollups()
+            logger.info("Analytics rollups rebuilt")
+        if Supplier.query.first() is not None and SupplierMetrics.query.first() is None:
+            rebuild_supplier_metrics()
+            logger.info("Supplier metrics rebuilt")
     except Exception as e:
         logger.error(f"Error creating database tables: {e!s}")
         raise
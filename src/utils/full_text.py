@@ -0,0 +1,187 @@
+"""
+Full-text search indexes
+
+The plants, clients, projects and suppliers tables are indexed for full-text
+search, so searches no longer scan them with ``LIKE '%term%'``:
+
+- SQLite: an FTS5 table ``<table>_fts`` over the table's text columns
+  (external content, so the text is not stored twice), kept in sync by
+  triggers
+- PostgreSQL: a generated ``search_vector`` tsvector column with a GIN index,
+  built over the text without accents (the ``unaccent`` extension, through
+  an IMMUTABLE wrapper as generated columns require)
+
+Both are maintained by the database, so bulk inserts that bypass the ORM are
+indexed as well. Columns are listed most important first; the first ones
+weigh most in the ranking. Searches match every term as a word prefix,
+case-insensitively and ignoring accents.
+"""
+
+import re
+import unicodedata
+
+from sqlalchemy import inspect, text
+
+# Indexed columns per table, most important first
+SEARCH_COLUMNS = {
+    "plants": ("name", "common_name", "category"),
+    "clients": ("name", "company", "contact_person", "email", "city", "phone"),
+    "projects": ("name", "location", "description"),
+    "suppliers": ("name", "contact_person", "specialization", "city", "email"),
+}
+
+SUPPORTED_DIALECTS = ("sqlite", "postgresql")
+SEARCH_VECTOR_COLUMN = "search_vector"
+# IMMUTABLE wrapper of unaccent(), which is only STABLE and cannot be used in a generated column
+UNACCENT_FUNCTION = "search_unaccent"
+# Terms taken from one search; the rest are ignored
+MAX_SEARCH_TERMS = 8
+
+# Column weights by position: PostgreSQL weight classes and the matching bm25 weights
+_PG_WEIGHTS = ("A", "B", "C", "D")
+_BM25_WEIGHTS = (10.0, 4.0, 2.0, 1.0)
+
+# What FTS5's unicode61 tokenizer keeps together: letters and digits
+_TERM_RE = re.compile(r"[^\W_]+")
+
+
+def fts_table(table: str) -> str:
+    return f"{table}_fts"
+
+
+def bm25_weights(table: str) -> list[float]:
+    columns = SEARCH_COLUMNS[table]
+    return [_BM25_WEIGHTS[min(position, len(_BM25_WEIGHTS) - 1)] for position in range(len(columns))]
+
+
+def search_terms(value: str | None) -> list[str]:
+    """The words of a search, case-folded and without accents; single letters only on their own"""
+    if not value:
+        return []
+    normalized = unicodedata.normalize("NFKD", value)
+    normalized = "".join(char for char in normalized if not unicodedata.combining(char)).casefold()
+    terms = _TERM_RE.findall(normalized)
+    # A single letter hardly narrows a search for longer words but is costly as a prefix
+    words = [term for term in terms if len(term) > 1]
+    return (words or terms)[:MAX_SEARCH_TERMS]
+
+
+def match_expression(dialect: str, terms: list[str]) -> str:
+    """A query matching rows that contain every term as a word prefix"""
+    if dialect == "postgresql":
+        return " & ".join(f"{term}:*" for term in terms)
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def include_in_migrations(name: str | None, type_: str, parent_names: dict) -> bool:
+    """
+    Alembic ``include_name`` hook that leaves the search indexes out of autogenerate.
+
+    They are not part of the models' metadata, so a comparison would otherwise
+    drop them: the FTS5 tables with their shadow tables (``<table>_fts_data``
+    and so on) on SQLite, and the ``search_vector`` columns and their indexes on
+    PostgreSQL.
+    """
+    if type_ == "table":
+        return not any(name == fts_table(table) or name.startswith(f"{fts_table(table)}_") for table in SEARCH_COLUMNS)
+    if type_ == "column":
+        return not (name == SEARCH_VECTOR_COLUMN and parent_names.get("table_name") in SEARCH_COLUMNS)
+    if type_ == "index":
+        return name not in {f"idx_{table}_search" for table in SEARCH_COLUMNS}
+    return True
+
+
+# The statements below are built from the identifiers in SEARCH_COLUMNS only
+def _sqlite_statements(table: str) -> list[str]:
+    columns = SEARCH_COLUMNS[table]
+    fts = fts_table(table)
+    names = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    insert_new = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values});"  # noqa: S608
+    delete_old = f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values});"  # noqa: S608
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({names}, content='{table}', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table} BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF {names} ON {table} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def _postgresql_function_statements() -> list[str]:
+    # The dictionary is named so the function does not depend on the search_path
+    return [
+        "CREATE EXTENSION IF NOT EXISTS unaccent",
+        f"CREATE OR REPLACE FUNCTION {UNACCENT_FUNCTION}(value text) RETURNS text "
+        "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT "
+        "AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, value) $$",
+    ]
+
+
+def _postgresql_statements(table: str) -> list[str]:
+    vector = " || ".join(
+        f"setweight(to_tsvector('simple', {UNACCENT_FUNCTION}(coalesce({column}, ''))), "
+        f"'{_PG_WEIGHTS[min(position, 3)]}')"
+        for position, column in enumerate(SEARCH_COLUMNS[table])
+    )
+    return [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {SEARCH_VECTOR_COLUMN} tsvector "
+        f"GENERATED ALWAYS AS ({vector}) STORED",
+        f"CREATE INDEX IF NOT EXISTS idx_{table}_search ON {table} USING GIN ({SEARCH_VECTOR_COLUMN})",
+    ]
+
+
+def create_search_indexes(connection, tables=None) -> list[str]:
+    """
+    Create the full-text indexes of existing tables that lack them.
+
+    New SQLite indexes are filled from their table. Returns the tables indexed.
+    """
+    dialect = connection.dialect.name
+    if dialect not in SUPPORTED_DIALECTS:
+        return []
+    inspector = inspect(connection)
+    if dialect == "postgresql":
+        for statement in _postgresql_function_statements():
+            connection.execute(text(statement))
+    created = []
+    for table in tables or SEARCH_COLUMNS:
+        if not inspector.has_table(table):
+            continue
+        if dialect == "postgresql":
+            for statement in _postgresql_statements(table):
+                connection.execute(text(statement))
+        else:
+            existed = inspector.has_table(fts_table(table))
+            for statement in _sqlite_statements(table):
+                connection.execute(text(statement))
+            if not existed:
+                rebuild_search_index(connection, [table])
+        created.append(table)
+    return created
+
+
+def drop_search_indexes(connection, tables=None) -> None:
+    dialect = connection.dialect.name
+    for table in tables or SEARCH_COLUMNS:
+        if dialect == "postgresql":
+            connection.execute(text(f"DROP INDEX IF EXISTS idx_{table}_search"))
+            connection.execute(text(f"ALTER TABLE IF EXISTS {table} DROP COLUMN IF EXISTS {SEARCH_VECTOR_COLUMN}"))
+        elif dialect == "sqlite":
+            fts = fts_table(table)
+            for trigger in ("insert", "delete", "update"):
+                connection.execute(text(f"DROP TRIGGER IF EXISTS {fts}_{trigger}"))
+            connection.execute(text(f"DROP TABLE IF EXISTS {fts}"))
+    if dialect == "postgresql" and tables is None:
+        connection.execute(text(f"DROP FUNCTION IF EXISTS {UNACCENT_FUNCTION}(text)"))
+
+
+def rebuild_search_index(connection, tables=None) -> None:
+    """Re-read every row into the SQLite indexes; PostgreSQL's generated columns are always current"""
+    if connection.dialect.name != "sqlite":
+        return
+    for table in tables or SEARCH_COLUMNS:
+        fts = fts_table(table)
+        connection.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))  # noqa: S608
@@ -0,0 +1,52 @@
+"""
+Natural key normalization for duplicate detection
+
+Natural keys identify a record the way a user would ("the same plant", "the same
+supplier") rather than by primary key. Values are case-folded, accent-stripped and
+whitespace-collapsed so that "Acer  Palmatum" and "acer palmatum" share one key.
+"""
+
+import re
+import unicodedata
+from typing import Any
+
+KEY_SEPARATOR = "|"
+NATURAL_KEY_LENGTH = 255
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_key(value: Any) -> str:
+    """Normalize a single value for natural key comparison"""
+    if value is None:
+        return ""
+    text = unicodedata.normalize("NFKD", str(value))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return _WHITESPACE_RE.sub(" ", text.casefold()).strip()
+
+
+def _join(*parts: Any) -> str | None:
+    normalized = [normalize_key(part) for part in parts]
+    if not normalized[0]:
+        return None
+    return KEY_SEPARATOR.join(normalized)[:NATURAL_KEY_LENGTH]
+
+
+def plant_key(name: Any) -> str | None:
+    """Plants are identified by their (botanical) name"""
+    return _join(name)
+
+
+def supplier_key(name: Any, email: Any) -> str | None:
+    """Suppliers are identified by name and email"""
+    return _join(name, email)
+
+
+def client_key(email: Any) -> str | None:
+    """Clients are identified by email; clients without email have no natural key"""
+    return _join(email)
+
+
+def product_key(name: Any, supplier_id: Any) -> str | None:
+    """Products are identified by name per supplier"""
+    return _join(name, "" if supplier_id in (None, "") else int(supplier_id))
@@ -24,7 +24,7 @@ import os
 import time
 
 import pytest
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -324,6 +324,29 @@ def app_context(app):
     return app
 
 
+@pytest.fixture
+def statements(app_context):
+    """
+    Queries (SELECT and WITH statements) sent to the database while the test runs.
+
+    Clear the list before the part of the test whose queries are counted.
+    """
+    from src.models.user import db as flask_db
+
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        # Leaves out the SAVEPOINTs of the test transaction and the writes of the test's setup
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            executed.append(statement)
+
+    # Tests bind the session to a single connection, so listen on the bind itself
+    bind = flask_db.session.get_bind()
+    event.listen(bind, "before_cursor_execute", record)
+    yield executed
+    event.remove(bind, "before_cursor_execute", record)
+
+
 # Enhanced test result reporting
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
@@ -334,10 +334,8 @@ class TestReportsPDFGeneration(DatabaseTestMixin):
 
     @patch("src.routes.reports.send_file")
     @patch("src.routes.reports.SimpleDocTemplate")
-    @patch("src.routes.reports.getSampleStyleSheet")
     def test_business_summary_pdf_structure(
         self,
-        mock_styles,
         mock_doc,
         mock_send_file,
         client,
@@ -353,15 +351,6 @@ class TestReportsPDFGeneration(DatabaseTestMixin):
         # Mock the PDF components
         mock_doc_instance = MagicMock()
         mock_doc.return_value = mock_doc_instance
-
-        # Create proper mock styles that work with ReportLab
-        from reportlab.lib.styles import ParagraphStyle
-
-        mock_styles.return_value = {
-            "Heading1": ParagraphStyle("MockHeading1"),
-            "Heading2": ParagraphStyle("MockHeading2"),
-            "Normal": ParagraphStyle("MockNormal"),
-        }
         mock_send_file.return_value = MagicMock()
 
         response = client.get("/api/reports/business-summary", query_string={"format": "pdf"})
@@ -0,0 +1,117 @@
+"""
+Tests for the offline (fallback) column mapping and validation of the AI data mapping service
+"""
+
+import pandas as pd
+import pytest
+
+from src.services.ai_data_mapping import (
+    AIDataMappingService,
+    HeaderSimilarityIndex,
+    get_header_index,
+    normalize_header,
+)
+
+SUPPLIER_SCHEMA = {
+    "name": "Company name",
+    "contact_person": "Contact person",
+    "email": "Email address",
+    "phone": "Phone number",
+    "city": "City",
+    "postal_code": "Postal code",
+    "website": "Website",
+}
+
+
+@pytest.mark.service
+class TestFallbackMapping:
+    """Test header normalization and similarity-based mapping"""
+
+    def test_normalize_header(self):
+        """Headers are case-folded, accent-stripped and punctuation-collapsed"""
+        assert normalize_header("  E-mail Adrés ") == "e mail adres"
+        assert normalize_header("Post_Code") == "post code"
+
+    def test_dutch_headers_map_to_fields(self):
+        """Dutch and English synonyms map with full confidence"""
+        service = AIDataMappingService()
+        mapping = service._fallback_mapping(
+            ["Bedrijfsnaam", "E-mailadres", "Telefoonnummer", "Woonplaats", "Postcode", "Contact Person"],
+            SUPPLIER_SCHEMA,
+        )
+
+        assert mapping["Bedrijfsnaam"] == {"name": 1.0}
+        assert mapping["E-mailadres"] == {"email": 1.0}
+        assert mapping["Telefoonnummer"] == {"phone": 1.0}
+        assert mapping["Woonplaats"] == {"city": 1.0}
+        assert mapping["Postcode"] == {"postal_code": 1.0}
+        assert next(iter(mapping["Contact Person"])) == "contact_person"
+
+    def test_partial_and_fuzzy_matches(self):
+        """Contained synonyms score below exact matches; typos still find the field"""
+        service = AIDataMappingService()
+        mapping = service._fallback_mapping(["Telefoon mobiel", "Telefon", "Woonplaat", "Website URL"], SUPPLIER_SCHEMA)
+
+        assert mapping["Telefoon mobiel"]["phone"] >= 0.7
+        assert mapping["Telefon"]["phone"] < 1.0
+        assert next(iter(mapping["Telefon"])) == "phone"
+        assert next(iter(mapping["Woonplaat"])) == "city"
+        assert next(iter(mapping["Website URL"])) == "website"
+
+    def test_unknown_header_gets_low_confidence_default(self):
+        """Headers without any match fall back to the first schema field"""
+        service = AIDataMappingService()
+        mapping = service._fallback_mapping(["xyz"], SUPPLIER_SCHEMA)
+
+        assert mapping["xyz"] == {"name": 0.3}
+
+    def test_mapping_is_memoized_and_isolated(self):
+        """Repeated header signatures reuse the cached result without sharing mutable state"""
+        service = AIDataMappingService()
+        first = service._fallback_mapping(["Naam"], SUPPLIER_SCHEMA)
+        first["Naam"]["email"] = 0.99
+
+        second = service._fallback_mapping(["Naam"], SUPPLIER_SCHEMA)
+        assert second == {"Naam": {"name": 1.0}}
+
+    def test_index_is_cached_per_schema(self):
+        """The similarity index is built once per target field set"""
+        fields = tuple(SUPPLIER_SCHEMA)
+        index = get_header_index(fields)
+
+        assert isinstance(index, HeaderSimilarityIndex)
+        assert get_header_index(fields) is index
+        assert index.score(["Naam", "Stad"]).shape == (2, len(fields))
+
+    def test_empty_schema(self):
+        """An empty target schema yields no suggestions"""
+        assert AIDataMappingService()._fallback_mapping(["Naam"], {}) == {}
+
+
+@pytest.mark.service
+class TestFallbackValidation:
+    """Test column-wise fallback data validation"""
+
+    def test_reports_missing_and_invalid_emails(self):
+        """Null counts and invalid email formats are reported per column"""
+        data = pd.DataFrame(
+            {
+                "Naam": ["Groen BV", None, "Tuin & Co"],
+                "E-mail": ["info@groen.nl", "geen-email", None],
+            }
+        )
+        result = AIDataMappingService()._fallback_validation(data, {"Naam": "name", "E-mail": "email"})
+
+        assert result["issues"] == [
+            {"type": "missing_data", "column": "Naam", "suggestion": "1 empty values found in Naam"},
+            {"type": "missing_data", "column": "E-mail", "suggestion": "1 empty values found in E-mail"},
+            {"type": "invalid_format", "column": "E-mail", "suggestion": "1 invalid email formats in E-mail"},
+        ]
+        assert result["quality_score"] == 0.7
+
+    def test_ignores_unmapped_and_missing_columns(self):
+        """Columns absent from the mapping or the data are skipped"""
+        data = pd.DataFrame({"Naam": ["A"], "Extra": [None]})
+        result = AIDataMappingService()._fallback_validation(data, {"Naam": "name", "Ontbreekt": "email"})
+
+        assert result["issues"] == []
@@ -0,0 +1,154 @@
+"""
+Test Analytics Rollups
+
+Tests for the monthly rollup tables, their incremental refresh and the
+dialect-portable month buckets.
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import column, delete, func, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from src.models.landscape import (
+    PlantMonthlyRollup,
+    Project,
+    ProjectMonthlyRollup,
+    ProjectPlant,
+    RollupDirtyMonth,
+)
+from src.models.user import db
+from src.services.analytics import AnalyticsService
+from src.services.analytics_rollups import rebuild_rollups, refresh_dirty_months
+from src.utils.date_buckets import add_months, month_bucket
+
+
+@pytest.fixture
+def portfolio(client_factory, project_factory, plant_factory, project_plant_factory):
+    utrecht = client_factory(city="Utrecht")
+    delft = client_factory(city="Delft")
+    acer = plant_factory(name="Acer palmatum", category="Tree", bloom_time="Spring")
+    buxus = plant_factory(name="Buxus sempervirens", category="Shrub", bloom_time="Summer")
+
+    projects = [
+        project_factory(client=utrecht, project_type="garden", budget=1000.0, created_at=datetime(2026, 1, 10)),
+        project_factory(client=utrecht, project_type="garden", budget=2000.0, created_at=datetime(2026, 2, 3)),
+        project_factory(client=delft, project_type="roof", budget=4000.0, created_at=datetime(2026, 2, 20)),
+        project_factory(client=delft, project_type="roof", budget=None, created_at=datetime(2026, 3, 15)),
+    ]
+    project_plant_factory(project=projects[0], plant=acer, quantity=2, unit_cost=50.0)
+    project_plant_factory(project=projects[1], plant=acer, quantity=1, unit_cost=40.0)
+    project_plant_factory(project=projects[2], plant=buxus, quantity=10, unit_cost=5.0)
+    project_plant_factory(project=projects[3], plant=buxus, quantity=4, unit_cost=None)
+    return projects
+
+
+def _stored(model, *columns):
+    return db.session.execute(select(model.month, *columns).order_by(model.month, *columns)).all()
+
+
+@pytest.mark.service
+class TestAnalyticsRollups:
+    """Test the rollup refresh and period reads"""
+
+    def test_writes_mark_months_dirty(self, app_context, portfolio):
+        """Inserts record their months and a refresh fills the rollups"""
+        dirty = {month for (month,) in db.session.execute(select(RollupDirtyMonth.month))}
+        assert dirty == {"2026-01", "2026-02", "2026-03"}
+
+        assert refresh_dirty_months() == ["2026-01", "2026-02", "2026-03"]
+        assert db.session.execute(select(func.count(RollupDirtyMonth.id))).scalar() == 0
+        assert _stored(ProjectMonthlyRollup, ProjectMonthlyRollup.project_type, ProjectMonthlyRollup.budget_total) == [
+            ("2026-01", "garden", 1000.0),
+            ("2026-02", "garden", 2000.0),
+            ("2026-02", "roof", 4000.0),
+            ("2026-03", "roof", None),
+        ]
+
+    def test_update_refreshes_only_changed_month(self, app_context, portfolio):
+        """A budget change is picked up by the next read without a rebuild"""
+        refresh_dirty_months()
+        portfolio[1].budget = 2500.0
+        db.session.commit()
+
+        assert refresh_dirty_months() == ["2026-02"]
+        revenue = AnalyticsService().get_financial_reporting((None, None))["revenue_summary"]["total_revenue"]
+        assert revenue == 7500.0
+
+    def test_client_city_change_marks_months(self, app_context, portfolio):
+        """Moving a client updates the per-city rollups of its projects"""
+        refresh_dirty_months()
+        portfolio[2].client.city = "Leiden"
+        db.session.commit()
+
+        assert refresh_dirty_months() == ["2026-02", "2026-03"]
+        geographic = AnalyticsService().get_geographic_analytics()
+        assert sorted(geographic["coverage_areas"]) == ["Leiden", "Utrecht"]
+        assert geographic["regional_plant_preferences"]["Leiden"] == {"Shrub": 2}
+
+    def test_partial_months_are_read_from_projects(self, app_context, portfolio):
+        """Edges of a period that cut through a month only count projects inside the period"""
+        financial = AnalyticsService().get_financial_reporting(("2026-01-15T00:00:00", "2026-02-10T00:00:00"))
+
+        assert financial["revenue_summary"] == {
+            "total_revenue": 2000.0,
+            "project_count": 1,
+            "avg_project_value": 2000.0,
+        }
+        assert [trend["month"] for trend in financial["revenue_trends"]] == ["2026-02"]
+
+    def test_whole_months_are_read_from_rollups(self, app_context, portfolio):
+        """Whole months come from the rollup tables, so bulk deletes need a rebuild"""
+        refresh_dirty_months()
+        db.session.execute(delete(ProjectPlant))
+        db.session.execute(delete(Project).where(Project.id == portfolio[0].id))
+        db.session.commit()
+
+        period = ("2026-01-01T00:00:00", "2026-03-31T23:59:59.999999")
+        assert AnalyticsService().get_financial_reporting(period)["revenue_summary"]["total_revenue"] == 7000.0
+
+        rebuild_rollups()
+        assert AnalyticsService().get_financial_reporting(period)["revenue_summary"]["total_revenue"] == 6000.0
+        assert _stored(PlantMonthlyRollup, PlantMonthlyRollup.plant_id) == []
+
+    def test_plant_usage_totals(self, app_context, portfolio):
+        """Usage totals, average costs and monthly trends add up over the rollups"""
+        usage = AnalyticsService().get_plant_usage_analytics(("2026-02-01T00:00:00", "2026-03-31T23:59:59"))
+
+        assert [(plant["name"], plant["project_count"]) for plant in usage["most_used_plants"]] == [
+            ("Buxus sempervirens", 2),
+            ("Acer palmatum", 1),
+        ]
+        assert usage["most_used_plants"][0]["avg_cost"] == 5.0
+        assert usage["total_plants_used"] == 15
+        assert usage["total_projects_with_plants"] == 3
+        assert [trend["month"] for trend in usage["usage_trends"]] == ["2026-02", "2026-03"]
+
+    def test_seasonal_analytics(self, app_context, portfolio):
+        seasonal = AnalyticsService().get_seasonal_analytics()
+
+        assert seasonal["projects_by_month"] == [
+            {"month": "January", "count": 1},
+            {"month": "February", "count": 2},
+            {"month": "March", "count": 1},
+        ]
+        assert seasonal["plant_usage_by_season"] == {"Spring": 3, "Summer": 14}
+
+
+class TestDateBuckets:
+    """Test the dialect-portable month buckets"""
+
+    @pytest.mark.parametrize(
+        ("dialect", "expected"),
+        [
+            (sqlite.dialect(), "strftime('%Y-%m', created_at)"),
+            (postgresql.dialect(), "to_char(created_at, 'YYYY-MM')"),
+            (mysql.dialect(), "date_format(created_at, '%%Y-%%m')"),
+        ],
+    )
+    def test_month_bucket_compiles_per_dialect(self, dialect, expected):
+        assert str(month_bucket(column("created_at")).compile(dialect=dialect)) == expected
+
+    def test_add_months_crosses_years(self):
+        assert add_months(datetime(2026, 11, 30, 12), 2) == datetime(2027, 1, 1)
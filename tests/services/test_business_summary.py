@@ -0,0 +1,113 @@
+"""
+Test Business Summary
+
+Tests for the two-statement business summary query engine.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from src.models.user import db
+from src.services.analytics import AnalyticsService
+from src.services.business_summary import get_business_summary
+from tests.fixtures.auth_fixtures import authenticated_test_user
+
+
+@pytest.fixture
+def authenticated_client(client, app_context, authenticated_test_user):
+    """Provide an authenticated test client with application context"""
+
+    return client
+
+
+@pytest.fixture
+def portfolio(client_factory, project_factory, plant_factory, project_plant_factory):
+    jansen = client_factory(name="Familie Jansen")
+    de_vries = client_factory(name="De Vries BV")
+    acer = plant_factory(name="Acer palmatum")
+    buxus = plant_factory(name="Buxus sempervirens")
+
+    projects = [
+        project_factory(client=jansen, status="active", budget=1000.0, created_at=datetime(2026, 1, 10)),
+        project_factory(client=jansen, status="completed", budget=3000.0, created_at=datetime(2026, 2, 10)),
+        project_factory(client=de_vries, status="completed", budget=None, created_at=datetime(2026, 3, 10)),
+    ]
+    project_plant_factory(project=projects[0], plant=acer)
+    project_plant_factory(project=projects[1], plant=acer)
+    project_plant_factory(project=projects[2], plant=buxus)
+    return projects
+
+
+@pytest.mark.service
+class TestBusinessSummary:
+    """Test the business summary query engine"""
+
+    def test_summary_figures(self, app_context, portfolio):
+        """Totals, budget statistics and rankings match the data"""
+        summary = get_business_summary()
+
+        assert summary.total_projects == 3
+        assert summary.total_clients == 2
+        assert summary.total_plants == 2
+        assert summary.status_distribution == {"active": 1, "completed": 2}
+        assert summary.budgeted_projects == 2
+        assert summary.total_budget == 4000.0
+        assert summary.avg_budget == 2000.0
+        assert (summary.min_budget, summary.max_budget) == (1000.0, 3000.0)
+        assert [(c.name, c.project_count, c.total_budget) for c in summary.top_clients] == [
+            ("Familie Jansen", 2, 4000.0),
+            ("De Vries BV", 1, 0.0),
+        ]
+        assert [(p.name, p.project_count) for p in summary.plant_usage] == [
+            ("Acer palmatum", 2),
+            ("Buxus sempervirens", 1),
+        ]
+
+    def test_period_filter(self, app_context, portfolio):
+        """Only projects created in the period are aggregated; entity totals are not filtered"""
+        summary = get_business_summary(start=datetime(2026, 2, 1), end=datetime(2026, 3, 31))
+
+        assert summary.total_projects == 2
+        assert summary.total_clients == 2
+        assert summary.status_distribution == {"completed": 2}
+        assert [p.name for p in summary.plant_usage] == ["Acer palmatum", "Buxus sempervirens"]
+        assert [p.project_count for p in summary.plant_usage] == [1, 1]
+
+    def test_runs_two_statements(self, portfolio, statements):
+        """The whole summary takes two statements, the totals alone one"""
+        get_business_summary(start=datetime(2026, 1, 1))
+        assert len(statements) == 2
+
+        statements.clear()
+        summary = get_business_summary(distributions=False)
+        assert len(statements) == 1
+        assert summary.status_distribution == {}
+
+    def test_shared_with_analytics(self, app_context, portfolio):
+        """The analytics service reports the same budget figures"""
+        metrics = AnalyticsService().get_project_performance_metrics()
+
+        assert metrics["status_distribution"] == {"active": 1, "completed": 2}
+        assert metrics["budget_analysis"]["project_count"] == 2
+        assert metrics["budget_analysis"]["max_budget"] == 3000.0
+
+
+@pytest.mark.api
+class TestBusinessSummaryEndpoints:
+    """Test the endpoints built on the summary"""
+
+    def test_business_summary_report(self, authenticated_client, portfolio):
+        response = authenticated_client.get("/api/reports/business-summary?start_date=2026-02-01T00:00:00")
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["summary"]["total_projects"] == 2
+        assert data["project_stats"]["budget_stats"]["total_budget"] == 3000.0
+        assert data["top_clients"][0]["name"] == "Familie Jansen"
+
+    def test_project_insights(self, authenticated_client, portfolio):
+        response = authenticated_client.get("/api/ai/project-insights")
+
+        assert response.status_code == 200
+        assert "2 out of 3 projects" in response.get_json()["insights"][0]["content"]
@@ -0,0 +1,148 @@
+"""
+Test Export Service
+
+Tests for streaming plant, supplier and client exports.
+"""
+
+import csv
+import io
+import json
+
+import pytest
+from openpyxl import load_workbook
+
+from src.models.landscape import Client, Plant, Supplier
+from src.services.export_service import ExportService
+from tests.fixtures.auth_fixtures import authenticated_test_user
+
+
+@pytest.fixture
+def authenticated_client(client, app_context, authenticated_test_user):
+    """Provide an authenticated test client with application context"""
+
+    return client
+
+
+@pytest.mark.service
+class TestExportService:
+    """Test export query building and serialization"""
+
+    def test_unknown_entity(self):
+        """Only configured entities can be exported"""
+        with pytest.raises(ValueError, match="Unsupported export entity"):
+            ExportService("invoices")
+
+    def test_resolve_columns(self):
+        """Column selection defaults to the to_dict() fields and rejects unknown names"""
+        service = ExportService("plants")
+
+        assert service.resolve_columns(None) == list(Plant(name="Acer").to_dict())
+        assert service.resolve_columns("name, category") == ["name", "category"]
+        with pytest.raises(ValueError, match="Unknown export columns: secret"):
+            service.resolve_columns("name,secret")
+
+    @pytest.mark.parametrize(("entity", "model"), [("plants", Plant), ("suppliers", Supplier), ("clients", Client)])
+    def test_default_columns_match_to_dict(self, app_context, entity, model):
+        """Internal columns are neither exported by default nor selectable"""
+        service = ExportService(entity)
+
+        assert service.resolve_columns(None) == list(model().to_dict())
+        assert "natural_key" not in service.available_columns
+        with pytest.raises(ValueError, match="Unknown export columns: natural_key"):
+            service.resolve_columns("name,natural_key")
+
+    def test_csv_stream_is_batched(self, app_context, plant_factory, monkeypatch):
+        """CSV output is produced per database batch"""
+        monkeypatch.setattr("src.services.export_service.EXPORT_BATCH_SIZE", 2)
+        for idx in range(5):
+            plant_factory(name=f"Plant {idx}", category="Tree")
+
+        service = ExportService("plants")
+        columns = ["name", "category"]
+        chunks = list(service.stream("csv", columns, service.build_query(columns)))
+
+        assert len(chunks) == 3
+        rows = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+        assert rows[0] == ["name", "category"]
+        assert [row[0] for row in rows[1:]] == [f"Plant {idx}" for idx in range(5)]
+
+
+@pytest.mark.api
+class TestExportRoutes:
+    """Test the streaming export endpoints"""
+
+    def test_plants_export_filters_and_columns(self, authenticated_client, plant_factory):
+        """Filters and column selection apply to the NDJSON export"""
+        plant_factory(name="Acer", category="Tree", native=True)
+        plant_factory(name="Buxus", category="Shrub", native=False)
+        plant_factory(name="Carpinus", category="Tree", native=False)
+
+        response = authenticated_client.get("/api/plants/export?format=ndjson&category=Tree&columns=name,native")
+
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        assert "attachment" in response.headers["Content-Disposition"]
+        records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert records == [{"name": "Acer", "native": True}, {"name": "Carpinus", "native": False}]
+
+    def test_plants_export_json_is_not_truncated(self, authenticated_client, plant_factory, monkeypatch):
+        """JSON export streams every row, not just the first page"""
+        monkeypatch.setattr("src.services.export_service.EXPORT_BATCH_SIZE", 3)
+        for idx in range(7):
+            plant_factory(name=f"Plant {idx:02d}", native=False)
+
+        response = authenticated_client.get("/api/plants/export?format=json&native=false")
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["count"] == 7
+        assert [plant["name"] for plant in data["plants"]] == [f"Plant {idx:02d}" for idx in range(7)]
+
+    def test_json_export_keeps_the_previous_shape(
+        self, authenticated_client, supplier_factory, plant_factory, product_factory
+    ):
+        """Default JSON exports carry the to_dict() fields and the previous envelope"""
+        supplier = supplier_factory(name="Groen BV")
+        plant = plant_factory(name="Acer", supplier=supplier)
+        product_factory(supplier=supplier)
+        product_factory(supplier=supplier)
+
+        plants = authenticated_client.get("/api/plants/export?format=json").get_json()
+        assert plants["plants"] == [{**plant.to_dict(), "supplier_name": "Groen BV"}]
+        assert plants["count"] == 1
+
+        suppliers = authenticated_client.get("/api/suppliers/export?format=json").get_json()
+        assert suppliers["suppliers"] == [supplier.to_dict()]
+        assert suppliers["suppliers"][0]["product_count"] == 2
+        assert {key: suppliers[key] for key in ("total", "pages", "current_page", "count")} == {
+            "total": 1,
+            "pages": 1,
+            "current_page": 1,
+            "count": 1,
+        }
+
+    def test_suppliers_export_xlsx(self, authenticated_client, supplier_factory):
+        """Suppliers can be exported as an XLSX workbook"""
+        supplier_factory(name="Groen BV", city="Utrecht")
+        supplier_factory(name="Tuin & Co", city="Gouda")
+
+        response = authenticated_client.get("/api/suppliers/export?format=xlsx&columns=name,city&city=Gouda")
+
+        assert response.status_code == 200
+        worksheet = load_workbook(io.BytesIO(response.get_data())).active
+        assert list(worksheet.values) == [("name", "city"), ("Tuin & Co", "Gouda")]
+
+    def test_clients_export_csv_search(self, authenticated_client, client_factory):
+        """Client export supports search"""
+        client_factory(name="Gemeente Utrecht")
+        client_factory(name="Villa Rozenhof")
+
+        response = authenticated_client.get("/api/clients/export?format=csv&columns=name&search=rozen")
+
+        assert response.status_code == 200
+        assert response.get_data(as_text=True).splitlines() == ["name", "Villa Rozenhof"]
+
+    def test_export_rejects_unsupported_format_and_columns(self, authenticated_client):
+        """Invalid formats and columns fail before streaming starts"""
+        assert authenticated_client.get("/api/plants/export?format=pdf").status_code == 400
+        assert authenticated_client.get("/api/suppliers/export?columns=password").status_code == 400
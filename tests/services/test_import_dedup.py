@@ -0,0 +1,120 @@
+"""
+Test Import Deduplication
+
+Tests for natural key normalization and chunk-level duplicate lookups.
+"""
+
+import io
+
+import pytest
+
+from src.models.landscape import Client, Plant, Supplier
+from src.models.user import db
+from src.services.import_dedup import NaturalKeyIndex
+from src.utils.natural_keys import normalize_key, product_key, supplier_key
+from tests.fixtures.auth_fixtures import authenticated_test_user
+
+
+@pytest.fixture
+def authenticated_client(client, app_context, authenticated_test_user):
+    """Provide an authenticated test client with application context"""
+
+    return client
+
+
+@pytest.mark.service
+class TestNaturalKeys:
+    """Test key normalization"""
+
+    def test_normalize_key(self):
+        """Case, accents and whitespace do not affect the key"""
+        assert normalize_key("  Hébé   Pinguifolia\t") == "hebe pinguifolia"
+        assert normalize_key(None) == ""
+
+    def test_composite_keys(self):
+        """Composite keys require their leading part"""
+        assert supplier_key("Groen BV", "INFO@groen.nl ") == "groen bv|info@groen.nl"
+        assert supplier_key("", "info@groen.nl") is None
+        assert product_key("Potgrond", 3.0) == "potgrond|3"
+        assert product_key("Potgrond", "") == "potgrond|"
+
+    def test_models_maintain_natural_key(self, app_context, plant_factory):
+        """Keys are set on insert and kept up to date on update"""
+        plant = plant_factory(name="Acer  Palmatum")
+        assert plant.natural_key == "acer palmatum"
+
+        plant.name = "Acer Campestre"
+        db.session.commit()
+        assert plant.natural_key == "acer campestre"
+
+
+@pytest.mark.service
+class TestNaturalKeyIndex:
+    """Test chunk-level lookups"""
+
+    def test_prime_resolves_chunk_in_one_query(self, app_context, plant_factory):
+        """Existing records are found with one query per chunk"""
+        acer = plant_factory(name="Acer palmatum")
+        plant_factory(name="Buxus sempervirens")
+
+        index = NaturalKeyIndex(Plant)
+        index.prime(["acer palmatum", "taxus baccata", None])
+        index.prime(["acer palmatum"])
+
+        assert index.queries == 1
+        assert index.get("acer palmatum") is acer
+        assert index.get("taxus baccata") is None
+        assert index.get(None) is None
+
+    def test_added_records_are_visible(self, app_context):
+        """Records created during an import are matched by later rows"""
+        index = NaturalKeyIndex(Supplier)
+        supplier = Supplier(name="Groen BV", email="info@groen.nl")
+        index.add("groen bv|info@groen.nl", supplier)
+
+        index.prime(["groen bv|info@groen.nl"])
+
+        assert index.queries == 0
+        assert index.get("groen bv|info@groen.nl") is supplier
+
+    def test_near_duplicates(self, app_context, plant_factory):
+        """Keys that differ by a typo are reported as near-duplicates"""
+        plant_factory(name="Lavandula angustifolia")
+        plant_factory(name="Lavatera olbia")
+
+        index = NaturalKeyIndex(Plant)
+        keys = ["lavandula angustifolai", "lavatera thuringiaca", "rosa canina"]
+        index.prime(keys)
+
+        assert index.near_duplicates(keys) == {"lavandula angustifolai": "lavandula angustifolia"}
+
+
+@pytest.mark.api
+class TestImportDeduplication:
+    """Test duplicate handling in the Excel import endpoint"""
+
+    def test_duplicates_match_normalized_keys(self, authenticated_client, client_factory):
+        """Existing records and repeated rows are detected regardless of case and spacing"""
+        client_factory(name="Familie Jansen", email="j.jansen@email.nl")
+        csv_content = (
+            "name,email,phone,address,city,postal_code,country,client_type\n"
+            "Jansen,J.Jansen@Email.nl ,0612345678,Dorpsstraat 25,Hilversum,1234 AB,Nederland,Particulier\n"
+            "De Vries,devries@email.nl,0687654321,Kerkstraat 1,Utrecht,3511 AB,Nederland,Particulier\n"
+            "M. de Vries,DEVRIES@email.nl,0687654321,Kerkstraat 1,Utrecht,3511 AB,Nederland,Particulier\n"
+        )
+
+        response = authenticated_client.post(
+            "/api/import/process",
+            data={
+                "type": "clients",
+                "file": (io.BytesIO(csv_content.encode()), "clients.csv"),
+                "update_existing": "false",
+            },
+        )
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["successful_imports"] == 1
+        assert data["failed_imports"] == 2
+        assert data["errors"] == ["Rij 2: Klant bestaat al", "Rij 4: Klant bestaat al"]
+        assert db.session.query(Client).filter_by(natural_key="devries@email.nl").count() == 1
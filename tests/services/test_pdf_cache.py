@@ -0,0 +1,163 @@
+"""
+Test PDF Cache
+
+Tests for the content-addressed PDF cache and its use by the PDF endpoints.
+"""
+
+import pytest
+
+from src.models.user import db
+from src.routes.reports import _section_story, render_comprehensive_pdf
+from src.services.pdf_cache import PDFCache, cache_key, get_pdf_cache
+from src.services.report_templates import report_translations
+from tests.fixtures.auth_fixtures import authenticated_test_user
+
+PDF_BYTES = b"%PDF-1.4 test document"
+
+
+def render_stub(data, language="en"):
+    return PDF_BYTES
+
+
+@pytest.fixture
+def pdf_cache_dir(app, tmp_path, monkeypatch):
+    """Enable the PDF cache in a temporary directory"""
+    monkeypatch.setitem(app.config, "PDF_CACHE_ENABLED", True)
+    monkeypatch.setitem(app.config, "PDF_CACHE_DIR", str(tmp_path / "pdf_cache"))
+    return tmp_path / "pdf_cache"
+
+
+@pytest.fixture
+def authenticated_client(client, app_context, authenticated_test_user):
+    """Provide an authenticated test client with application context"""
+
+    return client
+
+
+@pytest.mark.service
+class TestPDFCache:
+    """Test keys, LRU bounds and invalidation"""
+
+    def test_cache_key_ignores_generation_time(self):
+        """Renders on the same day share a key; data and language changes do not"""
+        morning = {"generated_at": "2026-03-01T08:00:00", "project": {"name": "Tuin"}}
+        evening = {"generated_at": "2026-03-01T20:15:00", "project": {"name": "Tuin"}}
+        renamed = {"generated_at": "2026-03-01T08:00:00", "project": {"name": "Park"}}
+
+        assert cache_key(render_stub, [morning]) == cache_key(render_stub, [evening])
+        assert cache_key(render_stub, [morning]) != cache_key(render_stub, [renamed])
+        assert cache_key(render_stub, [morning, "en"]) != cache_key(render_stub, [morning, "nl"])
+
+    def test_comprehensive_report_time_is_part_of_its_key(self):
+        """A comprehensive report prints the render time its cache key was made from"""
+        monday = {"start": "2026-03-01", "end": "2026-03-31", "generated_at": "2026-03-02T08:05:00"}
+        tuesday = {**monday, "generated_at": "2026-03-03T08:05:00"}
+
+        story = _section_story("overview", "overview", monday, {}, report_translations("en"), first=True)
+
+        assert "02-03-2026 08:05" in story[2].text
+        assert cache_key(render_comprehensive_pdf, ["overview", monday, {}, "en", None]) != cache_key(
+            render_comprehensive_pdf, ["overview", tuesday, {}, "en", None]
+        )
+
+    def test_put_and_get(self, tmp_path):
+        """Stored PDFs are found by key and survive a new index"""
+        pdf_cache = PDFCache(str(tmp_path))
+
+        path = pdf_cache.put("ab" * 32, PDF_BYTES)
+
+        assert pdf_cache.get("ab" * 32) == path
+        assert PDFCache(str(tmp_path)).get("ab" * 32) == path
+        assert pdf_cache.get("cd" * 32) is None
+        assert pdf_cache.stats()["hits"] == 1
+
+    def test_non_pdf_output_is_not_cached(self, tmp_path):
+        """Failed or mocked renders never end up in the cache"""
+        pdf_cache = PDFCache(str(tmp_path))
+
+        assert pdf_cache.put("ab" * 32, b"") is None
+        assert pdf_cache.stats()["entries"] == 0
+
+    def test_lru_eviction_by_bytes(self, tmp_path):
+        """The least recently used entries are evicted once the byte limit is exceeded"""
+        pdf_cache = PDFCache(str(tmp_path), max_bytes=len(PDF_BYTES) * 2)
+        pdf_cache.put("aa" * 32, PDF_BYTES)
+        pdf_cache.put("bb" * 32, PDF_BYTES)
+        pdf_cache.get("aa" * 32)
+
+        pdf_cache.put("cc" * 32, PDF_BYTES)
+
+        assert pdf_cache.get("bb" * 32) is None
+        assert pdf_cache.get("aa" * 32) is not None
+        assert pdf_cache.stats()["total_bytes"] == len(PDF_BYTES) * 2
+
+    def test_entries_of_other_workers_are_found(self, tmp_path):
+        """A PDF written by another process after the index was built is a hit"""
+        worker = PDFCache(str(tmp_path))
+        other_worker = PDFCache(str(tmp_path))
+        assert worker.get("ab" * 32) is None
+
+        path = other_worker.put("ab" * 32, PDF_BYTES)
+
+        assert worker.get("ab" * 32) == path
+        assert worker.stats()["entries"] == 1
+
+    def test_byte_limit_covers_every_worker(self, tmp_path):
+        """Entries are evicted by their use in any process once the directory exceeds the limit"""
+        worker = PDFCache(str(tmp_path), max_bytes=len(PDF_BYTES) * 2)
+        other_worker = PDFCache(str(tmp_path), max_bytes=len(PDF_BYTES) * 2)
+        worker.put("aa" * 32, PDF_BYTES)
+        other_worker.put("bb" * 32, PDF_BYTES)
+        worker.get("aa" * 32)
+
+        other_worker.put("cc" * 32, PDF_BYTES)
+
+        assert sorted(path.name for path in tmp_path.rglob("*.pdf")) == [f"{'aa' * 32}.pdf", f"{'cc' * 32}.pdf"]
+        assert other_worker.stats()["total_bytes"] == len(PDF_BYTES) * 2
+        assert worker.get("bb" * 32) is None
+
+    def test_project_changes_invalidate_tagged_entries(self, app_context, pdf_cache_dir, project_factory):
+        """Updating a project removes the PDFs rendered from it"""
+        project = project_factory()
+        pdf_cache = get_pdf_cache()
+        pdf_cache.put("aa" * 32, PDF_BYTES, tags=[f"project:{project.id}"])
+        pdf_cache.put("bb" * 32, PDF_BYTES, tags=["project:999999"])
+
+        project.description = "Nieuwe beschrijving"
+        db.session.commit()
+
+        assert pdf_cache.get("aa" * 32) is None
+        assert pdf_cache.get("bb" * 32) is not None
+
+
+@pytest.mark.api
+class TestCachedPDFRoutes:
+    """Test serving cached PDFs"""
+
+    def test_quote_pdf_is_served_from_cache(
+        self, authenticated_client, pdf_cache_dir, project_factory, project_plant_factory, plant_factory
+    ):
+        """A repeated quote download is a cache hit with ETag and Range support"""
+        project = project_factory(status="completed", area_size=50)
+        project_plant_factory(project=project, plant=plant_factory(), quantity=3, unit_cost=12.5)
+        url = f"/api/invoices/quote/{project.id}?format=pdf"
+
+        first = authenticated_client.get(url)
+        assert first.status_code == 200
+        assert first.data.startswith(b"%PDF")
+        assert get_pdf_cache().stats()["entries"] == 1
+
+        second = authenticated_client.get(url)
+        assert second.status_code == 200
+        assert second.data == first.data
+        etag = second.headers["ETag"]
+        assert get_pdf_cache().stats()["hits"] == 1
+
+        assert authenticated_client.get(url, headers={"If-None-Match": etag}).status_code == 304
+        partial = authenticated_client.get(url, headers={"Range": "bytes=0-3"})
+        assert partial.status_code == 206
+        assert partial.data == b"%PDF"
+
+        project.area_size = 80
+        db.session.commit()
+        assert get_pdf_cache().stats()["entries"] == 0
@@ -0,0 +1,380 @@
+"""
+Test PDF Render Service
+
+Tests for the bounded PDF rendering pool and the job endpoints.
+"""
+
+import io
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from reportlab.pdfgen import canvas
+from sqlalchemy import delete, insert, update
+
+from src.models.landscape import PDFRenderJob
+from src.models.user import db
+from src.routes.invoices import render_quote_pdf
+from src.services.pdf_render import JOB_RETENTION_SECONDS, PDFRenderBusyError, PDFRenderService, pdf_renderer
+from tests.fixtures.auth_fixtures import authenticated_test_user
+
+
+def render_text(text):
+    """Module-level stand-in for a render function so it can be pickled"""
+    return f"%PDF {text}".encode()
+
+
+def render_slowly(seconds):
+    time.sleep(seconds)
+    return b"%PDF slow"
+
+
+def render_failure():
+    raise RuntimeError("layout failed")
+
+
+def render_page(text):
+    """A one-page PDF showing ``text``"""
+    buffer = io.BytesIO()
+    page = canvas.Canvas(buffer)
+    page.drawString(72, 720, text)
+    page.save()
+    return buffer.getvalue()
+
+
+def render_page_slowly(text, seconds):
+    time.sleep(seconds)
+    return render_page(text)
+
+
+def page_texts(pdf_bytes):
+    pypdf = pytest.importorskip("pypdf")
+    return [page.extract_text().strip() for page in pypdf.PdfReader(io.BytesIO(pdf_bytes)).pages]
+
+
+@pytest.fixture(autouse=True)
+def job_store(app):
+    """Stored jobs are written outside the test's transaction; remove them afterwards"""
+    yield
+    with app.app_context(), db.engine.begin() as connection:
+        connection.execute(delete(PDFRenderJob))
+
+
+def store_job(**values):
+    with db.engine.begin() as connection:
+        connection.execute(insert(PDFRenderJob).values(status="pending", submitted_at=datetime.utcnow(), **values))
+
+
+@pytest.fixture
+def authenticated_client(client, app_context, authenticated_test_user):
+    """Provide an authenticated test client with application context"""
+
+    return client
+
+
+@pytest.mark.service
+class TestPDFRenderService:
+    """Test job handling, limits and metrics"""
+
+    def test_inline_render(self, app_context):
+        """Inline jobs finish before render() returns"""
+        service = PDFRenderService()
+
+        job = service.render(render_text, "hello", filename="hello.pdf")
+
+        assert job.done()
+        assert job.status == "completed"
+        assert job.result() == b"%PDF hello"
+        assert service.get_job(job.id) is job
+        assert service.metrics()["completed"] == 1
+
+    def test_failed_render(self, app_context):
+        """Render errors are kept on the job and counted"""
+        service = PDFRenderService()
+
+        job = service.render(render_failure, filename="broken.pdf")
+
+        assert job.status == "failed"
+        with pytest.raises(RuntimeError, match="layout failed"):
+            job.result()
+        assert service.metrics()["failed"] == 1
+
+    def test_rejects_when_queue_is_full(self, app, app_context, monkeypatch):
+        """Submissions beyond the pending limit are rejected"""
+        monkeypatch.setitem(app.config, "PDF_RENDER_MAX_PENDING", 0)
+        service = PDFRenderService()
+
+        with pytest.raises(PDFRenderBusyError):
+            service.submit(render_text, "x", filename="x.pdf")
+        assert service.metrics()["rejected"] == 1
+
+    def test_jobs_are_stored_for_other_workers(self, app_context):
+        """A worker without the job in memory reads it from the job store"""
+        job = PDFRenderService().render(render_text, "shared", filename="shared.pdf")
+
+        stored = PDFRenderService().get_job(job.id)
+
+        assert stored is not job
+        assert stored.status == "completed"
+        assert stored.filename == "shared.pdf"
+        assert stored.result() == b"%PDF shared"
+
+    def test_finished_jobs_keep_the_path_of_their_pdf(self, app_context):
+        """The rendered bytes are read from disk instead of being held by the job"""
+        job = PDFRenderService().render(render_text, "on disk", filename="disk.pdf")
+
+        assert job.future.result()[0] is None
+        with open(job.path, "rb") as pdf_file:
+            assert pdf_file.read() == b"%PDF on disk"
+        assert job.result() == b"%PDF on disk"
+
+    def test_storing_a_job_leaves_the_request_session_alone(self, app_context, client_factory):
+        """Submitting a job neither commits nor discards what the caller has pending"""
+        client = client_factory.build(name="Not yet committed")
+        db.session.add(client)
+        db.session.flush()
+
+        PDFRenderService().render(render_text, "x", filename="x.pdf")
+
+        assert client in db.session
+        db.session.rollback()
+        assert db.session.query(type(client)).filter_by(name="Not yet committed").count() == 0
+
+    def test_failed_jobs_are_stored(self, app_context):
+        job = PDFRenderService().render(render_failure, filename="broken.pdf")
+
+        assert PDFRenderService().get_job(job.id).status == "failed"
+        assert PDFRenderService().get_job("missing") is None
+
+    def test_shared_pending_limit(self, app, app_context, monkeypatch):
+        """Renders pending on other workers count against PDF_RENDER_MAX_PENDING_TOTAL"""
+        monkeypatch.setitem(app.config, "PDF_RENDER_MAX_PENDING_TOTAL", 3)
+        store_job(id="a" * 32, filename="other.pdf", slots=3)
+        service = PDFRenderService()
+
+        with pytest.raises(PDFRenderBusyError) as busy:
+            service.submit(render_text, "x", filename="x.pdf")
+        assert busy.value.payload["pending_jobs"] == 3
+        assert service.metrics()["pending_total"] == 3
+
+        # A job pending for longer than the retention was lost with its worker
+        lost_at = datetime.utcnow() - timedelta(seconds=JOB_RETENTION_SECONDS + 1)
+        with db.engine.begin() as connection:
+            connection.execute(update(PDFRenderJob).values(submitted_at=lost_at))
+        assert service.submit(render_text, "x", filename="x.pdf").status == "completed"
+
+    def test_sectioned_job_must_fit_under_the_limit(self, app, app_context, monkeypatch):
+        """A sectioned job takes a slot per section; it is rejected when they do not all fit"""
+        pytest.importorskip("pypdf")
+        monkeypatch.setitem(app.config, "PDF_RENDER_MODE", "process")
+        monkeypatch.setitem(app.config, "PDF_RENDER_WORKERS", 1)
+        monkeypatch.setitem(app.config, "PDF_RENDER_MAX_PENDING", 3)
+        service = PDFRenderService()
+        try:
+            first = service.submit(render_slowly, 0.5, filename="first.pdf")
+            second = service.submit(render_slowly, 0.5, filename="second.pdf")
+            assert service.metrics()["pending"] == 2
+
+            with pytest.raises(PDFRenderBusyError):
+                service.submit_sections(render_page, [("a", ("A",)), ("b", ("B",))], filename="sections.pdf")
+            metrics = service.metrics()
+            assert metrics["pending"] == 2
+            assert metrics["rejected"] == 1
+
+            # One slot is still free
+            third = service.submit(render_slowly, 0.1, filename="third.pdf")
+            assert all(job.wait(60) for job in (first, second, third))
+        finally:
+            service.shutdown()
+
+    def test_job_with_more_sections_than_the_limit_is_rejected(self, app, app_context, monkeypatch):
+        monkeypatch.setitem(app.config, "PDF_RENDER_MAX_PENDING", 2)
+        service = PDFRenderService()
+
+        with pytest.raises(PDFRenderBusyError):
+            service.submit_sections(render_page, [("a", ("A",)), ("b", ("B",)), ("c", ("C",))], filename="x.pdf")
+        assert service.metrics()["pending"] == 0
+
+    def test_process_pool_with_deadline(self, app, app_context, monkeypatch):
+        """Pool jobs that miss the deadline return a pending handle and finish later"""
+        monkeypatch.setitem(app.config, "PDF_RENDER_MODE", "process")
+        monkeypatch.setitem(app.config, "PDF_RENDER_WORKERS", 1)
+        service = PDFRenderService()
+        try:
+            job = service.render(render_slowly, 0.5, filename="slow.pdf", wait=0)
+            assert job.status == "pending"
+            assert service.metrics()["pending"] == 1
+
+            assert job.wait(60)
+            assert job.result() == b"%PDF slow"
+            assert job.render_seconds is None or job.render_seconds >= 0.5
+        finally:
+            service.shutdown()
+
+    def test_sections_are_merged_in_order(self, app_context):
+        """Sections render as separate PDFs and are merged with a timing per section"""
+        pytest.importorskip("pypdf")
+        service = PDFRenderService()
+
+        job = service.render_sections(
+            render_page, [("intro", ("Intro",)), ("plants", ("Plants",))], filename="sections.pdf"
+        )
+
+        assert job.status == "completed"
+        assert page_texts(job.result()) == ["Intro", "Plants"]
+        assert set(job.to_dict()["section_seconds"]) == {"intro", "plants"}
+        metrics = service.metrics()
+        assert metrics["completed"] == 1
+        assert metrics["pending"] == 0
+        assert metrics["sections"]["plants"]["renders"] == 1
+
+    def test_failed_section_fails_the_job(self, app_context):
+        pytest.importorskip("pypdf")
+        service = PDFRenderService()
+
+        job = service.render_sections(render_failure, [("broken", ())], filename="broken.pdf")
+
+        assert job.status == "failed"
+        assert service.metrics()["pending"] == 0
+
+    def test_sections_render_in_parallel_in_the_pool(self, app, app_context, monkeypatch):
+        """Each section takes a worker, so two slow sections finish in about the time of one"""
+        pytest.importorskip("pypdf")
+        monkeypatch.setitem(app.config, "PDF_RENDER_MODE", "process")
+        monkeypatch.setitem(app.config, "PDF_RENDER_WORKERS", 2)
+        service = PDFRenderService()
+        sections = [("first", ("First", 0.6)), ("second", ("Second", 0.6))]
+        try:
+            # Start both workers first so process start-up is not measured
+            service.render_sections(render_page_slowly, sections, filename="warm-up.pdf", wait=60)
+
+            started = time.perf_counter()
+            job = service.render_sections(render_page_slowly, sections, filename="slow.pdf", wait=0)
+            assert job.status == "pending"
+            assert service.metrics()["pending"] == 2
+
+            assert job.wait(60)
+            elapsed = time.perf_counter() - started
+            assert page_texts(job.result()) == ["First", "Second"]
+            assert min(job.section_seconds.values()) >= 0.6
+            assert elapsed < sum(job.section_seconds.values())
+        finally:
+            service.shutdown()
+
+    def test_quote_renders_to_pdf_bytes(self):
+        """Render functions work on plain data without an app context"""
+        data = {
+            "quote_number": "OFF-0001-202601",
+            "generated_at": "2026-01-01T10:00:00+00:00",
+            "valid_until": "2026-01-31T10:00:00+00:00",
+            "project": {"id": 1, "name": "Tuin", "description": "", "location": "Utrecht", "area_size": 0},
+            "client": {"name": "Jansen", "email": "", "phone": "", "address": "", "city": "", "postal_code": ""},
+            "items": [],
+            "financial": {"subtotal": 0, "vat_rate": 0.21, "vat_amount": 0, "total": 0, "currency": "EUR"},
+        }
+
+        assert render_quote_pdf(data).startswith(b"%PDF")
+
+
+@pytest.mark.api
+class TestPDFJobRoutes:
+    """Test polling and metrics endpoints"""
+
+    def test_poll_finished_job(self, authenticated_client):
+        """Finished jobs are downloaded from the job endpoint"""
+        job = pdf_renderer.submit(render_text, "report", filename="report.pdf")
+
+        response = authenticated_client.get(f"/api/reports/jobs/{job.id}")
+
+        assert response.status_code == 200
+        assert response.mimetype == "application/pdf"
+        assert "report.pdf" in response.headers["Content-Disposition"]
+        assert response.data == b"%PDF report"
+
+    def test_poll_job_of_another_worker(self, authenticated_client):
+        """Polls may reach a worker other than the one rendering the job"""
+        job = PDFRenderService().submit(render_text, "elsewhere", filename="elsewhere.pdf")
+
+        response = authenticated_client.get(f"/api/reports/jobs/{job.id}")
+
+        assert response.status_code == 200
+        assert response.data == b"%PDF elsewhere"
+
+    def test_poll_pending_job_of_another_worker(self, authenticated_client):
+        store_job(id="b" * 32, filename="pending.pdf")
+
+        response = authenticated_client.get(f"/api/reports/jobs/{'b' * 32}")
+
+        assert response.status_code == 202
+        data = response.get_json()
+        assert data["status"] == "pending"
+        assert data["status_url"].endswith(f"/api/reports/jobs/{'b' * 32}")
+
+    def test_unknown_job(self, authenticated_client):
+        """Unknown or expired jobs return 404"""
+        assert authenticated_client.get("/api/reports/jobs/missing").status_code == 404
+
+    def test_busy_renderer_returns_503(self, authenticated_client, app, monkeypatch):
+        """Report endpoints answer 503 instead of queueing without limit"""
+        monkeypatch.setitem(app.config, "PDF_RENDER_MAX_PENDING", 0)
+
+        response = authenticated_client.get("/api/reports/business-summary?format=pdf")
+
+        assert response.status_code == 503
+        assert response.get_json()["pending_jobs"] == 0
+
+    def test_comprehensive_report_renders_every_section(self, authenticated_client):
+        """A comprehensive report has a page per section and reports section timings"""
+        pytest.importorskip("pypdf")
+        payload = {
+            "type": "comprehensive",
+            "language": "en",
+            "data": {
+                "overview": {"stats": {"projects": 3, "clients": 2}},
+                "projects": {"totalProjects": 3, "totalBudget": 9000.0, "averageBudget": 3000.0},
+                "financial": {"totalRevenue": 9000.0, "monthlyRevenue": [{"month": "2026-09", "revenue": 9000.0}]},
+            },
+        }
+
+        response = authenticated_client.post("/api/reports/generate-pdf", json=payload)
+
+        assert response.status_code == 200
+        texts = page_texts(response.data)
+        assert len(texts) == 5
+        assert "Client Analysis" in texts[1]
+        assert "Financial Summary" in texts[4]
+        timings = response.headers["Server-Timing"]
+        assert [entry.split(";")[0] for entry in timings.split(", ")] == [
+            "overview",
+            "clients",
+            "projects",
+            "plants",
+            "financial",
+        ]
+
+    def test_comprehensive_report_sections_can_be_selected(self, authenticated_client):
+        payload = {"type": "comprehensive", "sections": ["financial", "unknown"], "data": {}}
+
+        response = authenticated_client.post("/api/reports/generate-pdf", json=payload)
+
+        assert response.status_code == 200
+        assert response.data.startswith(b"%PDF")
+        assert "Server-Timing" not in response.headers
+
+    def test_comprehensive_report_without_pypdf(self, authenticated_client, monkeypatch):
+        """Without a PDF merger all sections are laid out in one document"""
+        monkeypatch.setattr("src.routes.reports.can_merge_sections", lambda: False)
+
+        response = authenticated_client.post("/api/reports/generate-pdf", json={"type": "comprehensive", "data": {}})
+
+        assert response.status_code == 200
+        assert response.data.startswith(b"%PDF")
+        assert "Server-Timing" not in response.headers
+
+    def test_metrics(self, authenticated_client):
+        """Queue metrics are exposed on the performance API"""
+        response = authenticated_client.get("/api/performance/pdf-rendering")
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert {"pending", "queued", "max_workers", "rejected", "avg_render_seconds"} <= set(data)
@@ -0,0 +1,229 @@
+"""
+Test Photo Backends
+
+Tests for the photo storage backends: the local filesystem default and an
+object store, using the local object-store stand-in.
+"""
+
+import os
+import time
+from io import BytesIO
+from unittest.mock import MagicMock
+
+import pytest
+from PIL import Image
+from werkzeug.datastructures import FileStorage
+
+from src.models.photo import Photo, PhotoCategory, PhotoProcessingState
+from src.models.user import db
+from src.services.photo_backends import FakeObjectStorage, LocalStorage, S3Storage, StorageBackend, get_photo_storage
+from src.services.photo_pipeline import derivative_files, photo_pipeline
+from src.services.photo_service import PhotoService
+from tests.fixtures.auth_fixtures import authenticated_test_user
+
+
+@pytest.fixture
+def upload_folder(app, tmp_path, monkeypatch):
+    folder = tmp_path / "staging"
+    monkeypatch.setitem(app.config, "UPLOAD_FOLDER", str(folder))
+    return folder
+
+
+@pytest.fixture
+def object_storage(app, app_context, tmp_path, upload_folder, monkeypatch):
+    monkeypatch.setitem(app.config, "PHOTO_STORAGE_BACKEND", "fake")
+    monkeypatch.setitem(app.config, "PHOTO_STORAGE_FAKE_DIR", str(tmp_path / "objects"))
+    storage = get_photo_storage()
+    assert isinstance(storage, FakeObjectStorage)
+    return storage
+
+
+@pytest.fixture
+def authenticated_client(client, app_context, authenticated_test_user, object_storage):
+    """Provide an authenticated test client storing photos in the fake object store"""
+
+    return client
+
+
+def _image(color="green"):
+    buffer = BytesIO()
+    Image.new("RGB", (1200, 800), color=color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _upload(user, content, filename="bed.png"):
+    file = FileStorage(stream=BytesIO(content), filename=filename, content_type="image/png")
+    result = PhotoService().upload_photo(file, PhotoCategory.PLANT, uploaded_by_id=user.id)
+    assert result["success"], result
+    return db.session.get(Photo, result["photo"]["id"])
+
+
+def _staged_files(folder):
+    return [name for _, _, names in os.walk(folder) for name in names]
+
+
+@pytest.mark.service
+class TestObjectStorage:
+    """Test storing and processing photos in an object store"""
+
+    def test_upload_is_stored_in_the_bucket(self, object_storage, upload_folder, authenticated_test_user):
+        photo = _upload(authenticated_test_user, _image())
+
+        assert photo.processing_state == PhotoProcessingState.READY
+        assert object_storage.exists(photo.file_path)
+        files = derivative_files(photo)
+        assert files
+        assert all(object_storage.exists(path) for path in files)
+        # The staging area only holds files while they are in flight
+        assert _staged_files(upload_folder) == []
+
+    def test_delete_removes_the_objects(self, object_storage, authenticated_test_user):
+        photo = _upload(authenticated_test_user, _image())
+        paths = {photo.file_path} | derivative_files(photo)
+
+        assert PhotoService().delete_photo(photo.id)["success"]
+
+        assert not any(object_storage.exists(path) for path in paths)
+
+    def test_reprocess_fetches_the_original(self, object_storage, upload_folder, authenticated_test_user):
+        photo = _upload(authenticated_test_user, _image())
+        photo_id = photo.id
+        before = dict(object_storage.requests)
+
+        photo_pipeline.reprocess([photo_id], enqueue=False)
+        assert photo_pipeline.process(photo_id) == PhotoProcessingState.READY
+
+        assert object_storage.requests["get"] == before["get"] + 1
+        assert object_storage.requests["put"] > before["put"]
+        photo = db.session.get(Photo, photo_id)
+        assert all(object_storage.exists(path) for path in derivative_files(photo))
+        assert _staged_files(upload_folder) == []
+
+    def test_missing_original_fails_processing(self, object_storage, authenticated_test_user):
+        photo = _upload(authenticated_test_user, _image())
+        object_storage.delete(photo.file_path)
+
+        photo_pipeline.reprocess([photo.id], enqueue=False)
+
+        assert photo_pipeline.process(photo.id) == PhotoProcessingState.FAILED
+
+    def test_batch_originals_are_fetched_together(self, object_storage, authenticated_test_user):
+        photos = [_upload(authenticated_test_user, _image(color), f"{color}.png") for color in ("red", "blue")]
+        photo_ids = [photo.id for photo in photos]
+        photo_pipeline.reprocess(photo_ids, enqueue=False)
+        before = object_storage.requests["get"]
+
+        assert photo_pipeline.process_batch(photo_ids) == {"ready": 2, "failed": 0}
+
+        assert object_storage.requests["get"] == before + 2
+
+
+@pytest.mark.api
+class TestObjectStorageRoutes:
+    """Test that photo routes redirect to the object store"""
+
+    @pytest.fixture
+    def photo(self, authenticated_test_user, object_storage):
+        return _upload(authenticated_test_user, _image())
+
+    def test_file_redirects_to_a_signed_url(self, authenticated_client, object_storage, photo):
+        response = authenticated_client.get(f"/api/photos/file/{photo.id}")
+
+        assert response.status_code == 302
+        assert response.cache_control.max_age == object_storage.url_expires // 2
+        assert not response.cache_control.immutable
+        content = object_storage.read_url(response.location)
+        with Image.open(BytesIO(content)) as image:
+            assert image.size == (1200, 800)
+
+    def test_thumbnail_redirects_to_a_derivative(self, authenticated_client, object_storage, photo):
+        response = authenticated_client.get(f"/api/photos/thumbnail/{photo.id}?size=thumb&v={photo.version}")
+
+        assert response.status_code == 302
+        assert not response.cache_control.immutable
+        with Image.open(BytesIO(object_storage.read_url(response.location))) as image:
+            assert max(image.size) <= 300
+
+    def test_signed_urls_are_checked(self, authenticated_client, object_storage, photo, monkeypatch):
+        url = authenticated_client.get(f"/api/photos/file/{photo.id}").location
+
+        with pytest.raises(PermissionError):
+            object_storage.read_url(url.replace("signature=", "signature=x"))
+        monkeypatch.setattr(time, "time", lambda: 2**40)
+        with pytest.raises(PermissionError):
+            object_storage.read_url(url)
+
+
+@pytest.mark.service
+class TestStorageBackends:
+    """Test the backends themselves"""
+
+    def test_local_storage_is_the_default(self, app_context, upload_folder, authenticated_test_user):
+        storage = get_photo_storage()
+        assert isinstance(storage, LocalStorage)
+
+        photo = _upload(authenticated_test_user, _image())
+
+        assert os.path.exists(photo.file_path)
+        assert storage.url(photo.file_path) is None
+        with storage.local_copies([photo.file_path]) as failed:
+            assert failed == {}
+        assert os.path.exists(photo.file_path)
+
+    def test_paths_outside_the_root_are_rejected(self, tmp_path):
+        storage = LocalStorage(str(tmp_path / "uploads"))
+
+        assert storage.key(str(tmp_path / "uploads" / "blobs" / "ab" / "file.png")) == "blobs/ab/file.png"
+        with pytest.raises(ValueError):
+            storage.key(str(tmp_path / "elsewhere.png"))
+
+    def test_backends_implement_every_file_operation(self, tmp_path):
+        class ReadOnlyStorage(StorageBackend):
+            def exists(self, path):
+                return True
+
+            def download(self, path, local_path):
+                pass
+
+        with pytest.raises(TypeError, match="delete, store"):
+            ReadOnlyStorage(str(tmp_path))
+
+    def test_local_copies_are_removed(self, tmp_path):
+        storage = FakeObjectStorage(str(tmp_path / "staging"), str(tmp_path / "objects"))
+        source = tmp_path / "source.png"
+        source.write_bytes(b"content")
+        path = str(tmp_path / "staging" / "blobs" / "one.png")
+        storage.store(str(source), path)
+        missing = str(tmp_path / "staging" / "blobs" / "missing.png")
+
+        with storage.local_copies([path, missing]) as failed:
+            assert list(failed) == [missing]
+            with open(path, "rb") as fetched:
+                assert fetched.read() == b"content"
+
+        assert not os.path.exists(path)
+        assert not source.exists()
+
+    def test_s3_requests(self, tmp_path):
+        client = MagicMock()
+        client.generate_presigned_url.return_value = "https://bucket.example/signed"
+        storage = S3Storage(str(tmp_path), "photos", prefix="/media/", client=client)
+        local = tmp_path / "blobs" / "ab" / "file.png"
+        local.parent.mkdir(parents=True)
+        local.write_bytes(b"content")
+
+        storage.store(str(local), str(local))
+        url = storage.url(str(local), "image/png", "bed.png")
+
+        client.upload_file.assert_called_once_with(
+            str(local), "photos", "media/blobs/ab/file.png", ExtraArgs={"ContentType": "image/png"}
+        )
+        assert not local.exists()
+        assert url == "https://bucket.example/signed"
+        params = client.generate_presigned_url.call_args.kwargs["Params"]
+        assert params["Key"] == "media/blobs/ab/file.png"
+        assert params["ResponseContentType"] == "image/png"
+
+    def test_s3_needs_a_bucket(self, tmp_path):
+        with pytest.raises(ValueError):
+            S3Storage(str(tmp_path), "", client=MagicMock())
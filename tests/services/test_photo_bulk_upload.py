@@ -0,0 +1,209 @@
+"""
+Test Photo Bulk Upload
+
+Tests for uploading many photos per request, as multipart files or a zip
+archive, and for processing them as one batch.
+"""
+
+import os
+import zipfile
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from src.models.photo import Photo, PhotoBlob, PhotoCategory, PhotoProcessingState
+from src.models.user import db
+from src.services.photo_pipeline import photo_pipeline
+from src.services.photo_service import PhotoService
+from tests.fixtures.auth_fixtures import authenticated_test_user
+
+
+@pytest.fixture
+def upload_folder(app, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, "UPLOAD_FOLDER", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def authenticated_client(client, app_context, authenticated_test_user, upload_folder):
+    """Provide an authenticated test client with an isolated upload folder"""
+
+    return client
+
+
+def _image(color="green", size=(640, 480)):
+    buffer = BytesIO()
+    Image.new("RGB", size, color=color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _archive(entries):
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in entries.items():
+            archive.writestr(name, content)
+    buffer.seek(0)
+    return buffer
+
+
+@pytest.mark.api
+class TestBulkUploadRoutes:
+    """Test the bulk upload endpoint"""
+
+    def test_multipart_upload_returns_per_file_results(self, authenticated_client):
+        green = _image("green")
+        response = authenticated_client.post(
+            "/api/photos/upload/bulk",
+            data={
+                "category": "project",
+                "files": [
+                    (BytesIO(green), "north.png"),
+                    (BytesIO(_image("red")), "south.png"),
+                    (BytesIO(green), "north-again.png"),
+                    (BytesIO(b"%PDF-1.4"), "survey.pdf"),
+                ],
+            },
+        )
+
+        assert response.status_code == 207
+        data = response.get_json()
+        assert (data["uploaded"], data["failed"]) == (3, 1)
+        assert [result["filename"] for result in data["results"]] == [
+            "north.png",
+            "south.png",
+            "north-again.png",
+            "survey.pdf",
+        ]
+        assert [result["success"] for result in data["results"]] == [True, True, True, False]
+        assert "File type not allowed" in data["results"][3]["error"]
+        photos = [result["photo"] for result in data["results"][:3]]
+        assert {photo["processing_state"] for photo in photos} == {"ready"}
+        assert photos[0]["content_hash"] == photos[2]["content_hash"] != photos[1]["content_hash"]
+
+    def test_zip_archive_upload(self, authenticated_client):
+        archive = _archive(
+            {
+                "survey/": b"",
+                "survey/front.png": _image("green"),
+                "survey/back.PNG": _image("blue"),
+                "survey/.DS_Store": b"\0",
+                "__MACOSX/survey/._front.png": b"\0",
+            }
+        )
+
+        response = authenticated_client.post(
+            "/api/photos/upload/bulk", data={"category": "property", "archive": (archive, "survey.zip")}
+        )
+
+        assert response.status_code == 201
+        data = response.get_json()
+        assert [result["filename"] for result in data["results"]] == ["front.png", "back.PNG"]
+        assert all(result["photo"]["category"] == "property" for result in data["results"])
+
+    def test_files_and_archive_together(self, authenticated_client):
+        response = authenticated_client.post(
+            "/api/photos/upload/bulk",
+            data={
+                "files": [(BytesIO(_image("green")), "one.png")],
+                "archive": (_archive({"two.png": _image("red")}), "more.zip"),
+            },
+        )
+
+        assert response.status_code == 201
+        assert response.get_json()["uploaded"] == 2
+
+    def test_invalid_archive_is_rejected_before_storing(self, authenticated_client, upload_folder):
+        response = authenticated_client.post(
+            "/api/photos/upload/bulk",
+            data={
+                "files": [(BytesIO(_image()), "one.png")],
+                "archive": (BytesIO(b"not a zip"), "broken.zip"),
+            },
+        )
+
+        assert response.status_code == 400
+        assert Photo.query.count() == 0
+        assert not any(files for _, _, files in os.walk(upload_folder / "blobs") if files)
+
+    def test_limits(self, app, authenticated_client, monkeypatch):
+        monkeypatch.setitem(app.config, "PHOTO_BULK_MAX_FILES", 2)
+        monkeypatch.setattr(PhotoService, "MAX_FILE_SIZE", 4096)
+        small = BytesIO()
+        Image.new("RGB", (8, 8)).save(small, format="PNG")
+
+        response = authenticated_client.post(
+            "/api/photos/upload/bulk",
+            data={
+                "files": [
+                    (BytesIO(small.getvalue()), "small.png"),
+                    (BytesIO(os.urandom(8192)), "large.png"),
+                    (BytesIO(small.getvalue()), "third.png"),
+                ]
+            },
+        )
+
+        assert response.status_code == 207
+        errors = [result.get("error", "") for result in response.get_json()["results"]]
+        assert errors[0] == ""
+        assert errors[1].startswith("File too large")
+        assert errors[2] == "Too many files (max 2)"
+
+    def test_requires_files(self, authenticated_client):
+        response = authenticated_client.post("/api/photos/upload/bulk", data={"category": "project"})
+
+        assert response.status_code == 400
+
+    def test_requires_login(self, client):
+        response = client.post("/api/photos/upload/bulk", data={"files": [(BytesIO(_image()), "one.png")]})
+
+        assert response.status_code == 401
+
+
+@pytest.mark.service
+class TestBulkUploadService:
+    """Test storing and processing a batch of photos"""
+
+    def test_batch_is_stored_in_one_transaction(self, app_context, upload_folder, authenticated_test_user):
+        def uploads():
+            yield "one.png", BytesIO(_image("green"))
+            yield "two.png", BytesIO(_image("red"))
+            raise OSError("connection reset")
+
+        with pytest.raises(OSError):
+            PhotoService().upload_photos(uploads(), PhotoCategory.PROJECT, uploaded_by_id=authenticated_test_user.id)
+
+        assert Photo.query.count() == 0
+        assert PhotoBlob.query.count() == 0
+        assert not any(files for _, _, files in os.walk(upload_folder / "blobs") if files)
+
+    def test_batch_is_decoded_in_a_process_pool(self, app_context, upload_folder, authenticated_test_user):
+        service = PhotoService()
+        result = service.upload_photos(
+            [
+                ("a.png", BytesIO(_image("green"))),
+                ("b.png", BytesIO(_image("red"))),
+                ("c.png", BytesIO(_image("green"))),
+            ],
+            category=PhotoCategory.PROJECT,
+            uploaded_by_id=authenticated_test_user.id,
+        )
+        photo_ids = [entry["photo"]["id"] for entry in result["results"]]
+        photo_pipeline.reprocess(photo_ids, enqueue=False)
+        before = photo_pipeline.metrics()
+
+        try:
+            outcome = photo_pipeline.process_batch(photo_ids, parallel=True)
+        finally:
+            photo_pipeline.shutdown(wait=True)
+
+        after = photo_pipeline.metrics()
+        assert outcome == {"ready": 3, "failed": 0}
+        # The duplicate takes over the derivatives decoded for the first photo
+        assert after["processed"] - before["processed"] == 2
+        assert after["shared"] - before["shared"] == 1
+        db.session.expire_all()
+        photos = [db.session.get(Photo, photo_id) for photo_id in photo_ids]
+        assert {photo.processing_state for photo in photos} == {PhotoProcessingState.READY}
+        assert photos[0].derivatives == photos[2].derivatives
+        assert all(os.path.exists(photo.thumbnail_path) for photo in photos)
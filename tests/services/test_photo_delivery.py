@@ -0,0 +1,177 @@
+"""
+Test Photo Delivery
+
+Tests for serving photo files: the photo path cache, validators, cache
+headers, range requests and the X-Accel-Redirect hand-off.
+"""
+
+import os
+from io import BytesIO
+
+import pytest
+from PIL import Image
+from werkzeug.datastructures import FileStorage
+
+from src.models.photo import Photo, PhotoCategory
+from src.models.user import db
+from src.services.photo_delivery import IMMUTABLE_MAX_AGE, PhotoFiles, PhotoPathCache, photo_path_cache
+from src.services.photo_service import PhotoService
+from tests.fixtures.auth_fixtures import authenticated_test_user
+
+
+@pytest.fixture
+def upload_folder(app, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, "UPLOAD_FOLDER", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def cached(app, monkeypatch):
+    """Keep photo paths cached for the duration of the test"""
+    monkeypatch.setitem(app.config, "PHOTO_PATH_CACHE_TTL", 60)
+    photo_path_cache.clear()
+    yield photo_path_cache
+    photo_path_cache.clear()
+
+
+@pytest.fixture
+def photo(app_context, upload_folder, authenticated_test_user):
+    buffer = BytesIO()
+    Image.new("RGB", (1200, 800), color="green").save(buffer, format="PNG")
+    buffer.seek(0)
+    file = FileStorage(stream=buffer, filename="garden.png", content_type="image/png")
+    result = PhotoService().upload_photo(file, PhotoCategory.EXAMPLE, uploaded_by_id=authenticated_test_user.id)
+    assert result["success"], result
+    return db.session.get(Photo, result["photo"]["id"])
+
+
+@pytest.mark.api
+class TestPhotoDelivery:
+    """Test the photo file and thumbnail responses"""
+
+    def test_unversioned_url_revalidates_with_strong_etag(self, client, photo):
+        response = client.get(f"/api/photos/file/{photo.id}")
+
+        assert response.status_code == 200
+        assert response.mimetype == "image/png"
+        etag, weak = response.get_etag()
+        assert etag
+        assert not weak
+        assert response.cache_control.no_cache
+        assert response.cache_control.public
+
+        revalidated = client.get(f"/api/photos/file/{photo.id}", headers={"If-None-Match": f'"{etag}"'})
+        assert revalidated.status_code == 304
+        assert revalidated.data == b""
+
+    def test_versioned_url_is_immutable(self, client, photo):
+        assert photo.to_dict()["file_url"] == f"/api/photos/file/{photo.id}?v={photo.version}"
+
+        response = client.get(photo.thumbnail_url)
+
+        assert response.status_code == 200
+        assert response.cache_control.immutable
+        assert response.cache_control.max_age == IMMUTABLE_MAX_AGE
+        assert not response.cache_control.no_cache
+
+        stale = client.get(f"/api/photos/thumbnail/{photo.id}?v=outdated")
+        assert not stale.cache_control.immutable
+
+    def test_private_photos_are_not_cached_by_proxies(self, client, photo):
+        photo.is_public = False
+        db.session.commit()
+
+        response = client.get(photo.file_url)
+
+        assert response.cache_control.private
+        assert not response.cache_control.public
+
+    def test_range_request(self, client, photo):
+        with open(photo.file_path, "rb") as original:
+            content = original.read()
+
+        response = client.get(f"/api/photos/file/{photo.id}", headers={"Range": "bytes=0-99"})
+
+        assert response.status_code == 206
+        assert response.headers["Content-Range"] == f"bytes 0-99/{len(content)}"
+        assert response.data == content[:100]
+
+        unsatisfiable = client.get(f"/api/photos/file/{photo.id}", headers={"Range": f"bytes={len(content)}-"})
+        assert unsatisfiable.status_code == 416
+
+    def test_variants_have_distinct_etags(self, client, photo):
+        jpeg = client.get(f"/api/photos/thumbnail/{photo.id}", headers={"Accept": "image/jpeg"})
+        webp = client.get(f"/api/photos/thumbnail/{photo.id}", headers={"Accept": "image/webp"})
+
+        assert (jpeg.mimetype, webp.mimetype) == ("image/jpeg", "image/webp")
+        assert jpeg.get_etag()[0] != webp.get_etag()[0]
+        assert "Accept" in webp.headers["Vary"]
+
+    def test_missing_photo(self, client, app_context):
+        assert client.get("/api/photos/file/999999").status_code == 404
+        assert client.get("/api/photos/thumbnail/999999").status_code == 404
+
+    def test_x_accel_redirect(self, app, client, photo, monkeypatch):
+        monkeypatch.setitem(app.config, "PHOTO_X_ACCEL_REDIRECT_PREFIX", "/protected-uploads/")
+        relative = os.path.relpath(photo.derivatives["thumb"]["jpeg"], app.config["UPLOAD_FOLDER"])
+
+        response = client.get(photo.thumbnail_url, headers={"Accept": "image/jpeg"})
+
+        assert response.status_code == 200
+        assert response.headers["X-Accel-Redirect"] == f"/protected-uploads/{relative}"
+        assert response.mimetype == "image/jpeg"
+        assert response.data == b""
+        assert response.cache_control.immutable
+
+        etag = response.get_etag()[0]
+        revalidated = client.get(photo.thumbnail_url, headers={"Accept": "image/jpeg", "If-None-Match": f'"{etag}"'})
+        assert revalidated.status_code == 304
+
+
+@pytest.mark.api
+class TestPhotoPathCache:
+    """Test the in-memory photo ID to file mapping"""
+
+    def test_repeated_requests_skip_the_database(self, client, photo, cached, monkeypatch):
+        assert client.get(f"/api/photos/file/{photo.id}").status_code == 200
+
+        def no_queries(*args, **kwargs):
+            raise AssertionError("photo looked up in the database")
+
+        monkeypatch.setattr(db.session, "get", no_queries)
+        assert client.get(f"/api/photos/file/{photo.id}").status_code == 200
+        assert client.get(f"/api/photos/file/{photo.id}").status_code == 200
+        assert cached.stats()["hits"] == 2
+
+    def test_updates_invalidate_the_cache(self, client, photo, cached):
+        assert client.get(photo.file_url).cache_control.public
+
+        photo.is_public = False
+        db.session.commit()
+
+        assert client.get(photo.file_url).cache_control.private
+
+    def test_missing_cached_file_is_looked_up_again(self, client, photo, cached):
+        client.get(f"/api/photos/thumbnail/{photo.id}", headers={"Accept": "image/webp"})
+        os.remove(photo.derivatives["thumb"]["webp"])
+        # Reprocessed without WebP elsewhere: this process did not see the update
+        derivatives = {
+            name: {k: v for k, v in entry.items() if k != "webp"} for name, entry in photo.derivatives.items()
+        }
+        db.session.execute(db.update(Photo).where(Photo.id == photo.id).values(derivatives=derivatives))
+
+        response = client.get(f"/api/photos/thumbnail/{photo.id}", headers={"Accept": "image/webp"})
+
+        assert response.status_code == 200
+        assert response.mimetype == "image/jpeg"
+        assert cached.get(photo.id).derivatives == derivatives
+
+    def test_cache_is_bounded(self, photo):
+        cache = PhotoPathCache(max_entries=2, ttl=60)
+        files = PhotoFiles.from_photo(photo)
+        for photo_id in (1, 2, 3):
+            cache.put(PhotoFiles(**{**files.__dict__, "photo_id": photo_id}))
+
+        assert cache.get(1) is None
+        assert cache.get(3) is not None
+        assert cache.stats()["entries"] == 2
@@ -0,0 +1,257 @@
+"""
+Test Photo Pipeline
+
+Tests for processing photo uploads outside the request, the processing
+states and batch re-processing.
+"""
+
+import os
+from datetime import datetime, timedelta
+from io import BytesIO
+
+import pytest
+from PIL import Image
+from PIL.JpegImagePlugin import JpegImageFile
+from werkzeug.datastructures import FileStorage
+
+from src.models.photo import Photo, PhotoCategory, PhotoProcessingState
+from src.models.user import db
+from src.services.photo_pipeline import photo_pipeline
+from src.services.photo_service import PhotoService
+from tests.fixtures.auth_fixtures import authenticated_test_user
+
+
+@pytest.fixture
+def upload_folder(app, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, "UPLOAD_FOLDER", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def authenticated_client(client, app_context, authenticated_test_user, upload_folder):
+    """Provide an authenticated test client with an isolated upload folder"""
+
+    return client
+
+
+def _image(size=(1200, 800), mode="RGB", format="PNG"):
+    buffer = BytesIO()
+    Image.new(mode, size, color="green").save(buffer, format=format)
+    buffer.seek(0)
+    return buffer
+
+
+def _upload(user, image=None, filename="garden.png"):
+    file = FileStorage(stream=image or _image(), filename=filename, content_type="image/png")
+    result = PhotoService().upload_photo(file, PhotoCategory.EXAMPLE, uploaded_by_id=user.id)
+    assert result["success"], result
+    return db.session.get(Photo, result["photo"]["id"])
+
+
+@pytest.mark.service
+class TestPhotoPipeline:
+    """Test the processing states and the queue"""
+
+    def test_upload_is_processed_after_commit(self, app_context, upload_folder, authenticated_test_user):
+        photo = _upload(authenticated_test_user)
+
+        assert photo.processing_state == PhotoProcessingState.READY
+        assert (photo.width, photo.height) == (1200, 800)
+        assert photo.processed_at is not None
+        with Image.open(photo.thumbnail_path) as thumbnail:
+            assert max(thumbnail.size) == 300
+
+    def test_upload_returns_before_processing(
+        self, app, app_context, upload_folder, authenticated_test_user, monkeypatch
+    ):
+        # The test session shares one connection, so the worker only records what it was handed
+        handed_over = []
+        monkeypatch.setitem(app.config, "PHOTO_PIPELINE_MODE", "thread")
+        monkeypatch.setattr(photo_pipeline, "_run", lambda _app, photo_id: handed_over.append(photo_id))
+
+        file = FileStorage(stream=_image(), filename="garden.png", content_type="image/png")
+        result = PhotoService().upload_photo(file, PhotoCategory.EXAMPLE, uploaded_by_id=authenticated_test_user.id)
+        photo_pipeline.shutdown(wait=True)
+
+        assert result["photo"]["processing_state"] == "pending"
+        assert result["photo"]["thumbnail_path"] is None
+        assert handed_over == [result["photo"]["id"]]
+
+        # Whatever the workers did not finish is picked up from the queue
+        assert photo_pipeline.process_pending() == {"ready": 1, "failed": 0}
+        photo = db.session.get(Photo, result["photo"]["id"])
+        assert photo.processing_state == PhotoProcessingState.READY
+        assert os.path.exists(photo.thumbnail_path)
+
+    def test_unreadable_image_fails_and_can_be_reprocessed(self, app_context, upload_folder, authenticated_test_user):
+        # Passes the upload's header sniffing but cannot be decoded
+        photo = _upload(authenticated_test_user, image=BytesIO(b"\x89PNG\r\n\x1a\nnot an image"))
+
+        assert photo.processing_state == PhotoProcessingState.FAILED
+        assert photo.processing_error
+        assert photo.thumbnail_path is None
+
+        # Replace the original with a readable image and retry the failures
+        with open(photo.file_path, "wb") as original:
+            original.write(_image((400, 400)).getvalue())
+        ready = _upload(authenticated_test_user)
+
+        assert photo_pipeline.reprocess(failed_only=True) == 1
+        db.session.expire_all()
+        assert photo.processing_state == PhotoProcessingState.READY
+        assert photo.processing_error is None
+        assert ready.processing_state == PhotoProcessingState.READY
+
+    def test_process_pending_picks_up_left_over_photos(self, app_context, upload_folder, authenticated_test_user):
+        waiting = _upload(authenticated_test_user)
+        abandoned = _upload(authenticated_test_user)
+        busy = _upload(authenticated_test_user)
+        waiting.processing_state = PhotoProcessingState.PENDING
+        abandoned.processing_state = PhotoProcessingState.PROCESSING
+        busy.processing_state = PhotoProcessingState.PROCESSING
+        db.session.commit()
+        abandoned.updated_at = datetime.utcnow() - timedelta(hours=1)
+        db.session.commit()
+
+        assert photo_pipeline.process_pending() == {"ready": 2, "failed": 0}
+
+        db.session.expire_all()
+        assert waiting.processing_state == PhotoProcessingState.READY
+        assert abandoned.processing_state == PhotoProcessingState.READY
+        # Still within the grace period of the worker processing it
+        assert busy.processing_state == PhotoProcessingState.PROCESSING
+
+    def test_derivative_set(self, app_context, upload_folder, authenticated_test_user):
+        photo = _upload(authenticated_test_user, image=_image((2400, 1600)))
+
+        assert {name: (entry["width"], entry["height"]) for name, entry in photo.derivatives.items()} == {
+            "large": (1600, 1067),
+            "medium": (800, 533),
+            "thumb": (300, 200),
+        }
+        for entry in photo.derivatives.values():
+            with Image.open(entry["jpeg"]) as jpeg, Image.open(entry["webp"]) as webp:
+                assert (jpeg.format, webp.format) == ("JPEG", "WEBP")
+                assert jpeg.size == webp.size == (entry["width"], entry["height"])
+        assert photo.thumbnail_path == photo.derivatives["thumb"]["jpeg"]
+
+    def test_small_images_are_not_enlarged(self, app_context, upload_folder, authenticated_test_user):
+        photo = _upload(authenticated_test_user, image=_image((640, 480)))
+
+        assert (photo.derivatives["large"]["width"], photo.derivatives["medium"]["width"]) == (640, 640)
+        assert photo.derivatives["thumb"]["width"] == 300
+
+    def test_jpeg_is_draft_decoded_and_derivatives_chained(
+        self, app, app_context, upload_folder, authenticated_test_user, monkeypatch
+    ):
+        drafts, resizes = [], []
+        draft, resize = JpegImageFile.draft, Image.Image.resize
+        monkeypatch.setattr(
+            JpegImageFile, "draft", lambda img, mode, size: drafts.append(size) or draft(img, mode, size)
+        )
+        monkeypatch.setattr(
+            Image.Image,
+            "resize",
+            lambda img, size, *args, **kwargs: resizes.append((img.size, size)) or resize(img, size, *args, **kwargs),
+        )
+        monkeypatch.setitem(app.config, "PHOTO_DERIVATIVE_FORMATS", ("jpeg",))
+
+        photo = _upload(authenticated_test_user, image=_image((4000, 3000), format="JPEG"), filename="garden.jpg")
+
+        # Decoded at 1/2 scale, just enough for the 1600px derivative
+        assert drafts == [(1600, 1200)]
+        assert resizes == [((2000, 1500), (1600, 1200)), ((1600, 1200), (800, 600)), ((800, 600), (300, 225))]
+        assert "webp" not in photo.derivatives["large"]
+
+    def test_reprocessing_removes_dropped_derivatives(self, app, app_context, upload_folder, authenticated_test_user):
+        photo = _upload(authenticated_test_user)
+        webp = photo.derivatives["medium"]["webp"]
+        app.config["PHOTO_DERIVATIVE_FORMATS"] = ("jpeg",)
+        try:
+            photo_pipeline.reprocess([photo.id])
+        finally:
+            app.config["PHOTO_DERIVATIVE_FORMATS"] = ("jpeg", "webp")
+
+        assert not os.path.exists(webp)
+        assert os.path.exists(photo.derivatives["medium"]["jpeg"])
+
+    def test_processing_is_claimed_once(self, app_context, upload_folder, authenticated_test_user):
+        photo = _upload(authenticated_test_user)
+
+        assert photo_pipeline.process(photo.id) is None
+
+    def test_cli_reprocess(self, app, app_context, upload_folder, authenticated_test_user):
+        _upload(authenticated_test_user)
+        _upload(authenticated_test_user)
+
+        result = app.test_cli_runner().invoke(args=["photos", "reprocess"])
+
+        assert result.exit_code == 0, result.output
+        assert "Reprocessed 2 photo(s): 2 ready, 0 failed" in result.output
+
+
+@pytest.mark.api
+class TestPhotoPipelineRoutes:
+    """Test the processing state in the API and batch re-processing"""
+
+    def test_photo_reports_processing_state(self, authenticated_client):
+        response = authenticated_client.post(
+            "/api/photos/upload", data={"file": (_image(), "garden.png"), "category": "example"}
+        )
+
+        assert response.status_code == 201
+        assert response.get_json()["photo"]["processing_state"] == "ready"
+
+    def test_reprocess_selected_photos(self, authenticated_client, authenticated_test_user):
+        photos = [_upload(authenticated_test_user) for _ in range(3)]
+
+        response = authenticated_client.post("/api/photos/reprocess", json={"photo_ids": [photos[0].id, photos[2].id]})
+
+        assert response.status_code == 202
+        assert response.get_json()["queued"] == 2
+
+    @pytest.mark.parametrize(
+        ("query", "accept", "expected"),
+        [
+            ({}, "image/jpeg", ("thumb", "image/jpeg")),
+            ({"size": "500"}, "image/jpeg", ("medium", "image/jpeg")),
+            ({"size": "800"}, "image/webp,image/*", ("medium", "image/webp")),
+            ({"size": "large"}, "*/*", ("large", "image/jpeg")),
+        ],
+    )
+    def test_thumbnail_size_picks_smallest_adequate_derivative(
+        self, authenticated_client, authenticated_test_user, query, accept, expected
+    ):
+        photo = _upload(authenticated_test_user, image=_image((2400, 1600)))
+        name, mimetype = expected
+
+        response = authenticated_client.get(
+            f"/api/photos/thumbnail/{photo.id}", query_string=query, headers={"Accept": accept}
+        )
+
+        assert response.status_code == 200
+        assert response.mimetype == mimetype
+        assert "Accept" in response.headers["Vary"]
+        with Image.open(BytesIO(response.data)) as served:
+            assert served.width == photo.derivatives[name]["width"]
+
+    def test_thumbnail_larger_than_derivatives_serves_original(self, authenticated_client, authenticated_test_user):
+        photo = _upload(authenticated_test_user, image=_image((2400, 1600)))
+
+        response = authenticated_client.get(f"/api/photos/thumbnail/{photo.id}", query_string={"size": "2000"})
+
+        assert response.status_code == 200
+        with Image.open(BytesIO(response.data)) as served:
+            assert served.size == (2400, 1600)
+
+    def test_thumbnail_rejects_unknown_size(self, authenticated_client, authenticated_test_user):
+        photo = _upload(authenticated_test_user)
+
+        response = authenticated_client.get(f"/api/photos/thumbnail/{photo.id}", query_string={"size": "huge"})
+
+        assert response.status_code == 400
+
+    def test_reprocess_validates_ids(self, authenticated_client):
+        response = authenticated_client.post("/api/photos/reprocess", json={"photo_ids": "all"})
+
+        assert response.status_code == 400
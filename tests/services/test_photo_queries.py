@@ -0,0 +1,190 @@
+"""
+Test Photo Queries
+
+Tests for the photo gallery indexes and the batch primary photo lookup used
+by list pages.
+"""
+
+import pytest
+
+from src.models.photo import Photo, PhotoCategory
+from src.models.user import db
+from src.services.photo_service import PhotoService
+from tests.fixtures.auth_fixtures import authenticated_test_user
+
+
+@pytest.fixture
+def authenticated_client(client, app_context, authenticated_test_user):
+    """Provide an authenticated test client with application context"""
+
+    return client
+
+
+@pytest.fixture
+def add_photo(authenticated_test_user):
+    def add(category, entity_id=None, is_primary=False, name="photo.jpg"):
+        photo = Photo(
+            filename=name,
+            original_filename=name,
+            file_path=f"/uploads/{name}",
+            category=category,
+            is_primary=is_primary,
+            uploaded_by_id=authenticated_test_user.id,
+            **PhotoService.entity_fields(category, entity_id),
+        )
+        db.session.add(photo)
+        db.session.commit()
+        return photo
+
+    return add
+
+
+def _photo_queries(statements):
+    """The queries reading the photos table"""
+    return [statement for statement in statements if "FROM photos" in statement]
+
+
+def _query_plan(query):
+    statement = query.statement.compile(db.engine, compile_kwargs={"literal_binds": True})
+    rows = db.session.execute(db.text(f"EXPLAIN QUERY PLAN {statement}")).all()
+    return " ".join(row[-1] for row in rows)
+
+
+@pytest.mark.service
+class TestPrimaryPhotos:
+    """Test fetching the primary photos of many entities at once"""
+
+    def test_batch_returns_primary_photos_by_entity(self, add_photo, plant_factory, statements):
+        first, second, third = plant_factory(), plant_factory(), plant_factory()
+        add_photo(PhotoCategory.PLANT, first.id, name="first-other.jpg")
+        primary = add_photo(PhotoCategory.PLANT, first.id, is_primary=True, name="first.jpg")
+        add_photo(PhotoCategory.PLANT, second.id, name="second.jpg")
+        other = add_photo(PhotoCategory.PLANT, third.id, is_primary=True, name="third.jpg")
+
+        statements.clear()
+
+        photos = PhotoService.get_primary_photos(PhotoCategory.PLANT, [first.id, second.id, 999999])
+
+        assert len(_photo_queries(statements)) == 1
+        assert list(photos) == [first.id]
+        assert photos[first.id]["id"] == primary.id
+        assert photos[first.id]["thumbnail_url"] == primary.thumbnail_url
+        assert other.id not in {photo["id"] for photo in photos.values()}
+
+    def test_other_categories_are_ignored(self, app_context, add_photo, plant_factory):
+        plant = plant_factory()
+        # Project 1 and plant 1 share an ID but not a column
+        add_photo(PhotoCategory.PROJECT, plant.id, is_primary=True)
+
+        assert PhotoService.get_primary_photos(PhotoCategory.PLANT, [plant.id]) == {}
+        assert PhotoService.get_primary_photos(PhotoCategory.EXAMPLE, [plant.id]) == {}
+        assert PhotoService.get_primary_photos(PhotoCategory.PLANT, []) == {}
+
+    def test_set_primary_photo_replaces_the_previous_one(self, app, app_context, add_photo, plant_factory):
+        plant = plant_factory()
+        old = add_photo(PhotoCategory.PLANT, plant.id, is_primary=True, name="old.jpg")
+        new = add_photo(PhotoCategory.PLANT, plant.id, name="new.jpg")
+
+        assert PhotoService().set_primary_photo(new.id, plant.id, PhotoCategory.PLANT)["success"]
+
+        db.session.expire_all()
+        assert not old.is_primary
+        assert PhotoService.get_primary_photos(PhotoCategory.PLANT, [plant.id])[plant.id]["id"] == new.id
+
+
+@pytest.mark.api
+class TestPrimaryPhotoRoutes:
+    """Test the batch primary photo endpoint and the list pages using it"""
+
+    def test_primary_photos_endpoint(self, authenticated_client, add_photo, plant_factory):
+        plants = [plant_factory() for _ in range(3)]
+        primary = add_photo(PhotoCategory.PLANT, plants[1].id, is_primary=True)
+        ids = ",".join(str(plant.id) for plant in plants)
+
+        response = authenticated_client.get(f"/api/photos/primary?category=plant&entity_ids={ids}")
+
+        assert response.status_code == 200
+        photos = response.get_json()["photos"]
+        assert list(photos) == [str(plants[1].id)]
+        assert photos[str(plants[1].id)]["id"] == primary.id
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "entity_ids=1",
+            "category=garden&entity_ids=1",
+            "category=example&entity_ids=1",
+            "category=plant&entity_ids=a",
+        ],
+    )
+    def test_primary_photos_endpoint_validation(self, authenticated_client, query):
+        assert authenticated_client.get(f"/api/photos/primary?{query}").status_code == 400
+
+    def test_primary_photos_endpoint_limit(self, authenticated_client):
+        ids = ",".join(str(entity_id) for entity_id in range(1, 202))
+
+        response = authenticated_client.get(f"/api/photos/primary?category=plant&entity_ids={ids}")
+
+        assert response.status_code == 400
+
+    def test_plant_list_attaches_primary_photos_in_one_query(
+        self, authenticated_client, add_photo, plant_factory, statements
+    ):
+        plants = [plant_factory() for _ in range(5)]
+        for plant in plants[:3]:
+            add_photo(PhotoCategory.PLANT, plant.id, is_primary=True, name=f"plant-{plant.id}.jpg")
+
+        statements.clear()
+
+        response = authenticated_client.get("/api/plants")
+
+        assert response.status_code == 200
+        assert len(_photo_queries(statements)) == 1
+        listed = {plant["id"]: plant["primary_photo"] for plant in response.get_json()["plants"]}
+        assert all(listed[plant.id]["plant_id"] == plant.id for plant in plants[:3])
+        assert all(listed[plant.id] is None for plant in plants[3:])
+
+    def test_project_list_attaches_primary_photos(self, authenticated_client, add_photo, project_factory):
+        project = project_factory()
+        primary = add_photo(PhotoCategory.PROJECT, project.id, is_primary=True)
+
+        response = authenticated_client.get("/api/projects")
+
+        assert response.status_code == 200
+        (listed,) = response.get_json()["projects"]
+        assert listed["primary_photo"]["id"] == primary.id
+
+
+@pytest.mark.service
+class TestPhotoIndexes:
+    """Test that the photo access patterns are served by indexes"""
+
+    @pytest.fixture(autouse=True)
+    def _sqlite_only(self, app_context):
+        if db.engine.dialect.name != "sqlite":
+            pytest.skip("Query plans are checked on SQLite")
+
+    def test_entity_gallery_uses_an_ordered_index(self):
+        query = Photo.query.filter(Photo.category == PhotoCategory.PLANT, Photo.plant_id == 1).order_by(
+            Photo.uploaded_at.desc()
+        )
+
+        plan = _query_plan(query)
+
+        assert "idx_photo_plant_uploaded" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_category_gallery_uses_an_ordered_index(self):
+        query = Photo.query.filter(Photo.category == PhotoCategory.EXAMPLE).order_by(Photo.uploaded_at.desc())
+
+        plan = _query_plan(query)
+
+        assert "idx_photo_category_uploaded" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_primary_batch_uses_an_entity_index(self):
+        query = Photo.query.filter(
+            Photo.project_id.in_([1, 2, 3]), Photo.category == PhotoCategory.PROJECT, Photo.is_primary
+        )
+
+        assert "idx_photo_project_uploaded" in _query_plan(query)
@@ -0,0 +1,255 @@
+"""
+Test Photo Storage
+
+Tests for content-addressed photo storage: single-pass ingest, deduplicated
+uploads, shared derivatives and reference counted cleanup.
+"""
+
+import hashlib
+import os
+from io import BytesIO
+
+import pytest
+from PIL import Image
+from werkzeug.datastructures import FileStorage
+
+import src.services.photo_pipeline as pipeline_module
+import src.services.photo_service as service_module
+from src.models.photo import Photo, PhotoBlob, PhotoCategory
+from src.models.user import db
+from src.services import photo_storage
+from src.services.photo_pipeline import derivative_files, photo_pipeline
+from src.services.photo_service import PhotoService
+from tests.fixtures.auth_fixtures import authenticated_test_user
+
+
+@pytest.fixture
+def authenticated_client(client, app_context, authenticated_test_user, upload_folder):
+    """Provide an authenticated test client with an isolated upload folder"""
+
+    return client
+
+
+@pytest.fixture
+def upload_folder(app, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, "UPLOAD_FOLDER", str(tmp_path))
+    return tmp_path
+
+
+def _image(color="green", format="PNG"):
+    buffer = BytesIO()
+    Image.new("RGB", (1200, 800), color=color).save(buffer, format=format)
+    return buffer.getvalue()
+
+
+def _upload(user, content, filename="catalogue.png"):
+    file = FileStorage(stream=BytesIO(content), filename=filename, content_type="image/png")
+    result = PhotoService().upload_photo(file, PhotoCategory.PLANT, uploaded_by_id=user.id)
+    assert result["success"], result
+    return db.session.get(Photo, result["photo"]["id"])
+
+
+def _stored_files(folder):
+    return sorted(
+        os.path.relpath(os.path.join(root, name), folder)
+        for root, _, names in os.walk(folder)
+        for name in names
+        if not root.endswith("tmp")
+    )
+
+
+@pytest.mark.service
+class TestPhotoStorage:
+    """Test deduplication and reference counting of stored photos"""
+
+    def test_identical_uploads_share_one_blob(self, app_context, upload_folder, authenticated_test_user):
+        content = _image()
+        first = _upload(authenticated_test_user, content)
+        second = _upload(authenticated_test_user, content, filename="copy.PNG")
+
+        digest = hashlib.sha256(content).hexdigest()
+        assert first.content_hash == second.content_hash == digest
+        assert first.file_path == second.file_path
+        assert first.file_path.endswith(os.path.join("blobs", digest[:2], f"{digest}.png"))
+        assert db.session.get(PhotoBlob, digest).ref_count == 2
+        assert second.original_filename == "copy.PNG"
+        # One stored original and no temporary files left behind
+        assert sum(1 for path in _stored_files(upload_folder) if path.startswith("blobs")) == 1
+        assert os.listdir(upload_folder / "blobs" / "tmp") == []
+        assert second.derivatives == first.derivatives
+
+    def test_duplicate_is_not_decoded_again(self, app_context, upload_folder, authenticated_test_user, monkeypatch):
+        decoded = []
+        process_photo_file = pipeline_module.process_photo_file
+        monkeypatch.setattr(
+            pipeline_module,
+            "process_photo_file",
+            lambda path, *args: decoded.append(path) or process_photo_file(path, *args),
+        )
+        shared_before = photo_pipeline.metrics()["shared"]
+        content = _image()
+
+        photos = [_upload(authenticated_test_user, content) for _ in range(3)]
+
+        assert len(decoded) == 1
+        assert photo_pipeline.metrics()["shared"] - shared_before == 2
+        assert {(photo.width, photo.height) for photo in photos} == {(1200, 800)}
+
+    def test_different_content_is_stored_separately(self, app_context, upload_folder, authenticated_test_user):
+        green = _upload(authenticated_test_user, _image("green"))
+        red = _upload(authenticated_test_user, _image("red"))
+
+        assert green.content_hash != red.content_hash
+        assert green.file_path != red.file_path
+        assert derivative_files(green).isdisjoint(derivative_files(red))
+
+    def test_files_are_removed_with_the_last_reference(self, app_context, upload_folder, authenticated_test_user):
+        content = _image()
+        first = _upload(authenticated_test_user, content)
+        second = _upload(authenticated_test_user, content)
+        files = derivative_files(first) | {first.file_path}
+        digest, second_id = first.content_hash, second.id
+        service = PhotoService()
+
+        assert service.delete_photo(first.id)["success"]
+        assert db.session.get(PhotoBlob, digest).ref_count == 1
+        assert all(os.path.exists(path) for path in files)
+
+        assert service.delete_photo(second_id)["success"]
+        assert db.session.get(PhotoBlob, digest) is None
+        assert not any(os.path.exists(path) for path in files)
+
+    def test_released_blob_uploaded_again_is_stored_again(self, app_context, upload_folder, authenticated_test_user):
+        content = _image()
+        photo = _upload(authenticated_test_user, content)
+        PhotoService().delete_photo(photo.id)
+
+        again = _upload(authenticated_test_user, content)
+
+        assert db.session.get(PhotoBlob, again.content_hash).ref_count == 1
+        assert os.path.exists(again.file_path)
+        assert os.path.exists(again.thumbnail_path)
+
+    def test_reprocessing_updates_photos_sharing_the_content(
+        self, app, app_context, upload_folder, authenticated_test_user, monkeypatch
+    ):
+        content = _image()
+        first = _upload(authenticated_test_user, content)
+        second = _upload(authenticated_test_user, content)
+        webp = first.derivatives["thumb"]["webp"]
+        monkeypatch.setitem(app.config, "PHOTO_DERIVATIVE_FORMATS", ("jpeg",))
+
+        photo_pipeline.reprocess([first.id])
+
+        db.session.expire_all()
+        assert not os.path.exists(webp)
+        assert "webp" not in second.derivatives["thumb"]
+        assert second.derivatives == first.derivatives
+
+    def test_legacy_photos_keep_their_own_files(self, app_context, upload_folder, authenticated_test_user):
+        photo = _upload(authenticated_test_user, _image())
+        legacy_path = os.path.join(upload_folder, "photos", "legacy.png")
+        os.makedirs(os.path.dirname(legacy_path), exist_ok=True)
+        with open(legacy_path, "wb") as legacy:
+            legacy.write(_image("blue"))
+        legacy = Photo(
+            filename="legacy.png",
+            original_filename="legacy.png",
+            file_path=legacy_path,
+            category=PhotoCategory.PLANT,
+            uploaded_by_id=authenticated_test_user.id,
+        )
+        db.session.add(legacy)
+        db.session.commit()
+
+        assert PhotoService().delete_photo(legacy.id)["success"]
+
+        assert not os.path.exists(legacy_path)
+        assert os.path.exists(photo.file_path)
+
+
+@pytest.mark.service
+class TestPhotoIngest:
+    """Test single-pass ingest of uploads into blob storage"""
+
+    @pytest.mark.parametrize(
+        ("format", "mimetype"),
+        [("PNG", "image/png"), ("JPEG", "image/jpeg"), ("GIF", "image/gif"), ("WEBP", "image/webp")],
+    )
+    def test_sniff_image(self, format, mimetype):
+        header = _image(format=format)[: photo_storage.HEADER_SIZE]
+
+        assert photo_storage.sniff_image(header) == mimetype
+
+    def test_sniff_rejects_other_content(self):
+        assert photo_storage.sniff_image(b"%PDF-1.7\n") is None
+        assert photo_storage.sniff_image(b"RIFF\0\0\0\0WAVEfmt ") is None
+        assert photo_storage.sniff_image(b"") is None
+
+    def test_ingest_file_stops_writing_past_the_limit(self, upload_folder):
+        with photo_storage.IngestFile(str(upload_folder), max_bytes=10) as ingest:
+            for _ in range(5):
+                ingest.write(b"abcde")
+            ingest.flush()
+
+            assert ingest.size == 25
+            assert os.path.getsize(ingest.path) <= 10
+            with pytest.raises(photo_storage.FileTooLargeError):
+                ingest.check_size()
+            temp_path = ingest.path
+
+        assert not os.path.exists(temp_path)
+
+    def test_request_body_is_parsed_into_blob_storage(self, authenticated_client, upload_folder, monkeypatch):
+        streams = []
+        ingest_stream = service_module.ingest_stream
+        monkeypatch.setattr(
+            service_module,
+            "ingest_stream",
+            lambda stream, *args: streams.append(stream) or ingest_stream(stream, *args),
+        )
+        content = _image()
+
+        response = authenticated_client.post(
+            "/api/photos/upload", data={"file": (BytesIO(content), "garden.png"), "category": "plant"}
+        )
+
+        assert response.status_code == 201
+        # The multipart parser wrote the part into an ingest file; it was not copied again
+        assert [type(stream) for stream in streams] == [photo_storage.IngestFile]
+        photo = response.get_json()["photo"]
+        assert photo["content_hash"] == hashlib.sha256(content).hexdigest()
+        assert photo["file_size"] == len(content)
+        with open(photo["file_path"], "rb") as stored:
+            assert stored.read() == content
+        assert os.listdir(upload_folder / "blobs" / "tmp") == []
+
+    def test_mime_type_is_sniffed_from_content(self, authenticated_client):
+        response = authenticated_client.post(
+            "/api/photos/upload",
+            data={"file": (BytesIO(_image(format="JPEG")), "garden.png", "image/png"), "category": "plant"},
+        )
+
+        assert response.status_code == 201
+        assert response.get_json()["photo"]["mime_type"] == "image/jpeg"
+
+    def test_non_image_content_is_rejected(self, authenticated_client, upload_folder):
+        response = authenticated_client.post(
+            "/api/photos/upload", data={"file": (BytesIO(b"<html></html>"), "garden.png"), "category": "plant"}
+        )
+
+        assert response.status_code == 400
+        assert response.get_json()["error"] == "File is not a supported image"
+        assert Photo.query.count() == 0
+        assert os.listdir(upload_folder / "blobs" / "tmp") == []
+
+    def test_oversized_upload_is_rejected_while_streaming(self, authenticated_client, upload_folder, monkeypatch):
+        monkeypatch.setattr(PhotoService, "MAX_FILE_SIZE", 1024)
+
+        response = authenticated_client.post(
+            "/api/photos/upload", data={"file": (BytesIO(_image()), "garden.png"), "category": "plant"}
+        )
+
+        assert response.status_code == 400
+        assert response.get_json()["error"].startswith("File too large")
+        assert os.listdir(upload_folder / "blobs" / "tmp") == []
@@ -0,0 +1,107 @@
+"""
+Test Plant CSV Import Service
+
+Tests for streaming, chunked plant CSV imports.
+"""
+
+import io
+
+import pytest
+
+from src.models.landscape import Plant
+from src.models.user import db
+from src.services.plant_csv_import import PlantCSVImportService
+from tests.fixtures.auth_fixtures import authenticated_test_user
+
+
+@pytest.fixture
+def authenticated_client(client, app_context, authenticated_test_user):
+    """Provide an authenticated test client with application context"""
+
+    return client
+
+
+@pytest.mark.service
+class TestPlantCSVImportService:
+    """Test chunked coercion and bulk insert"""
+
+    def test_coerce_chunk_types(self):
+        """Values are coerced column-wise to their model types"""
+        rows = [
+            {"name": " Acer campestre ", "height_min": "2.5", "native": "Yes", "category": " "},
+            {"name": "Buxus", "height_min": "n/a", "native": None},
+        ]
+        records, errors = PlantCSVImportService().coerce_chunk(rows, first_row_num=2)
+
+        assert errors == []
+        assert records[0]["name"] == "Acer campestre"
+        assert records[0]["height_min"] == 2.5
+        assert records[0]["native"] is True
+        assert records[0]["category"] is None
+        assert records[1]["height_min"] is None
+        assert records[1]["native"] is False
+
+    def test_coerce_chunk_reports_row_numbers(self):
+        """Missing names are reported with their CSV row number"""
+        rows = [{"name": "Acer"}, {"name": ""}, {"name": "Buxus"}]
+        records, errors = PlantCSVImportService().coerce_chunk(rows, first_row_num=12)
+
+        assert [record["name"] for record in records] == ["Acer", "Buxus"]
+        assert errors == ["Row 13: Plant name is required"]
+
+    def test_import_stream_in_chunks(self, app_context):
+        """Rows are inserted per chunk and throughput metrics are reported"""
+        content = "\ufeffname,category,price\n" + "".join(f"Plant {idx},Tree,{idx}.5\n" for idx in range(5))
+
+        result = PlantCSVImportService(chunk_size=2).import_stream(io.BytesIO(content.encode("utf-8")))
+
+        assert result.errors == []
+        assert result.imported_plants == [f"Plant {idx}" for idx in range(5)]
+        assert result.metrics["rows_processed"] == 5
+        assert result.metrics["chunks"] == 3
+        assert [timing["rows"] for timing in result.metrics["chunk_timings"]] == [2, 2, 1]
+        assert result.metrics["rows_per_second"] > 0
+
+        plant = db.session.query(Plant).filter_by(name="Plant 3").one()
+        assert plant.price == 3.5
+        assert plant.created_at is not None
+
+    def test_import_stream_stops_inserting_after_error(self, app_context):
+        """Chunks after the first error are validated but not inserted"""
+        content = "name\nA\n\nB\nC\n,\nD\n"
+
+        result = PlantCSVImportService(chunk_size=2).import_stream(io.BytesIO(content.encode("utf-8")))
+
+        assert result.errors == ["Row 5: Plant name is required"]
+        assert result.imported_plants == ["A", "B"]
+
+
+@pytest.mark.api
+class TestPlantImportRoute:
+    """Test the import endpoint response"""
+
+    def test_import_returns_metrics(self, authenticated_client):
+        """Successful imports include throughput metrics"""
+        csv_file = io.BytesIO(b"name,native\nRosa canina,true\nTaxus baccata,false\n")
+
+        response = authenticated_client.post(
+            "/api/plant-recommendations/import",
+            data={"file": (csv_file, "plants.csv")},
+        )
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["imported_plants"] == ["Rosa canina", "Taxus baccata"]
+        assert data["metrics"]["rows_processed"] == 2
+
+    def test_import_rejects_non_utf8(self, authenticated_client):
+        """Uploads that are not UTF-8 are rejected"""
+        csv_file = io.BytesIO("name\nPlatanus ×hispanica\n".encode("utf-16"))
+
+        response = authenticated_client.post(
+            "/api/plant-recommendations/import",
+            data={"file": (csv_file, "plants.csv")},
+        )
+
+        assert response.status_code == 400
+        assert "UTF-8" in response.get_json()["error"]
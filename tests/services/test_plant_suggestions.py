@@ -0,0 +1,255 @@
+"""
+Test Plant Suggestions
+
+Tests for the in-memory plant suggestion index, how it follows catalogue
+changes and the search suggestions endpoint served from it.
+"""
+
+import random
+
+import pytest
+from sqlalchemy import insert
+
+from src.models.landscape import Plant
+from src.models.user import db
+from src.services.plant_suggestions import (
+    HEAVY_PREFIX_KEYS,
+    PlantSuggestion,
+    PlantSuggestionIndex,
+    fold,
+    plant_suggestions,
+    suggest_plants,
+)
+from tests.fixtures.auth_fixtures import authenticated_test_user
+
+
+@pytest.fixture
+def authenticated_client(client, app_context, authenticated_test_user):
+    """Provide an authenticated test client with application context"""
+
+    return client
+
+
+def _names(suggestions):
+    return [suggestion["name"] for suggestion in suggestions]
+
+
+def _catalogue(count, seed=7):
+    words = ["acer", "achillea", "aconitum", "actaea", "alnus", "betula", "buxus", "carpinus", "cornus", "fagus"]
+    rng = random.Random(seed)
+    return [
+        PlantSuggestion(
+            plant_id,
+            f"{rng.choice(words).title()} {rng.choice(words)} {plant_id}",
+            f"{rng.choice(words).title()} {plant_id}" if plant_id % 3 else None,
+            "Tree",
+            usage=rng.randrange(5),
+        )
+        for plant_id in range(1, count + 1)
+    ]
+
+
+@pytest.mark.service
+class TestPlantSuggestionIndex:
+    """Test the index on its own"""
+
+    def test_fold(self):
+        assert fold("Acer  palmatum 'Bloodgood'") == "acer palmatum bloodgood"
+        assert fold("Zinnia élégante") == "zinnia elegante"
+        assert fold(None) == ""
+
+    def test_word_prefixes_of_names_and_common_names_match(self):
+        index = PlantSuggestionIndex()
+        index.build(
+            [
+                PlantSuggestion(1, "Acer palmatum", "Japanese Maple", "Tree"),
+                PlantSuggestion(2, "Zinnia élégante", None, "Annual"),
+                PlantSuggestion(3, "Fagus sylvatica", "European Beech", "Tree"),
+            ]
+        )
+
+        assert _names(index.suggest("acer PAL")) == ["Acer palmatum"]
+        assert _names(index.suggest("palm")) == ["Acer palmatum"]
+        assert _names(index.suggest("maple")) == ["Acer palmatum"]
+        assert _names(index.suggest("Élég")) == ["Zinnia élégante"]
+        assert _names(index.suggest("cer")) == []
+        assert index.suggest("  ") == []
+        assert index.suggest("beech")[0] == {
+            "id": 3,
+            "name": "Fagus sylvatica",
+            "common_name": "European Beech",
+            "category": "Tree",
+        }
+
+    def test_name_starts_then_usage_then_name(self):
+        index = PlantSuggestionIndex()
+        index.build(
+            [
+                PlantSuggestion(1, "Betula pendula", "Silver Birch", "Tree", usage=9),
+                PlantSuggestion(2, "Birch Hybrid", None, "Tree", usage=0),
+                PlantSuggestion(3, "Birchwood Fern", None, "Fern", usage=4),
+                PlantSuggestion(4, "Betula nigra", "River Birch", "Tree", usage=2),
+            ]
+        )
+
+        assert _names(index.suggest("birch")) == ["Birchwood Fern", "Birch Hybrid", "Betula pendula", "Betula nigra"]
+        assert _names(index.suggest("birch", limit=2)) == ["Birchwood Fern", "Birch Hybrid"]
+
+    def test_updates_keep_ranked_prefixes_exact(self):
+        plants = _catalogue(1500)
+        index = PlantSuggestionIndex()
+        index.build(plants)
+        assert index.stats()["ranked_prefixes"] > 0
+
+        current = {plant.id: plant for plant in plants}
+        rng = random.Random(11)
+        for plant_id in rng.sample(sorted(current), 300):
+            del current[plant_id]
+            index.update(removed=[plant_id])
+        for plant in _catalogue(2000, seed=13)[1400:]:
+            current[plant.id] = plant
+            index.update([plant])
+        for plant_id in rng.sample(sorted(current), 200):
+            plant = current[plant_id]
+            current[plant_id] = PlantSuggestion(plant.id, plant.name, plant.common_name, plant.category, usage=9)
+            index.update([current[plant_id]])
+
+        rebuilt = PlantSuggestionIndex()
+        rebuilt.build(current.values())
+        assert index.stats() == {**rebuilt.stats(), "ranked_prefixes": index.stats()["ranked_prefixes"]}
+        for query in ["a", "ac", "ace", "acer", "acer a", "b", "fagus", "1", "9"]:
+            assert index.suggest(query, limit=20) == rebuilt.suggest(query, limit=20), query
+
+    def test_queries_scan_a_bounded_number_of_keys(self, monkeypatch):
+        index = PlantSuggestionIndex()
+        index.build(_catalogue(20000))
+        scanned = []
+        rank = index._rank
+
+        def record(lo, hi, limit):
+            scanned.append(hi - lo)
+            return rank(lo, hi, limit)
+
+        monkeypatch.setattr(index, "_rank", record)
+        for query in ["a", "ac", "acer", "acer b", "be", "betula", "c", "cornus a", "fag", "12", "x"]:
+            assert index.suggest(query) == index.suggest(query, limit=20)[:10], query
+
+        # Prefixes matching more keys are answered from their ranking made ahead of time
+        assert max(scanned) <= HEAVY_PREFIX_KEYS
+
+
+@pytest.mark.service
+class TestSynchronization:
+    """Test that the index follows the catalogue"""
+
+    @pytest.fixture(autouse=True)
+    def fresh_index(self, app_context):
+        plant_suggestions.reset()
+
+    def test_plant_changes_are_applied(self, plant_factory):
+        plant = plant_factory(name="Quillwort lacustris", common_name=None, category="Aquatic")
+        assert _names(suggest_plants("quill")) == ["Quillwort lacustris"]
+
+        plant.name = "Zostera marina"
+        db.session.commit()
+        assert suggest_plants("quill") == []
+        assert _names(suggest_plants("zost")) == ["Zostera marina"]
+
+        db.session.delete(plant)
+        db.session.commit()
+        assert suggest_plants("zost") == []
+
+    def test_project_usage_ranks_plants(self, plant_factory, project_plant_factory):
+        plant_factory(name="Quillwort alpha", common_name=None, category="Aquatic")
+        popular = plant_factory(name="Quillwort beta", common_name=None, category="Aquatic")
+        assert _names(suggest_plants("quillwort")) == ["Quillwort alpha", "Quillwort beta"]
+
+        project_plant_factory(plant=popular)
+        assert _names(suggest_plants("quillwort")) == ["Quillwort beta", "Quillwort alpha"]
+
+    def test_changes_by_other_processes_are_found(self, plant_factory):
+        plant = plant_factory(name="Quillwort lacustris", common_name=None, category="Aquatic")
+        suggest_plants("quill")
+
+        # Writes that bypass this process' model events
+        db.session.execute(
+            insert(Plant), [{"name": f"Quillwort imported {number}", "category": "Aquatic"} for number in range(3)]
+        )
+        db.session.execute(db.delete(Plant).where(Plant.id == plant.id))
+        db.session.commit()
+
+        assert _names(suggest_plants("quill")) == [f"Quillwort imported {number}" for number in range(3)]
+
+    def test_suggestions_do_not_query_the_database(self, app, plant_factory, statements):
+        plant_factory(name="Quillwort lacustris", common_name=None, category="Aquatic")
+        app.config["PLANT_SUGGESTIONS_REFRESH_SECONDS"] = 3600
+        try:
+            suggest_plants("quill")
+            statements.clear()
+
+            assert _names(suggest_plants("quillwort l")) == ["Quillwort lacustris"]
+            assert statements == []
+        finally:
+            app.config["PLANT_SUGGESTIONS_REFRESH_SECONDS"] = 0
+
+
+@pytest.mark.service
+class TestBackgroundBuild:
+    """Test building the index in the background"""
+
+    @pytest.fixture(autouse=True)
+    def background_build(self, app, app_context):
+        plant_suggestions.reset()
+        app.config["PLANT_SUGGESTIONS_BACKGROUND_BUILD"] = True
+        yield
+        app.config["PLANT_SUGGESTIONS_BACKGROUND_BUILD"] = False
+        plant_suggestions.reset()
+
+    def test_search_is_used_until_the_index_is_built(self, plant_factory, monkeypatch):
+        warmed = []
+        monkeypatch.setattr(plant_suggestions, "warm", warmed.append)
+        plant_factory(name="Quillwort lacustris", common_name=None, category="Aquatic")
+
+        assert _names(suggest_plants("quillwort")) == ["Quillwort lacustris"]
+        assert suggest_plants("  ") == []
+        assert not plant_suggestions.ready
+        assert len(warmed) == 2
+
+    def test_index_is_built_in_the_background(self, app, plant_factory, statements):
+        plant_factory(name="Quillwort lacustris", common_name=None, category="Aquatic")
+
+        thread = plant_suggestions.warm(app)
+        thread.join(timeout=10)
+
+        assert plant_suggestions.ready
+        assert plant_suggestions.warm(app) is None
+        assert plant_suggestions.index.stats()["plants"] >= 1
+        app.config["PLANT_SUGGESTIONS_REFRESH_SECONDS"] = 3600
+        try:
+            statements.clear()
+            assert _names(suggest_plants("quillwort l")) == ["Quillwort lacustris"]
+            assert statements == []
+        finally:
+            app.config["PLANT_SUGGESTIONS_REFRESH_SECONDS"] = 0
+
+
+@pytest.mark.api
+class TestSuggestionRoute:
+    """Test the search suggestions endpoint"""
+
+    def test_suggestions(self, authenticated_client, plant_factory):
+        plant_suggestions.reset()
+        plant_factory(name="Quillwort lacustris", common_name="Lake quillwort", category="Aquatic")
+        plant_factory(name="Acer palmatum", common_name="Japanese Maple", category="Tree")
+
+        response = authenticated_client.get("/api/plants/search-suggestions?q=lake%20QUILL")
+
+        assert response.status_code == 200
+        assert _names(response.get_json()["suggestions"]) == ["Quillwort lacustris"]
+        assert authenticated_client.get("/api/plants/search-suggestions?q=").get_json() == {"suggestions": []}
+
+    @pytest.mark.parametrize("limit", [0, 21])
+    def test_limit_validation(self, authenticated_client, limit):
+        response = authenticated_client.get(f"/api/plants/search-suggestions?q=acer&limit={limit}")
+
+        assert response.status_code == 400
@@ -0,0 +1,109 @@
+"""
+Test Project Timeline
+
+Tests for the column-wise project timeline analytics and their cache.
+"""
+
+from datetime import date
+
+import pytest
+
+from src.models.user import db
+from src.services.analytics import AnalyticsService
+from src.services.project_timeline import get_timeline_analysis
+
+
+@pytest.fixture
+def projects(project_factory):
+    return [
+        # Ends on its end date, finished two days after the target
+        project_factory(
+            start_date="2026-03-01",
+            end_date="2026-03-31",
+            target_completion_date=date(2026, 4, 1),
+            actual_completion_date=date(2026, 4, 3),
+            budget=1200.0,
+        ),
+        # Falls back to the completion date; start has a time part
+        project_factory(
+            start_date="2026-04-01T09:30:00",
+            end_date=None,
+            target_completion_date=date(2026, 4, 30),
+            actual_completion_date=date(2026, 4, 21),
+            budget=None,
+        ),
+        # Unparseable end date: left out, even though it has a completion date
+        project_factory(
+            start_date="2026-05-01",
+            end_date="soon",
+            target_completion_date=date(2026, 4, 30),
+            actual_completion_date=date(2026, 6, 1),
+        ),
+        # No end at all
+        project_factory(
+            start_date="2026-06-01", end_date=None, target_completion_date=None, actual_completion_date=None
+        ),
+    ]
+
+
+@pytest.mark.service
+class TestProjectTimeline:
+    """Test the project timeline analytics"""
+
+    def test_durations_and_schedule(self, app_context, projects):
+        analysis = get_timeline_analysis()
+
+        assert [(project["id"], project["duration_days"], project["budget"]) for project in analysis["projects"]] == [
+            (projects[0].id, 30, 1200.0),
+            (projects[1].id, 20, 0),
+        ]
+        assert analysis["summary"] == {
+            "project_count": 2,
+            "avg_duration_days": 25.0,
+            "median_duration_days": 25.0,
+            "completed_with_target": 3,
+            "on_time_count": 1,
+            "on_time_rate": pytest.approx(100 / 3),
+            "avg_delay_days": pytest.approx((2 + 32) / 2),
+        }
+
+    def test_single_project(self, app_context, projects):
+        analysis = get_timeline_analysis(projects[1].id)
+
+        assert [project["name"] for project in analysis["projects"]] == [projects[1].name]
+
+    def test_empty(self, app_context):
+        assert get_timeline_analysis() == {
+            "projects": [],
+            "summary": {
+                "project_count": 0,
+                "avg_duration_days": 0,
+                "median_duration_days": 0,
+                "completed_with_target": 0,
+                "on_time_count": 0,
+                "on_time_rate": 0,
+                "avg_delay_days": 0,
+            },
+        }
+
+    def test_cached_per_project_set_version(self, projects, statements):
+        """A repeated call only checks the version; a change recomputes"""
+        get_timeline_analysis()
+        statements.clear()
+
+        get_timeline_analysis()
+        assert len(statements) == 1
+
+        projects[3].end_date = "2026-06-11"
+        db.session.commit()
+        statements.clear()
+
+        analysis = get_timeline_analysis()
+        assert len(statements) == 2
+        assert analysis["projects"][-1]["duration_days"] == 10
+
+    def test_performance_metrics_include_timeline(self, app_context, projects):
+        metrics = AnalyticsService().get_project_performance_metrics()
+
+        assert [project["duration_days"] for project in metrics["timeline_analysis"]] == [30, 20]
+        assert metrics["timeline_summary"]["on_time_count"] == 1
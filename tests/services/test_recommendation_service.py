@@ -29,6 +29,27 @@ class TestRecommendationService:
         """Create test plants with known characteristics"""
         from src.models.user import db
 
+        # Traits outside the criteria are the same for every plant; left to the
+        # factory they are random and can outweigh the criteria
+        traits = {
+            "bloom_color": "white",
+            "foliage_color": "green",
+            "maintenance": "medium",
+            "native": False,
+            "wildlife_value": "medium",
+            "pollinator_friendly": False,
+            "deer_resistant": False,
+            "pest_resistance": "medium",
+            "disease_resistance": "medium",
+            "suitable_for_containers": False,
+            "suitable_for_hedging": False,
+            "suitable_for_screening": False,
+            "suitable_for_groundcover": False,
+            "suitable_for_slopes": False,
+            "price": 25.0,
+            "soil_ph_min": 6.0,
+            "soil_ph_max": 7.0,
+        }
         plants = [
             create_test_plant(
                 name="Perfect Rose",
@@ -42,6 +63,7 @@ class TestRecommendationService:
                 hardiness_zone="5-9",
                 water_requirements="moderate",
                 bloom_time="spring",
+                **traits,
             ),
             create_test_plant(
                 name="Good Lavender",
@@ -55,6 +77,7 @@ class TestRecommendationService:
                 hardiness_zone="5-9",
                 water_requirements="low",  # Different water requirement
                 bloom_time="summer",  # Different bloom time
+                **traits,
             ),
             create_test_plant(
                 name="Poor Match Hosta",
@@ -68,6 +91,7 @@ class TestRecommendationService:
                 hardiness_zone="4-8",
                 water_requirements="high",
                 bloom_time="summer",
+                **traits,
             ),
         ]
 
@@ -0,0 +1,56 @@
+"""
+Test Report Loaders
+
+Tests that report data is loaded in a fixed number of queries.
+"""
+
+import pytest
+
+from src.models.user import db
+from src.services.report_loaders import load_invoiceable_projects, load_project_report
+
+
+@pytest.fixture
+def project_with_plants(project_factory, project_plant_factory, plant_factory):
+    project = project_factory(status="completed", start_date="2026-03-01")
+    for index, name in enumerate(["Acer palmatum", "Buxus sempervirens", "Taxus baccata"]):
+        project_plant_factory(project=project, plant=plant_factory(name=name), quantity=index + 1, unit_cost=10.0)
+    db.session.expire_all()
+    return project
+
+
+@pytest.mark.service
+class TestReportLoaders:
+    """Test the report data loaders"""
+
+    def test_project_report_loads_in_one_query(self, project_with_plants, statements):
+        """Project, client and plants come from a single statement"""
+        project_id = project_with_plants.id
+        statements.clear()
+
+        report = load_project_report(project_id)
+        plant_names = [plant.name for plant in report.plants]
+        client_name = report.client.name
+
+        assert len(statements) == 1
+        assert plant_names == ["Acer palmatum", "Buxus sempervirens", "Taxus baccata"]
+        assert [plant.quantity for plant in report.plants] == [1, 2, 3]
+        assert client_name == project_with_plants.client.name
+        assert report.start_date == "2026-03-01"
+
+    def test_missing_project(self, app_context):
+        """Unknown projects load as None"""
+        assert load_project_report(99999) is None
+
+    def test_invoiceable_projects_aggregate(self, project_with_plants, project_factory, statements):
+        """Plant counts and client names come from one aggregate query"""
+        project_factory(status="completed")
+        project_factory(status="Planning")
+        db.session.expire_all()
+        statements.clear()
+
+        projects = load_invoiceable_projects(["completed"])
+
+        assert len(statements) == 1
+        assert [project.plant_count for project in projects] == [3, 0]
+        assert projects[0].client_name == project_with_plants.client.name
@@ -0,0 +1,214 @@
+"""
+Test Report Scheduler
+
+Tests for the scheduled pre-generation of reports and serving the
+pre-generated artifacts from the report endpoints.
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from src.models.landscape import GeneratedReport
+from src.models.user import db
+from src.services.pdf_cache import get_pdf_cache
+from src.services.report_scheduler import (
+    _off_peak_hours,
+    last_closed_period,
+    period_for_label,
+    period_for_range,
+    pregenerate_reports,
+)
+from tests.fixtures.auth_fixtures import authenticated_test_user
+
+MONTH_START = datetime(2026, 10, 1, 2, 30)
+SEPTEMBER = {"start_date": "2026-09-01T00:00:00", "end_date": "2026-09-30T23:59:59.999999"}
+
+
+@pytest.fixture
+def pdf_cache_dir(app, tmp_path, monkeypatch):
+    """Enable the PDF cache in a temporary directory"""
+    monkeypatch.setitem(app.config, "PDF_CACHE_ENABLED", True)
+    monkeypatch.setitem(app.config, "PDF_CACHE_DIR", str(tmp_path / "pdf_cache"))
+    return tmp_path / "pdf_cache"
+
+
+@pytest.fixture
+def authenticated_client(client, app_context, authenticated_test_user):
+    """Provide an authenticated test client with application context"""
+
+    return client
+
+
+@pytest.fixture
+def portfolio(client_factory, project_factory, plant_factory, project_plant_factory):
+    customer = client_factory(name="Green Roofs BV")
+    project = project_factory(client=customer, budget=5000.0, created_at=datetime(2026, 9, 12))
+    project_plant_factory(project=project, plant=plant_factory(category="Tree"), quantity=3)
+    project_factory(client=customer, budget=2000.0, created_at=datetime(2026, 8, 3))
+    return project
+
+
+def _stored():
+    return {
+        (artifact.report_type, artifact.period): artifact
+        for artifact in db.session.execute(select(GeneratedReport)).scalars()
+    }
+
+
+@pytest.mark.service
+class TestReportScheduler:
+    """Test which reports are generated and when they are reused"""
+
+    @pytest.mark.parametrize(
+        ("frequency", "now", "expected"),
+        [
+            ("monthly", datetime(2026, 10, 1, 2), ("2026-09", "2026-09-01T00:00:00", "2026-09-30T23:59:59.999999")),
+            ("monthly", datetime(2026, 1, 15), ("2025-12", "2025-12-01T00:00:00", "2025-12-31T23:59:59.999999")),
+            ("quarterly", datetime(2026, 10, 18), ("2026-Q3", "2026-07-01T00:00:00", "2026-09-30T23:59:59.999999")),
+            ("quarterly", datetime(2026, 2, 1), ("2025-Q4", "2025-10-01T00:00:00", "2025-12-31T23:59:59.999999")),
+        ],
+    )
+    def test_last_closed_period(self, frequency, now, expected):
+        period = last_closed_period(frequency, now)
+
+        assert (period.label, period.start_date, period.end_date) == expected
+
+    @pytest.mark.parametrize(
+        ("start_date", "end_date", "expected"),
+        [
+            (None, None, "all"),
+            ("2026-09-01", "2026-09-30", "2026-09"),
+            ("2026-09-01T00:00:00", "2026-09-30T23:59:59.999999", "2026-09"),
+            ("2026-09-01T00:00:00Z", "2026-09-30T23:59:59.999999+00:00", "2026-09"),
+            ("2026-07-01", "2026-09-30", "2026-Q3"),
+            ("2026-08-01", "2026-10-31", None),
+            ("2026-09-02", "2026-09-30", None),
+            ("2026-09-01", "2026-09-29", None),
+            ("2026-09-01", None, None),
+            ("september", "2026-09-30", None),
+        ],
+    )
+    def test_requested_ranges_are_matched_to_periods(self, start_date, end_date, expected):
+        period = period_for_range(start_date, end_date)
+
+        assert (period.label if period else None) == expected
+
+    def test_period_labels(self):
+        assert period_for_label("2026-09") == last_closed_period("monthly", datetime(2026, 10, 5))
+        assert period_for_label("2026-Q3") == last_closed_period("quarterly", datetime(2026, 10, 5))
+        assert period_for_label("2026-13") is None
+        assert period_for_label("2026-Q5") is None
+
+    def test_off_peak_hours_may_wrap_midnight(self):
+        assert _off_peak_hours("1-5") == {1, 2, 3, 4}
+        assert _off_peak_hours("22-2") == {22, 23, 0, 1}
+
+    def test_pregenerates_scheduled_reports(self, app_context, pdf_cache_dir, portfolio):
+        """Every scheduled report is stored with timings; the business summary also for last month and as PDF"""
+        generated = pregenerate_reports(now=MONTH_START)
+
+        assert sorted((artifact.report_type, artifact.period) for artifact in generated) == [
+            ("business_summary", "2026-09"),
+            ("business_summary", "all"),
+            ("plant_usage", "all"),
+            ("supplier_performance", "all"),
+        ]
+        stored = _stored()
+        assert stored[("business_summary", "all")].data["summary"]["total_projects"] == 2
+        assert stored[("business_summary", "2026-09")].data["summary"]["total_projects"] == 1
+        assert stored[("plant_usage", "all")].pdf_cache_key is None
+        assert all(artifact.json_seconds is not None for artifact in stored.values())
+
+        summary = stored[("business_summary", "all")]
+        assert summary.pdf_seconds is not None
+        assert get_pdf_cache().get(summary.pdf_cache_key)
+
+        # Nothing changed, so nothing is due
+        assert pregenerate_reports(now=MONTH_START) == []
+
+    def test_changes_make_only_affected_reports_due(self, app_context, portfolio, project_factory):
+        pregenerate_reports(now=MONTH_START)
+        project_factory(budget=100.0)
+
+        regenerated = pregenerate_reports(now=MONTH_START)
+
+        assert sorted((artifact.report_type, artifact.period) for artifact in regenerated) == [
+            ("business_summary", "2026-09"),
+            ("business_summary", "all"),
+            ("supplier_performance", "all"),
+        ]
+
+    def test_schedule_skips_unknown_frequencies(self, app_context, portfolio):
+        generated = pregenerate_reports(
+            now=MONTH_START, schedule={"business_summary": "never", "plant_usage": "monthly"}
+        )
+
+        assert [(artifact.report_type, artifact.period) for artifact in generated] == [("plant_usage", "all")]
+
+    def test_cli_pregenerate(self, app, app_context, portfolio):
+        result = app.test_cli_runner().invoke(args=["reports", "pregenerate", "--report", "plant_usage"])
+
+        assert result.exit_code == 0, result.output
+        assert "plant_usage [all]: JSON" in result.output
+        assert set(_stored()) == {("plant_usage", "all")}
+
+
+@pytest.mark.api
+class TestPregeneratedReportRoutes:
+    """Test serving pre-generated reports"""
+
+    def test_serves_pregenerated_until_data_changes(self, authenticated_client, portfolio, project_factory):
+        pregenerate_reports(now=MONTH_START)
+        stored = _stored()
+
+        assert authenticated_client.get("/api/reports/business-summary").get_json() == (
+            stored[("business_summary", "all")].data
+        )
+        assert authenticated_client.get("/api/reports/business-summary", query_string=SEPTEMBER).get_json() == (
+            stored[("business_summary", "2026-09")].data
+        )
+        assert authenticated_client.get("/api/reports/plant-usage").get_json() == stored[("plant_usage", "all")].data
+        # However the dashboard writes the month
+        for query_string in (
+            {"start_date": "2026-09-01", "end_date": "2026-09-30"},
+            {"period": "2026-09"},
+        ):
+            assert authenticated_client.get("/api/reports/business-summary", query_string=query_string).get_json() == (
+                stored[("business_summary", "2026-09")].data
+            )
+
+        project_factory(budget=100.0)
+        live = authenticated_client.get("/api/reports/business-summary").get_json()
+        assert live["summary"]["total_projects"] == 3
+        assert live["generated_at"] != stored[("business_summary", "all")].data["generated_at"]
+
+    def test_live_summary_of_plain_dates_covers_the_last_day(self, authenticated_client, portfolio, project_factory):
+        project_factory(budget=100.0, created_at=datetime(2026, 9, 30, 17, 45))
+
+        data = authenticated_client.get(
+            "/api/reports/business-summary", query_string={"start_date": "2026-09-01", "end_date": "2026-09-30"}
+        ).get_json()
+
+        assert data["summary"]["total_projects"] == 2
+        assert authenticated_client.get("/api/reports/business-summary?period=last-month").status_code == 400
+
+    def test_business_summary_pdf_is_pregenerated(self, authenticated_client, pdf_cache_dir, portfolio):
+        pregenerate_reports(now=MONTH_START, schedule={"business_summary": "monthly"})
+        hits = get_pdf_cache().stats()["hits"]
+
+        response = authenticated_client.get("/api/reports/business-summary", query_string={"format": "pdf"})
+
+        assert response.status_code == 200
+        assert response.data.startswith(b"%PDF")
+        assert get_pdf_cache().stats()["hits"] == hits + 1
+
+    def test_scheduled_reports_status(self, authenticated_client, portfolio):
+        pregenerate_reports(now=MONTH_START, schedule={"plant_usage": "quarterly"})
+
+        status = authenticated_client.get("/api/reports/scheduled").get_json()
+
+        assert status["schedule"]["plant_usage"] == "quarterly"
+        assert [(report["report_type"], report["current"]) for report in status["reports"]] == [("plant_usage", True)]
+        assert status["reports"][0]["json_seconds"] is not None
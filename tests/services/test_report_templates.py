@@ -0,0 +1,65 @@
+"""
+Test Report Templates
+
+Tests for the shared ReportLab styles and that rendering a report reuses them.
+"""
+
+import pytest
+from reportlab.lib.styles import ParagraphStyle, StyleSheet1
+from reportlab.platypus import Table, TableStyle
+
+from src.routes.reports import build_business_summary_report, render_business_summary_pdf
+from src.services.report_templates import (
+    ACCENT_CLIENTS_TABLE_STYLE,
+    REPORT_TRANSLATIONS,
+    STYLES,
+    report_translations,
+)
+
+
+@pytest.fixture
+def style_constructions(monkeypatch):
+    """Names of the ReportLab style classes constructed while the test runs"""
+    constructed = []
+    for style_class in (StyleSheet1, ParagraphStyle, TableStyle):
+        original = style_class.__init__
+
+        def record(self, *args, _original=original, _name=style_class.__name__, **kwargs):
+            constructed.append(_name)
+            _original(self, *args, **kwargs)
+
+        monkeypatch.setattr(style_class, "__init__", record)
+    return constructed
+
+
+@pytest.mark.service
+class TestReportTemplates:
+    """Test the shared report templates"""
+
+    def test_title_styles_match_report_layout(self):
+        """Title styles keep the sizes and colours of the original reports"""
+        assert STYLES["ReportTitle"].fontSize == 24
+        assert STYLES["ProjectReportTitle"].fontSize == 20
+        assert STYLES["ComprehensiveReportTitle"].alignment == 1
+        assert STYLES["ReportTitle"].parent is STYLES["Heading1"]
+
+    def test_table_styles_are_reusable(self):
+        """Applying a shared table style does not change it"""
+        commands = list(ACCENT_CLIENTS_TABLE_STYLE.getCommands())
+        for _ in range(2):
+            Table([["Naam", "Projecten"], ["Jansen", "3"]]).setStyle(ACCENT_CLIENTS_TABLE_STYLE)
+
+        assert ACCENT_CLIENTS_TABLE_STYLE.getCommands() == commands
+        assert ("ALIGN", (2, 0), (-1, -1), "RIGHT") in commands
+
+    def test_translations_fall_back_to_english(self):
+        """Unknown languages use the English labels"""
+        assert report_translations("nl")["page"] == "Pagina"
+        assert report_translations("de") is REPORT_TRANSLATIONS["en"]
+
+    def test_rendering_does_not_rebuild_styles(self, app_context, style_constructions):
+        """Rendering a report uses the shared styles instead of building its own"""
+        pdf = render_business_summary_pdf(build_business_summary_report())
+
+        assert pdf.startswith(b"%PDF")
+        assert style_constructions == []
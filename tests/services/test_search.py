@@ -0,0 +1,222 @@
+"""
+Test Search
+
+Tests for the full-text search indexes, the search filter of the list
+endpoints and the unified search endpoint.
+"""
+
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import insert
+
+from src.models.landscape import Plant
+from src.models.user import db
+from src.services.search import matching, search
+from src.utils.full_text import (
+    UNACCENT_FUNCTION,
+    _postgresql_statements,
+    include_in_migrations,
+    match_expression,
+    search_terms,
+)
+from tests.fixtures.auth_fixtures import authenticated_test_user
+
+
+@pytest.fixture
+def authenticated_client(client, app_context, authenticated_test_user):
+    """Provide an authenticated test client with application context"""
+
+    return client
+
+
+def _matching_names(model, value):
+    return sorted(entity.name for entity in model.query.filter(matching(model, value)))
+
+
+@pytest.mark.service
+class TestSearchTerms:
+    """Test turning a search into index terms"""
+
+    def test_terms_are_folded_words(self):
+        assert search_terms("Zelkova  SERRATA") == ["zelkova", "serrata"]
+        assert search_terms("Éspèce d'été") == ["espece", "ete"]
+        assert search_terms("a") == ["a"]
+        assert search_terms("info@green-roof.nl") == ["info", "green", "roof", "nl"]
+        assert search_terms("%_ ") == []
+
+    def test_match_expressions(self):
+        assert match_expression("sqlite", ["zelk", "serr"]) == '"zelk"* "serr"*'
+        assert match_expression("postgresql", ["zelk", "serr"]) == "zelk:* & serr:*"
+
+    def test_postgresql_vectors_are_accent_free_like_the_terms(self):
+        column = _postgresql_statements("plants")[0]
+
+        assert column.count(f"{UNACCENT_FUNCTION}(coalesce(") == 3
+        assert "to_tsvector('simple', coalesce(" not in column
+
+
+@pytest.mark.service
+class TestSearchIndexMigrations:
+    """Test that migration autogenerate leaves the search indexes alone"""
+
+    @staticmethod
+    def _search_index_changes(**options):
+        with db.engine.connect() as connection:
+            changes = compare_metadata(MigrationContext.configure(connection, opts=options), db.metadata)
+        return [change for change in changes if "_fts" in str(change)]
+
+    def test_autogenerate_does_not_drop_the_search_indexes(self, app_context):
+        assert self._search_index_changes()
+        assert self._search_index_changes(include_name=include_in_migrations) == []
+
+    def test_names_owned_by_the_search_indexes(self):
+        assert not include_in_migrations("plants_fts", "table", {})
+        assert not include_in_migrations("plants_fts_docsize", "table", {})
+        assert not include_in_migrations("search_vector", "column", {"table_name": "clients"})
+        assert not include_in_migrations("idx_projects_search", "index", {"table_name": "projects"})
+        assert include_in_migrations("plants", "table", {})
+        assert include_in_migrations("idx_plant_name", "index", {"table_name": "plants"})
+
+
+@pytest.mark.service
+class TestSearchIndex:
+    """Test that the indexes follow every write to the indexed tables"""
+
+    def test_word_prefixes_match(self, app_context, plant_factory):
+        plant_factory(name="Zelkova serrata", common_name="Japanese Zelkova", category="Tree")
+        plant_factory(name="Quillwort lacustris", common_name="Lake quillwort", category="Perennial")
+
+        assert _matching_names(Plant, "zelk") == ["Zelkova serrata"]
+        assert _matching_names(Plant, "JAPANESE zel") == ["Zelkova serrata"]
+        assert _matching_names(Plant, "quillwort tree") == []
+        assert _matching_names(Plant, "elkova") == []
+
+    def test_accents_are_ignored(self, app_context, plant_factory):
+        plant_factory(name="Zinnia élégante", common_name=None, category="Annual")
+
+        assert _matching_names(Plant, "zinnia elegante") == ["Zinnia élégante"]
+        assert _matching_names(Plant, "Élég") == ["Zinnia élégante"]
+
+    def test_updates_and_deletes_are_indexed(self, app_context, plant_factory):
+        plant = plant_factory(name="Quillwort echinospora", common_name=None, category="Aquatic")
+
+        plant.name = "Zostera marina"
+        db.session.commit()
+        assert _matching_names(Plant, "quillwort") == []
+        assert _matching_names(Plant, "zostera") == ["Zostera marina"]
+
+        db.session.delete(plant)
+        db.session.commit()
+        assert _matching_names(Plant, "zostera") == []
+
+    def test_bulk_inserts_are_indexed(self, app_context):
+        db.session.execute(
+            insert(Plant),
+            [{"name": f"Quillwort imported {number}", "category": "Aquatic"} for number in range(3)],
+        )
+
+        assert len(_matching_names(Plant, "quillwort imported")) == 3
+
+    def test_rebuild_command(self, app, app_context, plant_factory):
+        if db.engine.dialect.name != "sqlite":
+            pytest.skip("PostgreSQL indexes are generated columns")
+        plant_factory(name="Zelkova serrata", common_name=None, category="Tree")
+        db.session.execute(db.text("INSERT INTO plants_fts(plants_fts) VALUES ('delete-all')"))
+        assert _matching_names(Plant, "zelkova") == []
+
+        result = app.test_cli_runner().invoke(args=["search", "rebuild"])
+
+        assert result.exit_code == 0, result.output
+        assert _matching_names(Plant, "zelkova") == ["Zelkova serrata"]
+
+    def test_searches_without_words_fall_back_to_like(self, app_context, plant_factory):
+        plant_factory(name="Zelkova 100%", common_name=None, category="Tree")
+
+        assert _matching_names(Plant, "%") == ["Zelkova 100%"]
+
+    def test_search_uses_the_index(self, app_context):
+        if db.engine.dialect.name != "sqlite":
+            pytest.skip("Query plans are checked on SQLite")
+        query = Plant.query.filter(matching(Plant, "zelk"))
+        statement = query.statement.compile(db.engine, compile_kwargs={"literal_binds": True})
+
+        plan = " ".join(row[-1] for row in db.session.execute(db.text(f"EXPLAIN QUERY PLAN {statement}")))
+
+        # Plants are looked up by the IDs the FTS index returns
+        assert "SCAN plants_fts VIRTUAL TABLE INDEX" in plan
+        assert "SEARCH plants USING INTEGER PRIMARY KEY" in plan
+
+
+@pytest.mark.service
+class TestUnifiedSearch:
+    """Test ranking matches across entity types"""
+
+    @pytest.fixture
+    def entities(self, app_context, plant_factory, client_factory, project_factory, supplier_factory):
+        return {
+            "plant": plant_factory(name="Zelkova serrata", common_name="Japanese Zelkova", category="Tree"),
+            "client": client_factory(name="Zelkova Estates", company="Zelkova Estates BV", city="Utrecht"),
+            "project": project_factory(
+                name="Courtyard renewal", location="Delft", description="Replace the limes with a zelkova"
+            ),
+            "supplier": supplier_factory(name="Quillwort Nursery", specialization="Zelkova and elms", city="Boskoop"),
+        }
+
+    def test_results_from_all_types_are_ranked(self, entities):
+        results = search("zelkova")
+
+        assert {result["type"] for result in results} == {"plant", "client", "project", "supplier"}
+        scores = [result["score"] for result in results]
+        assert scores == sorted(scores, reverse=True)
+        # Matches in names rank above matches in descriptions
+        ranked = [(result["type"], result["id"]) for result in results]
+        assert ranked.index(("client", entities["client"].id)) < ranked.index(("project", entities["project"].id))
+        plant = next(result for result in results if result["type"] == "plant")
+        assert plant == {
+            "type": "plant",
+            "id": entities["plant"].id,
+            "title": "Zelkova serrata",
+            "subtitle": "Japanese Zelkova · Tree",
+            "score": plant["score"],
+        }
+
+    def test_types_and_limit(self, entities):
+        assert [result["type"] for result in search("zelkova", types=["supplier"])] == ["supplier"]
+        assert len(search("zelkova", limit=2)) == 2
+        assert search("   ") == []
+        with pytest.raises(ValueError):
+            search("zelkova", types=["garden"])
+
+
+@pytest.mark.api
+class TestSearchRoutes:
+    """Test the unified search endpoint and the list endpoints using the index"""
+
+    def test_search_endpoint(self, authenticated_client, plant_factory, supplier_factory):
+        plant = plant_factory(name="Zelkova serrata", common_name=None, category="Tree")
+        supplier_factory(name="Zelkova Supplies", city="Boskoop")
+
+        response = authenticated_client.get("/api/search?q=zelk&types=plant")
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["query"] == "zelk"
+        assert data["count"] == 1
+        assert data["results"][0]["id"] == plant.id
+
+    @pytest.mark.parametrize("query", ["", "q=%20", "q=zelk&limit=0", "q=zelk&limit=101", "q=zelk&types=garden"])
+    def test_search_endpoint_validation(self, authenticated_client, query):
+        assert authenticated_client.get(f"/api/search?{query}").status_code == 400
+
+    def test_search_endpoint_requires_login(self, client):
+        assert client.get("/api/search?q=zelk").status_code == 401
+
+    def test_plant_list_search(self, authenticated_client, plant_factory):
+        plant_factory(name="Zelkova serrata", common_name="Japanese Zelkova", category="Tree")
+        plant_factory(name="Zelkova carpinifolia", common_name=None, category="Tree")
+
+        response = authenticated_client.get("/api/plants?search=zelkova ser")
+
+        assert response.status_code == 200
+        assert [plant["name"] for plant in response.get_json()["plants"]] == ["Zelkova serrata"]
@@ -0,0 +1,170 @@
+"""
+Test Supplier Metrics
+
+Tests for the per-supplier metrics table, its incremental refresh and the
+supplier reads served from it.
+"""
+
+import pytest
+from sqlalchemy import delete, select
+
+from src.models.landscape import Plant, SupplierMetrics, SupplierMetricsDirty
+from src.models.user import db
+from src.services.supplier_metrics import (
+    get_supplier_metrics,
+    ranked_supplier_metrics,
+    rebuild_supplier_metrics,
+    refresh_supplier_metrics,
+)
+from src.services.supplier_service import SupplierService
+from tests.fixtures.auth_fixtures import authenticated_test_user
+
+
+@pytest.fixture
+def suppliers(supplier_factory, product_factory, plant_factory, project_factory, project_plant_factory):
+    nursery = supplier_factory(name="Kwekerij Peters")
+    tools = supplier_factory(name="Gereedschap BV")
+    idle = supplier_factory(name="Stille Leverancier")
+
+    product_factory(supplier=tools, price=10.0, stock_quantity=5)
+    product_factory(supplier=tools, price=0.0, stock_quantity=3)
+    product_factory(supplier=nursery, price=20.0, stock_quantity=1)
+    acer = plant_factory(supplier=nursery, price=40.0)
+    buxus = plant_factory(supplier=nursery, price=None)
+
+    garden, roof = project_factory(), project_factory()
+    project_plant_factory(project=garden, plant=acer, quantity=2, unit_cost=50.0)
+    project_plant_factory(project=roof, plant=acer, quantity=1, unit_cost=40.0)
+    project_plant_factory(project=roof, plant=buxus, quantity=10, unit_cost=None)
+    return nursery, tools, idle
+
+
+def _dirty():
+    return {supplier_id for (supplier_id,) in db.session.execute(select(SupplierMetricsDirty.supplier_id))}
+
+
+@pytest.fixture
+def authenticated_client(client, app_context, authenticated_test_user):
+    """Provide an authenticated test client with application context"""
+
+    return client
+
+
+@pytest.mark.service
+class TestSupplierMetrics:
+    """Test the stored metrics and their refresh"""
+
+    def test_refresh_computes_metrics(self, app_context, suppliers):
+        nursery, tools, idle = suppliers
+        assert _dirty() == {nursery.id, tools.id, idle.id}
+
+        assert refresh_supplier_metrics() == sorted([nursery.id, tools.id, idle.id])
+        assert _dirty() == set()
+
+        metrics = db.session.get(SupplierMetrics, nursery.id)
+        assert (metrics.product_count, metrics.plant_count, metrics.total_items) == (1, 2, 3)
+        assert (metrics.project_count, metrics.selection_count, metrics.total_quantity) == (2, 3, 13)
+        assert metrics.revenue == 140.0
+        assert metrics.average_plant_price == 40.0
+
+        metrics = db.session.get(SupplierMetrics, tools.id)
+        assert metrics.inventory_value == 50.0
+        assert metrics.average_product_price == 10.0
+        assert metrics.revenue == 0
+
+        assert db.session.get(SupplierMetrics, idle.id).total_items == 0
+
+    def test_writes_refresh_only_touched_suppliers(self, app_context, suppliers, product_factory):
+        nursery, tools, idle = suppliers
+        refresh_supplier_metrics()
+
+        product = product_factory(supplier=idle, price=8.0, stock_quantity=2)
+        assert refresh_supplier_metrics() == [idle.id]
+        assert get_supplier_metrics(idle.id).inventory_value == 16.0
+
+        # Moving an item marks both the old and the new supplier
+        product.supplier_id = tools.id
+        db.session.commit()
+        assert _dirty() == {idle.id, tools.id}
+        assert get_supplier_metrics(idle.id).product_count == 0
+        assert get_supplier_metrics(tools.id).product_count == 3
+
+    def test_project_plant_changes_mark_the_plant_supplier(self, app_context, suppliers, project_plant_factory):
+        nursery, *_ = suppliers
+        refresh_supplier_metrics()
+        acer = db.session.execute(
+            select(Plant).where(Plant.supplier_id == nursery.id, Plant.price == 40.0)
+        ).scalar_one()
+
+        project_plant_factory(plant=acer, quantity=5, unit_cost=2.0)
+
+        assert _dirty() == {nursery.id}
+        assert get_supplier_metrics(nursery.id).revenue == 150.0
+
+    def test_deleted_supplier_loses_its_row(self, app_context, suppliers):
+        *_, idle = suppliers
+        refresh_supplier_metrics()
+
+        db.session.delete(idle)
+        db.session.commit()
+
+        assert get_supplier_metrics(idle.id) is None
+
+    def test_missing_rows_are_computed_on_read(self, app_context, suppliers):
+        nursery, *_ = suppliers
+        db.session.execute(delete(SupplierMetricsDirty))
+        db.session.commit()
+
+        assert get_supplier_metrics(nursery.id).total_items == 3
+
+    def test_rebuild_and_ranking(self, app_context, suppliers):
+        nursery, tools, idle = suppliers
+        rebuild_supplier_metrics()
+
+        assert _dirty() == set()
+        assert [supplier.id for supplier, _ in ranked_supplier_metrics()] == [nursery.id, tools.id, idle.id]
+        assert [supplier.id for supplier, _ in ranked_supplier_metrics(1)] == [nursery.id]
+        assert idle.id not in [supplier.id for supplier, _ in ranked_supplier_metrics(with_items_only=True)]
+
+    def test_service_reads_metrics(self, app_context, suppliers):
+        nursery, tools, _ = suppliers
+
+        statistics = SupplierService.get_supplier_statistics(nursery.id)
+
+        assert (statistics["total_products"], statistics["total_plants"]) == (1, 2)
+        # The service averages over all plants, counting a missing price as zero
+        assert statistics["average_plant_price"] == 20.0
+        assert [entry["supplier"]["id"] for entry in SupplierService.get_top_suppliers_by_products()] == [
+            nursery.id,
+            tools.id,
+        ]
+
+    def test_cli_rebuild(self, app, app_context, suppliers):
+        result = app.test_cli_runner().invoke(args=["supplier-metrics", "rebuild"])
+
+        assert result.exit_code == 0, result.output
+        assert db.session.execute(select(SupplierMetrics)).scalars().all()
+
+
+@pytest.mark.api
+class TestSupplierMetricsRoutes:
+    """Test the supplier endpoints served from the metrics"""
+
+    def test_statistics_include_usage(self, authenticated_client, suppliers):
+        nursery, *_ = suppliers
+
+        data = authenticated_client.get(f"/api/suppliers/{nursery.id}/statistics").get_json()
+
+        assert data["total_items"] == 3
+        assert data["average_plant_price"] == 40.0
+        assert (data["project_count"], data["total_quantity"], data["revenue"]) == (2, 13, 140.0)
+
+    def test_supplier_performance_report(self, authenticated_client, suppliers):
+        nursery, tools, idle = suppliers
+
+        data = authenticated_client.get("/api/reports/supplier-performance").get_json()
+
+        assert [supplier["name"] for supplier in data["suppliers"]] == [tools.name, nursery.name, idle.name]
+        assert data["suppliers"][1]["project_count"] == 2
+        assert data["suppliers"][1]["revenue_share"] == 100.0
+        assert data["top_supplier"]["product_count"] == 2
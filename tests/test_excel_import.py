@@ -2,6 +2,7 @@ import io
 import tempfile
 
 import pytest
+from openpyxl import load_workbook
 
 from tests.fixtures.auth_fixtures import authenticated_test_user, setup_test_authentication
 from tests.fixtures.database import DatabaseTestMixin
@@ -57,6 +58,37 @@ class TestExcelImport(DatabaseTestMixin):
         data = response.get_json()
         assert "error" in data
 
+    def test_template_is_cacheable(self, client, app_context):
+        """Test templates are served with an ETag and honour conditional requests"""
+        response = client.get("/api/import/template/clients")
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert "max-age=86400" in response.headers["Cache-Control"]
+        assert "private" in response.headers["Cache-Control"]
+
+        worksheet = load_workbook(io.BytesIO(response.get_data())).active
+        assert worksheet.title == "clients_template"
+        assert worksheet["A1"].value == "name"
+        assert worksheet["A1"].font.bold
+
+        response = client.get("/api/import/template/clients", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+    def test_template_regenerated_when_columns_change(self, client, app_context, monkeypatch):
+        """Test cached templates are rebuilt when the column definitions change"""
+        from src.routes import excel_import
+
+        first_etag, first_bytes = excel_import.get_template_workbook("products")
+        assert excel_import.get_template_workbook("products")[1] is first_bytes
+
+        monkeypatch.setitem(excel_import.REQUIRED_COLUMNS, "products", ["name", "price"])
+        second_etag, _ = excel_import.get_template_workbook("products")
+        assert second_etag != first_etag
+
+        response = client.get("/api/import/template/products", headers={"If-None-Match": first_etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"].strip('"') == second_etag
+
     def test_validate_empty_file_upload(self, client, app_context):
         """Test validation with no file uploaded"""
         response = client.post("/api/import/validate-file", data={"type": "suppliers"})